@@ -0,0 +1,173 @@
+"""
+feature_cache.py - Cached Feature Frames for ML Models
+
+This module provides a small cache for engineered feature frames so repeated
+training and prediction over the same price history do not recompute every
+technical indicator.
+
+Entries are keyed by (symbol, data hash, feature-set version). Recently used
+entries are kept in memory; when a cache directory is given, entries are also
+persisted with joblib so other processes can reuse them. At most
+max_disk_entries files are kept on disk, evicting the least recently written.
+Entries that are only ever looked up once (such as a rolling prediction
+window) can be stored with persist=False so they never reach the disk.
+
+Usage:
+    from basicbot.ml_models.feature_cache import FeatureCache
+    cache = FeatureCache(cache_dir="models/feature_cache")
+    key = cache.make_key("SPY", data, version="1")
+    features = cache.get(key)
+    if features is None:
+        features = compute_features(data)
+        cache.put(key, features)
+"""
+
+import hashlib
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+import joblib
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class FeatureCache:
+    """
+    LRU cache of feature DataFrames with optional on-disk persistence.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_entries: int = 16,
+        max_disk_entries: int = 64
+    ):
+        """
+        Initialize the feature cache.
+
+        Args:
+            cache_dir: Directory for persisted entries (memory-only if None)
+            max_entries: Maximum number of entries kept in memory
+            max_disk_entries: Maximum number of entries kept in cache_dir
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._entries: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(
+        symbol: Optional[str],
+        data: pd.DataFrame,
+        version: str,
+        columns: Optional[Sequence[str]] = None
+    ) -> str:
+        """
+        Build a cache key from the symbol, data contents and feature-set version.
+
+        Args:
+            symbol: Trading symbol (or None when unknown)
+            data: Input price data
+            version: Feature-set version string
+            columns: Columns that feed the features (defaults to all)
+
+        Returns:
+            Hex digest identifying the entry
+        """
+        frame = data[list(columns)] if columns is not None else data
+        row_hashes = pd.util.hash_pandas_object(frame, index=True).values
+        digest = hashlib.sha1(row_hashes.tobytes())
+        digest.update(f"|{symbol or '*'}|{version}|{','.join(map(str, frame.columns))}".encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """
+        Look up a feature frame.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Copy of the cached frame, or None if missing
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key].copy()
+
+        path = self._path_for(key)
+        if path is not None and path.exists():
+            try:
+                features = joblib.load(path)
+                self._remember(key, features)
+                self.hits += 1
+                return features.copy()
+            except Exception as e:
+                logger.warning(f"Discarding unreadable feature cache entry {path}: {e}")
+                path.unlink(missing_ok=True)
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, features: pd.DataFrame, persist: bool = True) -> None:
+        """
+        Store a feature frame.
+
+        Args:
+            key: Cache key from make_key()
+            features: Feature frame to cache
+            persist: Also write the entry to cache_dir (if one is set)
+        """
+        self._remember(key, features.copy())
+
+        path = self._path_for(key) if persist else None
+        if path is not None:
+            tmp_path = path.with_suffix(".tmp")
+            try:
+                joblib.dump(features, tmp_path)
+                tmp_path.replace(path)
+            except Exception as e:
+                logger.warning(f"Could not persist feature cache entry {path}: {e}")
+                tmp_path.unlink(missing_ok=True)
+                return
+            self._evict_disk(keep=path)
+
+    def clear(self) -> None:
+        """Drop all in-memory and persisted entries."""
+        self._entries.clear()
+        if self.cache_dir:
+            for path in self.cache_dir.glob("*.joblib"):
+                path.unlink(missing_ok=True)
+
+    def _evict_disk(self, keep: Path) -> None:
+        """Delete the oldest persisted entries beyond max_disk_entries, sparing ``keep``."""
+        entries = []
+        for path in self.cache_dir.glob("*.joblib"):
+            if path == keep:
+                continue
+            try:
+                entries.append((path.stat().st_mtime_ns, path))
+            except OSError:
+                continue  # Removed by another process
+        entries.sort()
+        for _, path in entries[:max(len(entries) + 1 - self.max_disk_entries, 0)]:
+            path.unlink(missing_ok=True)
+
+    def _remember(self, key: str, features: pd.DataFrame) -> None:
+        """Insert into the in-memory LRU, evicting the oldest entry if full."""
+        self._entries[key] = features
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path_for(self, key: str) -> Optional[Path]:
+        """Return the on-disk path for a key, if persistence is enabled."""
+        return self.cache_dir / f"{key}.joblib" if self.cache_dir else None
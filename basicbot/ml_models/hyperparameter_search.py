@@ -0,0 +1,286 @@
+"""
+hyperparameter_search.py - Successive-Halving Search with a Persistent Trial Cache
+
+This module provides a time-series-aware successive-halving search used by the
+ML models in place of an exhaustive GridSearchCV:
+
+- Every candidate is first scored on the most recent slice of the training
+  data; only the best 1/factor of candidates advance to a slice `factor`
+  times larger, until the survivors are scored on the full training set.
+- Cross-validation uses TimeSeriesSplit, so each fold validates on data that
+  comes after the data it was fitted on.
+- Each (data, parameters, resource) score is stored in a persistent trial
+  cache, so a retrain on unchanged data never refits a configuration.
+- The previous best parameters can be passed in as a warm start; they are
+  always carried through every rung so the new winner has to beat them.
+
+Usage:
+    from basicbot.ml_models.hyperparameter_search import SuccessiveHalvingSearch, TrialCache
+    search = SuccessiveHalvingSearch(RandomForestClassifier(random_state=42), param_grid,
+                                     trial_cache=TrialCache("models/trials.json"))
+    result = search.fit(X_train, y_train, warm_start=previous_best)
+"""
+
+import hashlib
+import json
+import logging
+import math
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import ParameterGrid, TimeSeriesSplit
+
+logger = logging.getLogger(__name__)
+
+
+class TrialCache:
+    """
+    JSON-backed store of cross-validation scores keyed by trial fingerprint.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, max_trials: int = 10000):
+        """
+        Initialize the trial cache.
+
+        Args:
+            path: JSON file to persist trials to (memory-only if None)
+            max_trials: Maximum number of trials kept; oldest are dropped first
+        """
+        self.path = Path(path) if path else None
+        self.max_trials = max_trials
+        self.trials: Dict[str, float] = {}
+        self.best_params: Optional[Dict[str, Any]] = None
+        self._dirty = False
+        self._load()
+
+    def get(self, key: str) -> Optional[float]:
+        """Return the cached score for a trial, or None."""
+        return self.trials.get(key)
+
+    def put(self, key: str, score: float) -> None:
+        """Record the score for a trial."""
+        self.trials.pop(key, None)
+        self.trials[key] = score
+        while len(self.trials) > self.max_trials:
+            self.trials.pop(next(iter(self.trials)))
+        self._dirty = True
+
+    def set_best_params(self, params: Dict[str, Any]) -> None:
+        """Remember the winning parameters for warm-starting the next search."""
+        self.best_params = dict(params)
+        self._dirty = True
+
+    def save(self) -> None:
+        """Persist the cache if it has changed."""
+        if not self.path or not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump({"best_params": self.best_params, "trials": self.trials}, f)
+            tmp_path.replace(self.path)
+            self._dirty = False
+        except Exception as e:
+            logger.warning(f"Could not save trial cache {self.path}: {e}")
+
+    def _load(self) -> None:
+        """Load persisted trials if the cache file exists."""
+        if not self.path or not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r') as f:
+                payload = json.load(f)
+            self.trials = dict(payload.get("trials", {}))
+            self.best_params = payload.get("best_params")
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable trial cache {self.path}: {e}")
+
+
+def fingerprint_arrays(*arrays: np.ndarray) -> str:
+    """
+    Hash array contents (shape, dtype and bytes) into a hex digest.
+
+    Args:
+        arrays: Arrays to fingerprint
+
+    Returns:
+        Hex digest identifying the arrays
+    """
+    digest = hashlib.sha1()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.shape}|{array.dtype}|".encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def _cv_score(
+    estimator,
+    params: Dict[str, Any],
+    X: np.ndarray,
+    y: np.ndarray,
+    n_splits: int,
+    scorer: Callable
+) -> float:
+    """Mean TimeSeriesSplit score for one parameter set."""
+    scores = []
+    for train_idx, test_idx in TimeSeriesSplit(n_splits=n_splits).split(X):
+        model = clone(estimator).set_params(**params)
+        model.fit(X[train_idx], y[train_idx])
+        scores.append(scorer(y[test_idx], model.predict(X[test_idx])))
+    return float(np.mean(scores))
+
+
+class SuccessiveHalvingSearch:
+    """
+    Successive-halving hyperparameter search over growing recent-data slices.
+    """
+
+    def __init__(
+        self,
+        estimator,
+        param_grid: Dict[str, List[Any]],
+        factor: int = 3,
+        n_splits: int = 5,
+        min_resources: Optional[int] = None,
+        scorer: Callable = accuracy_score,
+        trial_cache: Optional[TrialCache] = None,
+        n_jobs: int = -1
+    ):
+        """
+        Initialize the search.
+
+        Args:
+            estimator: Unfitted scikit-learn estimator to tune
+            param_grid: Parameter grid to search
+            factor: Fraction of candidates (1/factor) promoted at each rung
+            n_splits: Number of TimeSeriesSplit folds
+            min_resources: Samples used at the first rung (derived if None)
+            scorer: Score function (y_true, y_pred) -> float, higher is better
+            trial_cache: Cache of previous trial scores
+            n_jobs: Parallel jobs used to score candidates within a rung
+        """
+        self.estimator = estimator
+        self.param_grid = param_grid
+        self.factor = factor
+        self.n_splits = n_splits
+        self.min_resources = min_resources
+        self.scorer = scorer
+        self.trial_cache = trial_cache or TrialCache()
+        self.n_jobs = n_jobs
+
+    def fit(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        warm_start: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run the search on chronologically ordered training data.
+
+        Args:
+            X: Training features, oldest sample first
+            y: Training labels
+            warm_start: Previous best parameters to seed the search with
+
+        Returns:
+            Dictionary with best_params, best_score, n_fits, cache_hits,
+            wall_time and the per-rung history
+        """
+        start = time.perf_counter()
+        candidates = [dict(params) for params in ParameterGrid(self.param_grid)]
+        if warm_start:
+            warm_start = dict(warm_start)
+            if warm_start in candidates:
+                candidates.remove(warm_start)
+            candidates.insert(0, warm_start)
+
+        n_samples = len(X)
+        n_rungs = max(1, math.ceil(math.log(len(candidates), self.factor)))
+        min_resources = self.min_resources or max(
+            (self.n_splits + 1) * 20, n_samples // self.factor ** (n_rungs - 1)
+        )
+
+        history = []
+        n_fits = 0
+        cache_hits = 0
+        scores: Dict[int, float] = {}
+
+        for rung in range(n_rungs):
+            last_rung = len(candidates) <= 1 or rung == n_rungs - 1
+            resources = n_samples if last_rung else min(
+                n_samples, min_resources * self.factor ** rung
+            )
+
+            # Fit on the most recent samples so every rung reflects current regimes
+            X_rung, y_rung = X[-resources:], y[-resources:]
+            data_key = fingerprint_arrays(X_rung, y_rung)
+
+            keys = [self._trial_key(data_key, params) for params in candidates]
+            pending = [i for i, key in enumerate(keys) if self.trial_cache.get(key) is None]
+            cache_hits += len(candidates) - len(pending)
+
+            results = Parallel(n_jobs=self.n_jobs)(
+                delayed(_cv_score)(
+                    self.estimator, candidates[i], X_rung, y_rung, self.n_splits, self.scorer
+                )
+                for i in pending
+            )
+            for i, score in zip(pending, results):
+                self.trial_cache.put(keys[i], score)
+            n_fits += len(pending) * self.n_splits
+
+            scores = {i: self.trial_cache.get(key) for i, key in enumerate(keys)}
+            history.append({
+                'rung': rung,
+                'resources': resources,
+                'n_candidates': len(candidates),
+                'best_score': max(scores.values()),
+            })
+
+            if last_rung:
+                break
+
+            # Promote the top 1/factor, always carrying the warm-start candidate
+            n_keep = max(1, math.ceil(len(candidates) / self.factor))
+            ranked = sorted(scores, key=lambda i: scores[i], reverse=True)[:n_keep]
+            if warm_start and 0 not in ranked:
+                ranked.append(0)
+            candidates = [candidates[i] for i in sorted(ranked)]
+
+        # Ties go to the earliest candidate, which is the warm start if given
+        best = max(range(len(candidates)), key=lambda i: (scores[i], -i))
+        best_params = candidates[best]
+        self.trial_cache.set_best_params(best_params)
+        self.trial_cache.save()
+
+        return {
+            'best_params': best_params,
+            'best_score': scores[best],
+            'n_fits': n_fits,
+            'cache_hits': cache_hits,
+            'wall_time': time.perf_counter() - start,
+            'history': history,
+        }
+
+    def _trial_key(self, data_key: str, params: Dict[str, Any]) -> str:
+        """Fingerprint a trial from data, parameters and CV configuration."""
+        payload = json.dumps(
+            {
+                'data': data_key,
+                'params': params,
+                'estimator': type(self.estimator).__name__,
+                'base_params': {k: repr(v) for k, v in self.estimator.get_params().items()},
+                'n_splits': self.n_splits,
+                'scorer': getattr(self.scorer, '__name__', repr(self.scorer)),
+            },
+            sort_keys=True,
+            default=repr
+        )
+        return hashlib.sha1(payload.encode()).hexdigest()
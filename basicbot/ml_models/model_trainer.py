@@ -162,10 +162,10 @@ def train_regime_model(
         
         try:
             # Train on training data
-            metrics = detector.train(data_sets["train"], optimize=optimize)
+            metrics = detector.train(data_sets["train"], optimize=optimize, symbol=symbol)
             
             # Test on test data
-            test_prediction = detector.predict(data_sets["test"].iloc[-50:])
+            test_prediction = detector.predict(data_sets["test"].iloc[-50:], symbol=symbol)
             
             # Get strategy recommendation
             strategy = detector.get_regime_strategy(test_prediction)
@@ -17,6 +17,8 @@ Usage:
 """
 
 import os
+import json
+import time
 import logging
 import numpy as np
 import pandas as pd
@@ -54,6 +56,27 @@ except ImportError:
             logger.addHandler(handler)
             return logger
 
+from basicbot.ml_models.feature_cache import FeatureCache
+from basicbot.ml_models.hyperparameter_search import (
+    SuccessiveHalvingSearch,
+    TrialCache,
+    fingerprint_arrays,
+)
+
+# Bump whenever extract_features() changes so cached feature frames are not reused
+FEATURE_SET_VERSION = "1"
+
+# Bars of history needed to compute converged features for the latest bar
+PREDICT_LOOKBACK = 250
+
+# Hyperparameter grid searched by train(optimize=True)
+PARAM_GRID = {
+    'n_estimators': [100, 200, 300],
+    'max_depth': [None, 10, 20, 30],
+    'min_samples_split': [2, 5, 10],
+    'min_samples_leaf': [1, 2, 4]
+}
+
 
 class RegimeDetector:
     """
@@ -69,7 +92,8 @@ class RegimeDetector:
     def __init__(
         self,
         model_dir: str = "models",
-        logger: Optional[logging.Logger] = None
+        logger: Optional[logging.Logger] = None,
+        feature_cache: Optional[FeatureCache] = None
     ):
         """
         Initialize the regime detector.
@@ -77,16 +101,21 @@ class RegimeDetector:
         Args:
             model_dir: Directory to save/load models
             logger: Logger instance
+            feature_cache: Cache for extracted features (defaults to one
+                persisted under model_dir/feature_cache)
         """
         self.logger = logger or setup_logging("regime_detector")
         self.model_dir = Path(model_dir)
         self.model = None
         self.scaler = None
         self.feature_names = []
+        self.model_key = None
         
         # Ensure model directory exists
         os.makedirs(self.model_dir, exist_ok=True)
         
+        self.feature_cache = feature_cache or FeatureCache(self.model_dir / "feature_cache")
+        
         # Try to load pre-trained model if it exists
         self._load_model()
         
@@ -113,6 +142,11 @@ class RegimeDetector:
                     with open(feature_path, 'r') as f:
                         self.feature_names = [line.strip() for line in f.readlines()]
                 
+                # Load the fingerprint of the data and parameters the model was fit on
+                key_path = self.model_dir / "regime_model_key.txt"
+                if key_path.exists():
+                    self.model_key = key_path.read_text().strip() or None
+                
                 self.logger.info(f"Loaded pre-trained regime model from {model_path}")
                 return True
             except Exception as e:
@@ -141,16 +175,32 @@ class RegimeDetector:
                     for feature in self.feature_names:
                         f.write(f"{feature}\n")
             
+            key_path = self.model_dir / "regime_model_key.txt"
+            key_path.write_text(self.model_key or "")
+            
             self.logger.info(f"Saved regime model to {model_path}")
         except Exception as e:
             self.logger.error(f"Error saving model: {e}")
     
-    def extract_features(self, data: pd.DataFrame) -> pd.DataFrame:
+    def extract_features(
+        self,
+        data: pd.DataFrame,
+        symbol: Optional[str] = None,
+        use_cache: bool = True,
+        persist: bool = True
+    ) -> pd.DataFrame:
         """
         Extract features for regime detection.
         
+        Results are cached by (symbol, data hash, FEATURE_SET_VERSION), so
+        calling this again on the same history skips the TA-Lib computations.
+        
         Args:
             data: DataFrame with OHLCV price data
+            symbol: Trading symbol the data belongs to
+            use_cache: Whether to read from and write to the feature cache
+            persist: Whether a computed frame may be written to the cache's
+                directory (memory only otherwise)
             
         Returns:
             DataFrame with extracted features
@@ -160,6 +210,30 @@ class RegimeDetector:
         if not all(col in data.columns for col in required_cols):
             raise ValueError(f"Data must contain columns: {required_cols}")
         
+        if not use_cache:
+            return self._compute_features(data, required_cols)
+        
+        key = self.feature_cache.make_key(symbol, data, FEATURE_SET_VERSION)
+        df = self.feature_cache.get(key)
+        if df is None:
+            df = self._compute_features(data, required_cols)
+            self.feature_cache.put(key, df, persist=persist)
+        else:
+            self.feature_names = [col for col in df.columns if col not in required_cols + ['date', 'timestamp']]
+        
+        return df
+    
+    def _compute_features(self, data: pd.DataFrame, required_cols: List[str]) -> pd.DataFrame:
+        """
+        Compute the feature frame for extract_features() without caching.
+        
+        Args:
+            data: DataFrame with OHLCV price data
+            required_cols: OHLCV columns that are not features themselves
+            
+        Returns:
+            DataFrame with extracted features
+        """
         # Copy data to avoid modifying the original
         df = data.copy()
         
@@ -226,9 +300,6 @@ class RegimeDetector:
         """
         df = data.copy()
         
-        # Initialize regime column
-        df['regime'] = np.nan
-        
         # Trend detection parameters
         trend_threshold = 0.8  # % of time moving in same direction
         volatility_z_threshold = 1.5  # Standard deviations above mean volatility
@@ -248,23 +319,18 @@ class RegimeDetector:
             (df['bb_width'] < df['bb_width'].rolling(252).mean())
         )
         
-        # Assign regimes based on rules
-        for i in range(window, len(df)):
-            if df.loc[i, 'vol_z'] > volatility_z_threshold:
-                # High volatility regime
-                df.loc[i, 'regime'] = 3
-            elif df.loc[i, 'up_days'] > trend_threshold:
-                # Trending up regime
-                df.loc[i, 'regime'] = 1
-            elif df.loc[i, 'down_days'] > trend_threshold:
-                # Trending down regime
-                df.loc[i, 'regime'] = 2
-            elif df.loc[i, 'range_bound']:
-                # Mean reverting regime
-                df.loc[i, 'regime'] = 0
-            else:
-                # Default to uncertain/mixed regime
-                df.loc[i, 'regime'] = 3
+        # Assign regimes based on rules, first matching rule wins
+        conditions = [
+            df['vol_z'] > volatility_z_threshold,     # High volatility regime
+            df['up_days'] > trend_threshold,          # Trending up regime
+            df['down_days'] > trend_threshold,        # Trending down regime
+            df['range_bound'].astype(bool),           # Mean reverting regime
+        ]
+        regimes = np.select(conditions, [3, 1, 2, 0], default=3)  # Default to uncertain/mixed regime
+        
+        # The first `window` rows lack a full lookback and stay unlabeled
+        df['regime'] = regimes
+        df = df.iloc[window:].copy()
         
         # Convert to integer
         df['regime'] = df['regime'].astype('int')
@@ -303,7 +369,10 @@ class RegimeDetector:
         self, 
         data: pd.DataFrame,
         optimize: bool = True,
-        test_size: float = 0.2
+        test_size: float = 0.2,
+        symbol: Optional[str] = None,
+        search: str = "halving",
+        param_grid: Optional[Dict[str, List[Any]]] = None
     ) -> Dict[str, Any]:
         """
         Train the regime detection model.
@@ -312,13 +381,22 @@ class RegimeDetector:
             data: DataFrame with OHLCV data
             optimize: Whether to perform hyperparameter optimization
             test_size: Proportion of data to use for testing
+            symbol: Trading symbol the data belongs to (used for feature caching)
+            search: Optimization mode, "halving" for successive halving with
+                time-series CV and a persistent trial cache, or "grid" for an
+                exhaustive GridSearchCV
+            param_grid: Hyperparameter grid to search (defaults to PARAM_GRID)
             
         Returns:
             Dictionary with training metrics
         """
+        if search not in ("halving", "grid"):
+            raise ValueError(f"Unknown search mode: {search}")
+        param_grid = param_grid or PARAM_GRID
+        
         # Extract features
         self.logger.info("Extracting features for regime detection")
-        features_df = self.extract_features(data)
+        features_df = self.extract_features(data, symbol=symbol)
         
         # Label regimes
         self.logger.info("Labeling market regimes")
@@ -328,20 +406,54 @@ class RegimeDetector:
         X, y, feature_names = self.prepare_training_data(labeled_df)
         
         # Split into training and testing sets
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=test_size, random_state=42, stratify=y
+        train_idx, test_idx = train_test_split(
+            np.arange(len(X)), test_size=test_size, random_state=42, stratify=y
         )
-        
-        if optimize:
+        if optimize and search == "halving":
+            # Time-series CV needs the training rows in chronological order
+            train_idx = np.sort(train_idx)
+        X_train, X_test, y_train, y_test = X[train_idx], X[test_idx], y[train_idx], y[test_idx]
+        
+        search_info = None
+        start_time = time.perf_counter()
+        
+        if optimize and search == "halving":
+            # Successive halving, warm-started from the previous best parameters
+            self.logger.info("Performing successive-halving hyperparameter search")
+            trial_cache = TrialCache(self.model_dir / "regime_search_trials.json")
+            halving = SuccessiveHalvingSearch(
+                RandomForestClassifier(random_state=42),
+                param_grid=param_grid,
+                factor=3,
+                n_splits=5,
+                trial_cache=trial_cache
+            )
+            result = halving.fit(X_train, y_train, warm_start=trial_cache.best_params)
+            best_params = result['best_params']
+            
+            # Skip the final refit if this model was already fit on the same data and parameters
+            model_key = fingerprint_arrays(X_train, y_train) + json.dumps(best_params, sort_keys=True)
+            if self.model is None or self.model_key != model_key:
+                self.model = RandomForestClassifier(random_state=42, **best_params)
+                self.model.fit(X_train, y_train)
+                self.model_key = model_key
+            else:
+                self.logger.info("Data and parameters unchanged, reusing fitted model")
+            
+            search_info = {
+                'mode': 'halving',
+                'best_params': best_params,
+                'cv_score': result['best_score'],
+                'n_fits': result['n_fits'],
+                'cache_hits': result['cache_hits'],
+            }
+            self.logger.info(
+                f"Best parameters: {best_params} "
+                f"({result['n_fits']} fits, {result['cache_hits']} cached trials)"
+            )
+        elif optimize:
             # Hyperparameter optimization
             self.logger.info("Performing hyperparameter optimization")
-            param_grid = {
-                'n_estimators': [100, 200, 300],
-                'max_depth': [None, 10, 20, 30],
-                'min_samples_split': [2, 5, 10],
-                'min_samples_leaf': [1, 2, 4]
-            }
-            
             grid_search = GridSearchCV(
                 RandomForestClassifier(random_state=42),
                 param_grid=param_grid,
@@ -352,7 +464,15 @@ class RegimeDetector:
             
             grid_search.fit(X_train, y_train)
             self.model = grid_search.best_estimator_
+            self.model_key = None
             
+            search_info = {
+                'mode': 'grid',
+                'best_params': grid_search.best_params_,
+                'cv_score': float(grid_search.best_score_),
+                'n_fits': len(grid_search.cv_results_['params']) * grid_search.n_splits_,
+                'cache_hits': 0,
+            }
             self.logger.info(f"Best parameters: {grid_search.best_params_}")
         else:
             # Train with default parameters
@@ -362,6 +482,9 @@ class RegimeDetector:
                 random_state=42
             )
             self.model.fit(X_train, y_train)
+            self.model_key = None
+        
+        wall_time = time.perf_counter() - start_time
         
         # Evaluate model
         y_pred = self.model.predict(X_test)
@@ -375,7 +498,7 @@ class RegimeDetector:
         }).sort_values('importance', ascending=False)
         
         # Log results
-        self.logger.info(f"Model training complete. Accuracy: {accuracy:.4f}")
+        self.logger.info(f"Model training complete. Accuracy: {accuracy:.4f} ({wall_time:.1f}s)")
         self.logger.info(f"Top 5 important features: {feature_importance['feature'].head(5).tolist()}")
         
         # Save the model
@@ -386,17 +509,23 @@ class RegimeDetector:
             'accuracy': accuracy,
             'confusion_matrix': confusion_matrix(y_test, y_pred).tolist(),
             'classification_report': classification_report(y_test, y_pred, output_dict=True),
-            'feature_importance': feature_importance.to_dict('records')
+            'feature_importance': feature_importance.to_dict('records'),
+            'wall_time': wall_time,
+            'search': search_info
         }
         
         return metrics
     
-    def predict(self, data: pd.DataFrame) -> Dict[str, Any]:
+    def predict(self, data: pd.DataFrame, symbol: Optional[str] = None) -> Dict[str, Any]:
         """
-        Predict market regime from price data.
+        Predict market regime for the latest bar of the price data.
+        
+        Only the last PREDICT_LOOKBACK bars are used, which is enough history
+        for every feature of the latest bar to be fully warmed up.
         
         Args:
             data: DataFrame with OHLCV data
+            symbol: Trading symbol the data belongs to (used for feature caching)
             
         Returns:
             Dictionary with regime prediction and confidence
@@ -404,11 +533,15 @@ class RegimeDetector:
         if self.model is None or self.scaler is None:
             raise ValueError("Model not trained. Call train() first.")
         
-        # Extract features
-        features_df = self.extract_features(data)
+        # Extract features for the tail window only. The window moves with
+        # every new bar, so its entries stay in memory instead of adding a
+        # cache file per prediction
+        features_df = self.extract_features(data.iloc[-PREDICT_LOOKBACK:], symbol=symbol, persist=False)
+        if features_df.empty:
+            raise ValueError("Not enough data to compute regime features for the latest bar")
         
-        # Get feature values
-        X = features_df[self.feature_names].values
+        # Get feature values for the latest bar
+        X = features_df[self.feature_names].values[-1:]
         
         # Scale features
         X_scaled = self.scaler.transform(X)
@@ -426,12 +559,16 @@ class RegimeDetector:
         }
         
         regime_name = regime_names.get(regime_id, "unknown")
-        confidence = regime_proba[0][regime_id]
+        
+        # Probability columns follow model.classes_, which may omit regimes
+        # that never occurred in the training data
+        classes = list(self.model.classes_)
+        confidence = regime_proba[0][classes.index(regime_id)]
         
         # Get all probabilities as dict
         probabilities = {
-            regime_names[i]: prob 
-            for i, prob in enumerate(regime_proba[0])
+            regime_names.get(int(cls), "unknown"): prob 
+            for cls, prob in zip(classes, regime_proba[0])
         }
         
         return {
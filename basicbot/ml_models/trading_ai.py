@@ -137,7 +137,7 @@ class TradingAI:
                 }
             
             # Make prediction
-            prediction = self.regime_detector.predict(data)
+            prediction = self.regime_detector.predict(data, symbol=symbol)
             
             # Store current regime
             self.current_regime[symbol] = prediction
@@ -0,0 +1,118 @@
+"""
+mock_broker.py - Local Mock Broker for Testing and Benchmarks
+
+This module provides an in-process stand-in for the TradingAPI wrapper. It
+serves synthetic OHLCV bars, tracks positions and fills market orders, with
+configurable per-call latency so executor throughput can be measured without
+a brokerage connection.
+
+Usage:
+    from basicbot.mock_broker import MockBroker
+    broker = MockBroker(symbols=["AAPL", "MSFT"], latency=0.05)
+    executor = TradeExecutor(api=broker, symbols=broker.symbols)
+"""
+
+import itertools
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class MockBroker:
+    """
+    Thread-safe mock of the TradingAPI interface with simulated network latency.
+    """
+
+    def __init__(
+        self,
+        symbols: List[str],
+        equity: float = 100000.0,
+        latency: float = 0.0,
+        bars: int = 300,
+        seed: int = 0
+    ):
+        """
+        Initialize the mock broker.
+
+        Args:
+            symbols: Symbols to serve market data for
+            equity: Starting account equity
+            latency: Seconds each API call blocks for
+            bars: Number of bars returned by get_latest_data
+            seed: Random seed for the synthetic price paths
+        """
+        self.symbols = list(symbols)
+        self.equity = equity
+        self.latency = latency
+        self.bars = bars
+        self.logged_in = True
+
+        self._lock = threading.Lock()
+        self._rng = np.random.default_rng(seed)
+        self._positions: Dict[str, Tuple[int, float]] = {}
+        self._order_ids = itertools.count(1)
+        self._prices = {symbol: self._random_walk() for symbol in self.symbols}
+
+        self.orders: List[dict] = []
+        self.call_counts: Dict[str, int] = {}
+
+    def get_latest_data(self, symbol: str, timeframe: str = None) -> pd.DataFrame:
+        """Return synthetic OHLCV bars for a symbol, advancing its path by one bar."""
+        self._call("get_latest_data")
+        with self._lock:
+            path = self._prices[symbol]
+            path = np.append(path[1:], path[-1] * np.exp(self._rng.normal(0, 0.01)))
+            self._prices[symbol] = path
+        spread = path * 0.005
+        return pd.DataFrame({
+            'open': path,
+            'high': path + spread,
+            'low': path - spread,
+            'close': path,
+            'volume': np.full(len(path), 1000.0),
+        })
+
+    def get_account(self) -> dict:
+        """Return buying power and equity."""
+        self._call("get_account")
+        return {"buying_power": self.equity, "equity": self.equity}
+
+    def get_position(self, symbol: str) -> tuple:
+        """Return (quantity, cost_basis) for one symbol."""
+        self._call("get_position")
+        with self._lock:
+            return self._positions.get(symbol, (0, 0))
+
+    def get_positions(self) -> dict:
+        """Return all open positions as {symbol: (quantity, cost_basis)}."""
+        self._call("get_positions")
+        with self._lock:
+            return dict(self._positions)
+
+    def place_order(self, symbol: str, qty: int, side: str) -> Optional[dict]:
+        """Fill a market order at the latest price."""
+        self._call("place_order")
+        with self._lock:
+            price = float(self._prices[symbol][-1])
+            if side == "buy":
+                self._positions[symbol] = (qty, price)
+            else:
+                self._positions.pop(symbol, None)
+            order = {"id": str(next(self._order_ids)), "status": "filled",
+                     "symbol": symbol, "qty": qty, "side": side, "time": time.perf_counter()}
+            self.orders.append(order)
+        return order
+
+    def _random_walk(self) -> np.ndarray:
+        """Generate a starting price path."""
+        return 100 * np.exp(np.cumsum(self._rng.normal(0, 0.01, self.bars)))
+
+    def _call(self, name: str) -> None:
+        """Count an API call and block for the simulated latency."""
+        with self._lock:
+            self.call_counts[name] = self.call_counts.get(name, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
@@ -34,6 +34,9 @@ class Strategy:
     and generating trading signals based on configurable parameters.
     """
     
+    # Columns always added by calculate_indicators (ATR and stop levels also need high/low)
+    INDICATOR_COLUMNS = ['SMA_short', 'SMA_long', 'RSI', 'MACD', 'MACD_signal', 'MACD_hist']
+    
     def __init__(
         self,
         symbol: str = None,
@@ -219,14 +222,24 @@ class Strategy:
         
         return signals
     
-    def fetch_historical_data(self) -> Optional[pd.DataFrame]:
+    def fetch_historical_data(
+        self,
+        symbol: Optional[str] = None,
+        start: Optional[Union[datetime.datetime, pd.Timestamp]] = None
+    ) -> Optional[pd.DataFrame]:
         """
         Fetch historical price data for the symbol and timeframe.
         
+        Args:
+            symbol (str): Symbol to fetch (defaults to the strategy symbol)
+            start (datetime): Only return bars at or after this time, so callers
+                holding a cache can fetch just the new bars (full history if None)
+        
         Returns:
             pd.DataFrame: DataFrame with OHLCV data or None if failed
         """
-        self.logger.info(f"Fetching historical data: {self.symbol} @ {self.timeframe}")
+        symbol = symbol or self.symbol
+        self.logger.info(f"Fetching historical data: {symbol} @ {self.timeframe}")
         
         try:
             # This method should be implemented based on the data source
@@ -236,7 +249,7 @@ class Strategy:
             # Example:
             # from alpaca_trade_api import REST
             # api = REST()
-            # bars = api.get_bars(self.symbol, self.timeframe).df
+            # bars = api.get_bars(symbol, self.timeframe, start=start).df
             # return bars
             
             self.logger.warning("Historical data fetching not implemented")
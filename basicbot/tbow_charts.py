@@ -8,11 +8,45 @@ This module provides charting functionality for the TBOW Tactics system:
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence
 import numpy as np
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel
-from PyQt5.QtCore import Qt, QRect
-from PyQt5.QtGui import QPainter, QPen, QColor, QPainterPath
+from PyQt5.QtCore import Qt, QRect, QPointF
+from PyQt5.QtGui import QPainter, QPen, QColor, QPainterPath, QPixmap, QPolygonF, QTransform
+
+def m4_indices(values: np.ndarray, bucket_size: int) -> np.ndarray:
+    """
+    Reduce a series to the first, min, max and last point of each bucket.
+    
+    Drawing these points in index order reproduces the exact pixel envelope of
+    the full series when each bucket maps to at most one pixel column.
+    
+    Args:
+        values: Series values
+        bucket_size: Points per bucket
+        
+    Returns:
+        Array of shape (n_buckets, 4) with (first, min, max, last) indices
+    """
+    n = len(values)
+    if n == 0:
+        return np.empty((0, 4), dtype=int)
+    starts = np.arange(0, n, bucket_size)
+    ends = np.minimum(starts + bucket_size, n)
+    
+    n_full = n // bucket_size
+    mins = np.empty(len(starts), dtype=int)
+    maxs = np.empty(len(starts), dtype=int)
+    if n_full:
+        full = values[:n_full * bucket_size].reshape(n_full, bucket_size)
+        mins[:n_full] = full.argmin(axis=1) + starts[:n_full]
+        maxs[:n_full] = full.argmax(axis=1) + starts[:n_full]
+    if n_full < len(starts):
+        tail = values[starts[-1]:]
+        mins[-1] = tail.argmin() + starts[-1]
+        maxs[-1] = tail.argmax() + starts[-1]
+    return np.column_stack([starts, mins, maxs, ends - 1])
+
 
 class SparklineChart(QWidget):
     """
@@ -23,6 +57,12 @@ class SparklineChart(QWidget):
     - Color-coded trend
     - Optional volume overlay
     - Customizable time range
+    
+    Prices are reduced to first/min/max/last points per bucket, with between one
+    and two buckets per pixel column, so painting cost is bounded by the widget
+    width rather than the series length. The line is kept as a path in data
+    coordinates: appended points extend it without rebuilding, and the rendered
+    chart is cached in a pixmap until the data or size changes.
     """
     
     def __init__(
@@ -47,65 +87,232 @@ class SparklineChart(QWidget):
         self.down_color = QColor(150, 0, 0)  # Red
         self.volume_color = QColor(100, 100, 100, 100)  # Gray with alpha
         
+        # Render cache
+        self._pixmap: Optional[QPixmap] = None
+        
         # Initialize empty chart
         self.update_data([], [], [])
     
     def update_data(
         self,
-        prices: List[float],
-        volumes: Optional[List[float]] = None,
-        timestamps: Optional[List[Any]] = None
+        prices: Sequence[float],
+        volumes: Optional[Sequence[float]] = None,
+        timestamps: Optional[Sequence[Any]] = None
     ):
-        """Update chart data."""
-        self.prices = prices
-        self.volumes = volumes or []
-        self.timestamps = timestamps or []
+        """Replace the chart data."""
+        self.prices = list(prices)
+        self.volumes = list(volumes) if volumes is not None else []
+        self.timestamps = list(timestamps) if timestamps is not None else []
+        self._rebuild()
+        self._invalidate()
+    
+    def append_data(
+        self,
+        prices: Sequence[float],
+        volumes: Optional[Sequence[float]] = None,
+        timestamps: Optional[Sequence[Any]] = None,
+        replace_last: bool = False
+    ):
+        """
+        Append points to the chart.
+        
+        Args:
+            prices: New prices
+            volumes: New volumes
+            timestamps: New timestamps
+            replace_last: Whether the first new point replaces the current last
+                point (a re-fetched, still-forming bar)
+        """
+        if replace_last and self.prices:
+            self.prices.pop()
+            if self.volumes:
+                self.volumes.pop()
+            if self.timestamps:
+                self.timestamps.pop()
+            self._reopen_last_bucket()
+        
+        self.prices.extend(prices)
+        if volumes is not None:
+            self.volumes.extend(volumes)
+        if timestamps is not None:
+            self.timestamps.extend(timestamps)
+        
+        start = len(self.prices) - len(prices)
+        for index in range(start, len(self.prices)):
+            self._add_point(index)
+        self._invalidate()
+    
+    def _max_buckets(self) -> int:
+        """Upper bound on buckets: two per pixel column."""
+        return max(2, 2 * self.width())
+    
+    def _rebuild(self):
+        """Recompute every bucket and the cached path from the raw series."""
+        n = len(self.prices)
+        self._bucket_width = self.width()
+        self._bucket_size = 1
+        while -(-n // self._bucket_size) > self._max_buckets():
+            self._bucket_size *= 2
+        
+        prices = np.asarray(self.prices, dtype=float)
+        volumes = np.asarray(self.volumes, dtype=float)
+        # Each bucket: [first, min, max, last] indices plus peak volume
+        self._buckets = []
+        for first, low, high, last in m4_indices(prices, self._bucket_size):
+            peak = float(volumes[first:last + 1].max()) if len(volumes) > last else 0.0
+            self._buckets.append([int(first), int(low), int(high), int(last), peak])
+        
+        self._price_min = float(prices.min()) if n else 0.0
+        self._price_max = float(prices.max()) if n else 0.0
+        self._volume_max = float(volumes.max()) if len(volumes) else 0.0
+        self._rebuild_path()
+    
+    def _rebuild_path(self):
+        """Rebuild the path through all closed buckets (every bucket but the last)."""
+        self._closed_path = QPainterPath()
+        for bucket in self._buckets[:-1]:
+            self._extend_path(self._closed_path, bucket)
+    
+    def _bucket_points(self, bucket: List[float]) -> List[QPointF]:
+        """Return a bucket's distinct points in index order, in data coordinates."""
+        indices = sorted(set(int(i) for i in bucket[:4]))
+        return [QPointF(i, self.prices[i]) for i in indices]
+    
+    def _extend_path(self, path: QPainterPath, bucket: List[float]):
+        """Append a bucket's points to a path."""
+        for point in self._bucket_points(bucket):
+            if path.elementCount() == 0:
+                path.moveTo(point)
+            else:
+                path.lineTo(point)
+    
+    def _add_point(self, index: int):
+        """Fold one appended point into the open bucket."""
+        price = self.prices[index]
+        volume = self.volumes[index] if index < len(self.volumes) else 0.0
+        self._price_min = min(self._price_min, price) if index else price
+        self._price_max = max(self._price_max, price) if index else price
+        self._volume_max = max(self._volume_max, volume)
+        
+        if self._buckets and index - self._buckets[-1][0] < self._bucket_size:
+            bucket = self._buckets[-1]
+            if price < self.prices[bucket[1]]:
+                bucket[1] = index
+            if price > self.prices[bucket[2]]:
+                bucket[2] = index
+            bucket[3] = index
+            bucket[4] = max(bucket[4], volume)
+            return
+        
+        # The open bucket is full: close it into the path and start a new one
+        if self._buckets:
+            self._extend_path(self._closed_path, self._buckets[-1])
+        self._buckets.append([index, index, index, index, volume])
+        
+        if len(self._buckets) > self._max_buckets():
+            self._merge_buckets()
+    
+    def _merge_buckets(self):
+        """Halve the bucket count by merging neighbouring pairs."""
+        merged = []
+        for left, right in zip(self._buckets[0::2], self._buckets[1::2] + [None]):
+            if right is None:
+                merged.append(left)
+                continue
+            low = left[1] if self.prices[left[1]] <= self.prices[right[1]] else right[1]
+            high = left[2] if self.prices[left[2]] >= self.prices[right[2]] else right[2]
+            merged.append([left[0], low, high, right[3], max(left[4], right[4])])
+        self._buckets = merged
+        self._bucket_size *= 2
+        self._rebuild_path()
+    
+    def _reopen_last_bucket(self):
+        """Recompute the open bucket after its last point was removed."""
+        if not self._buckets:
+            return
+        first = self._buckets[-1][0]
+        if first >= len(self.prices):
+            self._buckets.pop()
+            self._rebuild()
+            return
+        # The price range is left as is: it may stay slightly wide if the removed
+        # point was an extreme, which is cheaper than rescanning the series
+        prices = np.asarray(self.prices[first:], dtype=float)
+        volumes = self.volumes[first:]
+        self._buckets[-1] = [
+            first,
+            first + int(prices.argmin()),
+            first + int(prices.argmax()),
+            len(self.prices) - 1,
+            max(volumes) if volumes else 0.0
+        ]
+    
+    def _invalidate(self):
+        """Drop the cached rendering and schedule a repaint."""
+        self._pixmap = None
         self.update()
     
+    def resizeEvent(self, event):
+        """Rebucket if the width changed (paintEvent re-renders on any size change)."""
+        if self.width() != self._bucket_width:
+            self._rebuild()
+            self._invalidate()
+        super().resizeEvent(event)
+    
     def paintEvent(self, event):
-        """Paint the sparkline chart."""
+        """Paint the sparkline chart from the cached pixmap."""
         if not self.prices:
             return
-            
+        
+        if self._pixmap is None or self._pixmap.size() != self.size():
+            self._pixmap = self._render()
+        
         painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._pixmap)
+        painter.end()
+    
+    def _render(self) -> QPixmap:
+        """Render the chart into a pixmap."""
+        pixmap = QPixmap(self.size())
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.Antialiasing)
         
-        # Calculate scaling
-        price_min = min(self.prices)
-        price_max = max(self.prices)
-        price_range = price_max - price_min or 1.0
-        
-        # Calculate points
-        points = []
-        for i, price in enumerate(self.prices):
-            x = (i / (len(self.prices) - 1)) * (self.width() - 1)
-            y = self.height() - 1 - ((price - price_min) / price_range) * (self.height() - 1)
-            points.append((x, y))
+        width, height = self.width(), self.height()
+        x_scale = (width - 1) / max(len(self.prices) - 1, 1)
         
-        # Draw volume bars if enabled
-        if self.show_volume and self.volumes:
-            vol_max = max(self.volumes)
-            for i, vol in enumerate(self.volumes):
-                x = (i / (len(self.volumes) - 1)) * (self.width() - 1)
-                height = (vol / vol_max) * (self.height() * 0.3)
+        # Draw volume bars if enabled (one per bucket)
+        if self.show_volume and self.volumes and self._volume_max > 0:
+            for bucket in self._buckets:
+                x = int((bucket[0] + bucket[3]) / 2 * x_scale)
+                bar_height = int((bucket[4] / self._volume_max) * (height * 0.3))
                 painter.fillRect(
-                    QRect(x - 1, self.height() - height, 2, height),
+                    QRect(x - 1, height - bar_height, 2, bar_height),
                     self.volume_color
                 )
         
-        # Draw price line
-        path = QPainterPath()
-        path.moveTo(points[0][0], points[0][1])
-        for x, y in points[1:]:
-            path.lineTo(x, y)
+        # Map data coordinates (index, price) onto the widget
+        price_range = self._price_max - self._price_min or 1.0
+        y_scale = (height - 1) / price_range
+        painter.setTransform(QTransform(
+            x_scale, 0, 0, -y_scale, 0, height - 1 + self._price_min * y_scale
+        ))
         
         # Set color based on trend
-        if self.prices[-1] > self.prices[0]:
-            painter.setPen(QPen(self.up_color, 1))
-        else:
-            painter.setPen(QPen(self.down_color, 1))
+        pen = QPen(self.up_color if self.prices[-1] > self.prices[0] else self.down_color, 1)
+        pen.setCosmetic(True)
+        painter.setPen(pen)
         
-        painter.drawPath(path)
+        # Draw price line: cached closed buckets plus the open bucket
+        painter.drawPath(self._closed_path)
+        tail = self._bucket_points(self._buckets[-1])
+        if self._closed_path.elementCount():
+            tail.insert(0, self._closed_path.currentPosition())
+        if len(tail) > 1:
+            painter.drawPolyline(QPolygonF(tail))
+        
+        painter.end()
+        return pixmap
 
 class PerformanceChart(QWidget):
     """
@@ -141,6 +348,9 @@ class PerformanceChart(QWidget):
             "neutral": QColor(100, 100, 100)
         }
         
+        # Render cache
+        self._pixmap: Optional[QPixmap] = None
+        
         # Initialize empty chart
         self.update_data([], [])
     
@@ -148,23 +358,37 @@ class PerformanceChart(QWidget):
         """Update chart data."""
         self.data = data
         self.labels = labels
+        self._pixmap = None
         self.update()
     
+    def resizeEvent(self, event):
+        """Drop the cached rendering when the size changes."""
+        self._pixmap = None
+        super().resizeEvent(event)
+    
     def paintEvent(self, event):
-        """Paint the performance chart."""
+        """Paint the performance chart from the cached pixmap."""
         if not self.data:
             return
+        
+        if self._pixmap is None or self._pixmap.size() != self.size():
+            self._pixmap = QPixmap(self.size())
+            self._pixmap.fill(Qt.transparent)
+            painter = QPainter(self._pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
             
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+            # Draw based on chart type
+            if self.chart_type == "winrate":
+                self._draw_winrate(painter)
+            elif self.chart_type == "compliance":
+                self._draw_compliance(painter)
+            elif self.chart_type == "emotion":
+                self._draw_emotion(painter)
+            painter.end()
         
-        # Draw based on chart type
-        if self.chart_type == "winrate":
-            self._draw_winrate(painter)
-        elif self.chart_type == "compliance":
-            self._draw_compliance(painter)
-        elif self.chart_type == "emotion":
-            self._draw_emotion(painter)
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._pixmap)
+        painter.end()
     
     def _draw_winrate(self, painter: QPainter):
         """Draw win rate chart."""
@@ -192,11 +416,18 @@ class PerformanceChart(QWidget):
     
     def _draw_compliance(self, painter: QPainter):
         """Draw checklist compliance chart."""
+        # Keep at most first/min/max/last per pixel column of long histories
+        plot_width = max(self.width() - 40, 1)
+        indices = range(len(self.data))
+        if len(self.data) > plot_width:
+            bucket_size = -(-len(self.data) // plot_width)
+            indices = np.unique(m4_indices(np.asarray(self.data, dtype=float), bucket_size))
+        
         # Calculate points for line chart
         points = []
-        for i, score in enumerate(self.data):
-            x = 20 + (i / (len(self.data) - 1)) * (self.width() - 40)
-            y = self.height() - 20 - (score / 100) * (self.height() - 40)
+        for i in indices:
+            x = 20 + (i / max(len(self.data) - 1, 1)) * (self.width() - 40)
+            y = self.height() - 20 - (self.data[i] / 100) * (self.height() - 40)
             points.append((x, y))
         
         # Draw line
@@ -210,7 +441,7 @@ class PerformanceChart(QWidget):
         
         # Draw points
         for x, y in points:
-            painter.fillRect(QRect(x - 3, y - 3, 6, 6), self.colors["win"])
+            painter.fillRect(QRect(int(x) - 3, int(y) - 3, 6, 6), self.colors["win"])
     
     def _draw_emotion(self, painter: QPainter):
         """Draw emotion profile chart."""
@@ -10,6 +10,9 @@ It provides real-time visualization of:
 - Trade journal
 - Historical replay
 - Risk management
+
+Market data is fetched and analyzed on a worker thread by the incremental
+pipeline in tbow_data_pipeline; finished snapshots reach the widgets via signals.
 """
 
 import sys
@@ -24,13 +27,14 @@ from PyQt5.QtWidgets import (
     QLineEdit, QRadioButton, QButtonGroup, QFileDialog,
     QGroupBox, QScrollArea, QDateTimeEdit, QDoubleSpinBox
 )
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QDateTime
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal, pyqtSlot, QDateTime, QObject, QThread
 from PyQt5.QtGui import QFont, QColor, QPalette, QPixmap
 
 from basicbot.tbow_tactics import TBOWTactics
 from basicbot.tbow_replay import TBOWReplay
 from basicbot.tbow_risk import TBOWRisk
 from basicbot.tbow_charts import SparklineChart, PerformanceChart, ChartContainer
+from basicbot.tbow_data_pipeline import TBOWDataPipeline
 from basicbot.strategy import Strategy
 
 class PriceBox(QFrame):
@@ -84,19 +88,50 @@ class VolumePulseMeter(QProgressBar):
         ratio = min(current / average * 100, 100)
         self.setValue(int(ratio))
 
+class DashboardDataWorker(QObject):
+    """Runs the data pipeline off the UI thread and emits finished snapshots."""
+    
+    snapshot_ready = pyqtSignal(dict)
+    error = pyqtSignal(str)
+    
+    def __init__(self, pipeline: TBOWDataPipeline):
+        super().__init__()
+        self.pipeline = pipeline
+    
+    @pyqtSlot()
+    def refresh(self):
+        """Fetch new bars, update indicators and emit a snapshot."""
+        try:
+            snapshot = self.pipeline.refresh()
+            if snapshot is None:
+                self.error.emit("No data available")
+            else:
+                self.snapshot_ready.emit(snapshot)
+        except Exception as e:
+            self.error.emit(f"Error: {str(e)}")
+
+
 class TBOWDashboard(QMainWindow):
     """Main dashboard window for TBOW Tactics."""
     
+    refresh_requested = pyqtSignal()
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("TBOW Tactics Dashboard")
         self.setGeometry(100, 100, 1600, 1000)
+        self.logger = logging.getLogger(__name__)
         
         # Initialize TBOW Tactics
         self.tbow = None
         self.current_symbol = None
         self.current_timeframe = None
         
+        # Background data pipeline (one worker thread per symbol/timeframe)
+        self.data_thread = None
+        self.data_worker = None
+        self.refresh_pending = False
+        
         # Setup UI
         self.setup_ui()
         
@@ -822,77 +857,114 @@ class TBOWDashboard(QMainWindow):
                 symbol=self.current_symbol,
                 timeframe=self.current_timeframe
             )
+            self.start_data_worker()
+    
+    def start_data_worker(self):
+        """Start a worker thread running the data pipeline for the current TBOW instance."""
+        self.stop_data_worker()
+        
+        self.data_thread = QThread(self)
+        self.data_worker = DashboardDataWorker(TBOWDataPipeline(self.tbow))
+        self.data_worker.moveToThread(self.data_thread)
+        
+        # Cross-thread connections are queued, so slots run on the receiver's thread
+        self.refresh_requested.connect(self.data_worker.refresh)
+        self.data_worker.snapshot_ready.connect(self.apply_snapshot)
+        self.data_worker.error.connect(self.on_refresh_error)
+        self.data_thread.finished.connect(self.data_worker.deleteLater)
+        
+        self.refresh_pending = False
+        self.data_thread.start()
+    
+    def stop_data_worker(self):
+        """Stop the current data worker thread, if any."""
+        if self.data_thread is None:
+            return
+        self.refresh_requested.disconnect(self.data_worker.refresh)
+        self.data_thread.quit()
+        self.data_thread.wait()
+        self.data_thread = None
+        self.data_worker = None
+    
+    def closeEvent(self, event):
+        """Stop the refresh timer and data worker before closing."""
+        self.refresh_timer.stop()
+        self.stop_data_worker()
+        super().closeEvent(event)
     
     def refresh_data(self):
-        """Refresh dashboard data."""
-        if not self.tbow:
+        """Request a data refresh from the worker thread."""
+        if not self.tbow or self.data_worker is None:
             return
-            
+        
+        # Skip ticks while the previous refresh is still running
+        if self.refresh_pending:
+            return
+        self.refresh_pending = True
+        self.refresh_requested.emit()
+    
+    @pyqtSlot(dict)
+    def apply_snapshot(self, snapshot: Dict[str, Any]):
+        """Update widgets from a finished pipeline snapshot."""
+        self.refresh_pending = False
+        
+        # Ignore snapshots for a symbol/timeframe that is no longer selected
+        if (snapshot["symbol"], snapshot["timeframe"]) != (self.current_symbol, self.current_timeframe):
+            return
+        
         try:
-            # Get market data
-            data = self.tbow.strategy.fetch_historical_data()
-            if data is None or data.empty:
-                self.statusBar().showMessage("No data available")
-                return
-            
             # Update price box
-            latest = data.iloc[-1]
-            self.price_box.update_price(
-                latest["close"],
-                (latest["close"] - data.iloc[-2]["close"]) / data.iloc[-2]["close"] * 100
-            )
+            self.price_box.update_price(snapshot["price"], snapshot["change_pct"])
             
             # Update volume pulse
-            self.volume_pulse.update_volume(
-                latest["volume"],
-                data["volume"].rolling(20).mean().iloc[-1]
-            )
+            self.volume_pulse.update_volume(snapshot["volume"], snapshot["volume_avg"])
             
             # Update SPY/QQQ sparklines
-            spy_data = self.tbow.strategy.fetch_historical_data(symbol="SPY")
-            qqq_data = self.tbow.strategy.fetch_historical_data(symbol="QQQ")
-            
-            if spy_data is not None and not spy_data.empty:
-                self.spy_chart.update_data(
-                    spy_data["close"].tolist(),
-                    spy_data["volume"].tolist(),
-                    spy_data.index.tolist()
-                )
-            
-            if qqq_data is not None and not qqq_data.empty:
-                self.qqq_chart.update_data(
-                    qqq_data["close"].tolist(),
-                    qqq_data["volume"].tolist(),
-                    qqq_data.index.tolist()
-                )
+            charts = {"SPY": self.spy_chart, "QQQ": self.qqq_chart}
+            for symbol, series in snapshot["benchmarks"].items():
+                if series is not None and symbol in charts:
+                    self.update_sparkline(charts[symbol], series, snapshot["new_bars"].get(symbol, 0))
             
-            # Scan market context
-            context = self.tbow.scan_market_context(data)
-            self.update_market_tab(context)
-            
-            # Analyze indicators
-            indicators = self.tbow.analyze_indicators(data)
-            self.update_indicators_tab(indicators)
-            
-            # Generate bias
-            bias = self.tbow.generate_bias(context, indicators)
-            self.update_bias_tab(bias)
-            
-            # Check compliance
-            checklist = self.tbow.check_compliance(context, indicators)
-            self.update_checklist_tab(checklist)
+            self.update_market_tab(snapshot["context"])
+            self.update_indicators_tab(snapshot["indicators"])
+            self.update_bias_tab(snapshot["bias"])
+            self.update_checklist_tab(snapshot["checklist"])
             
             # Update analytics
             self.update_analytics_tab()
             
             # Update status
             self.statusBar().showMessage(
-                f"Last updated: {datetime.now().strftime('%H:%M:%S')}"
+                f"Last updated: {snapshot['timestamp'].strftime('%H:%M:%S')}"
             )
             
         except Exception as e:
             self.statusBar().showMessage(f"Error: {str(e)}")
     
+    def update_sparkline(self, chart: SparklineChart, series, n_changed: int):
+        """Append only the changed bars to a sparkline, or reload it if the series no longer lines up."""
+        closes, volumes, timestamps = series
+        if n_changed == 0 and len(chart.prices) == len(closes):
+            return
+        
+        # n_changed counts appended bars plus a replaced last bar, if any
+        replaced = len(chart.prices) + n_changed - len(closes)
+        anchor = len(closes) - n_changed - 1 + replaced
+        if (0 < n_changed < len(closes) and replaced in (0, 1) and chart.timestamps
+                and chart.timestamps[-1] == timestamps[anchor]):
+            chart.append_data(
+                closes[-n_changed:], volumes[-n_changed:], timestamps[-n_changed:],
+                replace_last=bool(replaced)
+            )
+        else:
+            chart.update_data(closes, volumes, timestamps)
+    
+    @pyqtSlot(str)
+    def on_refresh_error(self, message: str):
+        """Show a pipeline error in the status bar."""
+        self.refresh_pending = False
+        self.statusBar().showMessage(message)
+    
     def update_market_tab(self, context: Dict[str, Any]):
         """Update market context tab."""
         # Update correlation
@@ -0,0 +1,347 @@
+"""
+tbow_data_pipeline.py - Incremental Market Data Pipeline for the TBOW Dashboard
+
+This module keeps the dashboard's market data and indicators up to date without
+refetching or recomputing full histories on every refresh:
+
+- BarCache holds a bounded, thread-safe OHLCV frame per symbol and merges
+  newly fetched bars into it (a re-fetched last bar replaces the partial one).
+- IncrementalIndicators extends the Strategy indicator columns to new bars
+  only: rolling indicators are computed over a short tail window and the MACD
+  EMAs are carried forward from their running state.
+- TBOWDataPipeline fetches only bars since the last cached timestamp, runs the
+  TBOW analysis on a bounded window and returns a snapshot dictionary.
+
+The pipeline has no Qt dependency; the dashboard runs it on a worker thread and
+receives snapshots through signals.
+
+Usage:
+    from basicbot.tbow_data_pipeline import TBOWDataPipeline
+    pipeline = TBOWDataPipeline(tbow)
+    snapshot = pipeline.refresh()
+"""
+
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from basicbot.strategy import Strategy
+
+BarFetcher = Callable[[str, Optional[pd.Timestamp]], Optional[pd.DataFrame]]
+
+
+class BarCache:
+    """
+    Thread-safe, bounded per-symbol cache of OHLCV frames.
+    """
+
+    def __init__(self, max_bars: int = 5000):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bars: Maximum bars kept per symbol; oldest are dropped first
+        """
+        self.max_bars = max_bars
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.RLock()
+
+    def get(self, symbol: str) -> Optional[pd.DataFrame]:
+        """
+        Return the cached frame for a symbol.
+
+        Frames are replaced rather than modified on update, so the returned
+        frame can be read without holding the lock but must not be mutated.
+        """
+        with self._lock:
+            return self._frames.get(symbol)
+
+    def last_timestamp(self, symbol: str) -> Optional[pd.Timestamp]:
+        """Return the timestamp of the newest cached bar, or None."""
+        frame = self.get(symbol)
+        if frame is None or frame.empty:
+            return None
+        return frame.index[-1]
+
+    def merge(
+        self,
+        symbol: str,
+        bars: Optional[pd.DataFrame],
+        indicators: Optional["IncrementalIndicators"] = None
+    ) -> int:
+        """
+        Merge fetched bars into the cache.
+
+        Bars older than the newest cached bar are ignored, a bar with the same
+        timestamp replaces it, and newer bars are appended.
+
+        Args:
+            symbol: Symbol the bars belong to
+            bars: Fetched OHLCV bars indexed by timestamp
+            indicators: Indicator updater applied to the changed rows
+
+        Returns:
+            Number of rows at the end of the frame that were added or replaced
+        """
+        if bars is None or bars.empty:
+            return 0
+
+        with self._lock:
+            frame = self._frames.get(symbol)
+            if frame is None or frame.empty:
+                merged = bars.sort_index()
+                merged = merged[~merged.index.duplicated(keep='last')]
+                n_changed = len(merged)
+                replaced_last = False
+            else:
+                last = frame.index[-1]
+                bars = bars[bars.index >= last]
+                bars = bars[~bars.index.duplicated(keep='last')].sort_index()
+                if bars.empty:
+                    return 0
+                replaced_last = bars.index[0] == last
+                head = frame.iloc[:-1] if replaced_last else frame
+                merged = pd.concat([head, bars])
+                n_changed = len(bars)
+
+            if indicators is not None:
+                merged = indicators.update(merged, n_changed, replaced_last=replaced_last)
+
+            if len(merged) > self.max_bars:
+                merged = merged.iloc[-self.max_bars:]
+                n_changed = min(n_changed, self.max_bars)
+
+            self._frames[symbol] = merged
+            return n_changed
+
+    def clear(self, symbol: Optional[str] = None) -> None:
+        """Drop one symbol's bars, or all cached bars."""
+        with self._lock:
+            if symbol is None:
+                self._frames.clear()
+            else:
+                self._frames.pop(symbol, None)
+
+
+class _EMAState:
+    """Running numerator/denominator of a pandas ewm(adjust=True) mean."""
+
+    def __init__(self, span: int):
+        self.decay = 1.0 - 2.0 / (span + 1.0)
+        self.num = 0.0
+        self.den = 0.0
+
+    def advance(self, values: np.ndarray) -> np.ndarray:
+        """Feed new values and return the EMA after each one."""
+        out = np.empty(len(values))
+        num, den = self.num, self.den
+        for i, value in enumerate(values):
+            num = value + self.decay * num
+            den = 1.0 + self.decay * den
+            out[i] = num / den
+        self.num, self.den = num, den
+        return out
+
+    def copy(self) -> "_EMAState":
+        state = _EMAState.__new__(_EMAState)
+        state.decay, state.num, state.den = self.decay, self.num, self.den
+        return state
+
+
+class IncrementalIndicators:
+    """
+    Extends Strategy.calculate_indicators columns to new bars only.
+    """
+
+    def __init__(self, strategy: Strategy):
+        """
+        Initialize the updater.
+
+        Args:
+            strategy: Strategy whose indicator parameters and helpers are used
+        """
+        self.strategy = strategy
+        # Rolling indicators need this many bars before the first changed row
+        self.lookback = max(strategy.maShortLength, strategy.maLongLength,
+                            strategy.rsiLength + 1, strategy.atrLength + 1)
+        self._ema: Optional[Dict[str, _EMAState]] = None
+        # EMA state before the newest row, so a replaced last bar can be recomputed
+        self._ema_before_last: Optional[Dict[str, _EMAState]] = None
+
+    def reset(self) -> None:
+        """Forget EMA state so the next update recomputes from scratch."""
+        self._ema = None
+        self._ema_before_last = None
+
+    def update(self, frame: pd.DataFrame, n_changed: int, replaced_last: bool = False) -> pd.DataFrame:
+        """
+        Fill indicator columns for the last n_changed rows of a frame.
+
+        Args:
+            frame: OHLCV frame whose earlier rows already carry indicators
+            n_changed: Number of trailing rows that are new or replaced
+            replaced_last: Whether the first changed row replaced the previous last bar
+
+        Returns:
+            Frame with indicator columns filled in
+        """
+        missing = [col for col in Strategy.INDICATOR_COLUMNS if col not in frame.columns]
+        if self._ema is None or missing or n_changed >= len(frame):
+            return self._full(frame)
+        if n_changed <= 0:
+            return frame
+
+        start = len(frame) - n_changed
+        tail = frame.iloc[max(0, start - self.lookback):]
+        closes = frame['close'].to_numpy(dtype=float)[start:]
+
+        base = self._ema_before_last if replaced_last else self._ema
+        ema = {name: state.copy() for name, state in base.items()}
+        macd, signal, before_last = self._advance_macd(ema, closes)
+
+        values = {
+            'SMA_short': self.strategy._calculate_sma(tail['close'], self.strategy.maShortLength),
+            'SMA_long': self.strategy._calculate_sma(tail['close'], self.strategy.maLongLength),
+            'RSI': self.strategy._calculate_rsi(tail['close'], self.strategy.rsiLength),
+            'MACD': macd,
+            'MACD_signal': signal,
+            'MACD_hist': macd - signal,
+        }
+        if 'high' in frame.columns and 'low' in frame.columns:
+            atr = self.strategy._calculate_atr(
+                tail['high'], tail['low'], tail['close'], self.strategy.atrLength
+            ).to_numpy()[-n_changed:]
+            values['ATR'] = atr
+            values['stop_loss'] = closes - atr * self.strategy.atrMultiplier
+            values['take_profit'] = closes + (
+                atr * self.strategy.atrMultiplier * (self.strategy.profitTarget / 100)
+            )
+
+        # Assign into the small tail frame; label-based setitem on the full frame is slow
+        changed = frame.iloc[start:].copy()
+        for col, series in values.items():
+            changed[col] = np.asarray(series)[-n_changed:]
+
+        self._ema, self._ema_before_last = ema, before_last
+        return pd.concat([frame.iloc[:start], changed])
+
+    @staticmethod
+    def _advance_macd(ema: Dict[str, _EMAState], closes: np.ndarray):
+        """Advance the MACD EMAs over closes, returning (macd, signal, state before last close)."""
+        fast = ema['fast'].advance(closes[:-1])
+        slow = ema['slow'].advance(closes[:-1])
+        signal = ema['signal'].advance(fast - slow)
+        before_last = {name: state.copy() for name, state in ema.items()}
+        fast = np.append(fast, ema['fast'].advance(closes[-1:]))
+        slow = np.append(slow, ema['slow'].advance(closes[-1:]))
+        macd = fast - slow
+        signal = np.append(signal, ema['signal'].advance(macd[-1:]))
+        return macd, signal, before_last
+
+    def _full(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Compute every indicator row and seed the EMA state from the closes."""
+        frame = self.strategy.calculate_indicators(frame)
+        ema = {
+            'fast': _EMAState(self.strategy.macdFast),
+            'slow': _EMAState(self.strategy.macdSlow),
+            'signal': _EMAState(self.strategy.macdSignal),
+        }
+        before_last = {name: state.copy() for name, state in ema.items()}
+        if len(frame):
+            _, _, before_last = self._advance_macd(ema, frame['close'].to_numpy(dtype=float))
+        self._ema, self._ema_before_last = ema, before_last
+        return frame
+
+
+class TBOWDataPipeline:
+    """
+    Fetches new bars, updates indicators incrementally and runs the TBOW analysis.
+    """
+
+    def __init__(
+        self,
+        tbow,
+        benchmarks: Iterable[str] = ("SPY", "QQQ"),
+        fetcher: Optional[BarFetcher] = None,
+        cache: Optional[BarCache] = None,
+        analysis_window: int = 500,
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            tbow: TBOWTactics instance providing the strategy and analysis
+            benchmarks: Symbols shown as sparklines alongside the main symbol
+            fetcher: Callable (symbol, start) -> bars at or after start
+                     (defaults to the strategy's fetch_historical_data)
+            cache: Bar cache, shareable between pipelines
+            analysis_window: Trailing bars passed to the context/indicator analysis
+            logger: Optional logger instance
+        """
+        self.tbow = tbow
+        self.symbol = tbow.symbol
+        self.benchmarks = [symbol for symbol in benchmarks if symbol != tbow.symbol]
+        self.fetcher = fetcher or (
+            lambda symbol, start: tbow.strategy.fetch_historical_data(symbol=symbol, start=start)
+        )
+        self.cache = cache or BarCache()
+        self.analysis_window = analysis_window
+        self.logger = logger or logging.getLogger(__name__)
+        self.indicators = IncrementalIndicators(tbow.strategy)
+
+    def refresh(self) -> Optional[Dict[str, Any]]:
+        """
+        Pull new bars and build a dashboard snapshot.
+
+        Returns:
+            Snapshot dictionary, or None if no data is available for the symbol
+        """
+        new_bars = {self.symbol: self._update(self.symbol, self.indicators)}
+        for symbol in self.benchmarks:
+            new_bars[symbol] = self._update(symbol)
+
+        data = self.cache.get(self.symbol)
+        if data is None or len(data) < 2:
+            return None
+
+        # Analysis helpers add scratch columns, so give them a private window
+        window = data.iloc[-self.analysis_window:].copy()
+        context = self.tbow.scan_market_context(window)
+        indicators = self.tbow.analyze_indicators(window)
+        bias = self.tbow.generate_bias(context, indicators)
+        checklist = self.tbow.check_compliance(context, indicators)
+
+        latest, previous = data.iloc[-1], data.iloc[-2]
+        return {
+            "symbol": self.symbol,
+            "timeframe": self.tbow.timeframe,
+            "price": float(latest["close"]),
+            "change_pct": float((latest["close"] - previous["close"]) / previous["close"] * 100),
+            "volume": float(latest["volume"]),
+            "volume_avg": float(data["volume"].iloc[-20:].mean()),
+            "benchmarks": {symbol: self._series(symbol) for symbol in self.benchmarks},
+            "context": context,
+            "indicators": indicators,
+            "bias": bias,
+            "checklist": checklist,
+            "new_bars": new_bars,
+            "timestamp": datetime.now(),
+        }
+
+    def _update(self, symbol: str, indicators: Optional[IncrementalIndicators] = None) -> int:
+        """Fetch bars since the newest cached bar and merge them."""
+        start = self.cache.last_timestamp(symbol)
+        bars = self.fetcher(symbol, start)
+        return self.cache.merge(symbol, bars, indicators)
+
+    def _series(self, symbol: str) -> Optional[Tuple[np.ndarray, np.ndarray, pd.Index]]:
+        """Return (closes, volumes, timestamps) for a sparkline without copying the cache."""
+        data = self.cache.get(symbol)
+        if data is None or data.empty:
+            return None
+        return data["close"].to_numpy(), data["volume"].to_numpy(), data.index
@@ -97,7 +97,7 @@ class TBOWTactics:
             Dictionary with indicator analysis
         """
         # Calculate indicators
-        data = self.strategy.calculate_indicators(data)
+        data = self._with_indicators(data)
         
         # Extract latest values
         latest = data.iloc[-1]
@@ -271,13 +271,19 @@ class TBOWTactics:
             self.logger.error(f"Error logging trade: {e}")
             return False
     
+    def _with_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Return data with strategy indicators, computing them only if absent."""
+        if all(col in data.columns for col in Strategy.INDICATOR_COLUMNS):
+            return data
+        return self.strategy.calculate_indicators(data)
+    
     def _detect_trend(self, data: pd.DataFrame) -> str:
         """Detect market trend."""
         if len(data) < 2:
             return "unknown"
             
         # Calculate short and long SMAs
-        data = self.strategy.calculate_indicators(data)
+        data = self._with_indicators(data)
         
         # Get latest values
         latest = data.iloc[-1]
@@ -314,7 +320,7 @@ class TBOWTactics:
             return {"state": "unknown"}
             
         # Calculate ATR
-        data = self.strategy.calculate_indicators(data)
+        data = self._with_indicators(data)
         
         # Get latest ATR
         latest_atr = data["ATR"].iloc[-1]
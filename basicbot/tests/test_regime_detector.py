@@ -0,0 +1,157 @@
+"""
+test_regime_detector.py - Tests for RegimeDetector labeling and feature caching
+
+This module contains tests for the RegimeDetector class:
+- Vectorized regime labeling against the rule-by-rule reference
+- Feature cache reuse across calls
+- Latest-bar prediction from the tail window, kept off the disk cache
+- Successive-halving search with the persistent trial cache
+"""
+
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from basicbot.ml_models.feature_cache import FeatureCache
+from basicbot.ml_models.regime_detector import RegimeDetector, PREDICT_LOOKBACK
+
+
+def _generate_ohlcv(n_bars: int = 1500, seed: int = 3) -> pd.DataFrame:
+    """Generate a random-walk OHLCV frame."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_bars)))
+    spread = np.abs(rng.normal(0, 0.5, n_bars))
+    return pd.DataFrame({
+        'open': close + rng.normal(0, 0.2, n_bars),
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': rng.integers(1_000, 10_000, n_bars).astype(float),
+    }, index=pd.date_range("2015-01-01", periods=n_bars, freq="D"))
+
+
+class TestRegimeDetector(unittest.TestCase):
+    """Test cases for RegimeDetector."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.model_dir = tempfile.mkdtemp()
+        self.detector = RegimeDetector(model_dir=self.model_dir)
+        self.data = _generate_ohlcv()
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.model_dir)
+
+    def test_label_regimes_matches_rule_order(self):
+        """Vectorized labels follow the same rule priority as the row-wise rules."""
+        features = self.detector.extract_features(self.data)
+        window = 20
+        labeled = self.detector.label_regimes(features, window=window)
+
+        # Recompute the helper columns and apply the rules row by row
+        df = features.copy()
+        up_days = (df['returns'] > 0).rolling(window).sum() / window
+        down_days = (df['returns'] < 0).rolling(window).sum() / window
+        vol = df['volatility_20d']
+        vol_z = (vol - vol.rolling(252).mean()) / vol.rolling(252).std()
+        range_bound = (
+            (df['close_to_ma_20d'] < df['close_to_ma_20d'].rolling(252).mean()) &
+            (df['bb_width'] < df['bb_width'].rolling(252).mean())
+        )
+        expected = []
+        for i in range(window, len(df)):
+            if vol_z.iloc[i] > 1.5:
+                expected.append(3)
+            elif up_days.iloc[i] > 0.8:
+                expected.append(1)
+            elif down_days.iloc[i] > 0.8:
+                expected.append(2)
+            elif range_bound.iloc[i]:
+                expected.append(0)
+            else:
+                expected.append(3)
+
+        self.assertEqual(labeled['regime'].tolist(), expected)
+        self.assertNotIn('vol_z', labeled.columns)
+
+    def test_extract_features_uses_cache(self):
+        """Repeated extraction over the same history is served from the cache."""
+        cache = FeatureCache()
+        detector = RegimeDetector(model_dir=self.model_dir, feature_cache=cache)
+
+        first = detector.extract_features(self.data, symbol="TEST")
+        second = detector.extract_features(self.data, symbol="TEST")
+
+        self.assertEqual((cache.misses, cache.hits), (1, 1))
+        pd.testing.assert_frame_equal(first, second)
+
+        detector.extract_features(self.data, symbol="OTHER")
+        self.assertEqual(cache.misses, 2)
+
+    def test_predict_uses_latest_bar(self):
+        """Prediction only needs the tail window of the history."""
+        self.detector.train(self.data, optimize=False, symbol="TEST")
+
+        full = self.detector.predict(self.data, symbol="TEST")
+        tail = self.detector.predict(self.data.iloc[-PREDICT_LOOKBACK:], symbol="TEST")
+
+        self.assertEqual(full['regime_id'], tail['regime_id'])
+        self.assertAlmostEqual(full['confidence'], tail['confidence'])
+
+        # A different latest bar changes both its features and the prediction
+        shocked = self.data.copy()
+        shocked.iloc[-1, shocked.columns.get_indexer(['close', 'high'])] *= 1.3
+        before = self.detector.extract_features(self.data.iloc[-PREDICT_LOOKBACK:], symbol="TEST")
+        after = self.detector.extract_features(shocked.iloc[-PREDICT_LOOKBACK:], symbol="TEST")
+        names = self.detector.feature_names
+        self.assertFalse(np.allclose(before[names].values[-1], after[names].values[-1]))
+        self.assertNotEqual(self.detector.predict(shocked, symbol="TEST")['probabilities'],
+                            full['probabilities'])
+
+    def test_predict_does_not_persist_rolling_windows(self):
+        """Predicting bar after bar adds no feature cache files."""
+        self.detector.train(self.data, optimize=False, symbol="TEST")
+        cache_dir = self.detector.feature_cache.cache_dir
+        persisted = sorted(cache_dir.glob("*.joblib"))
+
+        for end in range(len(self.data) - 20, len(self.data)):
+            self.detector.predict(self.data.iloc[:end], symbol="TEST")
+
+        self.assertEqual(sorted(cache_dir.glob("*.joblib")), persisted)
+
+    def test_feature_cache_caps_disk_entries(self):
+        """Persisted entries beyond max_disk_entries are evicted oldest first."""
+        cache = FeatureCache(cache_dir=self.model_dir, max_entries=1, max_disk_entries=3)
+        frame = self.data.iloc[:10]
+        keys = [cache.make_key("TEST", frame, version=str(i)) for i in range(5)]
+        for key in keys:
+            cache.put(key, frame)
+
+        self.assertEqual(len(list(cache.cache_dir.glob("*.joblib"))), 3)
+        # The newest entry always survives eviction and reloads from disk
+        reopened = FeatureCache(cache_dir=self.model_dir)
+        self.assertIsNotNone(reopened.get(keys[-1]))
+
+    def test_halving_search_reuses_cached_trials(self):
+        """A retrain on unchanged data refits nothing and keeps the best parameters."""
+        grid = {'n_estimators': [10, 20], 'max_depth': [None, 5], 'min_samples_leaf': [1, 4]}
+
+        first = self.detector.train(self.data, optimize=True, symbol="TEST", param_grid=grid)
+        self.assertEqual(first['search']['mode'], 'halving')
+        self.assertGreater(first['search']['n_fits'], 0)
+
+        # A fresh detector warm-starts from the persisted trials and model key
+        detector = RegimeDetector(model_dir=self.model_dir)
+        second = detector.train(self.data, optimize=True, symbol="TEST", param_grid=grid)
+
+        self.assertEqual(second['search']['n_fits'], 0)
+        self.assertEqual(second['search']['best_params'], first['search']['best_params'])
+        self.assertAlmostEqual(second['accuracy'], first['accuracy'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+test_tbow_charts.py - Tests for downsampled sparkline rendering
+
+This module contains tests for the tbow_charts module:
+- First/min/max/last bucket reduction
+- Appended points produce the same buckets as a full reload
+- Bucket count stays bounded by the widget width
+"""
+
+import os
+import unittest
+
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+try:
+    from PyQt5.QtWidgets import QApplication
+    from basicbot.tbow_charts import SparklineChart, m4_indices
+    HAS_QT = True
+except ImportError:
+    HAS_QT = False
+
+
+@unittest.skipUnless(HAS_QT, "PyQt5 is not installed")
+class TestSparklineChart(unittest.TestCase):
+    """Test cases for SparklineChart."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create the Qt application."""
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """Set up test environment."""
+        rng = np.random.default_rng(5)
+        self.prices = (100 + np.cumsum(rng.normal(0, 1, 20_000))).tolist()
+        self.volumes = rng.integers(1_000, 10_000, 20_000).astype(float).tolist()
+
+    def test_m4_indices(self):
+        """Each bucket keeps its first, lowest, highest and last point."""
+        values = np.array([3.0, 1.0, 5.0, 2.0, 4.0, 0.0, 6.0])
+        np.testing.assert_array_equal(
+            m4_indices(values, 3),
+            [[0, 1, 2, 2], [3, 5, 4, 5], [6, 6, 6, 6]]
+        )
+
+    def test_append_matches_reload(self):
+        """Appending in chunks, with a replaced last point, matches a full reload."""
+        appended = SparklineChart(width=100, show_volume=True)
+        appended.update_data(self.prices[:150], self.volumes[:150])
+        for start in range(150, len(self.prices), 997):
+            end = min(start + 997, len(self.prices))
+            appended.append_data(self.prices[start:end], self.volumes[start:end])
+        appended.append_data([self.prices[-1] + 50], [1.0], replace_last=True)
+
+        prices = self.prices[:-1] + [self.prices[-1] + 50]
+        volumes = self.volumes[:-1] + [1.0]
+        reloaded = SparklineChart(width=100, show_volume=True)
+        reloaded.update_data(prices, volumes)
+
+        self.assertEqual(appended.prices, prices)
+        self.assertEqual(appended._bucket_size, reloaded._bucket_size)
+        self.assertEqual(appended._buckets, reloaded._buckets)
+        self.assertLessEqual(len(appended._buckets), 2 * appended.width())
+        self.assertEqual(
+            appended.grab().toImage(), reloaded.grab().toImage()
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
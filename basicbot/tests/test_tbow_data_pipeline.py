@@ -0,0 +1,120 @@
+"""
+test_tbow_data_pipeline.py - Tests for the incremental TBOW dashboard data pipeline
+
+This module contains tests for the tbow_data_pipeline module:
+- Incremental indicators match a full Strategy.calculate_indicators pass
+- Re-fetched partial bars replace the cached last bar
+- The pipeline only requests bars newer than its cache
+"""
+
+import logging
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from basicbot.strategy import Strategy
+from basicbot.tbow_data_pipeline import BarCache, IncrementalIndicators, TBOWDataPipeline
+
+INDICATORS = ['SMA_short', 'SMA_long', 'RSI', 'MACD', 'MACD_signal', 'MACD_hist',
+              'ATR', 'stop_loss', 'take_profit']
+
+
+def _bars(n_bars: int, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, n_bars)))
+    spread = np.abs(rng.normal(0, 0.1, n_bars))
+    return pd.DataFrame({
+        'open': close,
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': rng.integers(1_000, 10_000, n_bars).astype(float),
+    }, index=pd.date_range("2024-01-02 09:30", periods=n_bars, freq="min"))
+
+
+class _StubTactics:
+    """Minimal TBOWTactics stand-in that records the frames it analyzes."""
+
+    def __init__(self, strategy: Strategy):
+        self.symbol = strategy.symbol
+        self.timeframe = strategy.timeframe
+        self.strategy = strategy
+        self.analyzed = []
+
+    def scan_market_context(self, data):
+        self.analyzed.append(data)
+        return {"trend": "bullish"}
+
+    def analyze_indicators(self, data):
+        return {"macd": {"value": data["MACD"].iloc[-1]}}
+
+    def generate_bias(self, context, indicators):
+        return {"bias": "BULLISH"}
+
+    def check_compliance(self, context, indicators):
+        return {}
+
+
+class TestTBOWDataPipeline(unittest.TestCase):
+    """Test cases for the TBOW data pipeline."""
+
+    def setUp(self):
+        """Set up test environment."""
+        logger = logging.getLogger("test_tbow_data_pipeline")
+        logger.setLevel(logging.CRITICAL)
+        self.strategy = Strategy(symbol="TSLA", timeframe="1Min", logger=logger)
+        self.bars = _bars(600)
+
+    def test_incremental_matches_full_recompute(self):
+        """Chunked appends and a replaced partial bar give the same indicators."""
+        cache = BarCache()
+        indicators = IncrementalIndicators(self.strategy)
+        cache.merge("TSLA", self.bars.iloc[:400], indicators)
+        previous = 400
+        for end in (401, 437, 500):
+            # Each fetch starts at the last cached bar, so it is re-sent as well
+            self.assertEqual(cache.merge("TSLA", self.bars.iloc[previous - 1:end], indicators),
+                             end - previous + 1)
+            previous = end
+
+        # Re-fetch the last bar with a revised close, as a still-forming bar would be
+        revised = self.bars.iloc[500:502].copy()
+        revised.iloc[-1, revised.columns.get_loc('close')] *= 1.01
+        self.assertEqual(cache.merge("TSLA", self.bars.iloc[500:501], indicators), 1)
+        self.assertEqual(cache.merge("TSLA", revised, indicators), 2)
+        self.assertEqual(cache.merge("TSLA", revised.iloc[-1:], indicators), 1)
+
+        expected_bars = pd.concat([self.bars.iloc[:501], revised.iloc[-1:]])
+        expected = self.strategy.calculate_indicators(expected_bars)
+        cached = cache.get("TSLA")
+        self.assertEqual(len(cached), 502)
+        pd.testing.assert_frame_equal(cached[INDICATORS], expected[INDICATORS],
+                                      check_exact=False, rtol=1e-9, atol=1e-9)
+
+    def test_pipeline_fetches_only_new_bars(self):
+        """Each refresh asks for bars from the newest cached timestamp onward."""
+        visible = {"n": 300}
+        requests = []
+
+        def fetcher(symbol, start):
+            requests.append((symbol, start))
+            bars = self.bars.iloc[:visible["n"]]
+            return bars if start is None else bars[bars.index >= start]
+
+        tactics = _StubTactics(self.strategy)
+        pipeline = TBOWDataPipeline(tactics, fetcher=fetcher, analysis_window=100)
+        first = pipeline.refresh()
+        self.assertEqual(first["new_bars"], {"TSLA": 300, "SPY": 300, "QQQ": 300})
+
+        visible["n"] = 305
+        second = pipeline.refresh()
+        self.assertEqual(second["new_bars"]["TSLA"], 6)
+        self.assertEqual(requests[3], ("TSLA", self.bars.index[299]))
+        self.assertAlmostEqual(second["price"], self.bars["close"].iloc[304])
+        self.assertEqual(len(second["benchmarks"]["SPY"][0]), 305)
+        self.assertEqual(len(tactics.analyzed[-1]), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+test_trade_executor.py - Tests for the concurrent TradeExecutor cycle
+
+This module contains tests for the TradeExecutor class:
+- One account/positions snapshot per cycle
+- Parallel symbol processing with serialized order submission
+- Latency statistics
+- Stopping mid-cycle
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import unittest
+
+import pandas as pd
+
+from basicbot.mock_broker import MockBroker
+from basicbot.trade_executor import TradeExecutor
+
+
+class _SignalStrategy:
+    """Strategy stub that emits a fixed signal and records worker threads."""
+
+    def __init__(self, signal: str):
+        self.signal = signal
+        self.threads = set()
+
+    def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+        self.threads.add(threading.current_thread().name)
+        return df
+
+    def generate_signals(self, df: pd.DataFrame) -> pd.Series:
+        return pd.Series([self.signal] * len(df), index=df.index)
+
+
+class TestTradeExecutor(unittest.TestCase):
+    """Test cases for TradeExecutor."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.symbols = ["AAA", "BBB", "CCC", "DDD"]
+        self.broker = MockBroker(symbols=self.symbols, latency=0.01, bars=50)
+        self.strategy = _SignalStrategy("BUY")
+        fd, self.journal = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+        os.remove(self.journal)
+        self.executor = TradeExecutor(
+            api=self.broker,
+            strategy=self.strategy,
+            symbols=self.symbols,
+            poll_interval=0,
+            journal_file=self.journal,
+            logger=logging.getLogger("test_trade_executor")
+        )
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.executor.stop()
+        os.remove(self.journal)
+
+    def test_cycle_uses_one_account_snapshot(self):
+        """Account and positions are fetched once per cycle, not per symbol."""
+        self.executor.run_cycle()
+        self.executor.run_cycle()
+
+        self.assertEqual(self.broker.call_counts.get("get_account"), 2)
+        self.assertEqual(self.broker.call_counts.get("get_positions"), 2)
+        self.assertNotIn("get_position", self.broker.call_counts)
+
+    def test_orders_are_serialized_and_risk_checked(self):
+        """Symbols run on the pool while orders go through the single order thread."""
+        self.executor.risk_manager.max_positions = 2
+        self.executor.run_cycle()
+
+        self.assertTrue(all(name.startswith("trade-symbol") for name in self.strategy.threads))
+        # The order queue sees each fill before checking the next intent
+        self.assertEqual(len(self.broker.orders), 2)
+        held = [s for s, pos in self.executor.active_positions.items() if pos['quantity'] > 0]
+        self.assertEqual(len(held), 2)
+
+        # Unchanged signals raise no further orders
+        self.executor.run_cycle()
+        self.assertEqual(len(self.broker.orders), 2)
+
+    def test_latency_stats(self):
+        """Cycle and tick-to-order latencies are recorded."""
+        for _ in range(3):
+            self.executor.run_cycle()
+
+        stats = self.executor.get_latency_stats()
+        self.assertEqual(stats["cycle_count"], 3)
+        self.assertGreater(stats["order_count"], 0)
+        self.assertLessEqual(stats["cycle_p50_ms"], stats["cycle_p99_ms"])
+
+    def test_stop_during_cycle_does_not_hang(self):
+        """Stopping while orders are queued unblocks the cycle and drains the queue."""
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_handle(intent):
+            started.set()
+            release.wait(timeout=5)
+
+        self.executor._handle_order_intent = slow_handle
+        cycle = threading.Thread(target=self.executor.run_cycle, daemon=True)
+        cycle.start()
+        self.assertTrue(started.wait(timeout=5))
+
+        stopper = threading.Thread(target=self.executor.stop)
+        stopper.start()
+        release.set()
+        stopper.join(timeout=5)
+        cycle.join(timeout=5)
+        self.assertFalse(cycle.is_alive())
+        self.assertEqual(self.executor._order_queue.unfinished_tasks, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
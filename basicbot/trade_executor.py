@@ -8,6 +8,10 @@ This module implements the live trading engine for the BasicBot system:
 - Executes orders via brokerage API
 - Logs trade activity and performance
 
+Each polling cycle takes one account/positions snapshot, processes all symbols
+in parallel on a thread pool, and funnels resulting orders through a single
+risk-checked order queue so submissions stay serialized.
+
 Usage:
     from basicbot.trade_executor import TradeExecutor
     executor = TradeExecutor(api, strategy, risk_manager)
@@ -20,7 +24,11 @@ import datetime
 import os
 from pathlib import Path
 import json
+import queue
 import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Any, Optional, Tuple, Union
 
@@ -54,7 +62,9 @@ class TradeExecutor:
         poll_interval: int = 60,
         journal_file: str = None,
         logger: logging.Logger = None,
-        dry_run: bool = False
+        dry_run: bool = False,
+        max_workers: int = None,
+        latency_window: int = 500
     ):
         """
         Initialize the trade executor.
@@ -69,6 +79,9 @@ class TradeExecutor:
             journal_file: Path to trade journal file
             logger: Logger instance
             dry_run: If True, don't execute actual trades
+            max_workers: Threads used to process symbols in parallel
+                (defaults to one per symbol, capped at 32)
+            latency_window: Number of recent cycles/orders kept for latency stats
         """
         # Setup logger
         self.logger = logger or setup_logging("trade_executor")
@@ -90,13 +103,26 @@ class TradeExecutor:
         self.timeframe = timeframe or config.TIMEFRAME
         self.poll_interval = poll_interval
         self.dry_run = dry_run
+        self.max_workers = max_workers or min(32, len(self.symbols))
         
         # State tracking
         self.is_running = False
         self.last_signals = {}
         self.active_positions = {}
+        self.account_snapshot = {}
         self.trade_history = []
         
+        # Concurrency: symbol worker pool plus one order-submission thread
+        self._symbol_pool = None
+        self._order_queue = queue.Queue()
+        self._order_thread = None
+        self._order_stop = threading.Event()
+        self._state_lock = threading.Lock()
+        
+        # Latency tracking (seconds)
+        self.cycle_latencies = deque(maxlen=latency_window)
+        self.order_latencies = deque(maxlen=latency_window)
+        
         # Setup journal
         self.journal_file = journal_file or "trade_journal.csv"
         self._setup_journal()
@@ -153,21 +179,14 @@ class TradeExecutor:
         self.logger.info("Trading executor started")
         
         try:
-            # Update account info
-            self._update_account_info()
-            
             # Main trading loop
             while self.is_running:
                 # Check if market is open
-                # Execute strategy for each symbol
-                for symbol in self.symbols:
-                    try:
-                        self._process_symbol(symbol)
-                    except Exception as e:
-                        self.logger.error(f"Error processing {symbol}: {e}")
+                # Execute strategy for all symbols
+                latency = self.run_cycle()
                 
-                # Wait for next cycle
-                time.sleep(self.poll_interval)
+                # Wait for next cycle, keeping a fixed cadence
+                time.sleep(max(0.0, self.poll_interval - latency))
                 
         except KeyboardInterrupt:
             self.logger.info("Trading loop interrupted by user")
@@ -181,40 +200,135 @@ class TradeExecutor:
         Stop the trading loop.
         """
         self.is_running = False
+        self._order_stop.set()
+        if self._order_thread and self._order_thread is not threading.current_thread():
+            self._order_thread.join(timeout=5)
+        self._order_thread = None
+        self._drain_order_queue()
+        if self._symbol_pool:
+            self._symbol_pool.shutdown(wait=False)
+            self._symbol_pool = None
         self.logger.info("Trading executor stopped")
     
+    def run_cycle(self) -> float:
+        """
+        Run one trading cycle over all symbols.
+        
+        Takes one account/positions snapshot, processes every symbol on the
+        worker pool and waits until all orders raised by the cycle have been
+        handled by the order queue.
+        
+        Returns:
+            Cycle latency in seconds
+        """
+        self._ensure_workers()
+        cycle_start = time.perf_counter()
+        
+        # One shared account snapshot per cycle
+        try:
+            self._update_account_info()
+        except Exception as e:
+            self.logger.error(f"Error updating account info: {e}")
+        
+        futures = {
+            self._symbol_pool.submit(self._process_symbol, symbol, cycle_start): symbol
+            for symbol in self.symbols
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                self.logger.error(f"Error processing {futures[future]}: {e}")
+        
+        # Wait for orders raised this cycle so the next snapshot sees them
+        self._wait_for_orders()
+        
+        latency = time.perf_counter() - cycle_start
+        self.cycle_latencies.append(latency)
+        return latency
+    
+    def get_latency_stats(self) -> Dict[str, Any]:
+        """
+        Get latency percentiles for recent cycles and orders.
+        
+        Returns:
+            Dictionary with p50/p90/p99 cycle and tick-to-order latencies in milliseconds
+        """
+        stats = {}
+        for name, samples in (("cycle", self.cycle_latencies), ("order", self.order_latencies)):
+            values = np.array(samples) * 1000
+            stats[f"{name}_count"] = len(values)
+            for pct in (50, 90, 99):
+                stats[f"{name}_p{pct}_ms"] = float(np.percentile(values, pct)) if len(values) else None
+        return stats
+    
+    def _ensure_workers(self):
+        """
+        Start the symbol worker pool and the order-submission thread if needed.
+        """
+        if self._symbol_pool is None:
+            self._symbol_pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="trade-symbol"
+            )
+        if self._order_thread is None or not self._order_thread.is_alive():
+            self._order_stop.clear()
+            self._order_thread = threading.Thread(
+                target=self._order_worker, name="trade-orders", daemon=True
+            )
+            self._order_thread.start()
+    
     def _update_account_info(self):
         """
         Update account information and active positions.
         """
         # Get account info
         account = self.api.get_account()
-        if account:
-            equity = float(account.get('equity', 0))
-            buying_power = float(account.get('buying_power', 0))
-            
-            # Update risk manager with latest account metrics
-            self.risk_manager.update_account_metrics(equity, buying_power)
+        
+        # Fetch all positions in one call when the API supports it
+        positions = None
+        if hasattr(self.api, 'get_positions'):
+            positions = self.api.get_positions()
+        if positions is None:
+            positions = {symbol: self.api.get_position(symbol) for symbol in self.symbols}
+        
+        with self._state_lock:
+            if account:
+                equity = float(account.get('equity', 0))
+                buying_power = float(account.get('buying_power', 0))
+                self.account_snapshot = {
+                    'equity': equity,
+                    'buying_power': buying_power,
+                    'timestamp': datetime.datetime.now().isoformat()
+                }
+                
+                # Update risk manager with latest account metrics
+                self.risk_manager.update_account_metrics(equity, buying_power)
+                
+                self.logger.info(f"Account updated: equity=${equity:.2f}, buying_power=${buying_power:.2f}")
             
-            self.logger.info(f"Account updated: equity=${equity:.2f}, buying_power=${buying_power:.2f}")
-        
-        # Update positions for each symbol
-        for symbol in self.symbols:
-            qty, cost_basis = self.api.get_position(symbol)
-            self.active_positions[symbol] = {
-                'quantity': qty,
-                'cost_basis': cost_basis
-            }
-            if qty > 0:
-                self.logger.info(f"Position: {symbol} - {qty} shares @ ${cost_basis:.2f}")
+            # Update positions for each symbol
+            for symbol in self.symbols:
+                qty, cost_basis = positions.get(symbol, (0, 0))
+                self.active_positions[symbol] = {
+                    'quantity': qty,
+                    'cost_basis': cost_basis
+                }
+                if qty > 0:
+                    self.logger.info(f"Position: {symbol} - {qty} shares @ ${cost_basis:.2f}")
     
-    def _process_symbol(self, symbol: str):
+    def _process_symbol(self, symbol: str, tick_time: float = None):
         """
         Process trading logic for a single symbol.
         
+        Runs on the symbol worker pool. Signal changes that call for an order
+        are queued for the order thread rather than executed here.
+        
         Args:
             symbol: Trading symbol to process
+            tick_time: perf_counter() timestamp of the cycle start
         """
+        tick_time = tick_time or time.perf_counter()
+        
         # Get latest market data
         data = self._get_market_data(symbol)
         if data is None or data.empty:
@@ -237,52 +351,114 @@ class TradeExecutor:
         if current_signal != previous_signal:
             self.logger.info(f"Signal change for {symbol}: {previous_signal} -> {current_signal}")
             
-            # Get account info for risk calculations
-            account = self.api.get_account()
-            equity = float(account.get('equity', 0)) if account else 0
-            
-            # Get current position
+            if current_signal in ("BUY", "SELL"):
+                atr = data['ATR'].iloc[-1] if 'ATR' in data.columns else None
+                stop_loss = data['stop_loss'].iloc[-1] if 'stop_loss' in data.columns else None
+                self._order_queue.put({
+                    'symbol': symbol,
+                    'signal': current_signal,
+                    'price': current_price,
+                    'atr': atr,
+                    'stop_loss': stop_loss,
+                    'tick_time': tick_time
+                })
+    
+    def _wait_for_orders(self):
+        """
+        Block until every queued order intent has been handled, or until the
+        executor is stopped (the order thread then exits with intents left).
+        """
+        with self._order_queue.all_tasks_done:
+            while self._order_queue.unfinished_tasks and not self._order_stop.is_set():
+                self._order_queue.all_tasks_done.wait(timeout=0.1)
+    
+    def _drain_order_queue(self):
+        """
+        Discard order intents left in the queue after the order thread stopped.
+        
+        Returns:
+            Number of intents dropped
+        """
+        dropped = 0
+        while True:
+            try:
+                intent = self._order_queue.get_nowait()
+            except queue.Empty:
+                break
+            dropped += 1
+            self.logger.warning(f"Dropping unsubmitted order for {intent.get('symbol')} on stop")
+            self._order_queue.task_done()
+        return dropped
+    
+    def _order_worker(self):
+        """
+        Drain the order queue, handling one order intent at a time.
+        """
+        while not self._order_stop.is_set():
+            try:
+                intent = self._order_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            try:
+                self._handle_order_intent(intent)
+            except Exception as e:
+                self.logger.error(f"Error handling order for {intent.get('symbol')}: {e}", exc_info=True)
+            finally:
+                self._order_queue.task_done()
+    
+    def _handle_order_intent(self, intent: Dict[str, Any]):
+        """
+        Risk-check and execute a queued order intent.
+        
+        Args:
+            intent: Order intent queued by _process_symbol
+        """
+        symbol = intent['symbol']
+        current_signal = intent['signal']
+        current_price = intent['price']
+        
+        # Use the cycle snapshot for risk calculations
+        with self._state_lock:
+            equity = self.account_snapshot.get('equity', 0)
             position_qty = self.active_positions.get(symbol, {}).get('quantity', 0)
             current_positions = sum(1 for pos in self.active_positions.values() if pos.get('quantity', 0) > 0)
+        
+        # Handle BUY signal
+        if current_signal == "BUY" and position_qty == 0:
+            # Check if we can trade
+            can_trade, reason = self.risk_manager.can_place_trade(equity, current_positions)
             
-            # Handle BUY signal
-            if current_signal == "BUY" and position_qty == 0:
-                # Check if we can trade
-                can_trade, reason = self.risk_manager.can_place_trade(equity, current_positions)
+            if can_trade:
+                # Calculate position size
+                _, shares = self.risk_manager.calculate_position_size(
+                    account_balance=equity,
+                    price=current_price,
+                    stop_loss=intent['stop_loss'],
+                    atr=intent['atr']
+                )
                 
-                if can_trade:
-                    # Calculate position size
-                    atr = data.get('ATR', pd.Series()).iloc[-1] if 'ATR' in data.columns else None
-                    stop_loss = data.get('stop_loss', pd.Series()).iloc[-1] if 'stop_loss' in data.columns else None
-                    
-                    # Calculate position size
-                    _, shares = self.risk_manager.calculate_position_size(
-                        account_balance=equity,
-                        price=current_price,
-                        stop_loss=stop_loss,
-                        atr=atr
-                    )
-                    
-                    # Validate trade
-                    is_valid, reason = self.risk_manager.validate_trade(
-                        symbol=symbol,
-                        side="buy",
-                        quantity=shares,
-                        price=current_price
-                    )
-                    
-                    # Execute order if valid
-                    if is_valid and shares > 0:
-                        self._execute_order(symbol, "buy", shares, current_price)
-                    else:
-                        self.logger.warning(f"Trade validation failed: {reason}")
+                # Validate trade
+                is_valid, reason = self.risk_manager.validate_trade(
+                    symbol=symbol,
+                    side="buy",
+                    quantity=shares,
+                    price=current_price
+                )
+                
+                # Execute order if valid
+                if is_valid and shares > 0:
+                    self._execute_order(symbol, "buy", shares, current_price)
+                    self.order_latencies.append(time.perf_counter() - intent['tick_time'])
                 else:
-                    self.logger.info(f"Trade not allowed: {reason}")
-            
-            # Handle SELL signal
-            elif current_signal == "SELL" and position_qty > 0:
-                # Execute order
-                self._execute_order(symbol, "sell", position_qty, current_price)
+                    self.logger.warning(f"Trade validation failed: {reason}")
+            else:
+                self.logger.info(f"Trade not allowed: {reason}")
+        
+        # Handle SELL signal
+        elif current_signal == "SELL" and position_qty > 0:
+            # Execute order
+            self._execute_order(symbol, "sell", position_qty, current_price)
+            self.order_latencies.append(time.perf_counter() - intent['tick_time'])
     
     def _get_market_data(self, symbol: str) -> pd.DataFrame:
         """
@@ -386,20 +562,19 @@ class TradeExecutor:
                 # Update risk manager
                 self.risk_manager.record_trade()
                 
-                # Update position tracking (optimistic update)
-                if side.lower() == 'buy':
-                    self.active_positions[symbol] = {
-                        'quantity': quantity,
-                        'cost_basis': price
-                    }
-                elif side.lower() == 'sell':
-                    self.active_positions[symbol] = {
-                        'quantity': 0,
-                        'cost_basis': 0
-                    }
-                
-                # Update account info
-                self._update_account_info()
+                # Update position tracking (optimistic update); the account
+                # snapshot itself is refreshed at the start of the next cycle
+                with self._state_lock:
+                    if side.lower() == 'buy':
+                        self.active_positions[symbol] = {
+                            'quantity': quantity,
+                            'cost_basis': price
+                        }
+                    elif side.lower() == 'sell':
+                        self.active_positions[symbol] = {
+                            'quantity': 0,
+                            'cost_basis': 0
+                        }
             else:
                 self.logger.error(f"Order failed: {symbol} {side} {quantity}")
         
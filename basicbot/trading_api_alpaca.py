@@ -107,6 +107,25 @@ class TradingAPI:
             self.logger.error(f"❌ Error fetching position: {e}")
             return 0, 0
 
+    def get_positions(self) -> dict:
+        """
+        Fetch all open positions in a single request.
+
+        :return: Dictionary {symbol: (quantity, cost_basis)}, or None if failed.
+        """
+        if not self.logged_in:
+            self.logger.error("🚫 Cannot fetch positions. TradingAPI is logged out!")
+            return None
+
+        try:
+            return {
+                position.symbol: (int(position.qty), float(position.cost_basis))
+                for position in self.api.list_positions()
+            }
+        except Exception as e:
+            self.logger.error(f"❌ Error fetching positions: {e}")
+            return None
+
     def logout(self):
         """Marks the API session as closed and prevents further calls."""
         self.logged_in = False
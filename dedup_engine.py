@@ -0,0 +1,347 @@
+"""
+Duplicate-file engine shared by the dedup scripts.
+
+- Files are bucketed by size first; a file with a unique size cannot have an
+  exact duplicate and is never read.
+- Files in a shared size bucket get a partial hash of their first
+  PARTIAL_HASH_BYTES; only files whose partial hashes also collide are hashed
+  in full.
+- Hashing runs in a process pool for large batches.
+- Digests are kept in a JSON cache keyed by path and checked against the
+  file's (mtime, size), so unchanged files are not read again on the next
+  run. This makes repeated repository-wide reports incremental.
+- Near-duplicate source files are found with token n-gram shingles, MinHash
+  and LSH banding; candidate pairs are verified by exact Jaccard similarity.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import struct
+import tempfile
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger("dedup_engine")
+
+PARTIAL_HASH_BYTES = 64 * 1024
+MIN_FILES_FOR_POOL = 32  # smaller batches are hashed in this process
+CACHE_VERSION = 1
+
+# Near-duplicate detection
+SOURCE_EXTENSIONS = {".py", ".js", ".ts", ".tsx", ".jsx", ".rs", ".css", ".html"}
+NGRAM_SIZE = 5
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+_PRIME = (1 << 61) - 1
+# Fixed seed: band keys are cached, so they must be stable across runs
+_rng = random.Random(0xD3D0)
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+# --- Walking ---
+
+def walk_files(base_path, extensions: Iterable[str], ignore_dirs: Iterable[str]) -> Dict[str, os.stat_result]:
+    """
+    Stat every matching file under base_path.
+
+    Directories in ignore_dirs (case-insensitive) and hidden files and
+    directories are skipped.
+
+    Returns:
+        Dict mapping each absolute file path to its stat result
+    """
+    extensions = {ext.lower() for ext in extensions}
+    ignore_dirs = {name.lower() for name in ignore_dirs}
+    files = {}
+    for root, dirs, names in os.walk(os.path.abspath(base_path)):
+        dirs[:] = [d for d in dirs if d.lower() not in ignore_dirs and not d.startswith('.')]
+        for name in names:
+            if name.startswith('.') or (extensions and os.path.splitext(name)[1].lower() not in extensions):
+                continue
+            path = os.path.join(root, name)
+            try:
+                files[path] = os.stat(path)
+            except OSError as e:
+                logger.warning(f"Skipping {path}: {e}")
+    return files
+
+
+# --- Hashing and shingling (run in worker processes) ---
+
+def _hash_path(task: Tuple[str, str, str]) -> Tuple[str, str, Optional[object], Optional[str]]:
+    """
+    Compute one digest for a file.
+
+    Args:
+        task: (path, kind, algorithm); kind is "partial", "full" or "bands"
+
+    Returns:
+        (path, kind, result, error). result is a hex digest, or for "bands"
+        the file's LSH band keys.
+    """
+    path, kind, algorithm = task
+    try:
+        if kind == "bands":
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                return path, kind, band_keys(shingles(f.read())), None
+        hasher = hashlib.new(algorithm)
+        with open(path, "rb") as f:
+            if kind == "partial":
+                hasher.update(f.read(PARTIAL_HASH_BYTES))
+            else:
+                while chunk := f.read(1024 * 1024):
+                    hasher.update(chunk)
+        return path, kind, hasher.hexdigest(), None
+    except OSError as e:
+        return path, kind, None, str(e)
+
+
+def shingles(text: str, n: int = NGRAM_SIZE) -> Set[int]:
+    """64-bit hashes of every run of n consecutive tokens (identifiers, numbers, punctuation)."""
+    tokens = _TOKEN_RE.findall(text)
+    if not tokens:
+        return set()
+    n = min(n, len(tokens))
+    return {
+        int.from_bytes(hashlib.blake2b("\0".join(tokens[i:i + n]).encode(), digest_size=8).digest(), "little")
+        for i in range(len(tokens) - n + 1)
+    }
+
+
+def band_keys(shingle_set: Set[int]) -> List[int]:
+    """One key per LSH band of the shingle set's MinHash signature."""
+    if not shingle_set:
+        return []
+    sig = [min((a * h + b) % _PRIME for h in shingle_set) for a, b in _PERMS]
+    return [
+        int.from_bytes(hashlib.blake2b(
+            struct.pack(f"<{ROWS}Q", *sig[band * ROWS:(band + 1) * ROWS]), digest_size=8).digest(), "little")
+        for band in range(BANDS)
+    ]
+
+
+def jaccard(a: Set[int], b: Set[int]) -> float:
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
+
+# --- Cache ---
+
+class HashCache:
+    """
+    Persistent path -> digests cache, valid while (mtime, size) match.
+    """
+
+    def __init__(self, cache_path=None, algorithm: str = "sha256"):
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.algorithm = algorithm
+        self.entries: Dict[str, Dict] = {}
+        self.dirty = False
+        if self.cache_path and self.cache_path.exists():
+            try:
+                with self.cache_path.open("r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == CACHE_VERSION and data.get("algorithm") == algorithm:
+                    self.entries = data.get("files", {})
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Ignoring unreadable hash cache {self.cache_path}: {e}")
+
+    def get(self, path: str, stat: os.stat_result, kind: str):
+        entry = self.entries.get(path)
+        if entry and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return entry.get(kind)
+        return None
+
+    def put(self, path: str, stat: os.stat_result, kind: str, value) -> None:
+        entry = self.entries.get(path)
+        if not entry or entry["mtime"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+            entry = self.entries[path] = {"mtime": stat.st_mtime_ns, "size": stat.st_size}
+        entry[kind] = value
+        self.dirty = True
+
+    def prune(self, live_paths: Iterable[str], under: Optional[str] = None) -> None:
+        """Drop entries for files that no longer exist (only below ``under``, if given)."""
+        live = set(live_paths)
+        prefix = os.path.join(os.path.abspath(under), "") if under else None
+        for path in list(self.entries):
+            if path not in live and (prefix is None or path.startswith(prefix)):
+                del self.entries[path]
+                self.dirty = True
+
+    def save(self) -> None:
+        if not self.cache_path or not self.dirty:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.cache_path.parent, suffix=".tmp", delete=False, encoding="utf-8"
+        ) as f:
+            json.dump({"version": CACHE_VERSION, "algorithm": self.algorithm, "files": self.entries}, f)
+        os.replace(f.name, self.cache_path)
+        self.dirty = False
+
+
+# --- Engine ---
+
+class DedupEngine:
+    """
+    Finds exact and near-duplicate files, reading as little as possible.
+
+    Args:
+        cache_path: JSON digest cache kept between runs (None: no cache)
+        algorithm: hashlib algorithm for exact matching
+        num_workers: Process pool size (defaults to os.cpu_count())
+    """
+
+    def __init__(self, cache_path=None, algorithm: str = "sha256", num_workers: Optional[int] = None):
+        self.algorithm = algorithm
+        self.cache = HashCache(cache_path, algorithm)
+        self.num_workers = num_workers
+        self.digests: Dict[str, str] = {}  # Full digests computed or loaded in this run
+        self.stats = {"files": 0, "read": 0, "cached": 0}
+
+    def _compute(self, files: Dict[str, os.stat_result], paths: Iterable[str], kind: str) -> Dict[str, object]:
+        """Cached-or-computed results of ``kind`` for each path."""
+        results = {}
+        tasks = []
+        for path in paths:
+            value = self.cache.get(path, files[path], kind)
+            if value is not None:
+                results[path] = value
+                self.stats["cached"] += 1
+            else:
+                tasks.append((path, kind, self.algorithm))
+        for path, _, value, error in self._run(tasks):
+            if error is not None:
+                logger.warning(f"Could not read {path}: {error}")
+                continue
+            self.stats["read"] += 1
+            self.cache.put(path, files[path], kind, value)
+            results[path] = value
+        return results
+
+    def _run(self, tasks: List[Tuple[str, str, str]]):
+        """Yields _hash_path results, using a process pool for large batches."""
+        num_workers = self.num_workers or os.cpu_count() or 4
+        if num_workers > 1 and len(tasks) >= MIN_FILES_FOR_POOL:
+            chunksize = max(1, len(tasks) // (num_workers * 4))
+            done = 0
+            try:
+                with ProcessPoolExecutor(max_workers=num_workers) as pool:
+                    for result in pool.map(_hash_path, tasks, chunksize=chunksize):
+                        done += 1
+                        yield result
+                return
+            except (OSError, RuntimeError) as e:
+                # e.g. no semaphore support or a worker died; finish the rest here
+                logger.warning(f"Process pool unavailable ({e}); hashing in-process.")
+                tasks = tasks[done:]
+        for task in tasks:
+            yield _hash_path(task)
+
+    def find_exact(self, files: Dict[str, os.stat_result]) -> Dict[str, List[str]]:
+        """
+        Group byte-identical files.
+
+        Returns:
+            Dict mapping each full digest shared by 2+ files to their paths
+        """
+        self.stats["files"] += len(files)
+        by_size = defaultdict(list)
+        for path, stat in files.items():
+            by_size[stat.st_size].append(path)
+        candidates = [paths for paths in by_size.values() if len(paths) > 1]
+
+        # Files no larger than the partial block are fully hashed by it
+        small = [p for paths in candidates for p in paths if files[p].st_size <= PARTIAL_HASH_BYTES]
+        large = [p for paths in candidates for p in paths if files[p].st_size > PARTIAL_HASH_BYTES]
+        full = self._compute(files, small, "full")
+
+        partial = self._compute(files, large, "partial")
+        by_partial = defaultdict(list)
+        for path, digest in partial.items():
+            by_partial[(files[path].st_size, digest)].append(path)
+        full.update(self._compute(
+            files, [p for paths in by_partial.values() if len(paths) > 1 for p in paths], "full"))
+
+        self.digests.update(full)
+        groups = defaultdict(list)
+        for path, digest in full.items():
+            groups[digest].append(path)
+        return {digest: sorted(paths) for digest, paths in groups.items() if len(paths) > 1}
+
+    def find_near(self, files: Dict[str, os.stat_result], threshold: float = 0.8,
+                  extensions: Iterable[str] = SOURCE_EXTENSIONS) -> List[Dict]:
+        """
+        Group source files whose token n-gram sets are similar.
+
+        Byte-identical files are left to find_exact; a group only joins files
+        with some pairwise similarity >= threshold.
+
+        Returns:
+            List of {"paths": [...], "similarity": lowest linking similarity}
+        """
+        extensions = {ext.lower() for ext in extensions}
+        sources = {p: s for p, s in files.items() if os.path.splitext(p)[1].lower() in extensions}
+        bands = self._compute(sources, sources, "bands")
+
+        buckets = defaultdict(list)
+        for path, keys in bands.items():
+            for band, key in enumerate(keys):
+                buckets[(band, key)].append(path)
+        pairs = set()
+        for paths in buckets.values():
+            for i, a in enumerate(paths):
+                for b in paths[i + 1:]:
+                    pairs.add((a, b) if a < b else (b, a))
+
+        shingle_cache: Dict[str, Set[int]] = {}
+
+        def shingles_of(path):
+            if path not in shingle_cache:
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    shingle_cache[path] = shingles(f.read())
+            return shingle_cache[path]
+
+        parent = {}
+
+        def find(x):
+            while parent.get(x, x) != x:
+                x = parent[x]
+            return x
+
+        links = {}
+        for a, b in sorted(pairs):
+            if a in self.digests and b in self.digests and self.digests[a] == self.digests[b]:
+                continue
+            try:
+                similarity = jaccard(shingles_of(a), shingles_of(b))
+            except OSError as e:
+                logger.warning(f"Could not compare {a} and {b}: {e}")
+                continue
+            if similarity >= threshold:
+                ra, rb = find(a), find(b)
+                if ra != rb:
+                    parent[ra] = rb
+                links[(a, b)] = similarity
+
+        groups = defaultdict(list)
+        for path in {p for pair in links for p in pair}:
+            groups[find(path)].append(path)
+        result = []
+        for paths in groups.values():
+            members = set(paths)
+            lowest = min(s for (a, _), s in links.items() if a in members)
+            result.append({"paths": sorted(paths), "similarity": round(lowest, 3)})
+        return sorted(result, key=lambda g: g["paths"])
+
+    def save(self) -> None:
+        """Persist the digest cache."""
+        self.cache.save()
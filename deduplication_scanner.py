@@ -1,12 +1,11 @@
 import os
-import hashlib
 import json
-import subprocess
-import platform
 from collections import defaultdict
 from pathlib import Path
 import difflib
 
+from dedup_engine import DedupEngine
+
 # --- Configuration ---
 SCAN_CONFIG = {
     "base_path": "./",
@@ -16,9 +15,8 @@ SCAN_CONFIG = {
         "archive", "logs"
     ],
     "file_types": [".py", ".md", ".yaml", ".json"],
-    "use_certutil_for_large_files": True,
-    "large_file_threshold_kb": 500,
-    "similarity_threshold": 0.85  # For near-duplicate names
+    "similarity_threshold": 0.85,  # For near-duplicate names
+    "content_similarity_threshold": 0.8,  # For near-duplicate source files (0 disables)
 }
 
 # --- Output Paths ---
@@ -26,58 +24,12 @@ REPORTS_DIR = Path("runtime/reports")
 DUPLICATE_REPORT_JSON_PATH = REPORTS_DIR / "duplicate_report.json"
 DUPLICATE_SUMMARY_TXT_PATH = REPORTS_DIR / "duplicate_summary.txt"
 FILE_HASH_LOG_JSON_PATH = REPORTS_DIR / "file_hash_log.json"
+# Shared by every scan (including dedup_by_directory's per-directory runs), so
+# files whose path, mtime and size are unchanged are never read again
+HASH_CACHE_PATH = Path("runtime/reports/dedup_hash_cache.md5.json")
 
 # --- Helper Functions ---
 
-def get_file_hash_md5(filepath: Path, use_certutil: bool, threshold_kb: int) -> str | None:
-    """Calculates MD5 hash for a file."""
-    try:
-        size_kb = filepath.stat().st_size / 1024
-        if use_certutil and size_kb > threshold_kb and platform.system() == "Windows":
-            try:
-                # Ensure the path is absolute for certutil if it has spaces or special chars
-                abs_path_str = str(filepath.resolve())
-                result = subprocess.run(
-                    ['certutil', '-hashfile', abs_path_str, 'MD5'],
-                    capture_output=True, text=True, check=True, shell=False
-                )
-                # Output of certutil includes "MD5 hash of <file>:" and then the hash on the next line.
-                lines = result.stdout.strip().split('\\n')
-                for i, line in enumerate(lines):
-                    if "md5 hash of" in line.lower() and i + 1 < len(lines):
-                        return lines[i+1].strip()
-                    if i == 1 and len(lines) > 1 : # Fallback for some certutil versions
-                         return lines[i].strip()
-                # If specific line not found, try to find a 32-char hex string
-                for line in lines:
-                    hash_candidate = line.strip()
-                    if len(hash_candidate) == 32 and all(c in '0123456789abcdefABCDEF' for c in hash_candidate):
-                        return hash_candidate
-                print(f"Warning: Could not parse MD5 from certutil output for {filepath}. Output:\\n{result.stdout}")
-                return None
-            except subprocess.CalledProcessError as e:
-                print(f"Error using certutil for {filepath}: {e.stderr}")
-                # Fallback to hashlib
-            except FileNotFoundError:
-                print("Error: certutil command not found. Ensure it's in your PATH. Falling back to hashlib.")
-                # Fallback to hashlib
-        
-        # Fallback or default hashing with hashlib
-        hasher = hashlib.md5()
-        with open(filepath, 'rb') as f:
-            while chunk := f.read(8192):
-                hasher.update(chunk)
-        return hasher.hexdigest()
-    except FileNotFoundError:
-        print(f"Error: File not found for hashing: {filepath}")
-        return None
-    except PermissionError:
-        print(f"Error: Permission denied for hashing: {filepath}")
-        return None
-    except Exception as e:
-        print(f"An unexpected error occurred while hashing {filepath}: {e}")
-        return None
-
 def get_string_similarity(s1: str, s2: str) -> float:
     """Calculates similarity ratio between two strings."""
     return difflib.SequenceMatcher(None, s1.lower(), s2.lower()).ratio()
@@ -93,8 +45,8 @@ def scan_project(config: dict):
     print(f"Ignoring directories: {ignore_dirs_set}")
     print(f"Targeting file types: {file_types_set}")
 
-    all_files_data = {} # path_str -> {"hash": str, "size": int, "name": str}
-    hashes_to_files = defaultdict(list) # hash -> [path_str, path_str, ...]
+    all_files_data = {} # path_str -> {"hash": str | None, "size": int, "name": str}
+    all_stats = {} # path_str -> os.stat_result
     all_dir_paths = set()
     all_filenames = [] # (filename, full_path_str)
 
@@ -122,30 +74,34 @@ def scan_project(config: dict):
             if filename.startswith('.'):
                 continue
 
-            print(f"Processing: {filepath_str}")
-            file_hash = get_file_hash_md5(
-                filepath,
-                config["use_certutil_for_large_files"],
-                config["large_file_threshold_kb"]
-            )
-            
-            if file_hash:
-                try:
-                    size = filepath.stat().st_size
-                    all_files_data[filepath_str] = {"hash": file_hash, "size": size, "name": filename}
-                    hashes_to_files[file_hash].append(filepath_str)
-                    all_filenames.append((filename, filepath_str))
-                except FileNotFoundError:
-                     print(f"Warning: File {filepath_str} disappeared after listing and before stat.")
-                except Exception as e:
-                    print(f"Warning: Could not get stat for {filepath_str}: {e}")
-
-
-    # 1. Exact Duplicates
-    exact_duplicates = {
-        hash_val: paths
-        for hash_val, paths in hashes_to_files.items() if len(paths) > 1
-    }
+            try:
+                all_stats[filepath_str] = filepath.stat()
+                all_filenames.append((filename, filepath_str))
+            except FileNotFoundError:
+                 print(f"Warning: File {filepath_str} disappeared after listing and before stat.")
+            except Exception as e:
+                print(f"Warning: Could not get stat for {filepath_str}: {e}")
+
+
+    # 1. Exact Duplicates: only files sharing a size are hashed (partial hash
+    # first, then full), in a process pool, with digests cached between runs
+    engine = DedupEngine(cache_path=HASH_CACHE_PATH, algorithm="md5")
+    engine.cache.prune(all_stats, under=str(base_path))
+    exact_duplicates = engine.find_exact(all_stats)
+    for filepath_str, stat in all_stats.items():
+        all_files_data[filepath_str] = {
+            "hash": engine.digests.get(filepath_str),  # None: unique size, not read
+            "size": stat.st_size,
+            "name": Path(filepath_str).name,
+        }
+
+    # 1b. Near-duplicate source files (token n-gram MinHash, verified by Jaccard)
+    near_duplicate_content = []
+    if config.get("content_similarity_threshold"):
+        near_duplicate_content = engine.find_near(all_stats, config["content_similarity_threshold"])
+    engine.save()
+    print(f"Hashed {engine.stats['read']} digests, {engine.stats['cached']} from cache, "
+          f"{len(all_stats)} files in total.")
 
     # 2. Near-Duplicate Filenames
     near_duplicate_filenames = defaultdict(list)
@@ -232,10 +188,13 @@ def scan_project(config: dict):
     report_data = {
         "scan_config": config,
         "exact_duplicates": exact_duplicates,
+        "near_duplicate_content": near_duplicate_content,
         "near_duplicate_filenames": dict(near_duplicate_filenames), # convert defaultdict
         "similar_directory_names": dict(similar_dir_names), # convert defaultdict
         "notes": [
             "Exact duplicates are grouped by content hash.",
+            "File hashes are null for files whose size no other file shares (they cannot be exact duplicates).",
+            "Near-duplicate content groups source files by token n-gram similarity.",
             "Near-duplicate filenames are grouped by filename string similarity.",
             "Similar directory names are grouped by directory name string similarity.",
             "Review 'similar_directory_names' carefully; sub-structure similarity is not deeply analyzed in this version."
@@ -268,6 +227,13 @@ def scan_project(config: dict):
         for p in paths:
             summary_lines.append(f"    - {p} (Size: {all_files_data.get(p, {}).get('size', 'N/A')} bytes)")
     
+    summary_lines.append("---")
+    summary_lines.append(f"Found {len(near_duplicate_content)} groups of near-duplicate source files:")
+    for group in near_duplicate_content:
+        summary_lines.append(f"  Similarity >= {group['similarity']}:")
+        for p in group["paths"]:
+            summary_lines.append(f"    - {p}")
+
     summary_lines.append("---")
     summary_lines.append(f"Found {len(near_duplicate_filenames)} groups of near-duplicate filenames:")
     for group_name, paths in near_duplicate_filenames.items():
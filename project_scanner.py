@@ -3,11 +3,11 @@ import ast
 import json
 import hashlib
 import threading
-import queue
 import logging
 import datetime
 from pathlib import Path
-from typing import Dict, Union, Optional, List, Any
+from typing import Dict, Union, Optional, List, Any, Tuple
+from concurrent.futures import ProcessPoolExecutor
 import argparse
 
 logger = logging.getLogger(__name__)
@@ -277,55 +277,49 @@ class LanguageAnalyzer:
 
 
 # ---------------------------------
-# BotWorker & MultibotManager
+# Analysis worker processes
 # ---------------------------------
-class BotWorker(threading.Thread):
-    """
-    A background worker that pulls file tasks from a queue,
-    processes them, and appends results to results_list.
-    """
-    def __init__(self, task_queue: queue.Queue, results_list: list, scanner, status_callback=None):
-        super().__init__()
-        self.task_queue = task_queue
-        self.results_list = results_list
-        self.scanner = scanner
-        self.status_callback = status_callback
-        self.daemon = True
-        self.start()
-
-    def run(self):
-        while True:
-            file_path = self.task_queue.get()
-            if file_path is None:
-                break
-            result = self.scanner._process_file(file_path)
-            if result is not None:
-                self.results_list.append(result)
-            if self.status_callback:
-                self.status_callback(file_path, result)
-            self.task_queue.task_done()
-
-class MultibotManager:
-    """Manages a pool of BotWorker threads."""
-    def __init__(self, scanner, num_workers=4, status_callback=None):
-        self.task_queue = queue.Queue()
-        self.results_list = []
-        self.scanner = scanner
-        self.status_callback = status_callback
-        self.workers = [
-            BotWorker(self.task_queue, self.results_list, scanner, status_callback)
-            for _ in range(num_workers)
-        ]
+# Language parsing is CPU bound, so it runs in a process pool rather than threads.
+# Below this many files the pool start-up costs more than it saves.
+MIN_FILES_FOR_POOL = 32
+
+_worker_analyzer: Optional[LanguageAnalyzer] = None
 
-    def add_task(self, file_path: Path):
-        self.task_queue.put(file_path)
 
-    def wait_for_completion(self):
-        self.task_queue.join()
+def _init_analysis_worker():
+    """Pool initializer: build one LanguageAnalyzer per worker process."""
+    global _worker_analyzer
+    _worker_analyzer = LanguageAnalyzer()
+
+
+def _analyze_path(task: Tuple[str, Optional[str]],
+                  analyzer: Optional[LanguageAnalyzer] = None) -> Tuple[str, str, Optional[Dict], Optional[str]]:
+    """
+    Hashes and analyzes one file.
+
+    Args:
+        task: (absolute path, hash from the cache or None)
+        analyzer: Analyzer to use; defaults to the worker process's own
 
-    def stop_workers(self):
-        for _ in self.workers:
-            self.task_queue.put(None)
+    Returns:
+        (path, hash, analysis, error). analysis is None when the hash still
+        matches the cache (the file was only touched) or the file failed.
+    """
+    path_str, cached_hash = task
+    file_path = Path(path_str)
+    try:
+        raw = file_path.read_bytes()
+    except OSError as e:
+        return path_str, "", None, str(e)
+    file_hash = hashlib.md5(raw).hexdigest()
+    if file_hash == cached_hash:
+        return path_str, file_hash, None, None
+    analyzer = analyzer or _worker_analyzer or LanguageAnalyzer()
+    try:
+        source_code = raw.decode("utf-8", errors="replace")
+        return path_str, file_hash, analyzer.analyze_file(file_path, source_code), None
+    except Exception as e:
+        return path_str, file_hash, None, str(e)
 
 
 # ---------------------------------
@@ -960,11 +954,11 @@ class ProjectScanner:
     A universal project scanner that:
       - Identifies Python, Rust, JS, TS files.
       - Extracts functions, classes, routes, complexity.
-      - Caches file hashes to skip unchanged files.
+      - Keeps a path -> (mtime, size, hash) manifest in the cache to skip unchanged files.
       - Detects moved files by matching file hashes.
       - Merges new analysis into existing project_analysis.json (preserving old entries).
       - Exports a merged ChatGPT context if requested (preserving old context data).
-      - Processes files asynchronously with BotWorker threads.
+      - Parses changed files in a process pool.
       - Auto-generates __init__.py files for Python packages.
       - Can split output into multiple files based on directories, languages, or fixed chunks.
     """
@@ -975,6 +969,7 @@ class ProjectScanner:
         self.cache_lock = threading.Lock()
         self.additional_ignore_dirs = set()
         self.use_cache = True
+        self.num_workers: Optional[int] = None  # Defaults to os.cpu_count()
         self.language_analyzer = LanguageAnalyzer()
         self.file_processor = FileProcessor(
             self.project_root,
@@ -1006,8 +1001,9 @@ class ProjectScanner:
         Orchestrates the project scan:
         - Finds Python, Rust, JS, TS files with os.walk()
         - Excludes certain directories
-        - Detects moved files by comparing cached hashes
-        - Spawns multibot workers for concurrency
+        - Skips files whose mtime and size match the cache manifest
+        - Detects moved files by looking up new files' hashes in the missing files
+        - Parses changed files in a process pool
         - Merges new analysis with old project_analysis.json (preserving old data)
         - Writes/updates 'project_analysis.json' without overwriting unscanned files
         - Reports progress via progress_callback(percent)
@@ -1029,72 +1025,88 @@ class ProjectScanner:
         )
 
         file_extensions = self.file_processor.SUPPORTED_EXTENSIONS
-        valid_files = []
+        valid_files: Dict[str, os.stat_result] = {}
         for root, dirs, files in os.walk(self.project_root):
             root_path = Path(root)
-            if self.file_processor.should_exclude(root_path):
-                continue
+            # Prune excluded directories so the walk never descends into them
+            dirs[:] = [d for d in dirs if not self.file_processor.should_exclude(root_path / d)]
             for file in files:
                 file_path = root_path / file
                 if file_path.suffix.lower() in file_extensions and not self.file_processor.should_exclude(file_path):
-                    valid_files.append(file_path)
+                    try:
+                        valid_files[str(file_path.relative_to(self.project_root))] = file_path.stat()
+                    except OSError:
+                        continue
 
         total_files = len(valid_files)
         logger.info(f"📝 Found {total_files} valid files for analysis.")
 
-        # Progress reporting: update every file processed
-        processed_count = 0
-
-        previous_files = set(self.cache.keys())
-        current_files = {str(f.relative_to(self.project_root)) for f in valid_files}
+        # Files whose mtime and size match the manifest are neither hashed nor parsed
+        changed = {}
+        for rel_path, stat in valid_files.items():
+            entry = self.cache.get(rel_path)
+            if (not self.use_cache or entry is None or "data" not in entry
+                    or entry.get("mtime") != stat.st_mtime_ns or entry.get("size") != stat.st_size):
+                changed[rel_path] = stat
+
+        # Detect moved files: hash only the new files and look them up in a
+        # hash -> path map of the files that disappeared
+        missing_by_hash = {}
+        for old_path in set(self.cache) - set(valid_files):
+            old_hash = self.cache[old_path].get("hash")
+            if old_hash:
+                missing_by_hash.setdefault(old_hash, old_path)
         moved_files = {}
-        missing_files = previous_files - current_files
-
-        # Detect moved files by matching file hashes
-        for old_path in previous_files:
-            old_hash = self.cache.get(old_path, {}).get("hash")
-            if not old_hash:
-                continue
-            for new_path in current_files:
-                new_file = self.project_root / new_path
-                if self.file_processor.hash_file(new_file) == old_hash:
+        if missing_by_hash:
+            for new_path in changed:
+                if new_path in self.cache:
+                    continue
+                old_path = missing_by_hash.pop(
+                    self.file_processor.hash_file(self.project_root / new_path), None)
+                if old_path is not None:
                     moved_files[old_path] = new_path
-                    break
-
-        # Remove truly missing files from cache
-        for missing_file in missing_files:
-            if missing_file not in moved_files:
-                with self.cache_lock:
-                    if missing_file in self.cache:
-                        del self.cache[missing_file]
-
-        # Update cache for moved files
-        for old_path, new_path in moved_files.items():
-            with self.cache_lock:
-                self.cache[new_path] = self.cache.pop(old_path)
-
-        # Asynchronous processing
-        logger.info("⏱️  Processing files asynchronously...")
-        num_workers = os.cpu_count() or 4
-        manager = MultibotManager(
-            scanner=self,
-            num_workers=num_workers,
-            status_callback=lambda fp, res: logger.info(f"Processed: {fp}")
-        )
-        for file_path in valid_files:
-            manager.add_task(file_path)
-        manager.wait_for_completion()
-        manager.stop_workers()
 
-        # Update progress for each processed file
-        for result in manager.results_list:
+        with self.cache_lock:
+            # Update cache for moved files
+            for old_path, new_path in moved_files.items():
+                stat = changed.pop(new_path)
+                entry = self.cache.pop(old_path)
+                entry.update(mtime=stat.st_mtime_ns, size=stat.st_size)
+                self.cache[new_path] = entry
+                if "data" in entry:
+                    self.analysis[new_path] = entry["data"]
+            # Remove truly missing files from cache
+            for missing_file in set(self.cache) - set(valid_files):
+                del self.cache[missing_file]
+
+        logger.info(f"♻️  {total_files - len(changed)} files unchanged, {len(moved_files)} moved, "
+                    f"{len(changed)} to analyze.")
+
+        tasks = [
+            (str(self.project_root / rel_path),
+             self.cache.get(rel_path, {}).get("hash") if self.use_cache else None)
+            for rel_path in changed
+        ]
+        if progress_callback and not tasks:
+            # Nothing changed, so the loop below never reports progress
+            progress_callback(100)
+        processed_count = 0
+        for path_str, file_hash, analysis_result, error in self._analyze_files(tasks):
+            rel_path = str(Path(path_str).relative_to(self.project_root))
+            stat = changed[rel_path]
             processed_count += 1
             if progress_callback:
-                percent = int((processed_count / total_files) * 100)
-                progress_callback(percent)
-            if result is not None:
-                file_path, analysis_result = result
-                self.analysis[file_path] = analysis_result
+                progress_callback(int((processed_count / len(tasks)) * 100))
+            if error is not None:
+                logger.error(f"❌ Error analyzing {path_str}: {error}")
+                continue
+            with self.cache_lock:
+                entry = self.cache.setdefault(rel_path, {})
+                entry.update(hash=file_hash, mtime=stat.st_mtime_ns, size=stat.st_size)
+                if analysis_result is not None:
+                    entry["data"] = analysis_result
+                    self.analysis[rel_path] = analysis_result
+            logger.debug(f"Processed: {rel_path}")
 
         # Update the report_generator with the new analysis
         self.report_generator = ReportGenerator(self.project_root, self.analysis)
@@ -1113,6 +1125,29 @@ class ProjectScanner:
         """Processes a file via FileProcessor, returning (relative_path, analysis_result)."""
         return self.file_processor.process_file(file_path, self.language_analyzer)
 
+    def _analyze_files(self, tasks: List[Tuple[str, Optional[str]]]):
+        """
+        Yields _analyze_path results for each task, using a process pool for
+        large batches and this process for small ones.
+        """
+        num_workers = self.num_workers or os.cpu_count() or 4
+        if num_workers > 1 and len(tasks) >= MIN_FILES_FOR_POOL:
+            logger.info(f"⏱️  Analyzing {len(tasks)} files in {num_workers} processes...")
+            chunksize = max(1, len(tasks) // (num_workers * 4))
+            done = 0
+            try:
+                with ProcessPoolExecutor(max_workers=num_workers, initializer=_init_analysis_worker) as pool:
+                    for result in pool.map(_analyze_path, tasks, chunksize=chunksize):
+                        done += 1
+                        yield result
+                return
+            except (OSError, RuntimeError) as e:
+                # e.g. no semaphore support or a worker died; finish the rest here
+                logger.warning(f"⚠️ Process pool unavailable ({e}); analyzing in-process.")
+                tasks = tasks[done:]
+        for task in tasks:
+            yield _analyze_path(task, self.language_analyzer)
+
     def generate_init_files(self, overwrite: bool = True):
         """Generate __init__.py for python packages."""
         self.report_generator.generate_init_files(overwrite)
@@ -1197,7 +1232,7 @@ def main():
     parser.add_argument("-p", "--project-root", default=".", help="Root directory of the project to scan")
     parser.add_argument("--exclude", action="append", default=[], help='Directory patterns to exclude (can be used multiple times)')
     parser.add_argument("--no-cache", action="store_true", help="Disable using the file hash cache")
-    parser.add_argument("--workers", type=int, default=4, help="Number of worker threads for analysis")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes for analysis (default: CPU count)")
     
     # Add output splitting options
     parser.add_argument(
@@ -1235,6 +1270,7 @@ def main():
     scanner = ProjectScanner(project_root=args.project_root)
     scanner.additional_ignore_dirs = set(args.exclude)
     scanner.use_cache = not args.no_cache
+    scanner.num_workers = args.workers
     
     try:
         # Run scanner with output splitting options
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Config Startup Benchmark
+
+Times fresh interpreter startups: importing dreamos.core.config, a cold
+get_config() that rebuilds the resolved-config snapshot, a warm get_config()
+served from it, and `--help` for the short-lived CLI tools. Each row is the
+mean wall time of a subprocess, so interpreter start is included.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SNAPSHOT = ROOT / "runtime" / "config" / ".config.yaml.snapshot.json"
+
+CASES = [
+    ("python -c pass", ["-c", "pass"]),
+    ("import config", ["-c", "import dreamos.core.config"]),
+    ("get_config (cold)", ["-c", "from dreamos.core.config import get_config; get_config()"]),
+    ("get_config (warm)", ["-c", "from dreamos.core.config import get_config; get_config()"]),
+    ("status_all_agents --help", ["-m", "dreamos.tools.status_all_agents", "--help"]),
+    ("task_board_updater --help", ["-m", "dreamos.tools.task_board_updater", "--help"]),
+]
+
+
+def timed(args, env, repeat: int, before=None) -> float:
+    """Return mean milliseconds per subprocess run."""
+    total = 0.0
+    for _ in range(repeat):
+        if before:
+            before()
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        total += time.perf_counter() - start
+    return total / repeat * 1000
+
+
+def drop_snapshot():
+    SNAPSHOT.unlink(missing_ok=True)
+
+
+def main():
+    """Main entry point."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(ROOT / "src"), str(ROOT)]))
+    env.pop("DREAMOS_CONFIG_PATH", None)
+
+    print(f"{'case':<28}{'mean':>10}")
+    for label, args in CASES:
+        cold = label.endswith("(cold)")
+        ms = timed(args, env, repeat=10, before=drop_snapshot if cold else None)
+        print(f"{label:<28}{ms:>8.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
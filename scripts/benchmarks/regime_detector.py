@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Regime Detector Benchmark
+
+Times RegimeDetector feature extraction (cold and cached), regime labeling
+(vectorized versus the previous row-by-row loop) and latest-bar prediction on
+synthetic 10-year daily and 1-year minute OHLCV histories.
+"""
+
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from basicbot.ml_models.feature_cache import FeatureCache
+from basicbot.ml_models.regime_detector import RegimeDetector, PREDICT_LOOKBACK
+
+DATASETS = {
+    "10y daily": (252 * 10, "D"),
+    "1y minute": (252 * 390, "min"),
+}
+
+
+def generate_ohlcv(n_bars: int, freq: str, seed: int = 11) -> pd.DataFrame:
+    """Generate a random-walk OHLCV frame."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, n_bars)))
+    spread = np.abs(rng.normal(0, 0.1, n_bars))
+    return pd.DataFrame({
+        "open": close + rng.normal(0, 0.05, n_bars),
+        "high": close + spread,
+        "low": close - spread,
+        "close": close,
+        "volume": rng.integers(1_000, 10_000, n_bars).astype(float),
+    }, index=pd.date_range("2010-01-01", periods=n_bars, freq=freq))
+
+
+def rowwise_labels(detector: RegimeDetector, features: pd.DataFrame, window: int = 20) -> pd.Series:
+    """Reference implementation of the previous per-row labeling loop."""
+    df = detector.label_regimes(features, window=0).reset_index(drop=True)
+    df["up_days"] = (df["returns"] > 0).rolling(window).sum() / window
+    df["down_days"] = (df["returns"] < 0).rolling(window).sum() / window
+    vol = df["volatility_20d"]
+    df["vol_z"] = (vol - vol.rolling(252).mean()) / vol.rolling(252).std()
+    df["range_bound"] = (
+        (df["close_to_ma_20d"] < df["close_to_ma_20d"].rolling(252).mean()) &
+        (df["bb_width"] < df["bb_width"].rolling(252).mean())
+    )
+    for i in range(window, len(df)):
+        if df.loc[i, "vol_z"] > 1.5:
+            df.loc[i, "regime"] = 3
+        elif df.loc[i, "up_days"] > 0.8:
+            df.loc[i, "regime"] = 1
+        elif df.loc[i, "down_days"] > 0.8:
+            df.loc[i, "regime"] = 2
+        elif df.loc[i, "range_bound"]:
+            df.loc[i, "regime"] = 0
+        else:
+            df.loc[i, "regime"] = 3
+    return df["regime"].iloc[window:]
+
+
+def timed(func, *args, **kwargs):
+    """Run a callable and return (result, seconds)."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    """Main entry point."""
+    with tempfile.TemporaryDirectory() as model_dir:
+        for name, (n_bars, freq) in DATASETS.items():
+            data = generate_ohlcv(n_bars, freq)
+            detector = RegimeDetector(model_dir=model_dir, feature_cache=FeatureCache())
+
+            features, cold = timed(detector.extract_features, data, symbol="SPY")
+            _, warm = timed(detector.extract_features, data, symbol="SPY")
+            labeled, vectorized = timed(detector.label_regimes, features)
+            reference, rowwise = timed(rowwise_labels, detector, features)
+            assert labeled["regime"].tolist() == reference.astype(int).tolist()
+
+            # Train once on the daily history so the model fit does not dominate the run
+            if detector.model is None:
+                detector.train(generate_ohlcv(*DATASETS["10y daily"]), optimize=False)
+            _, predict = timed(detector.predict, data, symbol="SPY")
+            _, tail_features = timed(
+                detector.extract_features, data.iloc[-PREDICT_LOOKBACK:], use_cache=False
+            )
+
+            print(f"{name} ({n_bars} bars)")
+            print(f"  features cold:      {cold * 1000:9.1f} ms")
+            print(f"  features cached:    {warm * 1000:9.1f} ms")
+            print(f"  label vectorized:   {vectorized * 1000:9.1f} ms")
+            print(f"  label row-by-row:   {rowwise * 1000:9.1f} ms")
+            print(f"  tail-window feats:  {tail_features * 1000:9.1f} ms (vs cold full history)")
+            print(f"  predict latest bar: {predict * 1000:9.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Regime Detector Search Benchmark
+
+Compares wall time and holdout accuracy of RegimeDetector.train(optimize=True)
+using the exhaustive grid search against successive halving, then retrains
+with successive halving to show the effect of the persistent trial cache.
+"""
+
+import argparse
+import sys
+import tempfile
+
+from basicbot.ml_models.feature_cache import FeatureCache
+from basicbot.ml_models.regime_detector import RegimeDetector, PARAM_GRID
+
+sys.path.insert(0, __file__.rsplit("/", 1)[0])
+from regime_detector import generate_ohlcv  # noqa: E402
+
+QUICK_GRID = {
+    'n_estimators': [50, 100],
+    'max_depth': [None, 10, 20],
+    'min_samples_split': [2, 10],
+    'min_samples_leaf': [1, 4]
+}
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark regime model hyperparameter search")
+    parser.add_argument("--bars", type=int, default=252 * 10, help="Daily bars of history")
+    parser.add_argument("--quick", action="store_true", help="Use a 24-candidate grid")
+    args = parser.parse_args()
+
+    grid = QUICK_GRID if args.quick else PARAM_GRID
+    data = generate_ohlcv(args.bars, "D")
+
+    rows = []
+    with tempfile.TemporaryDirectory() as model_dir:
+        cache = FeatureCache()
+        runs = [("grid", "grid"), ("halving", "halving (cold)"), ("halving", "halving (cached)")]
+        for mode, label in runs:
+            detector = RegimeDetector(model_dir=model_dir, feature_cache=cache)
+            metrics = detector.train(data, optimize=True, search=mode, param_grid=grid)
+            rows.append((label, metrics))
+
+    print(f"{'mode':<18}{'wall time':>12}{'accuracy':>10}{'fits':>8}  best params")
+    for label, metrics in rows:
+        search = metrics['search']
+        print(f"{label:<18}{metrics['wall_time']:>11.1f}s{metrics['accuracy']:>10.4f}"
+              f"{search['n_fits']:>8}  {search['best_params']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
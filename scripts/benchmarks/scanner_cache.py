@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Scanner Cache Benchmark
+
+Simulates the cache traffic of a project scan: one ProjectCache.set per file
+with a scanner-sized entry, then close(). Compares the write-behind journal
+against rewriting the whole cache file on every set (the previous behaviour).
+Time per file should stay flat for the journal as the file count grows.
+"""
+
+import importlib.util
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# cache.py is loaded on its own: the scanner package __init__ imports
+# modules that are not part of this tree
+_CACHE_PATH = Path(__file__).resolve().parents[2] / "src" / "dreamos" / "tools" / "scanner" / "cache.py"
+_spec = importlib.util.spec_from_file_location("scanner_cache", _CACHE_PATH)
+_cache_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_cache_module)
+ProjectCache = _cache_module.ProjectCache
+
+
+def entry(i: int) -> dict:
+    return {
+        "hash": f"{i:032x}",
+        "data": {
+            "language": ".py",
+            "functions": [f"func_{i}_{j}" for j in range(8)],
+            "classes": {f"Class{i}": {"methods": ["run", "stop"], "docstring": "x" * 80}},
+            "complexity": i % 17,
+        },
+    }
+
+
+def rewrite_per_set(path: Path, n: int) -> None:
+    cache = {}
+    for i in range(n):
+        cache[f"src/module_{i}.py"] = entry(i)
+        with open(path, "w") as f:
+            json.dump(cache, f, indent=2)
+
+
+def write_behind(path: Path, n: int) -> None:
+    cache = ProjectCache(path)
+    for i in range(n):
+        cache.set(f"src/module_{i}.py", entry(i))
+    cache.close()
+
+
+def timed(func, n: int) -> float:
+    """Return microseconds per file."""
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        func(Path(tmp) / "project_scan_cache.json", n)
+        return (time.perf_counter() - start) / n * 1e6
+
+
+def main():
+    """Main entry point."""
+    print(f"{'files':>8}{'rewrite/set':>16}{'write-behind':>16}")
+    for n in (500, 1_000, 2_000, 4_000, 8_000):
+        # The old path is quadratic; past 2k files it takes minutes
+        old = timed(rewrite_per_set, n) if n <= 2_000 else float("nan")
+        new = timed(write_behind, n)
+        print(f"{n:>8}{old:>14.0f}us{new:>14.1f}us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Sparkline Chart Benchmark
+
+Times SparklineChart rendering for growing series lengths: a full data load
+plus render, a repaint served from the cached pixmap, and a one-point append
+plus render. Repaint and append cost should stay flat as the series grows.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+from basicbot.tbow_charts import SparklineChart  # noqa: E402
+
+
+def timed(func, repeat: int = 20) -> float:
+    """Return mean milliseconds per call."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    """Main entry point."""
+    app = QApplication.instance() or QApplication(sys.argv)  # noqa: F841
+    rng = np.random.default_rng(0)
+
+    print(f"{'points':>10}{'load+render':>14}{'cached repaint':>16}{'append+render':>15}")
+    for n in (1_000, 100_000, 1_000_000):
+        prices = (100 + np.cumsum(rng.normal(0, 1, n))).tolist()
+        volumes = rng.integers(1_000, 10_000, n).astype(float).tolist()
+        chart = SparklineChart(width=400, height=80, show_volume=True)
+
+        def load():
+            chart.update_data(prices, volumes)
+            chart.grab()
+
+        def append():
+            chart.append_data([prices[-1]], [volumes[-1]])
+            chart.grab()
+
+        load_ms = timed(load, repeat=3)
+        repaint_ms = timed(chart.grab)
+        append_ms = timed(append)
+        print(f"{n:>10}{load_ms:>12.1f}ms{repaint_ms:>14.2f}ms{append_ms:>13.2f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+TBOW Dashboard Pipeline Benchmark
+
+Times one dashboard refresh tick when a single new bar arrives: the previous
+approach (full refetch plus Strategy.calculate_indicators over the whole
+history, three times per tick) against the incremental BarCache merge.
+"""
+
+import argparse
+import logging
+import sys
+import time
+
+from basicbot.strategy import Strategy
+from basicbot.tbow_data_pipeline import BarCache, IncrementalIndicators
+
+sys.path.insert(0, __file__.rsplit("/", 1)[0])
+from regime_detector import generate_ohlcv  # noqa: E402
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the TBOW dashboard data pipeline")
+    parser.add_argument("--ticks", type=int, default=50)
+    args = parser.parse_args()
+
+    logger = logging.getLogger("tbow_pipeline_benchmark")
+    logger.setLevel(logging.CRITICAL)
+    strategy = Strategy(symbol="TSLA", timeframe="1Min", logger=logger)
+
+    for history in (1_000, 5_000, 20_000):
+        bars = generate_ohlcv(history + args.ticks, "min")
+
+        start = time.perf_counter()
+        for tick in range(args.ticks):
+            data = bars.iloc[:history + tick + 1]
+            for _ in range(3):  # analyze_indicators, _detect_trend, _analyze_volatility
+                strategy.calculate_indicators(data)
+        full = (time.perf_counter() - start) / args.ticks
+
+        cache = BarCache(max_bars=history + args.ticks)
+        indicators = IncrementalIndicators(strategy)
+        cache.merge("TSLA", bars.iloc[:history], indicators)
+        start = time.perf_counter()
+        for tick in range(args.ticks):
+            position = history + tick
+            cache.merge("TSLA", bars.iloc[position - 1:position + 1], indicators)
+        incremental = (time.perf_counter() - start) / args.ticks
+
+        print(f"{history:>6} bars  full recompute {full * 1000:8.2f} ms/tick  "
+              f"incremental {incremental * 1000:6.2f} ms/tick")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Trade Executor Benchmark
+
+Runs TradeExecutor cycles against the local MockBroker with simulated API
+latency and reports per-cycle and tick-to-order latency percentiles, comparing
+sequential symbol processing (one worker) with the concurrent engine.
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+from basicbot.mock_broker import MockBroker
+from basicbot.trade_executor import TradeExecutor
+
+
+def run(symbols, workers: int, cycles: int, latency: float, journal: Path) -> dict:
+    """Run executor cycles and return latency stats plus broker call counts."""
+    broker = MockBroker(symbols=symbols, latency=latency)
+    logger = logging.getLogger("trade_executor_benchmark")
+    logger.setLevel(logging.CRITICAL)
+    executor = TradeExecutor(
+        api=broker, symbols=symbols, poll_interval=0, journal_file=str(journal),
+        logger=logger, max_workers=workers
+    )
+    executor.strategy.logger = logger
+    try:
+        for _ in range(cycles):
+            executor.run_cycle()
+    finally:
+        executor.stop()
+    stats = executor.get_latency_stats()
+    stats["orders"] = len(broker.orders)
+    stats["api_calls"] = sum(broker.call_counts.values())
+    return stats
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the trade executor loop")
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per mock API call")
+    args = parser.parse_args()
+
+    symbols = [f"SYM{i:02d}" for i in range(args.symbols)]
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, workers in (("sequential", 1), ("concurrent", len(symbols))):
+            stats = run(symbols, workers, args.cycles, args.latency, Path(tmp) / f"{label}.csv")
+            order_p50 = stats["order_p50_ms"]
+            order_text = f"{order_p50:.0f} ms" if order_p50 is not None else "n/a"
+            print(f"{label:<11} cycle p50 {stats['cycle_p50_ms']:8.1f} ms  "
+                  f"p90 {stats['cycle_p90_ms']:8.1f} ms  p99 {stats['cycle_p99_ms']:8.1f} ms  "
+                  f"order p50 {order_text}  orders {stats['orders']}  api calls {stats['api_calls']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,11 @@
 import os
-import json
 import logging
 import hashlib
+from pathlib import Path
 from typing import List, Dict, Any
 
+from dreamos.tools.task_board_updater import load_task_board
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -31,8 +33,8 @@ class DuplicateDetector:
             logger.error(f"Task board not found at {task_board_path}")
             return []
 
-        with open(task_board_path, 'r') as f:
-            task_board = json.load(f)
+        # Includes updates still in the task board journal
+        task_board = load_task_board(Path(task_board_path))
 
         duplicates = []
         task_ids = set()
@@ -209,6 +209,9 @@ class BridgeTelemetry:
                 )
                 
             # Store the event
+            # Drop expired data first; this is a no-op between cleanup intervals
+            self.retention_manager.check_retention()
+            
             storage_result = self.storage.store_event(event_data)
             if not storage_result["success"]:
                 return self.error_handler.create_error_response(
@@ -285,6 +288,9 @@ class BridgeTelemetry:
             }
             
             # Store the metric
+            # Drop expired data first; this is a no-op between cleanup intervals
+            self.retention_manager.check_retention()
+            
             storage_result = self.storage.store_metric(event_data)
             if not storage_result["success"]:
                 return self.error_handler.create_error_response(
@@ -499,6 +505,24 @@ class MemoryStorage:
         
         return {"success": True, "metrics": result_metrics}
     
+    def apply_retention(self, data_type: str, cutoff: datetime.datetime) -> int:
+        """Drop events or metrics older than the cutoff; returns the number removed."""
+        if data_type == "events":
+            kept = [e for e in self.events if _parse_timestamp(e["timestamp"]) >= cutoff]
+            removed = len(self.events) - len(kept)
+            self.events = kept
+            return removed
+        
+        removed = 0
+        for metric_name in list(self.metrics):
+            kept = [m for m in self.metrics[metric_name] if _parse_timestamp(m["timestamp"]) >= cutoff]
+            removed += len(self.metrics[metric_name]) - len(kept)
+            if kept:
+                self.metrics[metric_name] = kept
+            else:
+                del self.metrics[metric_name]
+        return removed
+    
     def get_storage_info(self) -> Dict[str, Any]:
         """Get storage usage information."""
         return {
@@ -509,132 +533,360 @@ class MemoryStorage:
         }
 
 
+def _parse_timestamp(timestamp: str) -> datetime.datetime:
+    """
+    Parse an ISO-8601 timestamp into a naive UTC datetime.
+    
+    Args:
+        timestamp: ISO-8601 string, with or without a "Z" or offset suffix
+        
+    Returns:
+        Naive datetime in UTC
+    """
+    if timestamp.endswith('Z'):
+        timestamp = timestamp[:-1] + '+00:00'
+    parsed = datetime.datetime.fromisoformat(timestamp)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+class SegmentedLog:
+    """
+    Append-only JSONL log split into fixed-width time segments.
+    
+    Each record is written to the segment covering its own timestamp. A compact
+    index (min/max timestamp, record count, byte size and per-key counts for each
+    segment) is kept in memory and persisted next to the segments, so range
+    queries only open overlapping segments and retention deletes whole files.
+    """
+    
+    INDEX_FILE = "segments-index.json"
+    
+    def __init__(self, directory: str, prefix: str, segment_seconds: int = 3600,
+                 index_flush_interval: int = 100):
+        """
+        Initialize the segmented log.
+        
+        Args:
+            directory: Directory holding the segment files and index
+            prefix: File name prefix for segments (e.g. "metrics")
+            segment_seconds: Width of each segment in seconds
+            index_flush_interval: Number of appends between index writes
+        """
+        self.directory = directory
+        self.prefix = prefix
+        self.segment_seconds = max(1, int(segment_seconds))
+        self.index_flush_interval = max(1, int(index_flush_interval))
+        self.index_path = os.path.join(directory, f"{prefix}-{self.INDEX_FILE}")
+        self.segments: Dict[str, Dict[str, Any]] = {}
+        self._unflushed = 0
+        
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+    
+    def _segment_name(self, timestamp: datetime.datetime) -> str:
+        """Return the segment file name covering a timestamp."""
+        epoch = timestamp.replace(tzinfo=datetime.timezone.utc).timestamp()
+        start = int(epoch // self.segment_seconds * self.segment_seconds)
+        start_time = datetime.datetime.fromtimestamp(start, datetime.timezone.utc)
+        return f"{self.prefix}-{start_time:%Y%m%dT%H%M%S}.jsonl"
+    
+    def _load_index(self) -> None:
+        """Load the segment index, rescanning only segments it does not describe."""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.segments = json.load(f)
+        except (OSError, ValueError):
+            self.segments = {}
+        
+        on_disk = {
+            name for name in os.listdir(self.directory)
+            if name.startswith(f"{self.prefix}-") and name.endswith(".jsonl")
+        }
+        changed = False
+        for name in list(self.segments):
+            if name not in on_disk:
+                del self.segments[name]
+                changed = True
+        for name in on_disk:
+            size = os.path.getsize(os.path.join(self.directory, name))
+            if self.segments.get(name, {}).get("bytes") != size:
+                # Written after the last index flush (or never indexed)
+                self._rescan_segment(name)
+                changed = True
+        if changed:
+            self.flush_index()
+    
+    def _rescan_segment(self, name: str) -> None:
+        """Rebuild the index entry for one segment from its contents."""
+        entry = {"min_ts": None, "max_ts": None, "count": 0, "bytes": 0, "keys": {}}
+        with open(os.path.join(self.directory, name), 'rb') as f:
+            for raw in f:
+                entry["bytes"] += len(raw)
+                try:
+                    record = json.loads(raw)
+                    timestamp = _parse_timestamp(record["timestamp"])
+                except (ValueError, KeyError, TypeError):
+                    # Skip invalid lines
+                    continue
+                self._update_entry(entry, timestamp, record.get("_key", ""))
+        self.segments[name] = entry
+    
+    @staticmethod
+    def _update_entry(entry: Dict[str, Any], timestamp: datetime.datetime, key: str) -> None:
+        """Fold one record into a segment index entry."""
+        stamp = timestamp.isoformat(timespec='microseconds')
+        if entry["min_ts"] is None or stamp < entry["min_ts"]:
+            entry["min_ts"] = stamp
+        if entry["max_ts"] is None or stamp > entry["max_ts"]:
+            entry["max_ts"] = stamp
+        entry["count"] += 1
+        entry["keys"][key] = entry["keys"].get(key, 0) + 1
+    
+    def flush_index(self) -> None:
+        """Atomically persist the segment index."""
+        temp_path = f"{self.index_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.segments, f)
+        os.replace(temp_path, self.index_path)
+        self._unflushed = 0
+    
+    def append(self, record: Dict[str, Any], key: str) -> None:
+        """
+        Append a record to the segment covering its timestamp.
+        
+        Args:
+            record: JSON-serializable record with an ISO "timestamp" field
+            key: Index key for the record (e.g. metric name or event type)
+        """
+        timestamp = _parse_timestamp(record["timestamp"])
+        name = self._segment_name(timestamp)
+        line = json.dumps(dict(record, _key=key)) + '\n'
+        encoded = line.encode('utf-8')
+        
+        with open(os.path.join(self.directory, name), 'ab') as f:
+            f.write(encoded)
+        
+        entry = self.segments.setdefault(
+            name, {"min_ts": None, "max_ts": None, "count": 0, "bytes": 0, "keys": {}}
+        )
+        self._update_entry(entry, timestamp, key)
+        entry["bytes"] += len(encoded)
+        
+        self._unflushed += 1
+        if self._unflushed >= self.index_flush_interval:
+            self.flush_index()
+    
+    def select_segments(self, start: datetime.datetime = None, end: datetime.datetime = None,
+                        keys: List[str] = None) -> List[str]:
+        """
+        Find the segments that may hold records in a time range.
+        
+        Args:
+            start: Inclusive lower bound (None for unbounded)
+            end: Inclusive upper bound (None for unbounded)
+            keys: Only segments holding at least one of these keys (None for any)
+            
+        Returns:
+            Segment file paths in chronological order
+        """
+        low = start.isoformat(timespec='microseconds') if start else None
+        high = end.isoformat(timespec='microseconds') if end else None
+        selected = []
+        for name, entry in sorted(self.segments.items(), key=lambda item: item[1]["min_ts"] or ""):
+            if not entry["count"]:
+                continue
+            if low is not None and entry["max_ts"] < low:
+                continue
+            if high is not None and entry["min_ts"] > high:
+                continue
+            if keys is not None and not any(key in entry["keys"] for key in keys):
+                continue
+            selected.append(os.path.join(self.directory, name))
+        return selected
+    
+    def read(self, start: datetime.datetime = None, end: datetime.datetime = None,
+             keys: List[str] = None):
+        """
+        Yield (key, record) pairs in a time range, reading only matching segments.
+        
+        Args:
+            start: Inclusive lower bound (None for unbounded)
+            end: Inclusive upper bound (None for unbounded)
+            keys: Only records with one of these keys (None for all)
+        """
+        wanted = set(keys) if keys is not None else None
+        for path in self.select_segments(start, end, keys):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        timestamp = _parse_timestamp(record["timestamp"])
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    key = record.pop("_key", "")
+                    if wanted is not None and key not in wanted:
+                        continue
+                    if (start is not None and timestamp < start) or (end is not None and timestamp > end):
+                        continue
+                    yield key, record
+    
+    def drop_before(self, cutoff: datetime.datetime) -> int:
+        """
+        Delete every segment whose newest record is older than the cutoff.
+        
+        Args:
+            cutoff: Naive UTC datetime; segments entirely before it are removed
+            
+        Returns:
+            Number of segments deleted
+        """
+        stamp = cutoff.isoformat(timespec='microseconds')
+        expired = [
+            name for name, entry in self.segments.items()
+            if entry["max_ts"] is not None and entry["max_ts"] < stamp
+        ]
+        for name in expired:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            del self.segments[name]
+        if expired:
+            self.flush_index()
+        return len(expired)
+    
+    def key_counts(self) -> Dict[str, int]:
+        """Return record counts per key across all segments."""
+        counts: Dict[str, int] = defaultdict(int)
+        for entry in self.segments.values():
+            for key, count in entry["keys"].items():
+                counts[key] += count
+        return dict(counts)
+    
+    def size_bytes(self) -> int:
+        """Return the total size of all segments in bytes."""
+        return sum(entry["bytes"] for entry in self.segments.values())
+
+
 class FileStorage:
-    """File-based storage for telemetry events and metrics."""
+    """
+    File-based storage for telemetry events and metrics.
+    
+    Events and metrics are written to hourly segment files (configurable with
+    segment_seconds) under events_dir and metrics_dir. Only the compact segment
+    index is loaded at startup; records are read back from the segments that
+    overlap a query.
+    """
     
     def __init__(self, config: Dict[str, Any]):
         """Initialize file storage."""
         self.events_file = config.get('events_file', 'runtime/data/telemetry/events.jsonl')
         self.metrics_file = config.get('metrics_file', 'runtime/data/telemetry/metrics.jsonl')
-        self.metrics_index = {}
+        segment_seconds = config.get('segment_seconds', 3600)
+        flush_interval = config.get('index_flush_interval', 100)
         
-        # Create directories if they don't exist
-        events_dir = os.path.dirname(self.events_file)
-        metrics_dir = os.path.dirname(self.metrics_file)
+        self.events_dir = config.get(
+            'events_dir', os.path.join(os.path.dirname(self.events_file), 'events')
+        )
+        self.metrics_dir = config.get(
+            'metrics_dir', os.path.join(os.path.dirname(self.metrics_file), 'metrics')
+        )
+        self.events_log = SegmentedLog(self.events_dir, 'events', segment_seconds, flush_interval)
+        self.metrics_log = SegmentedLog(self.metrics_dir, 'metrics', segment_seconds, flush_interval)
         
-        if events_dir and not os.path.exists(events_dir):
-            os.makedirs(events_dir, exist_ok=True)
-        
-        if metrics_dir and not os.path.exists(metrics_dir):
-            os.makedirs(metrics_dir, exist_ok=True)
-        
-        # Initialize metrics index
-        self._load_metrics_index()
+        # Move records from the old single-file layout into segments
+        self._migrate_legacy_file(self.events_file, self.events_log,
+                                  lambda record: record.get("event_type", ""))
+        self._migrate_legacy_file(self.metrics_file, self.metrics_log,
+                                  lambda record: record["data"]["metric_name"])
     
-    def _load_metrics_index(self) -> None:
-        """Load metrics index from file."""
-        try:
-            if os.path.exists(self.metrics_file):
-                with open(self.metrics_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        try:
-                            metric = json.loads(line)
-                            metric_name = metric["data"]["metric_name"]
-                            
-                            if metric_name not in self.metrics_index:
-                                self.metrics_index[metric_name] = []
-                                
-                            self.metrics_index[metric_name].append({
-                                "value": metric["data"]["metric_value"],
-                                "timestamp": metric["timestamp"],
-                                "event_id": metric["event_id"],
-                                "line": line
-                            })
-                        except json.JSONDecodeError:
-                            # Skip invalid lines
-                            continue
-        except Exception:
-            # Start with empty index if file can't be read
-            self.metrics_index = {}
+    @staticmethod
+    def _migrate_legacy_file(path: str, log: SegmentedLog, key_func) -> None:
+        """Split a pre-segmentation JSONL file into segments and retire it."""
+        if not os.path.exists(path):
+            return
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    log.append(record, key_func(record))
+                except (ValueError, KeyError, TypeError):
+                    # Skip invalid lines
+                    continue
+        log.flush_index()
+        os.replace(path, f"{path}.migrated")
     
     def store_event(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Store an event in a file."""
+        """Store an event in its time segment."""
         try:
-            with open(self.events_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(event_data) + '\n')
-            
+            self.events_log.append(event_data, event_data.get("event_type", ""))
             return {"success": True}
         except Exception as e:
             return {"success": False, "error_message": str(e)}
     
     def store_metric(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Store a metric in a file."""
+        """Store a metric in its time segment."""
         try:
-            # Write to metrics file
-            with open(self.metrics_file, 'a', encoding='utf-8') as f:
-                line = json.dumps(event_data) + '\n'
-                f.write(line)
-            
-            # Update index
-            metric_name = event_data["data"]["metric_name"]
-            
-            if metric_name not in self.metrics_index:
-                self.metrics_index[metric_name] = []
-                
-            self.metrics_index[metric_name].append({
-                "value": event_data["data"]["metric_value"],
-                "timestamp": event_data["timestamp"],
-                "event_id": event_data["event_id"],
-                "line": line
-            })
-            
+            self.metrics_log.append(event_data, event_data["data"]["metric_name"])
             return {"success": True}
         except Exception as e:
             return {"success": False, "error_message": str(e)}
     
     def retrieve_metrics(self, metric_names: List[str] = None, 
                        time_range: Tuple[str, str] = None) -> Dict[str, Any]:
-        """Retrieve metrics from file storage."""
+        """Retrieve metrics from the segments overlapping the time range."""
         result_metrics = {}
         
         try:
-            # Use all metrics if None specified
-            if metric_names is None:
-                metric_names = list(self.metrics_index.keys())
-            
             # Set default time range if not provided
             if time_range is None:
                 # Default to all time
                 time_range = ("1970-01-01T00:00:00Z", datetime.datetime.utcnow().isoformat())
+            start, end = _parse_timestamp(time_range[0]), _parse_timestamp(time_range[1])
+            
+            values = defaultdict(list)
+            for metric_name, record in self.metrics_log.read(start, end, metric_names):
+                values[metric_name].append(record["data"]["metric_value"])
             
-            # Process each requested metric
-            for metric_name in metric_names:
-                if metric_name in self.metrics_index:
-                    # Filter by time range
-                    filtered_metrics = []
-                    for metric in self.metrics_index[metric_name]:
-                        if time_range[0] <= metric["timestamp"] <= time_range[1]:
-                            filtered_metrics.append(metric)
-                    
-                    # Extract values for aggregation
-                    values = [m["value"] for m in filtered_metrics]
-                    
-                    # Only include metrics with values
-                    if values:
-                        result_metrics[metric_name] = {
-                            "values": values,
-                            "time_range": time_range
-                        }
+            # Only include metrics with values
+            for metric_name in (metric_names if metric_names is not None else sorted(values)):
+                if values.get(metric_name):
+                    result_metrics[metric_name] = {
+                        "values": values[metric_name],
+                        "time_range": time_range
+                    }
             
             return {"success": True, "metrics": result_metrics}
         except Exception as e:
             return {"success": False, "error_message": str(e)}
     
+    def apply_retention(self, data_type: str, cutoff: datetime.datetime) -> int:
+        """
+        Drop whole segments older than the cutoff.
+        
+        Args:
+            data_type: "events" or "metrics"
+            cutoff: Naive UTC datetime
+            
+        Returns:
+            Number of segments deleted
+        """
+        log = self.events_log if data_type == "events" else self.metrics_log
+        return log.drop_before(cutoff)
+    
+    def flush(self) -> None:
+        """Persist pending segment index updates."""
+        self.events_log.flush_index()
+        self.metrics_log.flush_index()
+    
     def get_storage_info(self) -> Dict[str, Any]:
         """Get storage usage information."""
         try:
-            events_size = os.path.getsize(self.events_file) if os.path.exists(self.events_file) else 0
-            metrics_size = os.path.getsize(self.metrics_file) if os.path.exists(self.metrics_file) else 0
+            events_size = self.events_log.size_bytes()
+            metrics_size = self.metrics_log.size_bytes()
+            metric_counts = self.metrics_log.key_counts()
             
             # Arbitrary "full" size for percentage calculation
             max_size = 100 * 1024 * 1024  # 100MB
@@ -643,8 +895,10 @@ class FileStorage:
                 "usage_percentage": ((events_size + metrics_size) / max_size) * 100,
                 "events_size_bytes": events_size,
                 "metrics_size_bytes": metrics_size,
-                "metric_names": len(self.metrics_index),
-                "total_metrics": sum(len(metrics) for metrics in self.metrics_index.values())
+                "event_segments": len(self.events_log.segments),
+                "metric_segments": len(self.metrics_log.segments),
+                "metric_names": len(metric_counts),
+                "total_metrics": sum(metric_counts.values())
             }
         except Exception:
             return {
@@ -686,12 +940,21 @@ class RetentionManager:
     
     def _apply_retention_policies(self) -> None:
         """Apply retention policies to telemetry data."""
-        # In a real implementation, this would delete old data
+        now = datetime.datetime.utcnow()
+        removed = {}
+        
+        for data_type in ("events", "metrics"):
+            duration_days = self.config.get(data_type, {}).get('duration_days')
+            if duration_days is None or not callable(getattr(self.storage, "apply_retention", None)):
+                continue
+            cutoff = now - datetime.timedelta(days=duration_days)
+            removed[data_type] = self.storage.apply_retention(data_type, cutoff)
+        
         self.logger.log({
             "source": "Bridge_Telemetry",
             "status": "INFO",
-            "message": "Applying retention policies",
-            "payload": {"retention_policies": self.config}
+            "message": "Applied retention policies",
+            "payload": {"retention_policies": self.config, "removed": removed}
         })
 
 
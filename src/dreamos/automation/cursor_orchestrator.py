@@ -1,7 +1,6 @@
 import asyncio
 import json
 import logging
-import time
 from pathlib import Path
 from typing import Dict, Literal, Optional, Tuple, Type
 
@@ -29,6 +28,7 @@ except ImportError as e:
 
 import tenacity
 
+from dreamos.automation.input_arbiter import InputArbiter, get_input_arbiter
 from src.dreamos.core.config import AppConfig
 from src.dreamos.core.coordination.agent_bus import AgentBus, BaseEvent, EventType
 from src.dreamos.core.coordination.event_payloads import (
@@ -39,14 +39,6 @@ from src.dreamos.core.errors import ToolError as CoreToolError
 from src.dreamos.utils.decorators import retry_on_exception
 from src.dreamos.utils.gui_utils import wait_for_element
 
-# Import pygetwindow if available for recovery checks
-try:
-    import pygetwindow
-    PYGETWINDOW_AVAILABLE = True
-except ImportError:
-    pygetwindow = None
-    PYGETWINDOW_AVAILABLE = False
-
 logger = logging.getLogger(__name__)
 
 # Agent Status Types
@@ -93,12 +85,15 @@ class CursorOrchestrator:
         self,
         config: AppConfig,
         agent_bus: Optional[AgentBus] = None,
+        arbiter: Optional[InputArbiter] = None,
     ):
         """Initializes the CursorOrchestrator singleton instance.
 
         Args:
             config: The loaded AppConfig instance containing settings.
             agent_bus: Optional AgentBus instance. If None, gets the default singleton.
+            arbiter: Optional InputArbiter. If None, uses the process-wide one
+                shared with every other component that drives the GUI.
 
         Raises:
             CursorOrchestratorError: If UI dependencies missing or no coords loaded.
@@ -134,6 +129,7 @@ class CursorOrchestrator:
         self.input_coords_path = Path(self.config.input_coords_file_path).resolve()
         self.copy_coords_path = Path(self.config.copy_coords_file_path).resolve()
         self.agent_bus = agent_bus or AgentBus()
+        self.arbiter = arbiter or get_input_arbiter()
         self.input_coordinates: Dict[str, Tuple[int, int]] = {}
         self.copy_coordinates: Dict[str, Tuple[int, int]] = {}
         self.agent_status: Dict[str, AgentStatus] = {}
@@ -230,7 +226,9 @@ class CursorOrchestrator:
             target_window_title = f"Cursor - Agent {agent_id}"
 
             def injection_task():
-                self._perform_injection_sequence(x, y, prompt, agent_id, target_window_title)
+                self._perform_injection_sequence(
+                    x, y, prompt, agent_id, target_window_title, timeout
+                )
 
             if timeout:
                 await asyncio.wait_for(
@@ -265,55 +263,28 @@ class CursorOrchestrator:
             )
             raise CursorOrchestratorError(f"Injection failed for agent {agent_id}: {e}")
 
-    def _check_and_recover_focus(
-        self, target_title: str, agent_id_for_log: str
-    ) -> bool:
-        """Checks and recovers window focus if needed."""
-        if not PYGETWINDOW_AVAILABLE:
-            logger.warning("pygetwindow not available for focus recovery")
-            return True
-
-        try:
-            target_window = pygetwindow.getWindowsWithTitle(target_title)
-            if not target_window:
-                logger.error(f"Window not found: {target_title}")
-                return False
-
-            target_window = target_window[0]
-            if not target_window.isActive:
-                logger.info(f"Recovering focus for {target_title}")
-                target_window.activate()
-                time.sleep(0.5)  # Allow window to activate
-            return True
-        except Exception as e:
-            logger.error(f"Focus recovery failed: {e}")
-            return False
-
     def _perform_injection_sequence(
-        self, x: int, y: int, text: str, agent_id_for_log: str, target_window_title: str
+        self,
+        x: int,
+        y: int,
+        text: str,
+        agent_id_for_log: str,
+        target_window_title: str,
+        timeout: Optional[float] = None,
     ):
-        """Performs the actual injection sequence."""
-        if not self._check_and_recover_focus(target_window_title, agent_id_for_log):
-            raise CursorOrchestratorError("Failed to recover window focus")
+        """Queues the injection with the input arbiter and waits for it.
 
+        The timeout doubles as the job deadline, so a prompt that is still
+        queued when the caller gives up is dropped rather than typed late.
+        """
         try:
-            # Click the target location
-            pyautogui.click(x, y)
-            time.sleep(0.1)
-
-            # Clear existing text (Ctrl+A, Delete)
-            pyautogui.hotkey("ctrl", "a")
-            time.sleep(0.1)
-            pyautogui.press("delete")
-            time.sleep(0.1)
-
-            # Type the new text
-            pyautogui.write(text)
-            time.sleep(0.1)
-
-            # Press Enter to submit
-            pyautogui.press("enter")
-
+            self.arbiter.inject(
+                target_window_title,
+                text,
+                coords=(x, y),
+                timeout=timeout,
+                clear_first=True,
+            ).result()
         except FailSafeException:
             raise CursorOrchestratorError("Fail-safe triggered during injection")
         except Exception as e:
@@ -353,7 +324,9 @@ class CursorOrchestrator:
             target_window_title = f"Cursor - Agent {agent_id}"
 
             def copy_task():
-                return self._perform_copy_sequence(x, y, agent_id, target_window_title)
+                return self._perform_copy_sequence(
+                    x, y, agent_id, target_window_title, timeout
+                )
 
             if timeout:
                 response = await asyncio.wait_for(
@@ -399,26 +372,16 @@ class CursorOrchestrator:
 
     @retry_on_exception(max_attempts=3, exceptions=RETRYABLE_UI_EXCEPTIONS, delay=1.0)
     def _perform_copy_sequence(
-        self, x: int, y: int, agent_id_for_log: str, target_window_title: str
+        self,
+        x: int,
+        y: int,
+        agent_id_for_log: str,
+        target_window_title: str,
+        timeout: Optional[float] = None,
     ) -> Optional[str]:
-        """Performs the copy sequence with retries."""
-        if not self._check_and_recover_focus(target_window_title, agent_id_for_log):
-            raise CursorOrchestratorError("Failed to recover window focus")
-
+        """Performs the copy sequence through the input arbiter, with retries."""
         try:
-            # Click the target location
-            pyautogui.click(x, y)
-            time.sleep(0.1)
-
-            # Select all and copy
-            pyautogui.hotkey("ctrl", "a")
-            time.sleep(0.1)
-            pyautogui.hotkey("ctrl", "c")
-            time.sleep(0.1)
-
-            # Get clipboard content
-            return pyperclip.paste()
-
+            return self.arbiter.copy(target_window_title, coords=(x, y), timeout=timeout).result()
         except FailSafeException:
             raise CursorOrchestratorError("Fail-safe triggered during copy")
         except PyperclipException as e:
@@ -427,11 +390,12 @@ class CursorOrchestrator:
             raise CursorOrchestratorError(f"Copy sequence failed: {e}")
 
     @retry_on_exception(max_attempts=2, exceptions=(FailSafeException,), delay=0.5)
-    def _perform_health_check_click(self, x: int, y: int, agent_id_for_log: str):
-        """Performs a health check click with retries."""
+    def _perform_health_check_click(
+        self, x: int, y: int, agent_id_for_log: str, target_window_title: str
+    ):
+        """Performs a health check click through the input arbiter, with retries."""
         try:
-            pyautogui.click(x, y)
-            time.sleep(0.1)
+            self.arbiter.click(target_window_title, coords=(x, y)).result()
         except FailSafeException:
             raise CursorOrchestratorError("Fail-safe triggered during health check")
 
@@ -454,11 +418,8 @@ class CursorOrchestrator:
             x, y = self.input_coordinates[agent_id]
             target_window_title = f"Cursor - Agent {agent_id}"
 
-            if not self._check_and_recover_focus(target_window_title, agent_id):
-                return False
-
             await asyncio.to_thread(
-                self._perform_health_check_click, x, y, agent_id
+                self._perform_health_check_click, x, y, agent_id, target_window_title
             )
             return True
 
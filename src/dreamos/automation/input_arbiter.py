@@ -0,0 +1,546 @@
+"""
+Input arbiter: the single owner of the physical mouse and keyboard.
+
+CursorOrchestrator and AgentCellphone both drive the same input devices. Instead
+of calling pyautogui directly they submit typed jobs here, and one worker thread
+executes them in order of priority (lower value first), then deadline, then
+submission order. Queued injections for the same window at the same priority
+are coalesced into one batch that focuses and clicks the window once and then
+sends each message in turn. Fixed sleeps are replaced by polling the backend
+until the window is ready, with exponential backoff and a timeout.
+
+Jobs whose deadline passes while they are still queued are dropped instead of
+typed late. MockInputBackend records actions without touching the screen, so
+ordering and throughput can be tested headless.
+
+The worker thread only orders input within one process. AgentCellphone also
+runs as its own CLI process next to CursorOrchestrator, so the shared arbiter
+from get_input_arbiter() holds a file lock under runtime/locks for each batch.
+Batches from different processes then never interleave, though each process
+still orders only its own queue.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Literal, Optional, Protocol, Tuple, Union
+
+try:
+    import pyautogui  # type: ignore
+except Exception:  # pragma: no cover - optional dependency may not be available
+    pyautogui = None
+
+try:
+    import pyperclip  # type: ignore
+except Exception:  # pragma: no cover - optional dependency may not be available
+    pyperclip = None
+
+try:
+    import pygetwindow  # type: ignore
+except Exception:  # pragma: no cover - optional dependency may not be available
+    pygetwindow = None
+
+try:
+    import filelock
+except Exception:  # pragma: no cover - optional dependency may not be available
+    filelock = None
+
+logger = logging.getLogger(__name__)
+
+JobKind = Literal["inject", "copy", "click"]
+
+DEFAULT_PRIORITY = 2
+
+# Shared by every process that drives the devices through get_input_arbiter()
+DEFAULT_LOCK_PATH = Path(__file__).resolve().parents[3] / "runtime" / "locks" / "input_arbiter.lock"
+
+
+class InputArbiterError(Exception):
+    """Raised when an input job cannot be executed."""
+
+
+class InputDeadlineExceeded(InputArbiterError):
+    """Raised for a job whose deadline passed before it reached the devices."""
+
+
+@dataclass
+class InputJob:
+    """A unit of work for the input devices.
+
+    Attributes:
+        window: Target window; jobs are coalesced per window and, when ``focus``
+            is set, the window with this title is activated first.
+        text: Text to type (inject jobs only).
+        coords: Screen position to click before acting, if any.
+        kind: ``inject`` types ``text``, ``copy`` returns the window's text via
+            the clipboard, ``click`` only focuses and clicks.
+        priority: Lower values run first.
+        deadline: ``time.monotonic()`` value after which the job is dropped.
+        clear_first: Select all and delete before typing.
+        submit: Press Enter after typing.
+        focus: Activate ``window`` by title before clicking.
+    """
+
+    window: str
+    text: str = ""
+    coords: Optional[Tuple[int, int]] = None
+    kind: JobKind = "inject"
+    priority: int = DEFAULT_PRIORITY
+    deadline: Optional[float] = None
+    clear_first: bool = False
+    submit: bool = True
+    focus: bool = True
+    seq: int = field(default=0, compare=False)
+    future: Future = field(default_factory=Future, compare=False, repr=False)
+
+    def sort_key(self) -> Tuple[int, float, int]:
+        return (self.priority, self.deadline if self.deadline is not None else float("inf"), self.seq)
+
+    def __lt__(self, other: "InputJob") -> bool:
+        return self.sort_key() < other.sort_key()
+
+
+class InputBackend(Protocol):
+    """Primitive device operations used by the arbiter."""
+
+    def focus(self, window: str) -> bool: ...
+
+    def is_ready(self, window: str) -> bool: ...
+
+    def click(self, x: int, y: int) -> None: ...
+
+    def hotkey(self, *keys: str) -> None: ...
+
+    def press(self, key: str) -> None: ...
+
+    def write(self, text: str) -> None: ...
+
+    def set_clipboard(self, text: str) -> None: ...
+
+    def paste(self) -> str: ...
+
+
+class PyAutoGUIBackend:
+    """Drives the real devices through pyautogui, pyperclip and pygetwindow.
+
+    Without pyautogui (headless) actions are logged and skipped, as
+    CursorController does.
+
+    Window activation is the only readiness signal the OS exposes, and jobs
+    addressed by screen coordinates (``focus=False``, or a window title that
+    matches nothing) have no window to check. A click or Enter is therefore
+    never reported ready until ``settle`` seconds have passed, so the target
+    can take the click and the sent message before the next action lands.
+
+    Args:
+        settle: Minimum seconds between a click or submit and the next action
+    """
+
+    def __init__(self, settle: float = 0.1):
+        self.settle = settle
+        self._settle_until = 0.0
+        if pyautogui is not None:
+            pyautogui.FAILSAFE = True  # Move mouse to corner to abort
+        else:  # pragma: no cover - headless testing
+            logger.warning("pyautogui not available; input jobs will be skipped")
+
+    @staticmethod
+    def _window(title: str):
+        if pygetwindow is None:
+            return None
+        try:
+            windows = pygetwindow.getWindowsWithTitle(title)
+        except Exception as e:
+            logger.debug(f"Window lookup failed for {title}: {e}")
+            return None
+        return windows[0] if windows else None
+
+    def focus(self, window: str) -> bool:
+        if pygetwindow is None:
+            return True
+        target = self._window(window)
+        if target is None:
+            logger.error(f"Window not found: {window}")
+            return False
+        if not target.isActive:
+            logger.info(f"Recovering focus for {window}")
+            target.activate()
+        return True
+
+    def is_ready(self, window: str) -> bool:
+        if time.monotonic() < self._settle_until:
+            return False
+        target = self._window(window)
+        # Without a window handle the settle delay is the only signal
+        return target is None or bool(target.isActive)
+
+    def _start_settle(self) -> None:
+        self._settle_until = time.monotonic() + self.settle
+
+    # pyautogui's own PAUSE is a fixed sleep after every call; the arbiter
+    # polls for readiness instead, so it is disabled per call
+    def click(self, x: int, y: int) -> None:
+        if pyautogui is not None:
+            pyautogui.click(x, y, _pause=False)
+        self._start_settle()
+
+    def hotkey(self, *keys: str) -> None:
+        if pyautogui is not None:
+            pyautogui.hotkey(*keys, _pause=False)
+
+    def press(self, key: str) -> None:
+        if pyautogui is not None:
+            pyautogui.press(key, _pause=False)
+        if key == "enter":
+            self._start_settle()
+
+    def write(self, text: str) -> None:
+        if pyautogui is not None:
+            pyautogui.write(text, _pause=False)
+
+    def set_clipboard(self, text: str) -> None:
+        if pyperclip is not None:
+            pyperclip.copy(text)
+
+    def paste(self) -> str:
+        return pyperclip.paste() if pyperclip is not None else ""
+
+
+class MockInputBackend:
+    """Records device actions instead of performing them.
+
+    Args:
+        latency: Seconds each action takes, to model real device cost
+        ready_after: ``is_ready`` polls that fail after each click or submit
+        contents: Text a copy job finds in each window
+    """
+
+    def __init__(self, latency: float = 0.0, ready_after: int = 0,
+                 contents: Optional[Dict[str, str]] = None):
+        self.latency = latency
+        self.ready_after = ready_after
+        self.contents = dict(contents or {})
+        self.actions: List[Tuple] = []
+        self.sent: List[Tuple[str, str]] = []
+        self.missing_windows: set = set()
+        self.focused: Optional[str] = None
+        self.ready_polls = 0
+        self._clipboard = ""
+        self._buffer = ""
+        self._pending_polls = 0
+        self._lock = threading.Lock()
+
+    def _record(self, *action) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.actions.append(action)
+
+    def focus(self, window: str) -> bool:
+        if window in self.missing_windows:
+            return False
+        self._record("focus", window)
+        self.focused = window
+        return True
+
+    def is_ready(self, window: str) -> bool:
+        self.ready_polls += 1
+        if self._pending_polls:
+            self._pending_polls -= 1
+            return False
+        return True
+
+    def click(self, x: int, y: int) -> None:
+        self._record("click", x, y)
+        self._pending_polls = self.ready_after
+
+    def hotkey(self, *keys: str) -> None:
+        self._record("hotkey", *keys)
+        if keys == ("ctrl", "a"):
+            self._buffer = ""
+        elif keys == ("ctrl", "c"):
+            self._clipboard = self.contents.get(self.focused or "", "")
+
+    def press(self, key: str) -> None:
+        self._record("press", key)
+        if key == "enter":
+            self.sent.append((self.focused or "", self._buffer))
+            self._buffer = ""
+            self._pending_polls = self.ready_after
+
+    def write(self, text: str) -> None:
+        self._record("write", text)
+        self._buffer += text
+
+    def set_clipboard(self, text: str) -> None:
+        self._clipboard = text
+
+    def paste(self) -> str:
+        return self._clipboard
+
+
+class InputArbiter:
+    """Serializes all GUI input through one worker thread.
+
+    Args:
+        backend: Device backend; defaults to PyAutoGUIBackend
+        ready_timeout: Seconds to wait for a window to become ready
+        poll_interval: First readiness poll delay; doubles up to ``max_poll_interval``
+        max_poll_interval: Longest delay between readiness polls
+        max_batch: Most injections coalesced into one batch
+        lock_path: File lock held while a batch runs, shared with arbiters in
+            other processes (None for in-process ordering only)
+        lock_timeout: Seconds to wait for another process's batch to finish
+    """
+
+    def __init__(
+        self,
+        backend: Optional[InputBackend] = None,
+        ready_timeout: float = 5.0,
+        poll_interval: float = 0.01,
+        max_poll_interval: float = 0.2,
+        max_batch: int = 16,
+        lock_path: Optional[Union[str, Path]] = None,
+        lock_timeout: float = 30.0,
+    ):
+        self.backend = backend if backend is not None else PyAutoGUIBackend()
+        self.ready_timeout = ready_timeout
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.max_batch = max_batch
+        self.lock_timeout = lock_timeout
+        self._device_lock = None
+        if lock_path is not None:
+            if filelock is None:  # pragma: no cover - optional dependency may not be available
+                logger.warning("filelock not available; input is not arbitrated across processes")
+            else:
+                Path(lock_path).parent.mkdir(parents=True, exist_ok=True)
+                self._device_lock = filelock.FileLock(str(lock_path))
+        self.stats = {"jobs": 0, "batches": 0, "coalesced": 0, "expired": 0, "failed": 0}
+        self._queue: List[InputJob] = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    # ----- submission -----
+
+    def submit(self, job: InputJob) -> Future:
+        """Queue a job; its future resolves once the devices have executed it."""
+        with self._cond:
+            if self._stopping:
+                raise InputArbiterError("Input arbiter is stopped")
+            job.seq = next(self._counter)
+            heapq.heappush(self._queue, job)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="input-arbiter", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return job.future
+
+    def inject(
+        self,
+        window: str,
+        text: str,
+        coords: Optional[Tuple[int, int]] = None,
+        priority: int = DEFAULT_PRIORITY,
+        timeout: Optional[float] = None,
+        **options,
+    ) -> Future:
+        """Type ``text`` into ``window``; resolves to True once it is sent."""
+        return self.submit(InputJob(window, text, coords, "inject", priority,
+                                    _deadline(timeout), **options))
+
+    def copy(
+        self,
+        window: str,
+        coords: Optional[Tuple[int, int]] = None,
+        priority: int = DEFAULT_PRIORITY,
+        timeout: Optional[float] = None,
+        **options,
+    ) -> Future:
+        """Copy the text of ``window``; resolves to the clipboard contents."""
+        return self.submit(InputJob(window, "", coords, "copy", priority,
+                                    _deadline(timeout), **options))
+
+    def click(
+        self,
+        window: str,
+        coords: Optional[Tuple[int, int]] = None,
+        priority: int = DEFAULT_PRIORITY,
+        timeout: Optional[float] = None,
+        **options,
+    ) -> Future:
+        """Focus ``window`` and click ``coords``; resolves to True."""
+        return self.submit(InputJob(window, "", coords, "click", priority,
+                                    _deadline(timeout), **options))
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Finish queued jobs, then stop the worker thread."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    # ----- worker -----
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopping:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                batch = self._next_batch()
+            if batch:
+                self._execute(batch)
+
+    def _claim(self, job: InputJob) -> bool:
+        """Mark a dequeued job running; False if it was cancelled or expired.
+
+        Called with ``self._cond`` held, which also guards ``stats``.
+        """
+        if job.deadline is not None and time.monotonic() > job.deadline:
+            self.stats["expired"] += 1
+            if not job.future.cancelled():
+                job.future.set_exception(
+                    InputDeadlineExceeded(f"{job.kind} job for {job.window} expired in queue"))
+            return False
+        return job.future.set_running_or_notify_cancel()
+
+    def _next_batch(self) -> List[InputJob]:
+        """Pop the next job plus any queued injections it can be coalesced with."""
+        while self._queue:
+            head = heapq.heappop(self._queue)
+            if self._claim(head):
+                break
+        else:
+            return []
+        batch = [head]
+        if head.kind != "inject":
+            return batch
+        same = sorted(
+            (job for job in self._queue
+             if job.kind == "inject" and job.window == head.window
+             and job.priority == head.priority and job.coords == head.coords),
+            key=lambda job: job.seq,
+        )[: self.max_batch - 1]
+        if same:
+            taken = set(map(id, same))
+            self._queue = [job for job in self._queue if id(job) not in taken]
+            heapq.heapify(self._queue)
+            batch.extend(job for job in same if self._claim(job))
+        return batch
+
+    def _execute(self, batch: List[InputJob]) -> None:
+        head = batch[0]
+        with self._cond:
+            self.stats["batches"] += 1
+            self.stats["coalesced"] += len(batch) - 1
+        done = 0
+        locked = False
+        try:
+            if self._device_lock is not None:
+                # Wait for a batch another process is sending to the same devices
+                self._device_lock.acquire(timeout=self.lock_timeout)
+                locked = True
+            if head.focus and not self.backend.focus(head.window):
+                raise InputArbiterError(f"Failed to focus window: {head.window}")
+            if head.coords is not None:
+                self.backend.click(*head.coords)
+            self._wait_ready(head.window)
+
+            if head.kind == "click":
+                head.future.set_result(True)
+                done = 1
+            elif head.kind == "copy":
+                head.future.set_result(self._copy_text())
+                done = 1
+            else:
+                for job in batch:
+                    if done:
+                        # The previous message must be taken before the next is typed
+                        self._wait_ready(job.window)
+                    if job.clear_first:
+                        self.backend.hotkey("ctrl", "a")
+                        self.backend.press("delete")
+                    self.backend.write(job.text)
+                    if job.submit:
+                        self.backend.press("enter")
+                    job.future.set_result(True)
+                    done += 1
+        except Exception as e:
+            logger.error(f"Input job for {head.window} failed: {e}")
+            with self._cond:
+                self.stats["failed"] += len(batch) - done
+            for job in batch[done:]:
+                job.future.set_exception(e)
+        finally:
+            if locked:
+                self._device_lock.release()
+            with self._cond:
+                self.stats["jobs"] += len(batch)
+
+    def _copy_text(self) -> str:
+        """Select all and copy, waiting for the clipboard to pick up the text."""
+        self.backend.set_clipboard("")
+        self.backend.hotkey("ctrl", "a")
+        self.backend.hotkey("ctrl", "c")
+        text = ""
+
+        def copied() -> bool:
+            nonlocal text
+            text = self.backend.paste()
+            return bool(text)
+
+        # An empty window legitimately copies nothing, so a timeout is not an error
+        self._poll(copied, self.ready_timeout)
+        return text
+
+    def _wait_ready(self, window: str) -> None:
+        if not self._poll(lambda: self.backend.is_ready(window), self.ready_timeout):
+            raise InputArbiterError(f"Window {window} not ready after {self.ready_timeout:.1f}s")
+
+    def _poll(self, predicate: Callable[[], bool], timeout: float) -> bool:
+        """Poll ``predicate`` with exponential backoff; False on timeout."""
+        delay = self.poll_interval
+        end = time.monotonic() + timeout
+        while not predicate():
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, self.max_poll_interval)
+        return True
+
+
+def _deadline(timeout: Optional[float]) -> Optional[float]:
+    return time.monotonic() + timeout if timeout is not None else None
+
+
+_arbiter: Optional[InputArbiter] = None
+_arbiter_lock = threading.Lock()
+
+
+def get_input_arbiter() -> InputArbiter:
+    """Return the process-wide arbiter, creating it with the real backend.
+
+    It holds DEFAULT_LOCK_PATH for each batch, so arbiters in other processes
+    never interleave their input with this one's.
+    """
+    global _arbiter
+    if _arbiter is None:
+        with _arbiter_lock:
+            if _arbiter is None:
+                _arbiter = InputArbiter(lock_path=DEFAULT_LOCK_PATH)
+    return _arbiter
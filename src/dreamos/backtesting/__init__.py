@@ -10,6 +10,7 @@ __version__ = "0.1.0"
 from .core import BacktestEngine
 from .data import DataManager
 from .strategies import StrategyBase
+from .portfolio import PortfolioEngine
 from .analysis import PerformanceAnalyzer
 from .utils import ValidationError, BacktestError
 
@@ -17,6 +18,7 @@ __all__ = [
     'BacktestEngine',
     'DataManager',
     'StrategyBase',
+    'PortfolioEngine',
     'PerformanceAnalyzer',
     'ValidationError',
     'BacktestError'
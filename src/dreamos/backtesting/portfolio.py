@@ -0,0 +1,238 @@
+"""
+Vectorized multi-asset portfolio accounting for the backtesting framework.
+
+This module turns a signals matrix (time x symbol) and a price matrix of the same
+shape into positions, cash, trades and portfolio value using array operations,
+replacing the per-row ``iterrows`` loop previously used by ``StrategyBase.run``.
+"""
+
+import logging
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .utils import BacktestError
+
+logger = logging.getLogger(__name__)
+
+SIGNAL_SUFFIX = "_signal"
+PRICE_SUFFIX = "_price"
+
+
+def split_signal_frame(signals: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Split a strategy signal frame into aligned signal and price matrices.
+
+    Strategies emit one ``<symbol>_signal`` and one ``<symbol>_price`` column per
+    symbol. Symbol order follows the order of the ``_signal`` columns, which is
+    the order in which the per-row path opened positions.
+
+    Args:
+        signals: Signal frame produced by ``StrategyBase.generate_signals``
+
+    Returns:
+        Tuple of (signal matrix, price matrix), both indexed by timestamp with
+        one column per symbol
+
+    Raises:
+        BacktestError: If a signal column has no matching price column
+    """
+    signal_columns = [
+        col for col in signals.columns
+        if isinstance(col, str) and col.endswith(SIGNAL_SUFFIX)
+    ]
+    symbols = [col.replace(SIGNAL_SUFFIX, '') for col in signal_columns]
+    price_columns = [f"{symbol}{PRICE_SUFFIX}" for symbol in symbols]
+
+    missing = [col for col in price_columns if col not in signals.columns]
+    if missing:
+        raise BacktestError(f"Missing price columns for signals: {missing}")
+
+    signal_matrix = signals[signal_columns].set_axis(symbols, axis=1)
+    price_matrix = signals[price_columns].set_axis(symbols, axis=1)
+    return signal_matrix, price_matrix
+
+
+class PortfolioEngine:
+    """Array-based portfolio simulator for multi-symbol backtests."""
+
+    def run(
+        self,
+        signals: pd.DataFrame,
+        prices: pd.DataFrame,
+        initial_capital: float
+    ) -> Dict[str, Any]:
+        """
+        Simulate the portfolio for a signals matrix and a price matrix.
+
+        The accounting rules match the per-row path: within each bar, symbols are
+        visited in column order and every non-zero signal spends
+        ``abs(signal)`` of the remaining cash on that symbol, replacing any
+        previous position in it. Spending stops once cash is exhausted.
+
+        Args:
+            signals: Signal matrix (time x symbol)
+            prices: Price matrix with the same shape and labels as ``signals``
+            initial_capital: Initial capital for the portfolio
+
+        Returns:
+            Dictionary with portfolio value, returns, positions, trades and cash
+        """
+        try:
+            if signals.shape != prices.shape:
+                raise BacktestError(
+                    f"Signal shape {signals.shape} does not match price shape {prices.shape}"
+                )
+
+            symbols = list(signals.columns)
+            index = signals.index
+            n_bars, n_symbols = signals.shape
+
+            if n_bars == 0 or n_symbols == 0:
+                value = [float(initial_capital)] * n_bars
+                return self._build_results(value, {}, [], float(initial_capital))
+
+            sig = signals.to_numpy(dtype=float)
+            px = prices.to_numpy(dtype=float)
+
+            cash_before, cash_after, traded = self._cash_flow(
+                np.abs(sig).ravel(), px.ravel(), float(initial_capital)
+            )
+            traded = traded.reshape(n_bars, n_symbols)
+            cash_before = cash_before.reshape(n_bars, n_symbols)
+            row_cash = cash_after.reshape(n_bars, n_symbols)[:, -1]
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                quantity = np.where(traded, cash_before * np.abs(sig) / px, 0.0)
+
+            # Position held in each symbol is the quantity of its latest buy.
+            bar_numbers = np.arange(n_bars)[:, None]
+            last_trade = np.maximum.accumulate(
+                np.where(traded, bar_numbers, -1), axis=0
+            )
+            held = last_trade >= 0
+            position = np.where(
+                held,
+                np.take_along_axis(quantity, np.maximum(last_trade, 0), axis=0),
+                0.0
+            )
+
+            with np.errstate(invalid='ignore'):
+                holdings = np.where(position != 0, position * px, 0.0)
+            portfolio_value = (row_cash + holdings.sum(axis=1)).tolist()
+
+            positions = {
+                symbols[col]: float(position[-1, col])
+                for col in np.flatnonzero(held[-1])
+            }
+            trades = self._collect_trades(traded, quantity, px, index, symbols)
+
+            return self._build_results(
+                portfolio_value, positions, trades, float(row_cash[-1])
+            )
+
+        except BacktestError:
+            raise
+        except Exception as e:
+            logger.error(f"Portfolio simulation failed: {str(e)}")
+            raise BacktestError(f"Portfolio simulation failed: {str(e)}")
+
+    @staticmethod
+    def _cash_flow(
+        weights: np.ndarray,
+        prices: np.ndarray,
+        initial_capital: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Compute cash before and after every (bar, symbol) step in row-major order.
+
+        Each buy scales cash by ``1 - weight``, so cash is a cumulative product of
+        those factors. Once cash stops being positive no further buys can happen
+        and cash stays frozen at that value.
+
+        Args:
+            weights: Flattened absolute signal values
+            prices: Flattened prices
+            initial_capital: Cash at the start of the simulation
+
+        Returns:
+            Tuple of (cash before each step, cash after each step, buy mask)
+        """
+        with np.errstate(invalid='ignore'):
+            eligible = (
+                np.isfinite(weights) & (weights > 0)
+                & np.isfinite(prices) & (prices > 0)
+            )
+        if initial_capital <= 0:
+            eligible[:] = False
+
+        factors = np.where(eligible, 1.0 - weights, 1.0)
+        growth = np.cumprod(factors)
+
+        exhausted = np.flatnonzero(eligible & (growth <= 0))
+        if exhausted.size:
+            stop = exhausted[0]
+            eligible[stop + 1:] = False
+            growth[stop + 1:] = growth[stop]
+
+        cash_after = initial_capital * growth
+        cash_before = np.empty_like(cash_after)
+        cash_before[0] = initial_capital
+        cash_before[1:] = cash_after[:-1]
+        return cash_before, cash_after, eligible
+
+    @staticmethod
+    def _collect_trades(
+        traded: np.ndarray,
+        quantity: np.ndarray,
+        prices: np.ndarray,
+        index: pd.Index,
+        symbols: List[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Build the trade log for every executed buy, in execution order.
+
+        Args:
+            traded: Buy mask (time x symbol)
+            quantity: Bought quantities (time x symbol)
+            prices: Price matrix (time x symbol)
+            index: Timestamp index of the matrices
+            symbols: Symbol labels of the matrix columns
+
+        Returns:
+            List of trade dictionaries
+        """
+        rows, cols = np.nonzero(traded)
+        # Box each bar's timestamp once and share it across that bar's trades.
+        bar_timestamps = index.tolist()
+        timestamps = [bar_timestamps[row] for row in rows.tolist()]
+        names = np.asarray(symbols, dtype=object)[cols].tolist()
+        quantities = quantity[rows, cols].tolist()
+        fill_prices = prices[rows, cols].tolist()
+        return [
+            {
+                'timestamp': timestamp,
+                'symbol': symbol,
+                'action': 'buy',
+                'quantity': qty,
+                'price': price
+            }
+            for timestamp, symbol, qty, price in zip(timestamps, names, quantities, fill_prices)
+        ]
+
+    @staticmethod
+    def _build_results(
+        portfolio_value: List[float],
+        positions: Dict[str, float],
+        trades: List[Dict[str, Any]],
+        cash: float
+    ) -> Dict[str, Any]:
+        """Assemble the result dictionary returned by ``StrategyBase.run``."""
+        return {
+            'portfolio_value': portfolio_value,
+            'returns': pd.Series(portfolio_value).pct_change(),
+            'positions': positions,
+            'trades': trades,
+            'cash': cash
+        }
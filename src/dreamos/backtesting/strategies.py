@@ -12,6 +12,7 @@ import pandas as pd
 import numpy as np
 
 from .utils import ValidationError, BacktestError
+from .portfolio import PortfolioEngine, split_signal_frame, SIGNAL_SUFFIX
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +61,10 @@ class StrategyBase(ABC):
         """
         Run the strategy on the provided data.
         
+        Portfolio accounting is done by the vectorized ``PortfolioEngine``. The
+        per-row path is kept for signal frames that carry bare symbol columns,
+        which the row-wise close logic treats as exit signals.
+        
         Args:
             data: Market data
             initial_capital: Initial capital for the strategy
@@ -68,38 +73,77 @@ class StrategyBase(ABC):
             Dictionary containing strategy results
         """
         try:
-            # Initialize
-            self.cash = initial_capital
-            self.positions = {}
-            self.trades = []
-            
             # Generate signals
             signals = self.generate_signals(data)
             
-            # Execute trades
-            portfolio_value = []
-            for timestamp, row in signals.iterrows():
-                # Update positions based on signals
-                self._update_positions(row)
+            if self._has_exit_columns(signals):
+                return self._run_rowwise(signals, initial_capital)
                 
-                # Calculate portfolio value
-                portfolio_value.append(self._calculate_portfolio_value(row))
-                
-            # Calculate performance metrics
-            returns = pd.Series(portfolio_value).pct_change()
+            signal_matrix, price_matrix = split_signal_frame(signals)
+            results = PortfolioEngine().run(signal_matrix, price_matrix, initial_capital)
             
-            return {
-                'portfolio_value': portfolio_value,
-                'returns': returns,
-                'positions': self.positions,
-                'trades': self.trades,
-                'cash': self.cash
-            }
+            self.cash = results['cash']
+            self.positions = results['positions']
+            self.trades = results['trades']
+            return results
             
         except Exception as e:
             logger.error(f"Strategy execution failed: {str(e)}")
             raise BacktestError(f"Strategy execution failed: {str(e)}")
             
+    @staticmethod
+    def _has_exit_columns(signals: pd.DataFrame) -> bool:
+        """
+        Check whether the signal frame has columns named after bare symbols.
+        
+        Args:
+            signals: Signal frame produced by ``generate_signals``
+            
+        Returns:
+            True if any ``<symbol>`` column exists next to ``<symbol>_signal``
+        """
+        return any(
+            isinstance(col, str) and col.endswith(SIGNAL_SUFFIX)
+            and col.replace(SIGNAL_SUFFIX, '') in signals.columns
+            for col in signals.columns
+        )
+        
+    def _run_rowwise(self, signals: pd.DataFrame, initial_capital: float) -> Dict[str, Any]:
+        """
+        Run portfolio accounting one row at a time.
+        
+        Args:
+            signals: Signal frame produced by ``generate_signals``
+            initial_capital: Initial capital for the strategy
+            
+        Returns:
+            Dictionary containing strategy results
+        """
+        # Initialize
+        self.cash = initial_capital
+        self.positions = {}
+        self.trades = []
+        
+        # Execute trades
+        portfolio_value = []
+        for timestamp, row in signals.iterrows():
+            # Update positions based on signals
+            self._update_positions(row)
+            
+            # Calculate portfolio value
+            portfolio_value.append(self._calculate_portfolio_value(row))
+            
+        # Calculate performance metrics
+        returns = pd.Series(portfolio_value).pct_change()
+        
+        return {
+            'portfolio_value': portfolio_value,
+            'returns': returns,
+            'positions': self.positions,
+            'trades': self.trades,
+            'cash': self.cash
+        }
+            
     def _update_positions(self, signal: pd.Series) -> None:
         """
         Update positions based on trading signals.
@@ -7,30 +7,41 @@ import discord
 import asyncio
 from collections import defaultdict
 
+from .event_rollup import RollupStore
+
 logger = logging.getLogger(__name__)
 
 class AlertAggregator:
-    """Manages aggregation of similar alerts within a time window."""
+    """Manages aggregation of similar alerts within a time window.
+
+    Each alert type keeps only constant-size state while its window is open:
+    counters, the set of affected agents and a bounded set of recent samples.
+    Per-minute counts live in a RollupStore trimmed to the window, and
+    windows are closed by flush_expired() on a timer as well as by new alerts.
+    """
     
-    def __init__(self, window_seconds: int = 600):  # 10 minutes default
+    def __init__(self, window_seconds: int = 600, sample_size: int = 5):  # 10 minutes default
         self.window_seconds = window_seconds
+        self.sample_size = sample_size
+        self.rollups = RollupStore(bucket_seconds=60, sample_size=sample_size,
+                                   retention_seconds=window_seconds)
         self.alert_groups: Dict[str, Dict[str, Any]] = defaultdict(lambda: {
             "count": 0,
             "agents": set(),
             "first_seen": None,
             "last_seen": None,
-            "details": [],
             "recovery_count": 0,
             "recovered_agents": set()
         })
     
-    def add_alert(self, alert_type: str, agent_id: Optional[str], details: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def add_alert(self, alert_type: str, agent_id: Optional[str], details: Dict[str, Any],
+                  now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
         """Add an alert to the aggregation window.
         
         Returns:
             Aggregated alert if window is complete, None otherwise
         """
-        now = datetime.utcnow()
+        now = now or datetime.utcnow()
         group = self.alert_groups[alert_type]
         
         # Initialize timestamps if first alert
@@ -48,8 +59,8 @@ class AlertAggregator:
             group["recovery_count"] += 1
             group["recovered_agents"].add(agent_id)
         
-        # Store relevant details
-        group["details"].append({
+        # Fold into the per-minute rollups, keeping only the latest samples
+        self.rollups.record(alert_type, agent_id, timestamp=now, sample={
             "timestamp": now.isoformat(),
             "agent_id": agent_id,
             "details": details
@@ -57,13 +68,39 @@ class AlertAggregator:
         
         # Check if window is complete
         if (now - group["first_seen"]).total_seconds() >= self.window_seconds:
-            return self._create_aggregated_alert(alert_type, group)
+            return self._flush_group(alert_type, now)
         
         return None
     
-    def _create_aggregated_alert(self, alert_type: str, group: Dict[str, Any]) -> Dict[str, Any]:
+    def flush_expired(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Close every group whose window has elapsed.
+        
+        Called periodically so windows close even when no further alert of
+        that type arrives.
+        
+        Returns:
+            Aggregated alerts for the closed groups
+        """
+        now = now or datetime.utcnow()
+        aggregated = []
+        for alert_type in list(self.alert_groups.keys()):
+            group = self.alert_groups[alert_type]
+            if group["first_seen"] and (now - group["first_seen"]).total_seconds() >= self.window_seconds:
+                aggregated.append(self._flush_group(alert_type, now))
+        return aggregated
+    
+    def _flush_group(self, alert_type: str, now: datetime) -> Dict[str, Any]:
+        """Build the aggregated alert for a group and start a fresh window."""
+        group = self.alert_groups.pop(alert_type)
+        aggregated = self._create_aggregated_alert(alert_type, group, now)
+        self.rollups.clear_samples(alert_type)
+        self.rollups.prune(now - timedelta(seconds=self.window_seconds))
+        return aggregated
+    
+    def _create_aggregated_alert(self, alert_type: str, group: Dict[str, Any],
+                                 now: Optional[datetime] = None) -> Dict[str, Any]:
         """Create an aggregated alert from a completed group."""
-        now = datetime.utcnow()
+        now = now or datetime.utcnow()
         duration = (now - group["first_seen"]).total_seconds()
         
         # Build summary message
@@ -87,6 +124,7 @@ class AlertAggregator:
             message += f"\nAffected agents: {', '.join(sorted(group['agents']))}"
         
         return {
+            "timestamp": now.isoformat(),
             "type": f"AGGREGATED_{alert_type}",
             "message": message,
             "severity": "warning",
@@ -97,17 +135,15 @@ class AlertAggregator:
                 "recovery_count": group["recovery_count"],
                 "recovered_agents": list(sorted(group["recovered_agents"])),
                 "first_seen": group["first_seen"].isoformat(),
-                "last_seen": group["last_seen"].isoformat()
+                "last_seen": group["last_seen"].isoformat(),
+                "per_minute": self.rollups.series(alert_type, since=group["first_seen"]),
+                "samples": self.rollups.samples(alert_type)
             }
         }
     
     def cleanup_old_groups(self):
-        """Remove alert groups older than the window."""
-        now = datetime.utcnow()
-        for alert_type in list(self.alert_groups.keys()):
-            group = self.alert_groups[alert_type]
-            if group["first_seen"] and (now - group["first_seen"]).total_seconds() > self.window_seconds:
-                del self.alert_groups[alert_type]
+        """Remove alert groups older than the window without emitting them."""
+        self.flush_expired()
 
 class TrendDetector:
     """Analyzes swarm metrics to detect patterns, fatigue, and anomalies."""
@@ -353,11 +389,13 @@ class DailyDigest:
         if self.discord_enabled:
             self._init_discord()
         
+        # Per-minute event rollups replace per-event lists; memory is bounded by
+        # minutes x event types x agents rather than by the day's event volume
+        self.rollups = RollupStore(
+            bucket_seconds=60,
+            sample_size=config.get("digest", {}).get("sample_size", 5)
+        )
         self.stats = {
-            "drift_events": [],
-            "recovery_events": [],
-            "error_events": [],
-            "task_executions": [],
             "agent_activity": defaultdict(lambda: {
                 "tasks_completed": 0,
                 "errors": 0,
@@ -369,6 +407,10 @@ class DailyDigest:
             })
         }
         
+        # Compact per-day summaries of every saved digest, loaded once for trend analysis
+        self.index_path = self.digest_dir / "digest-index.json"
+        self._digest_index: Optional[Dict[str, Dict[str, Any]]] = None
+        
         self.digest_task_started = False
 
         if self.config.get("discord", {}).get("enabled"):
@@ -387,22 +429,6 @@ class DailyDigest:
             logger.error(f"Failed to initialize Discord client for digest: {e}")
             self.discord_client = None
     
-    def _load_previous_digest(self, date: datetime) -> Optional[Dict[str, Any]]:
-        """Load digest data from previous day."""
-        try:
-            prev_date = (date - timedelta(days=1)).strftime("%Y-%m-%d")
-            digest_path = self.digest_dir / f"daily-{prev_date}.json"
-            
-            if not digest_path.exists():
-                return None
-            
-            with open(digest_path, 'r') as f:
-                return json.load(f)
-                
-        except Exception as e:
-            logger.error(f"Error loading previous digest: {e}")
-            return None
-    
     def _calculate_metric_delta(self, current: Any, previous: Any, metric_type: str = "number") -> Tuple[str, str]:
         """Calculate and format metric delta.
         
@@ -649,36 +675,41 @@ class DailyDigest:
             
             if event_type == "TASK_COMPLETE":
                 agent_stats["tasks_completed"] += 1
-                self.stats["task_executions"].append({
+                self.rollups.record(event_type, agent_id, timestamp=now, sample={
                     "timestamp": now.isoformat(),
                     "agent_id": agent_id,
                     "task_id": details.get("task_id")
                 })
             
             elif event_type == "DRIFT":
+                duration = details.get("duration", details.get("drift_duration_seconds", 0))
                 agent_stats["drift_count"] += 1
-                agent_stats["total_drift_time_seconds"] += details.get("duration", details.get("drift_duration_seconds",0))
-                self.stats["drift_events"].append({
+                agent_stats["total_drift_time_seconds"] += duration
+                # Keep the longest drifts as samples
+                self.rollups.record(event_type, agent_id, timestamp=now, value=duration, sample={
                     "timestamp": now.isoformat(),
                     "agent_id": agent_id,
-                    "duration": details.get("duration", 0),
+                    "duration": duration,
                     "drift_type": details.get("drift_type")
                 })
             
             elif event_type == "RECOVERY":
+                success = details.get("recovery_successful", False)
                 agent_stats["recovery_attempts"] += 1
-                if details.get("recovery_successful", False):
+                if success:
                     agent_stats["successful_recoveries"] += 1
-                self.stats["recovery_events"].append({
+                    self.rollups.record("RECOVERY_SUCCESS", agent_id, timestamp=now)
+                self.rollups.record(event_type, agent_id, timestamp=now,
+                                    value=details.get("recovery_time_seconds", 0), sample={
                     "timestamp": now.isoformat(),
                     "agent_id": agent_id,
-                    "success": details.get("recovery_successful", False),
+                    "success": success,
                     "duration": details.get("recovery_time_seconds", 0)
-                })
+                }, score=0)
             
             elif event_type == "ERROR":
                 agent_stats["errors"] += 1
-                self.stats["error_events"].append({
+                self.rollups.record(event_type, agent_id, timestamp=now, sample={
                     "timestamp": now.isoformat(),
                     "agent_id": agent_id,
                     "error_type": details.get("error_type"),
@@ -703,12 +734,12 @@ class DailyDigest:
         current_day_agent_activity = self.stats["agent_activity"] # This is fine for the simulation
 
         total_agents_active = len(current_day_agent_activity)
-        total_drift_events = sum(data["drift_count"] for data in current_day_agent_activity.values())
-        total_recovery_attempts = sum(data["recovery_attempts"] for data in current_day_agent_activity.values())
-        total_successful_recoveries = sum(data["successful_recoveries"] for data in current_day_agent_activity.values())
+        total_drift_events = self.rollups.count("DRIFT")
+        total_recovery_attempts = self.rollups.count("RECOVERY")
+        total_successful_recoveries = self.rollups.count("RECOVERY_SUCCESS")
         recovery_success_rate_str = f"{total_successful_recoveries}/{total_recovery_attempts} ({total_successful_recoveries/total_recovery_attempts*100:.1f}%)" if total_recovery_attempts > 0 else "N/A"
-        total_task_executions = sum(data["tasks_completed"] for data in current_day_agent_activity.values())
-        total_errors = sum(data["errors"] for data in current_day_agent_activity.values())
+        total_task_executions = self.rollups.count("TASK_COMPLETE")
+        total_errors = self.rollups.count("ERROR")
 
         longest_drift_agent = None
         max_drift_time = 0
@@ -763,7 +794,16 @@ class DailyDigest:
             "longest_drift": {"agent": longest_drift_agent, "duration": f"{max_drift_time//60}m {max_drift_time%60}s"} if longest_drift_agent else None,
             "top_performer": {"agent": top_performer_agent, "tasks": max_tasks, "errors": min_errors_for_max_tasks} if top_performer_agent else None,
             "trend_analysis": trend_analysis_results,
-            "agent_activity": current_day_agent_activity 
+            "agent_activity": current_day_agent_activity,
+            "hourly_events": {
+                event_type: self.rollups.series(event_type, bucket_seconds=3600)
+                for event_type in ("TASK_COMPLETE", "DRIFT", "RECOVERY", "ERROR")
+            },
+            "samples": {
+                "longest_drifts": self.rollups.samples("DRIFT"),
+                "recent_errors": self.rollups.samples("ERROR"),
+                "recent_recoveries": self.rollups.samples("RECOVERY")
+            }
         }
 
         markdown_report = f"# 📊 Daily Swarm Digest - {date_to_use.isoformat()}\\n\\n"
@@ -823,6 +863,7 @@ class DailyDigest:
             with open(md_path, "w", encoding='utf-8') as f:
                 f.write(markdown_report)
             logger.info(f"Daily digest Markdown saved to {md_path}")
+            self._update_digest_index(digest_data)
         except IOError as e:
             logger.error(f"Error saving digest files for {date_to_use.isoformat()}: {e}")
             return {}
@@ -839,10 +880,7 @@ class DailyDigest:
 
     def _reset_daily_counters(self):
         logger.info("Resetting daily event counters and agent activity for the new day.")
-        self.stats["drift_events"] = []
-        self.stats["recovery_events"] = []
-        self.stats["error_events"] = []
-        self.stats["task_executions"] = []
+        self.rollups.reset()
         self.stats["agent_activity"] = defaultdict(lambda: {
             "tasks_completed": 0,
             "errors": 0,
@@ -853,35 +891,75 @@ class DailyDigest:
             "successful_recoveries": 0
         })
 
+    @staticmethod
+    def _compact_digest(digest_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Strip a digest down to the fields used for comparisons and trend analysis."""
+        return {
+            key: value for key, value in digest_data.items()
+            if key not in ("trend_analysis", "hourly_events", "samples")
+        }
+
+    def _load_digest_index(self) -> Dict[str, Dict[str, Any]]:
+        """Load the digest index, building it once from daily JSON files if it is missing."""
+        if self._digest_index is not None:
+            return self._digest_index
+
+        index: Dict[str, Dict[str, Any]] = {}
+        if self.index_path.exists():
+            try:
+                with open(self.index_path, "r", encoding='utf-8') as f:
+                    index = json.load(f).get("digests", {})
+                self._digest_index = index
+                return index
+            except Exception as e:
+                logger.warning(f"Could not load digest index {self.index_path}, rebuilding: {e}")
+
+        for file_path in sorted(self.digest_dir.glob("daily-*.json")):
+            try:
+                with open(file_path, "r", encoding='utf-8') as f:
+                    digest = json.load(f)
+                index[digest.get("date", file_path.stem[len("daily-"):])] = self._compact_digest(digest)
+            except Exception as e:
+                logger.warning(f"Could not load or parse historical digest {file_path}: {e}")
+        self._digest_index = index
+        if index:
+            self._save_digest_index()
+        return index
+
+    def _save_digest_index(self) -> None:
+        """Atomically write the digest index."""
+        tmp_path = self.index_path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding='utf-8') as f:
+                json.dump({"version": 1, "digests": self._digest_index}, f)
+            tmp_path.replace(self.index_path)
+        except IOError as e:
+            logger.error(f"Error saving digest index {self.index_path}: {e}")
+
+    def _update_digest_index(self, digest_data: Dict[str, Any]) -> None:
+        """Add or replace one day's entry in the digest index."""
+        index = self._load_digest_index()
+        index[digest_data["date"]] = self._compact_digest(digest_data)
+        self._save_digest_index()
+
     def _load_historical_digests_up_to(self, end_date: date, days_limit: int) -> List[Dict[str, Any]]:
         """Loads historical digests up to (but not including) end_date, for a given number of days."""
+        index = self._load_digest_index()
         historical_digests = []
         for i in range(1, days_limit + 1): # Start from 1 day ago
-            date_to_load = end_date - timedelta(days=i)
-            file_path = self.digest_dir / f"daily-{date_to_load.isoformat()}.json"
-            if file_path.exists():
-                try:
-                    with open(file_path, "r", encoding='utf-8') as f:
-                        historical_digests.append(json.load(f))
-                except Exception as e:
-                    logger.warning(f"Could not load or parse historical digest {file_path}: {e}")
-            # else:
-                # logger.debug(f"Historical digest not found for {date_to_load.isoformat()}")
+            digest = index.get((end_date - timedelta(days=i)).isoformat())
+            if digest is not None:
+                historical_digests.append(digest)
         
         # Sort by date ascending, so oldest is first
         return sorted(historical_digests, key=lambda x: x.get("date", ""))
 
     def _load_previous_digest(self, current_date: date) -> Optional[Dict[str, Any]]:
         """Loads the digest from the day immediately preceding current_date."""
+        if isinstance(current_date, datetime):
+            current_date = current_date.date()
         previous_date = current_date - timedelta(days=1)
-        file_path = self.digest_dir / f"daily-{previous_date.isoformat()}.json"
-        if file_path.exists():
-            try:
-                with open(file_path, "r", encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.warning(f"Could not load or parse previous day's digest {file_path}: {e}")
-        return None
+        return self._load_digest_index().get(previous_date.isoformat())
 
 class AlertManager:
     """Manages system alerts and notifications for Dream.OS."""
@@ -925,8 +1003,13 @@ class AlertManager:
         }
         
         # Initialize alert aggregator
+        aggregation_config = config.get("aggregation", {})
         self.aggregator = AlertAggregator(
-            window_seconds=config.get("aggregation", {}).get("window_seconds", 600)
+            window_seconds=aggregation_config.get("window_seconds", 600),
+            sample_size=aggregation_config.get("sample_size", 5)
+        )
+        self.flush_interval = aggregation_config.get(
+            "flush_interval_seconds", min(60, self.aggregator.window_seconds)
         )
         
         # Initialize daily digest
@@ -936,13 +1019,14 @@ class AlertManager:
         # self._start_cleanup_task()
     
     async def _cleanup_loop_coroutine(self):
-        """Background task to clean up old alert groups."""
+        """Background task that closes elapsed aggregation windows and sends their summaries."""
         while True:
             try:
-                self.aggregator.cleanup_old_groups()
-                await asyncio.sleep(60)  # Run every minute
+                for aggregated in self.aggregator.flush_expired():
+                    await self._send_aggregated_alert(aggregated)
             except Exception as e:
                 logger.error(f"Error in alert cleanup task: {e}")
+            await asyncio.sleep(self.flush_interval)
 
     async def maybe_start_cleanup_task(self):
         if not self.cleanup_task_started:
@@ -1196,17 +1280,17 @@ class AlertManager:
         return {
             "active_agents": len(self.digest.stats["agent_activity"]),
             "events_today": {
-                "drift": len(self.digest.stats["drift_events"]),
-                "recovery": len(self.digest.stats["recovery_events"]),
-                "error": len(self.digest.stats["error_events"]),
-                "tasks": len(self.digest.stats["task_executions"])
+                "drift": self.digest.rollups.count("DRIFT"),
+                "recovery": self.digest.rollups.count("RECOVERY"),
+                "error": self.digest.rollups.count("ERROR"),
+                "tasks": self.digest.rollups.count("TASK_COMPLETE")
             },
             "agent_stats": {
                 agent_id: {
                     "tasks": stats["tasks_completed"],
                     "errors": stats["errors"],
                     "drift_count": stats["drift_count"],
-                    "total_drift_time": stats["total_drift_time"]
+                    "total_drift_time": stats["total_drift_time_seconds"]
                 }
                 for agent_id, stats in self.digest.stats["agent_activity"].items()
             }
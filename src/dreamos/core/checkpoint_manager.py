@@ -15,6 +15,8 @@ import shutil
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any
 
+from dreamos.core.checkpoint_store import CheckpointStore
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, 
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -47,8 +49,17 @@ class CheckpointManager:
         self.agent_id = agent_id
         self.checkpoint_dir = "runtime/agent_comms/checkpoints"
         os.makedirs(self.checkpoint_dir, exist_ok=True)
+        self._store = None
         logger.info(f"Initialized CheckpointManager for {agent_id}")
     
+    @property
+    def store(self) -> CheckpointStore:
+        """Chunk store and index for the current checkpoint directory."""
+        if self._store is None or self._store.checkpoint_dir != self.checkpoint_dir:
+            os.makedirs(self.checkpoint_dir, exist_ok=True)
+            self._store = CheckpointStore(self.checkpoint_dir, self.agent_id)
+        return self._store
+    
     def create_checkpoint(self, checkpoint_type: str = "routine") -> str:
         """
         Create a checkpoint of the agent's current state.
@@ -57,11 +68,10 @@ class CheckpointManager:
             checkpoint_type: Type of checkpoint ("routine", "pre_operation", "recovery")
             
         Returns:
-            Path to the created checkpoint file
+            Path to the created checkpoint manifest
         """
         timestamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
         filename = f"{self.agent_id}_{timestamp}_{checkpoint_type}.checkpoint"
-        path = os.path.join(self.checkpoint_dir, filename)
         
         # Collect agent state
         state = {
@@ -80,8 +90,8 @@ class CheckpointManager:
             "state": state
         }
         
-        with open(path, 'w') as f:
-            json.dump(checkpoint_data, f, indent=2)
+        # Only sub-structures that changed since earlier checkpoints are written
+        path = self.store.save(filename, checkpoint_data)
         
         logger.info(f"Created {checkpoint_type} checkpoint at {path}")
         
@@ -101,8 +111,7 @@ class CheckpointManager:
             True if successful, False otherwise
         """
         try:
-            with open(checkpoint_path, 'r') as f:
-                checkpoint_data = json.load(f)
+            checkpoint_data = self.store.load(checkpoint_path)
                 
             # Validate checkpoint belongs to this agent
             if checkpoint_data["agent_id"] != self.agent_id:
@@ -130,14 +139,11 @@ class CheckpointManager:
         Returns:
             Path to the latest checkpoint or None if not found
         """
-        checkpoints = self._list_checkpoints(checkpoint_type)
-        if not checkpoints:
+        latest = self.store.latest(checkpoint_type)
+        if latest is None:
             logger.warning(f"No {checkpoint_type} checkpoints found for {self.agent_id}")
             return None
         
-        # Sort by timestamp (which is part of the filename)
-        sorted_checkpoints = sorted(checkpoints)
-        latest = sorted_checkpoints[-1]
         logger.info(f"Found latest {checkpoint_type} checkpoint: {latest}")
         return latest
     
@@ -318,18 +324,13 @@ class CheckpointManager:
             checkpoint_type: Type of checkpoint to filter by
             
         Returns:
-            List of checkpoint file paths
+            List of checkpoint file paths, oldest first
         """
-        checkpoints = []
         try:
-            for filename in os.listdir(self.checkpoint_dir):
-                if filename.startswith(self.agent_id) and filename.endswith(".checkpoint"):
-                    if checkpoint_type is None or f"_{checkpoint_type}." in filename:
-                        checkpoints.append(os.path.join(self.checkpoint_dir, filename))
+            return self.store.list(checkpoint_type)
         except Exception as e:
             logger.error(f"Error listing checkpoints: {str(e)}")
-            
-        return checkpoints
+            return []
     
     def _apply_retention_policy(self, checkpoint_type: str) -> None:
         """
@@ -341,16 +342,9 @@ class CheckpointManager:
         try:
             # Retention policies based on checkpoint type
             if checkpoint_type == "routine":
-                # Keep only the last 3 routine checkpoints
-                routine_checkpoints = self._list_checkpoints("routine")
-                if len(routine_checkpoints) > 3:
-                    # Sort by creation time (oldest first)
-                    sorted_checkpoints = sorted(routine_checkpoints)
-                    # Remove oldest checkpoints (everything except the 3 newest)
-                    for checkpoint in sorted_checkpoints[:-3]:
-                        if os.path.exists(checkpoint):
-                            os.remove(checkpoint)
-                            logger.info(f"Removed old routine checkpoint: {checkpoint}")
+                # Keep only the last 3 routine checkpoints; unshared chunks go with them
+                for checkpoint in self.store.prune("routine", keep=3):
+                    logger.info(f"Removed old routine checkpoint: {checkpoint}")
             
             # For recovery checkpoints, we keep them for 7 days
             # This would require a date-based cleanup which we'll implement in a future update
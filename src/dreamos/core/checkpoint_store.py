@@ -0,0 +1,309 @@
+"""
+Checkpoint Store
+
+Content-addressed storage for agent checkpoints. Each checkpoint is a small JSON
+manifest (the ``.checkpoint`` file) whose state sections reference zlib-compressed
+chunks by SHA-256, so sub-structures that did not change between checkpoints are
+written once and shared. A per-agent index tracks manifests in order and chunk
+reference counts, so lookup and retention never list or sort the directory.
+"""
+
+import hashlib
+import json
+import os
+import re
+import zlib
+from bisect import insort
+from typing import Any, Dict, List, Optional, Set
+
+MANIFEST_VERSION = "2.0"
+
+# Sub-structures smaller than this are stored inline in their parent
+MIN_CHUNK_BYTES = 512
+# Long lists are split into fixed runs, so appending only writes the last run
+LIST_RUN = 64
+
+_MARKERS = ("$ref", "$runs", "$dict")
+
+# {agent_id}_{timestamp}_{type}.checkpoint, where the timestamp may carry
+# numeric suffixes and the type may itself contain underscores
+_FILENAME_TYPE = re.compile(r"_\d+(?:_\d+)*_(?P<type>[^\d].*)\.checkpoint$")
+
+
+def _canonical(value: Any) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+class CheckpointStore:
+    """
+    Content-addressed chunk store and checkpoint index for one agent.
+
+    Layout under ``checkpoint_dir``:
+        {agent_id}_{timestamp}_{type}.checkpoint   manifest per checkpoint
+        objects/{agent_id}/{hh}/{sha256}.z         compressed chunks
+        objects/{agent_id}/index.json              manifest order and chunk refcounts
+    """
+
+    def __init__(self, checkpoint_dir: str, agent_id: str):
+        """
+        Initialize the store.
+
+        Args:
+            checkpoint_dir: Directory holding checkpoint manifests
+            agent_id: Agent whose checkpoints this store manages
+        """
+        self.checkpoint_dir = checkpoint_dir
+        self.agent_id = agent_id
+        self.objects_dir = os.path.join(checkpoint_dir, "objects", agent_id)
+        self.index_path = os.path.join(self.objects_dir, "index.json")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.index = self._load_index()
+
+    # Chunks
+
+    def _chunk_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.z")
+
+    def _put(self, node: Any, refs: Set[str]) -> str:
+        """Store an encoded node as a chunk unless it already exists."""
+        data = _canonical(node)
+        digest = hashlib.sha256(data).hexdigest()
+        refs.add(digest)
+        path = self._chunk_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            _atomic_write(path, zlib.compress(data, 1))
+        return digest
+
+    def _get(self, digest: str) -> Any:
+        with open(self._chunk_path(digest), "rb") as f:
+            return json.loads(zlib.decompress(f.read()))
+
+    def _encode(self, value: Any, refs: Set[str]) -> Any:
+        """Replace large sub-structures of value with chunk references."""
+        if isinstance(value, dict):
+            node = {key: self._encode(item, refs) for key, item in value.items()}
+            if len(node) == 1 and next(iter(node)) in _MARKERS:
+                node = {"$dict": node}
+        elif isinstance(value, list):
+            if len(value) > LIST_RUN:
+                runs = [
+                    self._put([self._encode(item, refs) for item in value[i:i + LIST_RUN]], refs)
+                    for i in range(0, len(value), LIST_RUN)
+                ]
+                return {"$runs": runs}
+            node = [self._encode(item, refs) for item in value]
+        else:
+            return value
+
+        if len(_canonical(node)) < MIN_CHUNK_BYTES:
+            return node
+        return {"$ref": self._put(node, refs)}
+
+    def _decode(self, node: Any) -> Any:
+        """Inverse of _encode: resolve chunk references."""
+        if isinstance(node, list):
+            return [self._decode(item) for item in node]
+        if not isinstance(node, dict):
+            return node
+        if len(node) == 1:
+            marker, inner = next(iter(node.items()))
+            if marker == "$ref":
+                return self._decode(self._get(inner))
+            if marker == "$runs":
+                items = []
+                for digest in inner:
+                    items.extend(self._decode(self._get(digest)))
+                return items
+            if marker == "$dict":
+                return {key: self._decode(item) for key, item in inner.items()}
+        return {key: self._decode(item) for key, item in node.items()}
+
+    # Index
+
+    def _dir_mtime(self) -> int:
+        return os.stat(self.checkpoint_dir).st_mtime_ns
+
+    def _load_index(self) -> Dict[str, Any]:
+        try:
+            with open(self.index_path, "r") as f:
+                index = json.load(f)
+            if index.get("version") == MANIFEST_VERSION:
+                return index
+        except (OSError, ValueError):
+            pass
+        # Forces a directory scan on first use
+        return {"version": MANIFEST_VERSION, "dir_mtime": None,
+                "checkpoints": {}, "manifests": {}, "refs": {}}
+
+    def _save_index(self) -> None:
+        self.index["dir_mtime"] = self._dir_mtime()
+        _atomic_write(self.index_path, json.dumps(self.index).encode("utf-8"))
+
+    def _sync(self) -> None:
+        """Pick up manifests added or removed outside this store.
+
+        Only runs when the checkpoint directory changed since the index was
+        last saved, so steady-state lookups cost a single stat.
+        """
+        if self.index["dir_mtime"] == self._dir_mtime():
+            return
+
+        prefix = f"{self.agent_id}_"
+        on_disk = {
+            filename for filename in os.listdir(self.checkpoint_dir)
+            if filename.startswith(prefix) and filename.endswith(".checkpoint")
+        }
+        indexed = set(self.index["manifests"])
+        for filename in indexed - on_disk:
+            self._forget(filename)
+        for filename in on_disk - indexed:
+            chunks: List[str] = []
+            checkpoint_type = self._checkpoint_type(filename)
+            try:
+                with open(os.path.join(self.checkpoint_dir, filename), "r") as f:
+                    manifest = json.load(f)
+                chunks = manifest.get("chunks", [])
+                checkpoint_type = manifest.get("checkpoint_type", checkpoint_type)
+            except (OSError, ValueError):
+                pass
+            self._remember(filename, checkpoint_type, chunks)
+        self._save_index()
+
+    def _checkpoint_type(self, filename: str) -> str:
+        match = _FILENAME_TYPE.search(filename[len(self.agent_id):])
+        return match.group("type") if match else filename[:-len(".checkpoint")].rsplit("_", 1)[-1]
+
+    def _retain(self, chunks: List[str]) -> None:
+        refs = self.index["refs"]
+        for digest in chunks:
+            refs[digest] = refs.get(digest, 0) + 1
+
+    def _release(self, chunks: List[str]) -> None:
+        """Drop references, deleting chunks nothing else uses."""
+        refs = self.index["refs"]
+        for digest in chunks:
+            refs[digest] = refs.get(digest, 1) - 1
+            if refs[digest] <= 0:
+                del refs[digest]
+                try:
+                    os.remove(self._chunk_path(digest))
+                except FileNotFoundError:
+                    pass
+
+    def _remember(self, filename: str, checkpoint_type: str, chunks: List[str]) -> None:
+        """Index a manifest; a re-used name replaces the previous entry."""
+        previous = self.index["manifests"].get(filename)
+        if previous is not None:
+            self.index["checkpoints"][previous["type"]].remove(filename)
+        insort(self.index["checkpoints"].setdefault(checkpoint_type, []), filename)
+        self.index["manifests"][filename] = {"type": checkpoint_type, "chunks": chunks}
+        # Retain before releasing so chunks shared with the old entry survive
+        self._retain(chunks)
+        if previous is not None:
+            self._release(previous["chunks"])
+
+    def _forget(self, filename: str) -> None:
+        entry = self.index["manifests"].pop(filename, None)
+        if entry is None:
+            return
+        self.index["checkpoints"][entry["type"]].remove(filename)
+        self._release(entry["chunks"])
+
+    # Checkpoints
+
+    def save(self, filename: str, checkpoint_data: Dict[str, Any]) -> str:
+        """
+        Write a checkpoint manifest, storing only chunks not already present.
+
+        Args:
+            filename: Manifest file name inside the checkpoint directory
+            checkpoint_data: Checkpoint dict with a "state" mapping
+
+        Returns:
+            Path to the manifest
+        """
+        self._sync()
+        refs: Set[str] = set()
+        state = {
+            section: self._encode(value, refs)
+            for section, value in checkpoint_data["state"].items()
+        }
+        manifest = dict(checkpoint_data, version=MANIFEST_VERSION, state=state, chunks=sorted(refs))
+
+        path = os.path.join(self.checkpoint_dir, filename)
+        _atomic_write(path, json.dumps(manifest, indent=2).encode("utf-8"))
+        self._remember(filename, checkpoint_data.get("checkpoint_type", self._checkpoint_type(filename)),
+                       manifest["chunks"])
+        self._save_index()
+        return path
+
+    def load(self, path: str) -> Dict[str, Any]:
+        """
+        Read a checkpoint and resolve its chunks into the full state.
+
+        Args:
+            path: Path to a manifest (or a pre-2.0 full checkpoint file)
+
+        Returns:
+            Checkpoint dict with the complete "state"
+        """
+        with open(path, "r") as f:
+            checkpoint_data = json.load(f)
+        if checkpoint_data.get("version") != MANIFEST_VERSION:
+            return checkpoint_data
+        checkpoint_data["state"] = self._decode(checkpoint_data["state"])
+        checkpoint_data.pop("chunks", None)
+        return checkpoint_data
+
+    def list(self, checkpoint_type: Optional[str] = None) -> List[str]:
+        """
+        List checkpoint paths oldest first, optionally filtered by type.
+
+        Args:
+            checkpoint_type: Type of checkpoint to filter by
+
+        Returns:
+            List of manifest paths
+        """
+        self._sync()
+        checkpoints = self.index["checkpoints"]
+        if checkpoint_type is None:
+            filenames = sorted(name for names in checkpoints.values() for name in names)
+        else:
+            filenames = checkpoints.get(checkpoint_type, [])
+        return [os.path.join(self.checkpoint_dir, filename) for filename in filenames]
+
+    def latest(self, checkpoint_type: str) -> Optional[str]:
+        """Return the newest checkpoint path of a type, or None."""
+        checkpoints = self.list(checkpoint_type)
+        return checkpoints[-1] if checkpoints else None
+
+    def prune(self, checkpoint_type: str, keep: int) -> List[str]:
+        """
+        Delete all but the newest ``keep`` checkpoints of a type.
+
+        Args:
+            checkpoint_type: Type of checkpoint
+            keep: Number of checkpoints to keep
+
+        Returns:
+            Paths of the deleted manifests
+        """
+        expired = self.list(checkpoint_type)[:-keep] if keep else self.list(checkpoint_type)
+        for path in expired:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._forget(os.path.basename(path))
+        if expired:
+            self._save_index()
+        return expired
@@ -7,19 +7,15 @@ centralized access to application configuration.
 """
 
 # core/config.py
-# EDIT START: Add print at the very beginning of the file
-print("DEBUG_CONFIG: Top of dreamos.core.config.py")
-# EDIT END
+import hashlib
+import json
 import logging
-
-print("DEBUG_CONFIG: Imported logging")
 import os
-
-print("DEBUG_CONFIG: Imported os")
 import threading
+import time
 from enum import Enum
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
 
 import yaml
 from pydantic import (
@@ -29,11 +25,14 @@ from pydantic import (
 )
 from pydantic_settings import (
     BaseSettings,
+    DotEnvSettingsSource,
+    EnvSettingsSource,
+    InitSettingsSource,
     PydanticBaseSettingsSource,
+    SecretsSettingsSource,
     SettingsConfigDict,
 )
 
-print("DEBUG_CONFIG: Before importing .errors", flush=True)
 # Adjusted imports to reflect new location within core
 # REMOVED: Unused AgentBus import
 # from .coordination.agent_bus import AgentBus
@@ -46,7 +45,6 @@ from .task_monitoring_config import TaskMonitoringConfig
 
 # EDIT: Add DreamscapeConfig import here
 # from dreamscape.config import DreamscapeConfig # Temporarily commented out for diagnosis
-print("DEBUG_CONFIG: DreamscapeConfig import line processed (commented out)")
 
 # Guarded import for GuiAutomationConfig
 if TYPE_CHECKING:
@@ -60,12 +58,18 @@ logger = logging.getLogger(__name__)
 
 # ADDED: Global config variable and lock with forward reference for AppConfig
 _config: Optional["AppConfig"] = None
-_config_lock = threading.Lock()
+_config_lock = threading.RLock()  # Re-entrant: get_config reloads through AppConfig.load
 _logging_configured = False  # Flag to prevent duplicate logging setup
+# Resolved YAML path of the loaded config and the input mtimes it was built from
+_config_source: Optional[str] = None
+_config_inputs: Dict[str, Optional[int]] = {}
+_RELOAD_CHECK_INTERVAL = 1.0  # Seconds between hot-reload mtime checks
+_last_reload_check = 0.0
+# Set while validating a snapshot so AppConfig is built from init kwargs only
+_snapshot_loading = threading.local()
 
 
 # --- Function to find project root robustly ---
-print("DEBUG_CONFIG: Before find_project_root_marker definition")
 
 
 def find_project_root_marker(marker: str = ".git") -> Path:
@@ -85,39 +89,15 @@ def find_project_root_marker(marker: str = ".git") -> Path:
     return Path.cwd()  # Or raise FileNotFoundError("Project root marker not found.")
 
 
-print("DEBUG_CONFIG: After find_project_root_marker definition")
-
-
 # --- Determine Project Root --- #
-print("DEBUG_CONFIG: Before PROJECT_ROOT determination")
 try:
     PROJECT_ROOT = find_project_root_marker()
-    # EDIT START: Add print after PROJECT_ROOT determination
-    print(
-        f"DEBUG: dreamos.core.config.py - PROJECT_ROOT determined: {PROJECT_ROOT}",
-        flush=True,
-    )
-    # EDIT END
 except FileNotFoundError as e:
     logger.error(
         f"Failed to find project root automatically: {e}. Falling back to relative path."
     )
     PROJECT_ROOT = Path(__file__).resolve().parents[3]
-    # EDIT START: Add print after fallback PROJECT_ROOT determination
-    print(
-        f"DEBUG: dreamos.core.config.py - PROJECT_ROOT fallback: {PROJECT_ROOT}",
-        flush=True,
-    )
-    # EDIT END
-print("DEBUG_CONFIG: After PROJECT_ROOT determination, before DEFAULT_CONFIG_PATH")
 DEFAULT_CONFIG_PATH = PROJECT_ROOT / "runtime" / "config" / "config.yaml"
-print(f"DEBUG_CONFIG: DEFAULT_CONFIG_PATH set to {DEFAULT_CONFIG_PATH}")
-# EDIT START: Add print after DEFAULT_CONFIG_PATH determination
-print(
-    f"DEBUG: dreamos.core.config.py - DEFAULT_CONFIG_PATH: {DEFAULT_CONFIG_PATH}",
-    flush=True,
-)
-# EDIT END
 
 # --- Pydantic Models for Config Structure ---
 
@@ -125,9 +105,6 @@ print(
 # REMOVED: from dreamscape.config import DreamscapeConfig # Moved later
 
 
-print("DEBUG_CONFIG: Before LoggingConfig definition")
-
-
 class LoggingConfig(BaseModel):
     level: str = Field("INFO", description="Logging level (e.g., DEBUG, INFO, WARNING)")
     log_file: Optional[str] = Field(
@@ -159,9 +136,6 @@ class LoggingConfig(BaseModel):
             return default_path
 
 
-print("DEBUG_CONFIG: After LoggingConfig definition, before PathsConfig")
-
-
 class PathsConfig(BaseModel):
     runtime: Path = Field(
         PROJECT_ROOT / "runtime", description="Path to the runtime directory"
@@ -262,9 +236,6 @@ class PathsConfig(BaseModel):
     # NOTE: GUI coords input path is handled under GuiAutomationConfig below
 
 
-print("DEBUG_CONFIG: After PathsConfig definition, before OpenAIConfig")
-
-
 class OpenAIConfig(BaseModel):
     api_key: Optional[SecretStr] = Field(
         None, alias="openai_api_key", description="OpenAI API Key"
@@ -531,9 +502,6 @@ class YamlConfigSettingsSource(PydanticBaseSettingsSource):
         return self._load_config()
 
 
-print("DEBUG_CONFIG: After YamlConfigSettingsSource, before load_config function")
-
-
 # --- End Moved YAML Source Class Definition ---
 
 
@@ -672,7 +640,6 @@ class OperatingMode(str, Enum):
 
 
 # --- AppConfig Definition ---
-print("DEBUG_CONFIG: Before AppConfig class definition")
 
 
 class AlertingConfig(BaseModel):
@@ -725,8 +692,6 @@ class AlertingConfig(BaseModel):
 class AppConfig(BaseSettings):
     """Main application configuration loaded from environment variables and/or config file."""
 
-    print("DEBUG_CONFIG: Inside AppConfig class body", flush=True)
-
     # MOVED all custom type imports here
     # Imports are now handled outside class or at bottom of file
 
@@ -808,6 +773,10 @@ class AppConfig(BaseSettings):
         dotenv_settings: PydanticBaseSettingsSource,
         file_secret_settings: PydanticBaseSettingsSource,
     ) -> tuple[PydanticBaseSettingsSource, ...]:
+        # A resolved snapshot already merged every source
+        if getattr(_snapshot_loading, "active", False):
+            return (init_settings,)
+
         # Determine the config file path (from env var or default)
         # Ensure PROJECT_ROOT is available at this point
         config_file_env = os.getenv(f"{cls.model_config['env_prefix']}CONFIG_PATH")
@@ -830,75 +799,60 @@ class AppConfig(BaseSettings):
         )
 
     @classmethod
-    def load(cls, config_file: Optional[str] = None) -> "AppConfig":
-        global _config
+    def load(
+        cls, config_file: Optional[str] = None, use_snapshot: bool = True
+    ) -> "AppConfig":
+        """Load, resolve and install the global configuration.
+
+        The resolved result is cached in a snapshot file next to the YAML file,
+        keyed by the contents of every input. When the key matches, the
+        snapshot is validated straight into the model and path resolution is
+        skipped. Secret fields are never written to the snapshot; when the
+        config has any, they are read from the settings sources again.
+
+        Args:
+            config_file: YAML file to load (defaults to DREAMOS_CONFIG_PATH or
+                DEFAULT_CONFIG_PATH)
+            use_snapshot: Read and write the resolved-config snapshot
+        """
+        global _config, _config_source, _config_inputs
         global _logging_configured  # Access the global flag
 
         with _config_lock:
             # If a specific config_file is provided, set it as an environment variable
             # so that settings_customise_sources can pick it up.
             # This allows overriding the default config path for this specific load() call.
-            original_env_config_path = os.getenv(
-                f"{cls.model_config['env_prefix']}CONFIG_PATH"
-            )
+            config_env_key = f"{cls.model_config['env_prefix']}CONFIG_PATH"
+            original_env_config_path = os.getenv(config_env_key)
             if config_file:
-                os.environ[f"{cls.model_config['env_prefix']}CONFIG_PATH"] = str(
-                    Path(config_file).resolve()
-                )
+                os.environ[config_env_key] = str(Path(config_file).resolve())
             elif original_env_config_path:  # If env var was already set, respect it
-                os.environ[f"{cls.model_config['env_prefix']}CONFIG_PATH"] = str(
+                os.environ[config_env_key] = str(
                     Path(original_env_config_path).resolve()
                 )
             else:  # Otherwise, ensure it's set to the default for this load operation
-                os.environ[f"{cls.model_config['env_prefix']}CONFIG_PATH"] = str(
-                    DEFAULT_CONFIG_PATH.resolve()
-                )
+                os.environ[config_env_key] = str(DEFAULT_CONFIG_PATH.resolve())
+            config_path = Path(os.environ[config_env_key])
 
             try:
-                config_env_key = f"{cls.model_config['env_prefix']}CONFIG_PATH"
-                logger.info(f"Loading AppConfig from: {os.getenv(config_env_key)}")
-                instance = cls()  # This will trigger Pydantic's loading logic
-                instance.project_root_internal = (
-                    PROJECT_ROOT  # Set the resolved project root
-                )
-
-                # Perform path resolutions after loading
-                instance.paths.runtime = (
-                    instance.project_root_internal / instance.paths.runtime
-                ).resolve()
-                instance.paths.logs = (
-                    instance.project_root_internal / instance.paths.logs
-                ).resolve()
-
-                # EDIT START: Resolve all other optional paths if they are set
-                for field_name, field_type in instance.paths.model_fields.items():
-                    if field_name in [
-                        "runtime",
-                        "logs",
-                        "project_root",
-                        "task_schema",
-                    ]:  # Already handled or absolute
-                        continue
-                    path_value = getattr(instance.paths, field_name)
-                    if path_value and isinstance(
-                        path_value, (str, Path)
-                    ):  # Check if it's a path type
-                        original_path_str = str(path_value)  # For logging
-                        if isinstance(path_value, str):  # If loaded as string from YAML
-                            path_value = Path(path_value)
-
-                        if not path_value.is_absolute():
-                            resolved_path = (
-                                instance.project_root_internal / path_value
-                            ).resolve()
-                            setattr(instance.paths, field_name, resolved_path)
-                            logger.debug(
-                                f"Resolved relative path for {field_name} (originally '{original_path_str}'): {resolved_path}"
-                            )
-                        # If it's already a Path object and absolute (like our new defaults), no change needed by this if block.
-                # EDIT END
+                inputs = _input_mtimes(config_path)
+                key = _snapshot_key(config_path) if use_snapshot else None
+                instance = _read_snapshot(cls, config_path, key) if key else None
+                if instance is None:
+                    logger.info(f"Loading AppConfig from: {config_path}")
+                    instance = cls()  # This will trigger Pydantic's loading logic
+                    instance.project_root_internal = (
+                        PROJECT_ROOT  # Set the resolved project root
+                    )
+                    _resolve_paths(instance)
+                    if key:
+                        _write_snapshot(instance, config_path, key)
+                else:
+                    logger.debug(f"Loaded AppConfig snapshot for: {config_path}")
 
                 _config = instance
+                _config_source = str(config_path)
+                _config_inputs = inputs
 
                 # Initialize logging only once after config is loaded
                 # and only if it hasn't been configured yet by an external entry point.
@@ -915,22 +869,216 @@ class AppConfig(BaseSettings):
                 return instance
             except Exception as e:
                 # Log the error with traceback for detailed debugging
-                config_env_key = f"{cls.model_config['env_prefix']}CONFIG_PATH"
                 logger.critical(
-                    f"Failed to load config from {os.getenv(config_env_key)}: {e}",
+                    f"Failed to load config from {config_path}: {e}",
                     exc_info=True,
                 )
                 raise appconfig_errors.ConfigurationError(
-                    f"Failed to load application configuration from {os.getenv(config_env_key)}: {e}"
+                    f"Failed to load application configuration from {config_path}: {e}"
                 ) from e
             finally:
                 # Restore original environment variable if it was changed
                 if original_env_config_path:
-                    os.environ[f"{cls.model_config['env_prefix']}CONFIG_PATH"] = (
-                        original_env_config_path
-                    )
-                elif config_file:  # If we set it and there wasn't one before
-                    del os.environ[f"{cls.model_config['env_prefix']}CONFIG_PATH"]
+                    os.environ[config_env_key] = original_env_config_path
+                else:  # If we set it and there wasn't one before
+                    os.environ.pop(config_env_key, None)
+
+
+def _resolve_paths(instance: AppConfig) -> None:
+    """Resolve relative entries of ``instance.paths`` against the project root."""
+    instance.paths.runtime = (
+        instance.project_root_internal / instance.paths.runtime
+    ).resolve()
+    instance.paths.logs = (instance.project_root_internal / instance.paths.logs).resolve()
+
+    for field_name in type(instance.paths).model_fields:
+        if field_name in [
+            "runtime",
+            "logs",
+            "project_root",
+            "task_schema",
+        ]:  # Already handled or absolute
+            continue
+        path_value = getattr(instance.paths, field_name)
+        if path_value and isinstance(path_value, (str, Path)):  # Check if it's a path type
+            original_path_str = str(path_value)  # For logging
+            if isinstance(path_value, str):  # If loaded as string from YAML
+                path_value = Path(path_value)
+
+            if not path_value.is_absolute():
+                resolved_path = (instance.project_root_internal / path_value).resolve()
+                setattr(instance.paths, field_name, resolved_path)
+                logger.debug(
+                    f"Resolved relative path for {field_name} (originally '{original_path_str}'): {resolved_path}"
+                )
+
+
+# --- Resolved config snapshot ---
+
+SNAPSHOT_VERSION = 1
+# Files defining the models; editing them changes what a snapshot must contain
+_SCHEMA_FILES = (
+    Path(__file__),
+    Path(__file__).with_name("task_monitoring_config.py"),
+)
+_DOTENV_PATH = Path(".env")  # Relative to the working directory, as pydantic reads it
+
+
+def _snapshot_path(config_path: Path) -> Path:
+    return config_path.with_name(f".{config_path.name}.snapshot.json")
+
+
+def _input_mtimes(config_path: Path) -> Dict[str, Optional[int]]:
+    """Return the mtimes of the files a loaded config depends on."""
+    mtimes: Dict[str, Optional[int]] = {}
+    for path in (config_path, _DOTENV_PATH):
+        try:
+            mtimes[str(path)] = path.stat().st_mtime_ns
+        except OSError:
+            mtimes[str(path)] = None
+    return mtimes
+
+
+def _snapshot_key(config_path: Path) -> str:
+    """Hash every input that affects the resolved config.
+
+    Covers the YAML and .env contents, the DREAMOS_* environment, the project
+    root and the model definitions.
+    """
+    digest = hashlib.sha256(f"{SNAPSHOT_VERSION}\0{PROJECT_ROOT}\0{config_path}".encode())
+    for path in (config_path, _DOTENV_PATH):
+        try:
+            digest.update(path.read_bytes())
+        except OSError:
+            digest.update(b"<missing>")
+        digest.update(b"\0")
+    for path in _SCHEMA_FILES:
+        try:
+            stat = path.stat()
+            digest.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size}\0".encode())
+        except OSError:
+            pass
+    for name in sorted(os.environ):
+        if name.startswith(AppConfig.model_config["env_prefix"]):
+            digest.update(f"{name}={os.environ[name]}\0".encode())
+    return digest.hexdigest()
+
+
+def _snapshot_default(value: Any) -> Any:
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    # Secrets outside plain model nesting are not stripped by _secret_paths;
+    # refuse to write the snapshot rather than store them
+    raise TypeError(f"Cannot serialize {type(value).__name__} in config snapshot")
+
+
+def _secret_paths(
+    model: BaseModel, prefix: Tuple[str, ...] = ()
+) -> Iterator[Tuple[str, ...]]:
+    """Yield the by-alias key paths of every set SecretStr field in ``model``."""
+    for name, field in type(model).model_fields.items():
+        if field.exclude:
+            continue
+        value = getattr(model, name)
+        path = prefix + (field.alias or name,)
+        if isinstance(value, SecretStr):
+            yield path
+        elif isinstance(value, BaseModel):
+            yield from _secret_paths(value, path)
+
+
+def _source_values(cls: type[AppConfig]) -> Dict[str, Any]:
+    """Merge the raw (unvalidated) settings sources in AppConfig's precedence order."""
+    sources = cls.settings_customise_sources(
+        cls,
+        init_settings=InitSettingsSource(cls, init_kwargs={}),
+        env_settings=EnvSettingsSource(cls),
+        dotenv_settings=DotEnvSettingsSource(cls),
+        file_secret_settings=SecretsSettingsSource(cls),
+    )
+    merged: Dict[str, Any] = {}
+    for source in reversed(sources):  # Earlier sources take precedence
+        _deep_merge(merged, source())
+    return merged
+
+
+def _deep_merge(target: Dict[str, Any], update: Dict[str, Any]) -> None:
+    for key, value in update.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _deep_merge(target[key], value)
+        else:
+            target[key] = value
+
+
+def _read_snapshot(
+    cls: type[AppConfig], config_path: Path, key: str
+) -> Optional[AppConfig]:
+    """Return the snapshotted config if its key matches, else None.
+
+    Secret fields are not in the snapshot; the ones it lists are looked up in
+    the YAML, env and .env sources again and merged into the data.
+    """
+    try:
+        with open(_snapshot_path(config_path), "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        if snapshot.get("key") != key:
+            return None
+        data = snapshot["data"]
+        secret_paths = snapshot.get("secrets", [])
+        if secret_paths:
+            sources = _source_values(cls)
+            for path in secret_paths:
+                value: Any = sources
+                for part in path:
+                    value = value.get(part) if isinstance(value, dict) else None
+                if value is None:
+                    return None  # Moved to a source we can't re-read; do a full load
+                target = data
+                for part in path[:-1]:
+                    target = target.setdefault(part, {})
+                target[path[-1]] = value
+        # The data is already resolved, so skip the YAML, env and .env sources
+        _snapshot_loading.active = True
+        try:
+            instance = cls.model_validate(data)
+        finally:
+            _snapshot_loading.active = False
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        if not isinstance(e, FileNotFoundError):
+            logger.debug(f"Ignoring unusable config snapshot for {config_path}: {e}")
+        return None
+    instance.project_root_internal = PROJECT_ROOT
+    return instance
+
+
+def _write_snapshot(instance: AppConfig, config_path: Path, key: str) -> None:
+    """Persist the resolved config without its secret fields."""
+    path = _snapshot_path(config_path)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        data = instance.model_dump(by_alias=True)
+        secret_paths = list(_secret_paths(instance))
+        for secret_path in secret_paths:
+            parent = data
+            for part in secret_path[:-1]:
+                parent = parent[part]
+            del parent[secret_path[-1]]
+        text = json.dumps(
+            {"key": key, "data": data, "secrets": secret_paths},
+            default=_snapshot_default,
+        )
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(temp_path, path)
+    except (OSError, TypeError, KeyError) as e:
+        logger.debug(f"Could not write config snapshot {path}: {e}")
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
 
 
 def setup_logging(config: AppConfig):
@@ -994,25 +1142,48 @@ def setup_logging(config: AppConfig):
 
 def load_config(config_file: Optional[str | Path] = None) -> AppConfig:
     """Loads application configuration using the AppConfig.load method."""
-    global _config
     if _config is None or config_file:  # Reload if a specific file is given
-        _config = AppConfig.load(config_file=str(config_file) if config_file else None)
+        AppConfig.load(config_file=str(config_file) if config_file else None)
     if _config is None:  # Should not happen if load was successful
         raise appconfig_errors.ConfigurationError("Configuration could not be loaded.")
     return _config
 
 
+def _inputs_changed() -> bool:
+    return _config_source is not None and (
+        _input_mtimes(Path(_config_source)) != _config_inputs
+    )
+
+
 def get_config() -> AppConfig:
-    """Returns the global AppConfig instance, loading it if necessary."""
-    global _config
-    if _config is None:
-        logger.debug("Global config not yet loaded. Loading default AppConfig now.")
-        _config = AppConfig.load()  # Loads default or from DREAMOS_CONFIG_PATH
-    if _config is None:  # Should not happen
-        raise appconfig_errors.ConfigurationError(
-            "Configuration could not be retrieved or loaded."
-        )
-    return _config
+    """Returns the global AppConfig instance, loading it on first use.
+
+    Thread-safe. At most once per ``_RELOAD_CHECK_INTERVAL`` seconds the
+    YAML and .env mtimes are checked, and the config is reloaded from the same
+    file when either changed.
+    """
+    global _last_reload_check
+    config = _config
+    if config is not None:
+        now = time.monotonic()
+        if now - _last_reload_check < _RELOAD_CHECK_INTERVAL:
+            return config
+        _last_reload_check = now
+        if not _inputs_changed():
+            return config
+
+    with _config_lock:
+        if _config is None:
+            logger.debug("Global config not yet loaded. Loading default AppConfig now.")
+            AppConfig.load()  # Loads default or from DREAMOS_CONFIG_PATH
+        elif _inputs_changed():
+            logger.info(f"Config inputs changed; reloading {_config_source}")
+            AppConfig.load(config_file=_config_source)
+        if _config is None:  # Should not happen
+            raise appconfig_errors.ConfigurationError(
+                "Configuration could not be retrieved or loaded."
+            )
+        return _config
 
 
 # EDIT START: Remove late import of GuiAutomationConfig
@@ -1021,7 +1192,6 @@ def get_config() -> AppConfig:
 
 # At the very end of the file, after all model definitions and functions
 AppConfig.model_rebuild()
-print("DEBUG_CONFIG: End of dreamos.core.config.py, AppConfig.model_rebuild() called.")
 
 # Ensure logging is set up if this module is imported and no entry point has done so.
 # This is a fallback. Ideally, the main application entry point calls load_config() or get_config().
@@ -0,0 +1,206 @@
+"""
+Event Rollups
+
+Bounded in-memory rollups of alert and monitoring events (drift, recovery,
+errors, task completions). Each event is folded into a per-minute counter
+keyed by (event type, agent), plus a top-K set of samples, so memory does not
+grow with event volume. Nothing is written to disk: AlertAggregator prunes
+buckets that fall out of its window when a group is flushed, and the daily
+digest reads the series and samples when it is generated and then resets the
+store for the next day.
+"""
+
+import heapq
+import itertools
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterator, Optional, List, Tuple
+
+RollupKey = Tuple[str, Optional[str]]
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def floor_time(timestamp: datetime, seconds: int) -> datetime:
+    """Round a timestamp down to a multiple of the given number of seconds."""
+    epoch = _EPOCH.replace(tzinfo=timestamp.tzinfo)
+    offset = (timestamp - epoch).total_seconds() % seconds
+    return timestamp - timedelta(seconds=offset)
+
+
+class TopKSamples:
+    """Keeps the k highest-scoring samples seen, ties going to the most recent."""
+
+    def __init__(self, k: int = 5, sequence: Optional[Iterator[int]] = None):
+        self.k = k
+        self._heap: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._sequence = sequence or itertools.count()
+
+    def add(self, sample: Dict[str, Any], score: float = 0.0) -> None:
+        """Offer a sample; it is kept only if it ranks in the top k."""
+        if self.k <= 0:
+            return
+        entry = (score, next(self._sequence), sample)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self) -> List[Dict[str, Any]]:
+        """Return kept samples, highest score (then most recent) first."""
+        return [sample for _, _, sample in self.entries()]
+
+    def entries(self) -> List[Tuple[float, int, Dict[str, Any]]]:
+        """Return (score, sequence, sample) entries, best first."""
+        return sorted(self._heap, key=lambda e: e[:2], reverse=True)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class RollupStore:
+    """Time-bucketed event counters with bounded top-K samples per event type and agent.
+
+    Events are folded into fixed-width buckets (one minute by default) keyed by
+    (event_type, agent_id), so memory grows with the number of active buckets,
+    event types and agents rather than with the number of events recorded.
+    """
+
+    def __init__(self, bucket_seconds: int = 60, sample_size: int = 5,
+                 retention_seconds: Optional[int] = None):
+        """Initialize the store.
+
+        Args:
+            bucket_seconds: Width of each counter bucket
+            sample_size: Samples kept per (event_type, agent_id)
+            retention_seconds: Drop buckets older than this on record (keep all if None)
+        """
+        self.bucket_seconds = bucket_seconds
+        self.sample_size = sample_size
+        self.retention_seconds = retention_seconds
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all buckets, totals and samples."""
+        # bucket start -> {(event_type, agent_id): [count, value_sum]}
+        self._buckets: "OrderedDict[datetime, Dict[RollupKey, List[float]]]" = OrderedDict()
+        self._totals: Dict[RollupKey, List[float]] = defaultdict(lambda: [0, 0.0])
+        self._samples: Dict[RollupKey, TopKSamples] = {}
+        self._sequence = itertools.count()
+
+    def bucket_start(self, timestamp: datetime) -> datetime:
+        """Return the start of the bucket containing timestamp."""
+        return floor_time(timestamp, self.bucket_seconds)
+
+    def record(self, event_type: str, agent_id: Optional[str] = None,
+               timestamp: Optional[datetime] = None, value: float = 0.0,
+               sample: Optional[Dict[str, Any]] = None, score: Optional[float] = None) -> None:
+        """Fold one event into its bucket.
+
+        Args:
+            event_type: Event or alert type
+            agent_id: Agent the event belongs to, if any
+            timestamp: Event time (defaults to now, UTC)
+            value: Numeric quantity summed per bucket (e.g. a duration)
+            sample: Payload offered to the top-K sample set
+            score: Sample ranking score (defaults to value, so ties keep the latest)
+        """
+        timestamp = timestamp or datetime.utcnow()
+        key = (event_type, agent_id)
+        start = self.bucket_start(timestamp)
+
+        bucket = self._buckets.get(start)
+        if bucket is None:
+            bucket = self._buckets[start] = {}
+            if len(self._buckets) > 1 and start < next(reversed(self._buckets)):
+                # Late event for an older bucket: keep the buckets ordered by time
+                self._buckets = OrderedDict(sorted(self._buckets.items()))
+        counters = bucket.setdefault(key, [0, 0.0])
+        counters[0] += 1
+        counters[1] += value
+
+        totals = self._totals[key]
+        totals[0] += 1
+        totals[1] += value
+
+        if sample is not None:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = TopKSamples(self.sample_size, self._sequence)
+            samples.add(sample, value if score is None else score)
+
+        if self.retention_seconds is not None:
+            self.prune(timestamp - timedelta(seconds=self.retention_seconds))
+
+    def prune(self, before: datetime) -> None:
+        """Drop buckets that ended before the given time (totals are kept)."""
+        cutoff = self.bucket_start(before)
+        while self._buckets and next(iter(self._buckets)) < cutoff:
+            self._buckets.popitem(last=False)
+
+    def _matching(self, event_type: Optional[str], agent_id: Optional[str]):
+        """Yield (key, totals) pairs matching the optional filters."""
+        for key, totals in self._totals.items():
+            if event_type is not None and key[0] != event_type:
+                continue
+            if agent_id is not None and key[1] != agent_id:
+                continue
+            yield key, totals
+
+    def count(self, event_type: Optional[str] = None, agent_id: Optional[str] = None,
+              since: Optional[datetime] = None) -> int:
+        """Count events matching the filters, optionally only in buckets from since onwards."""
+        if since is None:
+            return int(sum(totals[0] for _, totals in self._matching(event_type, agent_id)))
+        return int(sum(counters[0] for _, counters in self._bucket_counters(event_type, agent_id, since)))
+
+    def total(self, event_type: Optional[str] = None, agent_id: Optional[str] = None) -> float:
+        """Sum the recorded values of events matching the filters."""
+        return sum(totals[1] for _, totals in self._matching(event_type, agent_id))
+
+    def _bucket_counters(self, event_type: Optional[str], agent_id: Optional[str],
+                         since: Optional[datetime]):
+        """Yield (bucket_start, counters) for retained buckets matching the filters."""
+        cutoff = self.bucket_start(since) if since else None
+        for start, bucket in self._buckets.items():
+            if cutoff is not None and start < cutoff:
+                continue
+            for key, counters in bucket.items():
+                if event_type is not None and key[0] != event_type:
+                    continue
+                if agent_id is not None and key[1] != agent_id:
+                    continue
+                yield start, counters
+
+    def series(self, event_type: Optional[str] = None, agent_id: Optional[str] = None,
+               since: Optional[datetime] = None, bucket_seconds: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Return (bucket start ISO time, count) pairs, optionally re-bucketed to a coarser width."""
+        width = bucket_seconds or self.bucket_seconds
+        coarse: "OrderedDict[datetime, int]" = OrderedDict()
+        for start, counters in self._bucket_counters(event_type, agent_id, since):
+            if width != self.bucket_seconds:
+                start = floor_time(start, width)
+            coarse[start] = coarse.get(start, 0) + int(counters[0])
+        return [(start.isoformat(), count) for start, count in coarse.items()]
+
+    def samples(self, event_type: Optional[str] = None, agent_id: Optional[str] = None,
+                limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return top samples matching the filters, best first."""
+        entries = []
+        for key, samples in self._samples.items():
+            if event_type is not None and key[0] != event_type:
+                continue
+            if agent_id is not None and key[1] != agent_id:
+                continue
+            entries.extend(samples.entries())
+        entries.sort(key=lambda e: e[:2], reverse=True)
+        return [sample for _, _, sample in entries[:limit or self.sample_size]]
+
+    def clear_samples(self, event_type: Optional[str] = None) -> None:
+        """Forget kept samples, for one event type or all of them."""
+        for key in [key for key in self._samples if event_type is None or key[0] == event_type]:
+            del self._samples[key]
+
+    def bucket_count(self) -> int:
+        """Number of buckets currently retained."""
+        return len(self._buckets)
@@ -0,0 +1,534 @@
+"""
+Metrics Sink
+
+Write-behind storage for agent metrics. MetricsLogger records points into a
+shared in-process MetricsSink, which keeps per-series aggregates and recent
+points in memory and flushes from a background thread (and at exit). In the
+metrics directory it appends points to metrics-log.jsonl and merges the
+aggregates into aggregates.json. It also persists the JSON documents
+registered with it, such as runtime/episode-metrics.json and
+runtime/agent_status.json, by replaying queued updates under a file lock, so
+several agent processes can share the same files.
+"""
+
+import atexit
+import contextlib
+import copy
+import json
+import logging
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from .utils.file_locking import acquire_lock
+
+logger = logging.getLogger(__name__)
+
+SeriesKey = Tuple[str, str]
+DocumentUpdate = Callable[..., None]
+
+
+class SeriesStats:
+    """Running aggregates for one series, plus a bounded ring of recent points."""
+
+    def __init__(self, capacity: int = 256):
+        self.recent: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self.count = 0
+        self.total = 0.0
+        self.minimum: Optional[float] = None
+        self.maximum: Optional[float] = None
+        self.last: Optional[float] = None
+        self.last_timestamp: Optional[str] = None
+        # Sum of the values currently held in the ring, for the rolling mean
+        self.window_total = 0.0
+
+    def add(self, point: Dict[str, Any], value: Optional[float]) -> None:
+        """Fold a point into the aggregates and push it onto the ring."""
+        if len(self.recent) == self.recent.maxlen:
+            evicted = self.recent[0].get("value")
+            if evicted is not None:
+                self.window_total -= evicted
+        self.recent.append(point)
+        self.last_timestamp = point["timestamp"]
+        if value is None:
+            return
+        self.count += 1
+        self.total += value
+        self.window_total += value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        self.last = value
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the precomputed aggregates as a dict."""
+        window = [p["value"] for p in self.recent if p.get("value") is not None]
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.minimum,
+            "max": self.maximum,
+            "last": self.last,
+            "last_timestamp": self.last_timestamp,
+            "window_count": len(window),
+            "window_mean": self.window_total / len(window) if window else 0.0,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for the aggregates snapshot."""
+        return {
+            "count": self.count,
+            "total": self.total,
+            "min": self.minimum,
+            "max": self.maximum,
+            "last": self.last,
+            "last_timestamp": self.last_timestamp,
+            "recent": list(self.recent),
+        }
+
+    def copy(self, capacity: Optional[int] = None) -> "SeriesStats":
+        """Return an independent copy."""
+        return SeriesStats.from_dict(self.to_dict(), capacity or self.recent.maxlen)
+
+    def merge(self, other: "SeriesStats") -> None:
+        """Fold another process's aggregates for the same series into this one."""
+        self.count += other.count
+        self.total += other.total
+        if other.minimum is not None:
+            self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+        if other.maximum is not None:
+            self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+        if other.last_timestamp is not None and (self.last_timestamp is None
+                                                 or other.last_timestamp >= self.last_timestamp):
+            self.last_timestamp = other.last_timestamp
+            if other.last is not None:
+                self.last = other.last
+        points = sorted(list(self.recent) + list(other.recent), key=lambda p: p["timestamp"])
+        self.recent.clear()
+        self.recent.extend(points)
+        self.window_total = sum(p["value"] for p in self.recent if p.get("value") is not None)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], capacity: int) -> "SeriesStats":
+        """Restore from an aggregates snapshot entry."""
+        stats = cls(capacity)
+        stats.count = data.get("count", 0)
+        stats.total = data.get("total", 0.0)
+        stats.minimum = data.get("min")
+        stats.maximum = data.get("max")
+        stats.last = data.get("last")
+        stats.last_timestamp = data.get("last_timestamp")
+        stats.recent.extend(data.get("recent", []))
+        stats.window_total = sum(p["value"] for p in stats.recent if p.get("value") is not None)
+        return stats
+
+
+class MetricsSink:
+    """In-process, write-behind time-series sink shared safely across processes.
+
+    ``record`` only touches memory: it updates the series aggregates and ring
+    buffer and queues the point. Queued points are appended to
+    ``metrics-log.jsonl`` in batches, either every ``flush_interval`` seconds
+    from a background thread or once ``batch_size`` points are pending.
+
+    Several agent processes may share one metrics directory, so nothing is
+    flushed by overwriting a file with this process's view of it:
+
+    - Aggregates recorded since the last flush are kept as a delta and merged
+      into the on-disk ``aggregates.json`` under a file lock.
+    - Registered JSON documents are changed through ``update_documents``;
+      each update is applied to memory at once and replayed against the
+      current file contents, under its file lock, on flush.
+    - Readers reload a snapshot or document when another process has
+      rewritten it.
+
+    Points, deltas and updates that fail to write stay queued for the next
+    flush. File I/O happens outside ``lock``.
+    """
+
+    LOG_FILE = "metrics-log.jsonl"
+    SNAPSHOT_FILE = "aggregates.json"
+
+    def __init__(self, directory: Path, capacity: int = 256, batch_size: int = 500,
+                 flush_interval: float = 5.0, background: bool = True):
+        """Initialize the sink.
+
+        Args:
+            directory: Directory for the point log and aggregates snapshot
+            capacity: Recent points kept in memory per (series, agent)
+            batch_size: Pending points that force a flush from ``record``
+            flush_interval: Seconds between background flushes
+            background: Start the background flush thread
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.log_file = self.directory / self.LOG_FILE
+        self.snapshot_file = self.directory / self.SNAPSHOT_FILE
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.lock = threading.RLock()
+        # Serializes flushes so merged state is adopted in write order
+        self._flush_lock = threading.Lock()
+
+        # Last state read from or written to aggregates.json, plus local delta
+        self._base_series: Dict[SeriesKey, SeriesStats] = {}
+        self._base_agents: Dict[str, None] = {}
+        self._snapshot_signature: Optional[Tuple[int, int]] = None
+        self._delta: Dict[SeriesKey, SeriesStats] = {}
+        self._new_agents: Dict[str, None] = {}
+        # Merged view served to readers
+        self._series: Dict[SeriesKey, SeriesStats] = {}
+        self._agents: Dict[str, None] = {}
+        self._pending: List[Dict[str, Any]] = []
+
+        self._factories: Dict[Path, Callable[[], Dict[str, Any]]] = {}
+        self._disk_documents: Dict[Path, Dict[str, Any]] = {}
+        self._document_signatures: Dict[Path, Optional[Tuple[int, int]]] = {}
+        self._documents: Dict[Path, Dict[str, Any]] = {}
+        self._updates: List[Tuple[Tuple[Path, ...], DocumentUpdate]] = []
+        self._dirty_documents: set = set()
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._load_snapshot()
+        if background:
+            self._thread = threading.Thread(target=self._flush_loop, name="metrics-sink", daemon=True)
+            self._thread.start()
+
+    # --- Aggregates ---
+
+    def _read_snapshot(self) -> Tuple[Dict[str, None], Dict[SeriesKey, SeriesStats]]:
+        """Parse aggregates.json; missing or unreadable files read as empty."""
+        agents: Dict[str, None] = {}
+        series: Dict[SeriesKey, SeriesStats] = {}
+        if not self.snapshot_file.exists():
+            return agents, series
+        try:
+            with open(self.snapshot_file, 'r') as f:
+                snapshot = json.load(f)
+        except Exception as e:
+            logger.error(f"Error reading metrics snapshot: {e}")
+            return agents, series
+        for agent_id in snapshot.get("agents", []):
+            agents[agent_id] = None
+        for name, per_agent in snapshot.get("series", {}).items():
+            for agent_id, data in per_agent.items():
+                series[(name, agent_id)] = SeriesStats.from_dict(data, self.capacity)
+        return agents, series
+
+    def _load_snapshot(self) -> None:
+        """Restore aggregates and ring buffers from the last snapshot."""
+        signature = _signature(self.snapshot_file)
+        agents, series = self._read_snapshot()
+        with self.lock:
+            self._adopt_snapshot(agents, series, signature)
+
+    def _adopt_snapshot(self, agents: Dict[str, None], series: Dict[SeriesKey, SeriesStats],
+                        signature: Optional[Tuple[int, int]]) -> None:
+        """Make ``series`` the base state and rebuild the merged view. Caller holds ``lock``."""
+        self._base_agents = agents
+        self._base_series = series
+        self._snapshot_signature = signature
+        self._agents = dict(agents)
+        self._agents.update(self._new_agents)
+        self._series = {key: stats.copy() for key, stats in series.items()}
+        for key, stats in self._delta.items():
+            _merge_into(self._series, key, stats, self.capacity)
+
+    def _refresh_snapshot(self) -> None:
+        """Reload aggregates if another process has rewritten the snapshot."""
+        signature = _signature(self.snapshot_file)
+        if signature == self._snapshot_signature:
+            return
+        agents, series = self._read_snapshot()
+        with self.lock:
+            self._adopt_snapshot(agents, series, signature)
+
+    def register_agent(self, agent_id: str) -> None:
+        """Make an agent visible to ``agents`` before it records anything."""
+        with self.lock:
+            if agent_id not in self._agents:
+                self._agents[agent_id] = None
+                self._new_agents[agent_id] = None
+
+    def record(self, series: str, agent_id: str, value: Optional[float] = None,
+               fields: Optional[Dict[str, Any]] = None, timestamp: Optional[str] = None) -> Dict[str, Any]:
+        """Record one point.
+
+        Args:
+            series: Series name (e.g. "response_times")
+            agent_id: Agent the point belongs to
+            value: Numeric value aggregated for the series (None to only keep the point)
+            fields: Extra fields stored with the point
+            timestamp: ISO timestamp (defaults to now)
+
+        Returns:
+            The stored point
+        """
+        point = dict(fields or {})
+        point["timestamp"] = timestamp or datetime.now().isoformat()
+        if value is not None:
+            value = float(value)
+            point["value"] = value
+
+        key = (series, agent_id)
+        with self.lock:
+            if agent_id not in self._agents:
+                self._agents[agent_id] = None
+                self._new_agents[agent_id] = None
+            for table in (self._series, self._delta):
+                stats = table.get(key)
+                if stats is None:
+                    stats = table[key] = SeriesStats(self.capacity)
+                stats.add(point, value)
+            self._pending.append({"series": series, "agent_id": agent_id, **point})
+            flush_now = len(self._pending) >= self.batch_size
+
+        if flush_now:
+            self.flush()
+        return point
+
+    def recent(self, series: str, agent_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return recent points for one agent, or for all agents sorted by time."""
+        self._refresh_snapshot()
+        with self.lock:
+            if agent_id is not None:
+                stats = self._series.get((series, agent_id))
+                return list(stats.recent) if stats else []
+            points = [p for (name, _), stats in self._series.items() if name == series
+                      for p in stats.recent]
+        return sorted(points, key=lambda p: p["timestamp"])
+
+    def stats(self, series: str, agent_id: Optional[str] = None) -> Dict[str, Any]:
+        """Return precomputed aggregates for one agent, or combined over all agents."""
+        self._refresh_snapshot()
+        with self.lock:
+            if agent_id is not None:
+                stats = self._series.get((series, agent_id))
+                return stats.summary() if stats else SeriesStats(0).summary()
+            summaries = [s.summary() for (name, _), s in self._series.items() if name == series]
+
+        count = sum(s["count"] for s in summaries)
+        total = sum(s["total"] for s in summaries)
+        window_count = sum(s["window_count"] for s in summaries)
+        window_total = sum(s["window_mean"] * s["window_count"] for s in summaries)
+        latest = max(summaries, key=lambda s: s["last_timestamp"] or "", default={})
+        mins = [s["min"] for s in summaries if s["min"] is not None]
+        maxs = [s["max"] for s in summaries if s["max"] is not None]
+        return {
+            "count": count,
+            "total": total,
+            "mean": total / count if count else 0.0,
+            "min": min(mins) if mins else None,
+            "max": max(maxs) if maxs else None,
+            "last": latest.get("last"),
+            "last_timestamp": latest.get("last_timestamp"),
+            "window_count": window_count,
+            "window_mean": window_total / window_count if window_count else 0.0,
+        }
+
+    def agents(self) -> List[str]:
+        """Return every agent that has registered or recorded a point."""
+        self._refresh_snapshot()
+        with self.lock:
+            return list(self._agents)
+
+    # --- Documents ---
+
+    def _read_document(self, path: Path) -> Dict[str, Any]:
+        """Read a document from disk, falling back to its default structure."""
+        document = None
+        if path.exists():
+            try:
+                with open(path, 'r') as f:
+                    document = json.load(f)
+            except Exception as e:
+                logger.error(f"Error reading {path}: {e}")
+        return document or self._factories[path]()
+
+    def _rebuild_documents(self) -> None:
+        """Rebuild the in-memory documents as disk state plus queued updates. Caller holds ``lock``."""
+        self._documents = {path: copy.deepcopy(doc) for path, doc in self._disk_documents.items()}
+        for paths, update in self._updates:
+            update(*(self._documents[path] for path in paths))
+
+    def document(self, path: Path, default_factory: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return a shared JSON document that the sink persists on flush.
+
+        The document reflects the file as last seen plus this process's
+        pending updates, and is reloaded when another process rewrites the
+        file. Change it only through ``update_documents``; direct mutations are
+        not written back.
+        """
+        path = Path(path)
+        signature = _signature(path)
+        with self.lock:
+            if path not in self._factories:
+                self._factories[path] = default_factory
+                if signature is None:
+                    self._dirty_documents.add(path)
+            elif self._document_signatures[path] == signature:
+                return self._documents[path]
+        disk_document = self._read_document(path)
+        with self.lock:
+            self._disk_documents[path] = disk_document
+            self._document_signatures[path] = signature
+            self._rebuild_documents()
+            return self._documents[path]
+
+    def update_documents(self, paths: Sequence[Path], update: "DocumentUpdate") -> None:
+        """Apply ``update(*documents)`` now and replay it against the files on flush.
+
+        ``update`` may run more than once (against the in-memory documents and
+        again against the file contents at flush time), so it must derive
+        everything it writes from its arguments and its own closure, not from
+        the current time.
+        """
+        paths = tuple(Path(path) for path in paths)
+        with self.lock:
+            for path in paths:
+                if path not in self._factories:
+                    raise KeyError(f"Document {path} is not registered; call document() first")
+            update(*(self._documents[path] for path in paths))
+            self._updates.append((paths, update))
+            self._dirty_documents.update(paths)
+
+    # --- Flushing ---
+
+    def flush(self) -> None:
+        """Append pending points and merge the aggregates and documents into their files."""
+        with self._flush_lock:
+            with self.lock:
+                pending, self._pending = self._pending, []
+                delta, self._delta = self._delta, {}
+                new_agents, self._new_agents = self._new_agents, {}
+                updates, self._updates = self._updates, []
+                dirty_documents, self._dirty_documents = self._dirty_documents, set()
+
+            if pending:
+                self._append_points(pending)
+            if delta or new_agents:
+                self._merge_snapshot(delta, new_agents)
+            if dirty_documents:
+                self._merge_documents(sorted(dirty_documents, key=str), updates)
+
+    def _append_points(self, pending: List[Dict[str, Any]]) -> None:
+        try:
+            with open(self.log_file, 'a') as f:
+                f.write("".join(json.dumps(p) + "\n" for p in pending))
+        except Exception as e:
+            logger.error(f"Error appending metrics to {self.log_file}: {e}")
+            with self.lock:
+                self._pending[:0] = pending
+
+    def _merge_snapshot(self, delta: Dict[SeriesKey, SeriesStats], new_agents: Dict[str, None]) -> None:
+        try:
+            with acquire_lock(self.snapshot_file):
+                agents, series = self._read_snapshot()
+                agents.update(new_agents)
+                for key, stats in delta.items():
+                    _merge_into(series, key, stats, self.capacity)
+                merged: Dict[str, Dict[str, Any]] = {}
+                for (name, agent_id), stats in series.items():
+                    merged.setdefault(name, {})[agent_id] = stats.to_dict()
+                _atomic_write(self.snapshot_file, json.dumps({"agents": list(agents), "series": merged}))
+                signature = _signature(self.snapshot_file)
+        except Exception as e:
+            logger.error(f"Error flushing metrics to {self.snapshot_file}: {e}")
+            with self.lock:
+                for key, stats in self._delta.items():
+                    _merge_into(delta, key, stats, self.capacity)
+                self._delta = delta
+                new_agents.update(self._new_agents)
+                self._new_agents = new_agents
+            return
+        with self.lock:
+            self._adopt_snapshot(agents, series, signature)
+
+    def _merge_documents(self, paths: List[Path], updates: List[Tuple[Tuple[Path, ...], "DocumentUpdate"]]) -> None:
+        try:
+            with contextlib.ExitStack() as stack:
+                for path in paths:
+                    stack.enter_context(acquire_lock(path))
+                documents = {path: self._read_document(path) for path in paths}
+                for update_paths, update in updates:
+                    update(*(documents[path] for path in update_paths))
+                signatures = {}
+                for path in paths:
+                    _atomic_write(path, json.dumps(documents[path], indent=2))
+                    signatures[path] = _signature(path)
+        except Exception as e:
+            logger.error(f"Error flushing metrics documents: {e}")
+            with self.lock:
+                self._updates[:0] = updates
+                self._dirty_documents.update(paths)
+            return
+        with self.lock:
+            for path in paths:
+                self._disk_documents[path] = documents[path]
+                self._document_signatures[path] = signatures[path]
+            self._rebuild_documents()
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        """Stop the background thread and flush what is pending."""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.flush_interval + 1)
+        self.flush()
+
+
+def _merge_into(table: Dict[SeriesKey, SeriesStats], key: SeriesKey, stats: SeriesStats, capacity: int) -> None:
+    existing = table.get(key)
+    if existing is None:
+        table[key] = stats.copy(capacity)
+    else:
+        existing.merge(stats)
+
+
+def _signature(path: Path) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, 'w') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+_sinks: Dict[Path, MetricsSink] = {}
+_sinks_lock = threading.Lock()
+
+
+def get_metrics_sink(directory: Path) -> MetricsSink:
+    """Return the process-wide sink for a metrics directory, creating it on first use."""
+    key = Path(directory).resolve()
+    with _sinks_lock:
+        sink = _sinks.get(key)
+        if sink is None:
+            sink = _sinks[key] = MetricsSink(key)
+        return sink
+
+
+@atexit.register
+def flush_all_sinks() -> None:
+    """Flush every shared sink; registered to run at interpreter exit."""
+    with _sinks_lock:
+        sinks = list(_sinks.values())
+    for sink in sinks:
+        sink.flush()
@@ -17,11 +17,12 @@ from pathlib import Path
 
 # Import the resilient IO utilities
 from dreamos.utils.resilient_io import (
-    read_file, write_file, read_json, write_json, list_dir
+    read_file, write_file, read_json, write_json, list_dir, ensure_dir, with_retry
 )
 
-# Import the checkpoint manager
+# Import the checkpoint manager and its chunk store
 from dreamos.core.checkpoint_manager import CheckpointManager
+from dreamos.core.checkpoint_store import CheckpointStore
 
 # Configure logging
 logging.basicConfig(level=logging.INFO,
@@ -59,8 +60,22 @@ class ResilientCheckpointManager:
         self.agent_id = agent_id
         self.checkpoint_dir = "runtime/agent_comms/checkpoints"
         self.manager = CheckpointManager(agent_id)
+        self._store = None
         logger.info(f"Initialized ResilientCheckpointManager for {agent_id}")
     
+    @property
+    def store(self) -> CheckpointStore:
+        """Chunk store and index for the current checkpoint directory."""
+        if self._store is None or self._store.checkpoint_dir != self.checkpoint_dir:
+            ensure_dir(self.checkpoint_dir)
+            self._store = CheckpointStore(self.checkpoint_dir, self.agent_id)
+        return self._store
+    
+    @with_retry()
+    def _save_with_retry(self, filename: str, checkpoint_data: Dict[str, Any]) -> str:
+        """Save a checkpoint through the store, retrying transient IO errors."""
+        return self.store.save(filename, checkpoint_data)
+    
     def create_checkpoint(self, checkpoint_type: str = "routine") -> str:
         """
         Create a checkpoint of the agent's current state with resilient IO.
@@ -69,11 +84,10 @@ class ResilientCheckpointManager:
             checkpoint_type: Type of checkpoint ("routine", "pre_operation", "recovery")
             
         Returns:
-            Path to the created checkpoint file
+            Path to the created checkpoint manifest
         """
         timestamp = self._get_timestamp()
         filename = f"{self.agent_id}_{timestamp}_{checkpoint_type}.checkpoint"
-        path = os.path.join(self.checkpoint_dir, filename)
         
         try:
             # Collect agent state using resilient IO operations
@@ -93,8 +107,8 @@ class ResilientCheckpointManager:
                 "state": state
             }
             
-            # Write checkpoint data using resilient IO
-            write_json(path, checkpoint_data)
+            # Write changed chunks and the manifest through the shared store
+            path = self._save_with_retry(filename, checkpoint_data)
             
             logger.info(f"Created {checkpoint_type} checkpoint at {path}")
             
@@ -119,8 +133,8 @@ class ResilientCheckpointManager:
             True if successful, False otherwise
         """
         try:
-            # Read the checkpoint data using resilient IO
-            checkpoint_data = read_json(checkpoint_path)
+            # Read the manifest and its chunks
+            checkpoint_data = with_retry()(self.store.load)(checkpoint_path)
             
             # Validate checkpoint belongs to this agent
             if checkpoint_data["agent_id"] != self.agent_id:
@@ -151,14 +165,11 @@ class ResilientCheckpointManager:
             Path to the latest checkpoint or None if not found
         """
         try:
-            checkpoints = self._list_checkpoints(checkpoint_type)
-            if not checkpoints:
+            latest = self.store.latest(checkpoint_type)
+            if latest is None:
                 logger.warning(f"No {checkpoint_type} checkpoints found for {self.agent_id}")
                 return None
             
-            # Sort by timestamp (which is part of the filename)
-            sorted_checkpoints = sorted(checkpoints)
-            latest = sorted_checkpoints[-1]
             logger.info(f"Found latest {checkpoint_type} checkpoint: {latest}")
             return latest
             
@@ -346,34 +357,21 @@ class ResilientCheckpointManager:
             logger.error(f"Error restoring memory state: {str(e)}")
     
     def _list_checkpoints(self, checkpoint_type: Optional[str] = None) -> List[str]:
-        """List available checkpoints using resilient IO."""
-        checkpoints = []
+        """List available checkpoints from the checkpoint index, oldest first."""
         try:
-            files = list_dir(self.checkpoint_dir)
-            for filename in files:
-                if filename.startswith(self.agent_id) and filename.endswith(".checkpoint"):
-                    if checkpoint_type is None or f"_{checkpoint_type}." in filename:
-                        checkpoints.append(os.path.join(self.checkpoint_dir, filename))
+            return self.store.list(checkpoint_type)
         except Exception as e:
             logger.error(f"Error listing checkpoints: {str(e)}")
-            
-        return checkpoints
+            return []
     
     def _apply_retention_policy(self, checkpoint_type: str) -> None:
         """Apply retention policy for checkpoints."""
         try:
             # Retention policies based on checkpoint type
             if checkpoint_type == "routine":
-                # Keep only the last 3 routine checkpoints
-                routine_checkpoints = self._list_checkpoints("routine")
-                if len(routine_checkpoints) > 3:
-                    # Sort by creation time
-                    sorted_checkpoints = sorted(routine_checkpoints)
-                    # Remove oldest checkpoints
-                    for checkpoint in sorted_checkpoints[:-3]:
-                        if os.path.exists(checkpoint):
-                            os.remove(checkpoint)
-                            logger.info(f"Removed old routine checkpoint: {checkpoint}")
+                # Keep only the last 3 routine checkpoints; unshared chunks go with them
+                for checkpoint in self.store.prune("routine", keep=3):
+                    logger.info(f"Removed old routine checkpoint: {checkpoint}")
             
             # For recovery checkpoints, we keep them for 7 days
             # This would require a date-based cleanup which we'll implement in a future update
@@ -22,6 +22,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
 
 from dreamos.integrations.social.task_integration import integrate_social_tasks
+from dreamos.tools.task_board_updater import load_task_board
 
 # Configure logging
 logging.basicConfig(
@@ -70,9 +71,7 @@ def main():
         task_board_path = Path("runtime/task_board.json")
         if task_board_path.exists():
             try:
-                import json
-                with open(task_board_path, 'r') as f:
-                    task_board = json.load(f)
+                task_board = load_task_board(task_board_path)
                 
                 # Look for an idle agent
                 for cursor_id, cursor_data in task_board.get("cursor_agents", {}).items():
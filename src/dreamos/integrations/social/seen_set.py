@@ -0,0 +1,164 @@
+"""
+Dream.OS Social Seen-Set - Expiring deduplication store for SocialScout
+
+Content hashes are partitioned into daily shards by the day they were first
+seen. Each shard is an append-only JSON-lines file:
+
+    {"hash": "...", "first_seen": "...", "source": "..."}   first sighting
+    {"hash": "...", "seen": "..."}                           repeat sighting
+
+Membership checks hit an in-memory dict, saves append only the lines recorded
+since the last flush, and expiry deletes whole shard files instead of
+re-parsing every entry's timestamp.
+"""
+
+import json
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("dreamos.integrations.social.seen_set")
+
+DEFAULT_RETENTION_DAYS = 7
+SHARD_DATE_FORMAT = "%Y%m%d"
+
+
+class SeenSet:
+    """
+    Time-partitioned set of content hashes with per-hash sighting stats.
+    """
+
+    def __init__(self, directory: Path, name: str, retention_days: int = DEFAULT_RETENTION_DAYS):
+        """
+        Load the live shards for ``name`` from ``directory``.
+
+        Args:
+            directory: Directory holding the shard files
+            name: Shard file prefix (usually the platform)
+            retention_days: Shards older than this many days are expired
+        """
+        self.directory = Path(directory)
+        self.name = name
+        self.retention_days = retention_days
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._shards: Dict[str, List[str]] = {}  # shard day -> hashes first seen that day
+        self._pending: Dict[str, List[str]] = {}  # shard day -> lines not yet written
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for path in sorted(self.directory.glob(f"{self.name}_seen_*.jsonl")):
+            self._load_shard(path)
+        self._migrate_legacy()
+
+    def _shard_path(self, day: str) -> Path:
+        return self.directory / f"{self.name}_seen_{day}.jsonl"
+
+    def _load_shard(self, path: Path) -> None:
+        day = path.stem.rsplit("_", 1)[-1]
+        hashes = self._shards.setdefault(day, [])
+        try:
+            with open(path, "r") as f:
+                for line in f:
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Torn write; the rest of the shard is still usable
+                    hash_key = row.get("hash")
+                    entry = self.entries.get(hash_key)
+                    if "first_seen" in row and entry is None:
+                        self.entries[hash_key] = {
+                            "first_seen": row["first_seen"],
+                            "last_seen": row["first_seen"],
+                            "count": row.get("count", 1),
+                            "source": row.get("source"),
+                            "shard": day,
+                        }
+                        hashes.append(hash_key)
+                    elif entry is not None:
+                        entry["last_seen"] = row.get("seen", row.get("last_seen", entry["last_seen"]))
+                        entry["count"] += 1
+        except OSError as e:
+            logger.error(f"Error loading seen-set shard {path}: {e}")
+
+    def _migrate_legacy(self) -> None:
+        """Import a pre-shard ``{name}_dedup.json`` document once."""
+        legacy = self.directory / f"{self.name}_dedup.json"
+        if not legacy.exists():
+            return
+        try:
+            with open(legacy, "r") as f:
+                seen_hashes = json.load(f).get("seen_hashes", {})
+        except Exception as e:
+            logger.error(f"Error loading legacy dedup data {legacy}: {e}")
+            return
+        for hash_key, entry in seen_hashes.items():
+            if hash_key in self.entries:
+                continue
+            first_seen = entry.get("first_seen", datetime.now().isoformat())
+            self._record_first(hash_key, first_seen, entry.get("source"), entry.get("count", 1))
+            self.entries[hash_key]["last_seen"] = entry.get("last_seen", first_seen)
+        self.flush()
+        legacy.rename(legacy.with_name(legacy.name + ".migrated"))
+        logger.info(f"Migrated {len(seen_hashes)} entries from {legacy}")
+
+    def _record_first(self, hash_key: str, first_seen: str, source: Optional[str], count: int = 1) -> None:
+        day = datetime.fromisoformat(first_seen).strftime(SHARD_DATE_FORMAT)
+        self.entries[hash_key] = {
+            "first_seen": first_seen,
+            "last_seen": first_seen,
+            "count": count,
+            "source": source,
+            "shard": day,
+        }
+        self._shards.setdefault(day, []).append(hash_key)
+        row = {"hash": hash_key, "first_seen": first_seen, "source": source}
+        if count != 1:
+            row["count"] = count
+        self._pending.setdefault(day, []).append(json.dumps(row))
+
+    def __contains__(self, hash_key: str) -> bool:
+        return hash_key in self.entries
+
+    def seen(self, hash_key: str, source: str) -> bool:
+        """
+        Record a sighting of ``hash_key``.
+
+        Returns:
+            True if the hash had been seen before, False if this is the first sighting
+        """
+        now = datetime.now().isoformat()
+        entry = self.entries.get(hash_key)
+        if entry is None:
+            self._record_first(hash_key, now, source)
+            return False
+        entry["last_seen"] = now
+        entry["count"] += 1
+        self._pending.setdefault(entry["shard"], []).append(json.dumps({"hash": hash_key, "seen": now}))
+        return True
+
+    def flush(self) -> None:
+        """Append recorded sightings to their shard files."""
+        for day, lines in list(self._pending.items()):
+            try:
+                with open(self._shard_path(day), "a") as f:
+                    f.write("".join(line + "\n" for line in lines))
+                del self._pending[day]
+            except OSError as e:
+                logger.error(f"Error saving seen-set shard {day}: {e}")
+
+    def expire(self, now: Optional[datetime] = None) -> int:
+        """
+        Drop shards older than the retention window.
+
+        Returns:
+            Number of hashes removed
+        """
+        cutoff = ((now or datetime.now()) - timedelta(days=self.retention_days)).strftime(SHARD_DATE_FORMAT)
+        removed = 0
+        for day in [day for day in self._shards if day < cutoff]:
+            for hash_key in self._shards.pop(day):
+                del self.entries[hash_key]
+                removed += 1
+            self._pending.pop(day, None)
+            self._shard_path(day).unlink(missing_ok=True)
+        return removed
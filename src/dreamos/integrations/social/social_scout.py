@@ -37,10 +37,11 @@ import logging
 import uuid
 import hashlib
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 
 from dreamos.integrations.social.login_manager import get_social_browser
+from dreamos.integrations.social.seen_set import SeenSet
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, 
@@ -80,52 +81,18 @@ class SocialScout:
             # Add more platforms as they're implemented
         }
         
-        # Load deduplication database
-        self.dedup_file = DEDUP_DIR / f"{self.platform}_dedup.json"
-        self.dedup_data = self._load_dedup_data()
+        # Load deduplication database (daily shards, see seen_set.py)
+        self.seen = SeenSet(DEDUP_DIR, self.platform)
         
-    def _load_dedup_data(self) -> Dict[str, Any]:
-        """Load deduplication data from file."""
-        if self.dedup_file.exists():
-            try:
-                with open(self.dedup_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.error(f"Error loading dedup data: {e}")
-                return {"seen_hashes": {}, "last_cleanup": datetime.now().isoformat()}
-        else:
-            return {"seen_hashes": {}, "last_cleanup": datetime.now().isoformat()}
-    
     def _save_dedup_data(self) -> None:
-        """Save deduplication data to file."""
-        try:
-            with open(self.dedup_file, 'w') as f:
-                json.dump(self.dedup_data, f, indent=2)
-        except Exception as e:
-            logger.error(f"Error saving dedup data: {e}")
+        """Append new deduplication entries to their shard files."""
+        self.seen.flush()
     
     def _cleanup_dedup_data(self) -> None:
-        """Clean up old entries in deduplication database (older than 7 days)."""
-        # Check if we need to clean up (once a day is enough)
-        last_cleanup = datetime.fromisoformat(self.dedup_data["last_cleanup"])
-        if datetime.now() - last_cleanup < timedelta(days=1):
-            return
-            
-        # Remove entries older than 7 days
-        cutoff = datetime.now() - timedelta(days=7)
-        new_seen = {}
-        for hash_key, entry in self.dedup_data["seen_hashes"].items():
-            timestamp = datetime.fromisoformat(entry["first_seen"])
-            if timestamp > cutoff:
-                new_seen[hash_key] = entry
-                
-        removed = len(self.dedup_data["seen_hashes"]) - len(new_seen)
+        """Drop deduplication shards older than the retention window (7 days)."""
+        removed = self.seen.expire()
         if removed > 0:
             logger.info(f"Removed {removed} old entries from deduplication database")
-            
-        self.dedup_data["seen_hashes"] = new_seen
-        self.dedup_data["last_cleanup"] = datetime.now().isoformat()
-        self._save_dedup_data()
         
     def _is_duplicate(self, content: str, source: str) -> bool:
         """
@@ -141,21 +108,9 @@ class SocialScout:
         # Generate a hash of the content and source
         hash_key = hashlib.md5(f"{content}:{source}".encode()).hexdigest()
         
-        # Check if we've seen this hash before
-        if hash_key in self.dedup_data["seen_hashes"]:
-            # Update last seen time
-            self.dedup_data["seen_hashes"][hash_key]["last_seen"] = datetime.now().isoformat()
-            self.dedup_data["seen_hashes"][hash_key]["count"] += 1
-            logger.debug(f"Duplicate content detected: {source} (seen {self.dedup_data['seen_hashes'][hash_key]['count']} times)")
+        if self.seen.seen(hash_key, source):
+            logger.debug(f"Duplicate content detected: {source} (seen {self.seen.entries[hash_key]['count']} times)")
             return True
-            
-        # Add new hash
-        self.dedup_data["seen_hashes"][hash_key] = {
-            "first_seen": datetime.now().isoformat(),
-            "last_seen": datetime.now().isoformat(),
-            "count": 1,
-            "source": source
-        }
         return False
         
     def _connect(self) -> bool:
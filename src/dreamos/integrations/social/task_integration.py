@@ -16,6 +16,8 @@ from datetime import datetime
 import threading
 import os
 
+from dreamos.tools.task_board_updater import TaskBoardUpdater, load_task_board
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, 
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -81,8 +83,7 @@ class SocialTaskIntegrator:
         # Check if task exists in main task board
         if TASK_BOARD_FILE.exists():
             try:
-                with open(TASK_BOARD_FILE, 'r') as f:
-                    task_board = json.load(f)
+                task_board = load_task_board(TASK_BOARD_FILE)
                 
                 # Check each cursor agent's tasks
                 for cursor_data in task_board.get("cursor_agents", {}).values():
@@ -247,29 +248,25 @@ class SocialTaskIntegrator:
         # Update the task board file
         if TASK_BOARD_FILE.exists():
             try:
-                # Load existing task board
-                with open(TASK_BOARD_FILE, 'r') as f:
-                    task_board = json.load(f)
+                # Load the current task board (snapshot plus pending updates)
+                task_board = load_task_board(TASK_BOARD_FILE)
+                updater = TaskBoardUpdater(TASK_BOARD_FILE)
                 
                 # Find the agent in the task board
                 if agent_id in task_board.get("cursor_agents", {}):
-                    agent_data = task_board["cursor_agents"][agent_id]
-                    
-                    # Ensure agent has a tasks dictionary
-                    if "tasks" not in agent_data:
-                        agent_data["tasks"] = {}
+                    agent_tasks = task_board["cursor_agents"][agent_id].get("tasks", {})
                     
                     # Add new tasks
                     for task in tasks:
                         task_id = task["task_id"]
-                        if task_id not in agent_data["tasks"]:
+                        if task_id not in agent_tasks:
                             # Format task for task board format
-                            agent_data["tasks"][task_id] = {
+                            updater.add_task(agent_id, task_id, {
                                 "description": task["description"],
                                 "status": "PENDING",
                                 "last_updated": datetime.now().isoformat(),
                                 "source": "SOCIAL_MEDIA_LEAD"
-                            }
+                            })
                             assigned_count += 1
                             
                             # Also update the task file with the assignment
@@ -293,13 +290,6 @@ class SocialTaskIntegrator:
                                 except Exception as e:
                                     logger.error(f"Error updating task file {task_file}: {e}")
                     
-                    # Update last updated timestamp
-                    task_board["last_updated_utc"] = datetime.now().isoformat()
-                    
-                    # Save updated task board
-                    with open(TASK_BOARD_FILE, 'w') as f:
-                        json.dump(task_board, f, indent=2)
-                    
                     logger.info(f"Assigned {assigned_count} lead tasks to agent {agent_id}")
                 else:
                     logger.error(f"Agent {agent_id} not found in task board")
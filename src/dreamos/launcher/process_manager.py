@@ -14,7 +14,6 @@ Features:
 
 import os
 import sys
-import time
 import signal
 import logging
 import subprocess
@@ -45,6 +44,179 @@ logging.basicConfig(
 logger = logging.getLogger("dreamos.launcher.process_manager")
 
 
+def tail_lines(path: Union[str, Path], max_lines: int, block_size: int = 8192) -> List[str]:
+    """
+    Return the last lines of a text file, reading backwards from the end.
+
+    Only the blocks holding the requested lines are read, so the cost does
+    not depend on the size of the file.
+
+    Args:
+        path: File to read
+        max_lines: Number of lines to return
+        block_size: Bytes read per backwards step
+
+    Returns:
+        Lines including their trailing newline, as readlines() would
+    """
+    if max_lines <= 0:
+        return []
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        # One newline more than requested guarantees the first kept line is whole
+        while position > 0 and data.count(b"\n") <= max_lines:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+
+    parts = data.decode("utf-8", errors="replace").replace("\r\n", "\n").split("\n")
+    lines = [part + "\n" for part in parts[:-1]]
+    if parts[-1]:
+        lines.append(parts[-1])
+    return lines[-max_lines:]
+
+
+class ResourceSampler:
+    """
+    Samples CPU and memory for every tracked process from one thread.
+
+    Each pass reads all tracked processes through cached psutil.Process
+    objects. ``cpu_percent(None)`` is non-blocking and measures usage since
+    the previous pass. Samples are published to ``on_sample`` subscribers,
+    and processes that have gone away are reported once to ``on_exit``
+    subscribers and dropped.
+    """
+
+    def __init__(self, interval: float = 5.0):
+        """
+        Initialize the sampler.
+
+        Args:
+            interval: Seconds between sampling passes
+        """
+        self.interval = interval
+        self._tracked: Dict[str, psutil.Process] = {}
+        self._sample_callbacks: List[Callable[[str, Dict[str, Any]], None]] = []
+        self._exit_callbacks: List[Callable[[str, str], None]] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, on_sample: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                  on_exit: Optional[Callable[[str, str], None]] = None):
+        """
+        Register callbacks.
+
+        Args:
+            on_sample: Called with (process_id, {"cpu_percent", "memory_mb", "timestamp"})
+            on_exit: Called with (process_id, status), status "terminated" or "crashed"
+        """
+        with self._lock:
+            if on_sample:
+                self._sample_callbacks.append(on_sample)
+            if on_exit:
+                self._exit_callbacks.append(on_exit)
+
+    def track(self, process_id: str, pid: int) -> bool:
+        """
+        Start sampling a process.
+
+        Returns:
+            False if the PID does not exist (reported to on_exit as "crashed")
+        """
+        try:
+            process = psutil.Process(pid)
+            process.cpu_percent(None)  # Prime the counter so the first pass is meaningful
+        except psutil.Error:
+            self._publish_exit(process_id, "crashed")
+            return False
+
+        with self._lock:
+            self._tracked[process_id] = process
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="process-sampler", daemon=True)
+                self._thread.start()
+        return True
+
+    def untrack(self, process_id: str):
+        """Stop sampling a process without reporting an exit."""
+        with self._lock:
+            self._tracked.pop(process_id, None)
+
+    def is_tracked(self, process_id: str) -> bool:
+        with self._lock:
+            return process_id in self._tracked
+
+    def sample_once(self):
+        """Run a single sampling pass over every tracked process."""
+        with self._lock:
+            tracked = list(self._tracked.items())
+
+        samples = []
+        exited = []
+        for process_id, process in tracked:
+            try:
+                with process.oneshot():
+                    if process.status() == psutil.STATUS_ZOMBIE:
+                        raise psutil.NoSuchProcess(process.pid)
+                    cpu_percent = process.cpu_percent(None)
+                    memory_mb = process.memory_info().rss / (1024 * 1024)
+                samples.append((process_id, {
+                    "cpu_percent": cpu_percent,
+                    "memory_mb": memory_mb,
+                    "timestamp": datetime.now().isoformat()
+                }))
+            except psutil.NoSuchProcess:
+                exited.append((process_id, process))
+            except psutil.Error as e:
+                logger.error(f"Error collecting resource usage for {process_id}: {e}")
+
+        with self._lock:
+            callbacks = list(self._sample_callbacks)
+            for process_id, _ in exited:
+                self._tracked.pop(process_id, None)
+
+        for process_id, sample in samples:
+            for callback in callbacks:
+                try:
+                    callback(process_id, sample)
+                except Exception as e:
+                    logger.error(f"Error in sample subscriber for {process_id}: {e}")
+        for process_id, process in exited:
+            try:
+                process.wait(timeout=0)  # Reap our own zombie children
+            except (psutil.Error, psutil.TimeoutExpired, ChildProcessError):
+                pass
+            self._publish_exit(process_id, "terminated")
+
+    def _publish_exit(self, process_id: str, status: str):
+        with self._lock:
+            callbacks = list(self._exit_callbacks)
+        for callback in callbacks:
+            try:
+                callback(process_id, status)
+            except Exception as e:
+                logger.error(f"Error in exit subscriber for {process_id}: {e}")
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.sample_once()
+            with self._lock:
+                if not self._tracked:
+                    # Exits when idle; track() starts a new thread on demand
+                    self._thread = None
+                    return
+
+    def wake(self):
+        """Run the next pass now instead of waiting for the interval."""
+        self._wakeup.set()
+
+
 class ProcessManager:
     """
     Manager for spawning, monitoring, and controlling Dream.OS component processes.
@@ -54,7 +226,8 @@ class ProcessManager:
         """Initialize the process manager."""
         self._processes = {}  # Map of process_id -> process data
         self._lock = threading.RLock()
-        self._monitors = {}  # Map of process_id -> monitor thread
+        self._sampler = ResourceSampler()  # One thread samples every monitored process
+        self._sampler.subscribe(on_sample=self._on_sample, on_exit=self._on_exit)
         self._recovery_handlers = {}  # Map of component_type -> recovery handler
         self._load_running_processes()
         
@@ -139,118 +312,73 @@ class ProcessManager:
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
         return f"{component_id}_{timestamp}"
         
-    def _monitor_process(self, process_id: str):
+    def _on_sample(self, process_id: str, sample: Dict[str, Any]):
         """
-        Monitor a running process and handle termination.
+        Record a resource sample and run the per-sample checks.
         
         Args:
-            process_id: ID of the process to monitor
+            process_id: ID of the sampled process
+            sample: Sample published by the ResourceSampler
         """
-        try:
-            with self._lock:
-                if process_id not in self._processes:
-                    logger.warning(f"Process {process_id} not found for monitoring")
-                    return
-                    
-                process_data = self._processes[process_id]
-                pid = process_data.get("pid")
+        with self._lock:
+            if process_id not in self._processes:
+                return
+            self._processes[process_id]["resource_usage"] = sample
+            
+        # Check resource limits
+        self._check_resource_limits(process_id, sample["cpu_percent"], sample["memory_mb"])
+        
+        # Save checkpoint if needed
+        self._check_checkpoint_needs(process_id)
+        
+    def _on_exit(self, process_id: str, status: str):
+        """
+        Handle a monitored process that has gone away.
+        
+        Args:
+            process_id: ID of the process
+            status: "terminated" if it exited while monitored, "crashed" if it was already gone
+        """
+        with self._lock:
+            if process_id not in self._processes:
+                return
+            process_data = self._processes[process_id]
+            if process_data.get("status") != "running":
+                # Already stopped through stop_process
+                return
                 
-                if not pid:
-                    logger.warning(f"No PID found for process {process_id}")
-                    return
-                    
-            try:
-                process = psutil.Process(pid)
+            # Update process data
+            process_data["status"] = status
+            process_data["end_time"] = datetime.now().isoformat()
+            
+            # Handle recovery if needed
+            self._handle_process_termination(process_id)
+            
+            # Save updated process data
+            self._save_process_data(process_id, process_data)
+            
+            if status == "crashed":
+                logger.warning(f"Process {process_id} (PID: {process_data.get('pid')}) has crashed")
+            else:
+                logger.info(f"Process {process_id} (PID: {process_data.get('pid')}) has terminated")
                 
-                # Monitor loop
-                while True:
-                    try:
-                        # Check if process is still running
-                        if not process.is_running():
-                            break
-                            
-                        # Collect resource usage
-                        try:
-                            cpu_percent = process.cpu_percent(interval=1.0)
-                            memory_info = process.memory_info()
-                            memory_mb = memory_info.rss / (1024 * 1024)
-                            
-                            # Update process data with resource usage
-                            with self._lock:
-                                if process_id in self._processes:
-                                    self._processes[process_id]["resource_usage"] = {
-                                        "cpu_percent": cpu_percent,
-                                        "memory_mb": memory_mb,
-                                        "timestamp": datetime.now().isoformat()
-                                    }
-                                    
-                            # Check resource limits
-                            self._check_resource_limits(process_id, cpu_percent, memory_mb)
-                            
-                            # Save checkpoint if needed
-                            self._check_checkpoint_needs(process_id)
-                        except Exception as e:
-                            logger.error(f"Error collecting resource usage for {process_id}: {e}")
-                            
-                        # Sleep for monitoring interval
-                        time.sleep(5)
-                    except Exception as e:
-                        logger.error(f"Error in monitoring loop for {process_id}: {e}")
-                        time.sleep(5)
-                        
-                # Process has terminated
-                with self._lock:
-                    if process_id in self._processes:
-                        # Update process data
-                        self._processes[process_id]["status"] = "terminated"
-                        self._processes[process_id]["end_time"] = datetime.now().isoformat()
-                        
-                        # Handle recovery if needed
-                        self._handle_process_termination(process_id)
-                        
-                        # Save updated process data
-                        self._save_process_data(process_id, self._processes[process_id])
-                        
-                        logger.info(f"Process {process_id} (PID: {pid}) has terminated")
-            except psutil.NoSuchProcess:
-                with self._lock:
-                    if process_id in self._processes:
-                        # Update process data
-                        self._processes[process_id]["status"] = "crashed"
-                        self._processes[process_id]["end_time"] = datetime.now().isoformat()
-                        
-                        # Handle recovery if needed
-                        self._handle_process_termination(process_id)
-                        
-                        # Save updated process data
-                        self._save_process_data(process_id, self._processes[process_id])
-                        
-                        logger.warning(f"Process {process_id} (PID: {pid}) has crashed")
-        except Exception as e:
-            logger.error(f"Error monitoring process {process_id}: {e}")
-        finally:
-            # Clean up
-            with self._lock:
-                if process_id in self._monitors:
-                    del self._monitors[process_id]
-                    
     def _start_monitor(self, process_id: str):
         """
-        Start a monitoring thread for a process.
+        Start monitoring a process through the shared sampler.
         
         Args:
             process_id: ID of the process to monitor
         """
-        if process_id in self._monitors:
+        with self._lock:
+            process_data = self._processes.get(process_id)
+            pid = process_data.get("pid") if process_data else None
+            
+        if not pid:
+            logger.warning(f"No PID found for process {process_id}")
             return
             
-        monitor_thread = threading.Thread(
-            target=self._monitor_process,
-            args=(process_id,),
-            daemon=True
-        )
-        self._monitors[process_id] = monitor_thread
-        monitor_thread.start()
+        if not self._sampler.is_tracked(process_id):
+            self._sampler.track(process_id, pid)
         
     def _check_resource_limits(self, process_id: str, cpu_percent: float, memory_mb: float):
         """
@@ -706,6 +834,9 @@ class ProcessManager:
                         process.kill()
                         logger.warning(f"Process {process_id} (PID: {pid}) did not terminate gracefully, force killed")
                         
+                # A deliberate stop is not a failure to recover from
+                self._sampler.untrack(process_id)
+                
                 # Update process data
                 process_data["status"] = "terminated"
                 process_data["end_time"] = datetime.now().isoformat()
@@ -714,6 +845,7 @@ class ProcessManager:
                 return True
             except psutil.NoSuchProcess:
                 # Process already terminated
+                self._sampler.untrack(process_id)
                 process_data["status"] = "terminated"
                 process_data["end_time"] = datetime.now().isoformat()
                 self._save_process_data(process_id, process_data)
@@ -838,10 +970,7 @@ class ProcessManager:
                 return None
                 
             try:
-                with open(log_file, 'r') as f:
-                    # Get last N lines
-                    lines = f.readlines()
-                    return lines[-max_lines:] if len(lines) > max_lines else lines
+                return tail_lines(log_file, max_lines)
             except Exception as e:
                 logger.error(f"Error reading logs for process {process_id}: {e}")
                 return None
@@ -8,10 +8,13 @@ Features:
 - Persistent storage of component metadata
 - Schema validation for component entries
 - Transaction safety for concurrent access
-- Search and filtering capabilities
+- Search and filtering capabilities, backed by secondary indexes on
+  type, owner, status and tags
+- Rotating, compressed, incremental backups
 """
 
 import os
+import gzip
 import json
 import time
 import logging
@@ -33,6 +36,12 @@ REGISTRY_PATH = METADATA_DIR / "component_registry.json"
 REGISTRY_BACKUP_DIR = METADATA_DIR / "backups"
 TRANSACTION_LOG_PATH = METADATA_DIR / "transaction_log.json"
 
+# Fields with a value -> component IDs index; tags get their own index
+INDEXED_FIELDS = ("type", "owner_agent", "status")
+# Backups form chains: one full snapshot followed by deltas of changed components
+BACKUP_CHAIN_LENGTH = 50  # deltas before a new full snapshot is started
+MAX_BACKUP_CHAINS = 5     # older chains (and legacy full-copy backups) are pruned
+
 # Ensure directories exist
 for dir_path in [METADATA_DIR, SCHEMAS_DIR, REGISTRY_BACKUP_DIR]:
     dir_path.mkdir(parents=True, exist_ok=True)
@@ -57,6 +66,13 @@ class ComponentRegistry:
         """Initialize the registry with lock for thread safety."""
         self._lock = threading.RLock()
         self._components = {}
+        self._field_index: Dict[str, Dict[Any, Set[str]]] = {field: {} for field in INDEXED_FIELDS}
+        self._tag_index: Dict[str, Set[str]] = {}
+        # Canonical JSON of each component as last written to disk, and as
+        # captured by the newest backup (loaded lazily from the backup chain)
+        self._disk_state: Dict[str, str] = {}
+        self._backup_state: Optional[Dict[str, str]] = None
+        self._chain_length = 0
         self._schema = self._load_schema()
         self._load_registry()
         
@@ -199,27 +215,152 @@ class ComponentRegistry:
                 
         return False
     
+    # ----- secondary indexes -----
+
+    def _index_add(self, component_id: str, component: Dict[str, Any]) -> None:
+        for field in INDEXED_FIELDS:
+            value = component.get(field)
+            if value is not None and _hashable(value):
+                self._field_index[field].setdefault(value, set()).add(component_id)
+        for tag in _tags(component):
+            self._tag_index.setdefault(tag, set()).add(component_id)
+
+    def _index_remove(self, component_id: str, component: Dict[str, Any]) -> None:
+        for field in INDEXED_FIELDS:
+            value = component.get(field)
+            if value is not None and _hashable(value):
+                ids = self._field_index[field].get(value)
+                if ids is not None:
+                    ids.discard(component_id)
+                    if not ids:
+                        del self._field_index[field][value]
+        for tag in _tags(component):
+            ids = self._tag_index.get(tag)
+            if ids is not None:
+                ids.discard(component_id)
+                if not ids:
+                    del self._tag_index[tag]
+
+    def _rebuild_indexes(self) -> None:
+        self._field_index = {field: {} for field in INDEXED_FIELDS}
+        self._tag_index = {}
+        for comp_id, comp in self._components.items():
+            self._index_add(comp_id, comp)
+
+    def _put(self, component_id: str, component: Optional[Dict[str, Any]]) -> None:
+        """Set (or with None, remove) a component, keeping the indexes in step."""
+        old = self._components.pop(component_id, None)
+        if old is not None:
+            self._index_remove(component_id, old)
+        if component is not None:
+            self._components[component_id] = component
+            self._index_add(component_id, component)
+
+    # ----- backups -----
+
+    def _backup_files(self) -> List[Tuple[str, str, Path]]:
+        """All backups as (timestamp, kind, path), oldest first.
+
+        kind is "full" or "delta" for chain files and "legacy" for the
+        uncompressed whole-file copies written by earlier versions.
+        """
+        backups = []
+        for path in REGISTRY_BACKUP_DIR.glob("registry_backup_*"):
+            name = path.name[len("registry_backup_"):]
+            if name.endswith(".full.json.gz"):
+                backups.append((name[:-len(".full.json.gz")], "full", path))
+            elif name.endswith(".delta.json.gz"):
+                backups.append((name[:-len(".delta.json.gz")], "delta", path))
+            elif name.endswith(".json"):
+                backups.append((name[:-len(".json")], "legacy", path))
+        return sorted(backups)
+
+    def _replay_chain(self, upto: Optional[str] = None) -> Tuple[Optional[Dict[str, str]], int]:
+        """State captured by the chain containing ``upto`` (latest if None),
+        plus the number of deltas applied."""
+        chain: List[Tuple[str, str, Path]] = []
+        for backup in self._backup_files():
+            if upto is not None and backup[0] > upto:
+                break
+            if backup[1] == "full":
+                chain = [backup]
+            elif backup[1] == "delta" and chain:
+                chain.append(backup)
+        if not chain:
+            return None, 0
+        state: Dict[str, str] = {}
+        for _, kind, path in chain:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+            if kind == "full":
+                state = {k: _canonical(v) for k, v in data["components"].items()}
+            else:
+                for comp_id in data.get("removed", []):
+                    state.pop(comp_id, None)
+                state.update({k: _canonical(v) for k, v in data.get("changed", {}).items()})
+        return state, len(chain) - 1
+
+    def _write_backup_file(self, path: Path, payload: Dict[str, Any]) -> None:
+        temp_path = path.with_name(path.name + ".tmp")
+        with gzip.open(temp_path, "wt", encoding="utf-8") as f:
+            json.dump(payload, f)
+        temp_path.replace(path)
+
+    def _prune_backups(self) -> None:
+        """Keep the newest MAX_BACKUP_CHAINS chains; drop everything older."""
+        fulls = [ts for ts, kind, _ in self._backup_files() if kind == "full"]
+        if len(fulls) <= MAX_BACKUP_CHAINS:
+            return
+        oldest_kept = fulls[-MAX_BACKUP_CHAINS]
+        for ts, _, path in self._backup_files():
+            if ts < oldest_kept:
+                path.unlink(missing_ok=True)
+
     def _create_backup(self) -> bool:
         """
-        Create a backup of the current registry.
+        Back up the registry as last saved to disk.
+        
+        Writes only the components that changed since the previous backup;
+        every BACKUP_CHAIN_LENGTH deltas a full compressed snapshot starts a
+        new chain and the oldest chains are pruned.
         
         Returns:
-            True if successful, False otherwise
+            True if successful (or nothing changed), False otherwise
         """
         if not REGISTRY_PATH.exists():
             logger.warning("No registry file to backup")
             return False
             
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_path = REGISTRY_BACKUP_DIR / f"registry_backup_{timestamp}.json"
-        
-        try:
-            shutil.copy2(REGISTRY_PATH, backup_path)
-            logger.info(f"Created registry backup: {backup_path}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to create backup: {e}")
-            return False
+        with self._lock:
+            try:
+                if self._backup_state is None:
+                    self._backup_state, self._chain_length = self._replay_chain()
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+                current = self._disk_state
+                previous = self._backup_state
+                if previous == current:
+                    return True
+                    
+                if previous is None or self._chain_length >= BACKUP_CHAIN_LENGTH:
+                    backup_path = REGISTRY_BACKUP_DIR / f"registry_backup_{timestamp}.full.json.gz"
+                    self._write_backup_file(backup_path, {
+                        "components": {k: json.loads(v) for k, v in current.items()}
+                    })
+                    self._chain_length = 0
+                    self._prune_backups()
+                else:
+                    changed = {k: json.loads(v) for k, v in current.items() if previous.get(k) != v}
+                    removed = [k for k in previous if k not in current]
+                    backup_path = REGISTRY_BACKUP_DIR / f"registry_backup_{timestamp}.delta.json.gz"
+                    self._write_backup_file(backup_path, {"changed": changed, "removed": removed})
+                    self._chain_length += 1
+                    
+                self._backup_state = dict(current)
+                logger.info(f"Created registry backup: {backup_path}")
+                return True
+            except Exception as e:
+                logger.error(f"Failed to create backup: {e}")
+                return False
             
     def _load_registry(self) -> None:
         """Load the component registry from disk."""
@@ -246,6 +387,8 @@ class ComponentRegistry:
             else:
                 logger.info("Registry file not found, starting with empty registry")
                 self._components = {}
+            self._rebuild_indexes()
+            self._disk_state = {k: _canonical(v) for k, v in self._components.items()}
                 
     def _save_registry(self) -> bool:
         """
@@ -279,6 +422,7 @@ class ComponentRegistry:
             )
             
             if success:
+                self._disk_state = {k: _canonical(v) for k, v in clean_components.items()}
                 logger.info(f"Saved registry with {len(clean_components)} components")
             else:
                 logger.error("Failed to save registry")
@@ -383,7 +527,7 @@ class ComponentRegistry:
             component["updated_at"] = component["created_at"]
             
             # Add to registry
-            self._components[component_id] = component
+            self._put(component_id, component)
             
             # Save registry
             if self._save_registry():
@@ -391,8 +535,7 @@ class ComponentRegistry:
                 return True, None
             else:
                 # Revert changes if save failed
-                if component_id in self._components:
-                    del self._components[component_id]
+                self._put(component_id, None)
                 return False, "Failed to save registry"
                 
     def update_component(self, component_id: str, updates: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
@@ -435,7 +578,7 @@ class ComponentRegistry:
                 return False, error
                 
             # Update in registry
-            self._components[component_id] = component
+            self._put(component_id, component)
             
             # Save registry
             if self._save_registry():
@@ -447,7 +590,7 @@ class ComponentRegistry:
                 return True, None
             else:
                 # Revert changes if save failed
-                self._components[component_id] = original
+                self._put(component_id, original)
                 return False, "Failed to save registry"
                 
     def delete_component(self, component_id: str) -> Tuple[bool, Optional[str]]:
@@ -471,7 +614,7 @@ class ComponentRegistry:
             original = dict(component) if component else {}
             
             # Remove from registry
-            del self._components[component_id]
+            self._put(component_id, None)
             
             # Save registry
             if self._save_registry():
@@ -481,7 +624,7 @@ class ComponentRegistry:
             else:
                 # Revert changes if save failed
                 if original:
-                    self._components[component_id] = original
+                    self._put(component_id, original)
                 return False, "Failed to save registry"
                 
     def search_components(self, 
@@ -498,25 +641,28 @@ class ComponentRegistry:
             Dictionary of matching component_id -> component data
         """
         with self._lock:
-            # Start with all components, filtering out None values
-            results = {k: v for k, v in self._components.items() if v is not None}
-            
-            # Apply field filters
-            if filters:
-                for field, value in filters.items():
-                    results = {
-                        comp_id: comp for comp_id, comp in results.items()
-                        if comp.get(field) == value
-                    }
-                    
-            # Apply tag filters
-            if tags:
-                results = {
-                    comp_id: comp for comp_id, comp in results.items()
-                    if all(tag in comp.get("tags", []) for tag in tags)
-                }
+            # Narrow through the indexes, smallest set first
+            index_sets = []
+            remaining = {}
+            for field, value in (filters or {}).items():
+                if field in self._field_index and value is not None and _hashable(value):
+                    index_sets.append(self._field_index[field].get(value, set()))
+                else:
+                    remaining[field] = value
+            for tag in tags or []:
+                index_sets.append(self._tag_index.get(tag, set()) if _hashable(tag) else set())
                 
-            return results
+            if index_sets:
+                index_sets.sort(key=len)
+                ids = set(index_sets[0]).intersection(*index_sets[1:])
+            else:
+                ids = self._components.keys()
+                
+            # Fields without an index are checked on the narrowed set only
+            return {
+                comp_id: self._components[comp_id] for comp_id in ids
+                if all(self._components[comp_id].get(field) == value for field, value in remaining.items())
+            }
             
     def get_components_by_type(self, component_type: str) -> Dict[str, Any]:
         """
@@ -567,28 +713,56 @@ class ComponentRegistry:
             Tuple of (success, error_message)
         """
         try:
-            # Find the backup file
-            if backup_timestamp:
-                backup_path = REGISTRY_BACKUP_DIR / f"registry_backup_{backup_timestamp}.json"
-                if not backup_path.exists():
-                    return False, f"Backup with timestamp {backup_timestamp} not found"
-            else:
-                backup_files = list(REGISTRY_BACKUP_DIR.glob("registry_backup_*.json"))
-                if not backup_files:
-                    return False, "No backup files found"
+            with self._lock:
+                backups = self._backup_files()
+                if backup_timestamp:
+                    matches = [b for b in backups if b[0] == backup_timestamp]
+                    if not matches:
+                        return False, f"Backup with timestamp {backup_timestamp} not found"
+                    target = matches[0]
+                else:
+                    if not backups:
+                        return False, "No backup files found"
+                    target = backups[-1]
                     
-                # Sort by modification time (newest first)
-                backup_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-                backup_path = backup_files[0]
+                timestamp, kind, backup_path = target
+                if kind == "legacy":
+                    # Copy whole-file backup to registry file
+                    shutil.copy2(backup_path, REGISTRY_PATH)
+                else:
+                    state, _ = self._replay_chain(upto=timestamp)
+                    registry_data = {
+                        "components": {k: json.loads(v) for k, v in (state or {}).items()},
+                        "last_updated": datetime.now().isoformat(),
+                        "version": "1.0.0"
+                    }
+                    if not self._resilient_write(REGISTRY_PATH, json.dumps(registry_data, indent=2)):
+                        return False, "Failed to write restored registry"
+                    
+                # Reload the registry
+                self._load_registry()
                 
-            # Copy backup to registry file
-            shutil.copy2(backup_path, REGISTRY_PATH)
-            
-            # Reload the registry
-            self._load_registry()
-            
             logger.info(f"Restored registry from backup: {backup_path}")
             return True, None
         except Exception as e:
             logger.error(f"Error restoring backup: {e}")
-            return False, str(e) 
\ No newline at end of file
+            return False, str(e)
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+        return True
+    except TypeError:
+        return False
+
+
+def _tags(component: Dict[str, Any]) -> Set[str]:
+    tags = component.get("tags")
+    if not isinstance(tags, (list, tuple, set)):
+        return set()
+    return {tag for tag in tags if _hashable(tag)}
+
+
+def _canonical(component: Dict[str, Any]) -> str:
+    return json.dumps(component, sort_keys=True)
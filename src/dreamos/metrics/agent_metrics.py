@@ -2,116 +2,135 @@
 Core metrics collection and management for agent responses.
 """
 
-import time
 import json
-from datetime import datetime
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
+from dreamos.core.metrics_sink import get_metrics_sink
+
 class AgentMetrics:
-    """Manages metrics collection for individual agents."""
+    """Manages metrics collection for individual agents.
+    
+    Points are recorded into the process-wide metrics sink for
+    ``runtime/metrics``, which keeps a bounded window of recent points per
+    series and flushes them to disk in batches.
+    """
+    
+    SERIES = ('response_times', 'success_rates', 'resource_utilization')
     
     def __init__(self, agent_id: str):
         self.agent_id = agent_id
         self.metrics_dir = Path("runtime/metrics")
         self.metrics_dir.mkdir(parents=True, exist_ok=True)
         self.metrics_file = self.metrics_dir / f"{agent_id}_metrics.json"
+        self.sink = get_metrics_sink(self.metrics_dir)
+        self.sink.register_agent(agent_id)
         self._load_metrics()
     
     def _load_metrics(self):
-        """Load existing metrics from file."""
-        if self.metrics_file.exists():
-            with open(self.metrics_file, 'r') as f:
-                self.metrics = json.load(f)
-        else:
-            self.metrics = {
-                'response_times': [],
-                'success_rates': [],
-                'resource_utilization': []
-            }
-    
-    def _save_metrics(self):
-        """Save metrics to file."""
-        with open(self.metrics_file, 'w') as f:
-            json.dump(self.metrics, f, indent=2)
+        """Import a legacy per-agent metrics file into the sink, once."""
+        if not self.metrics_file.exists():
+            return
+        with open(self.metrics_file, 'r') as f:
+            legacy = json.load(f)
+        for entry in legacy.get('response_times', []):
+            self.sink.record('response_times', self.agent_id, entry['duration_ms'],
+                             entry, entry.get('timestamp'))
+        for entry in legacy.get('success_rates', []):
+            self.sink.record('success_rates', self.agent_id, 1.0 if entry['success'] else 0.0,
+                             entry, entry.get('timestamp'))
+        for entry in legacy.get('resource_utilization', []):
+            self.sink.record('resource_utilization', self.agent_id, entry['utilization'],
+                             entry, entry.get('timestamp'))
+        self.metrics_file.replace(self.metrics_file.with_suffix('.json.migrated'))
+    
+    @property
+    def metrics(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Recent points per series, in the shape of the old per-agent file."""
+        return {series: self.sink.recent(series, self.agent_id) for series in self.SERIES}
     
     def record_response_time(self, action: str, duration_ms: float):
         """Record response time for an action."""
-        self.metrics['response_times'].append({
-            'timestamp': datetime.now().isoformat(),
+        self.sink.record('response_times', self.agent_id, duration_ms, {
             'action': action,
             'duration_ms': duration_ms
         })
-        self._save_metrics()
     
     def record_success_rate(self, action: str, success: bool):
         """Record success/failure for an action."""
-        self.metrics['success_rates'].append({
-            'timestamp': datetime.now().isoformat(),
+        self.sink.record('success_rates', self.agent_id, 1.0 if success else 0.0, {
             'action': action,
             'success': success
         })
-        self._save_metrics()
     
     def record_resource_utilization(self, resource_type: str, utilization: float):
         """Record resource utilization."""
-        self.metrics['resource_utilization'].append({
-            'timestamp': datetime.now().isoformat(),
+        self.sink.record('resource_utilization', self.agent_id, utilization, {
             'resource_type': resource_type,
             'utilization': utilization
         })
-        self._save_metrics()
     
     def get_response_times(self, action: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get response times, optionally filtered by action."""
+        """Get recent response times, optionally filtered by action."""
+        response_times = self.sink.recent('response_times', self.agent_id)
         if action:
-            return [rt for rt in self.metrics['response_times'] if rt['action'] == action]
-        return self.metrics['response_times']
+            return [rt for rt in response_times if rt['action'] == action]
+        return response_times
     
     def get_success_rates(self, action: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get success rates, optionally filtered by action."""
+        """Get recent success rates, optionally filtered by action."""
+        success_rates = self.sink.recent('success_rates', self.agent_id)
         if action:
-            return [sr for sr in self.metrics['success_rates'] if sr['action'] == action]
-        return self.metrics['success_rates']
+            return [sr for sr in success_rates if sr['action'] == action]
+        return success_rates
     
     def get_resource_utilization(self, resource_type: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get resource utilization, optionally filtered by resource type."""
+        """Get recent resource utilization, optionally filtered by resource type."""
+        resource_util = self.sink.recent('resource_utilization', self.agent_id)
         if resource_type:
-            return [ru for ru in self.metrics['resource_utilization'] if ru['resource_type'] == resource_type]
-        return self.metrics['resource_utilization']
+            return [ru for ru in resource_util if ru['resource_type'] == resource_type]
+        return resource_util
+    
+    def get_summary(self) -> Dict[str, Dict[str, Any]]:
+        """Get precomputed aggregates (count, mean, min, max, rolling mean) per series."""
+        return {series: self.sink.stats(series, self.agent_id) for series in self.SERIES}
 
 class MetricsCollector:
-    """Collects metrics across multiple agents."""
+    """Collects metrics across multiple agents from the shared metrics sink."""
     
     def __init__(self):
         self.metrics_dir = Path("runtime/metrics")
         self.metrics_dir.mkdir(parents=True, exist_ok=True)
+        self.sink = get_metrics_sink(self.metrics_dir)
     
     def get_all_agent_metrics(self) -> Dict[str, AgentMetrics]:
         """Get metrics for all agents."""
-        metrics = {}
+        # Legacy per-agent files not yet imported into the sink
         for metrics_file in self.metrics_dir.glob("*_metrics.json"):
-            agent_id = metrics_file.stem.replace("_metrics", "")
-            metrics[agent_id] = AgentMetrics(agent_id)
-        return metrics
+            self.sink.register_agent(metrics_file.stem.replace("_metrics", ""))
+        return {agent_id: AgentMetrics(agent_id) for agent_id in self.sink.agents()}
     
     def get_aggregate_response_times(self, action: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get aggregate response times across all agents."""
-        all_times = []
-        for agent_metrics in self.get_all_agent_metrics().values():
-            all_times.extend(agent_metrics.get_response_times(action))
-        return sorted(all_times, key=lambda x: x['timestamp'])
+        """Get aggregate recent response times across all agents."""
+        all_times = self.sink.recent('response_times')
+        if action:
+            return [rt for rt in all_times if rt['action'] == action]
+        return all_times
     
     def get_aggregate_success_rates(self, action: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get aggregate success rates across all agents."""
-        all_rates = []
-        for agent_metrics in self.get_all_agent_metrics().values():
-            all_rates.extend(agent_metrics.get_success_rates(action))
-        return sorted(all_rates, key=lambda x: x['timestamp'])
+        """Get aggregate recent success rates across all agents."""
+        all_rates = self.sink.recent('success_rates')
+        if action:
+            return [sr for sr in all_rates if sr['action'] == action]
+        return all_rates
     
     def get_aggregate_resource_utilization(self, resource_type: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get aggregate resource utilization across all agents."""
-        all_util = []
-        for agent_metrics in self.get_all_agent_metrics().values():
-            all_util.extend(agent_metrics.get_resource_utilization(resource_type))
-        return sorted(all_util, key=lambda x: x['timestamp']) 
\ No newline at end of file
+        """Get aggregate recent resource utilization across all agents."""
+        all_util = self.sink.recent('resource_utilization')
+        if resource_type:
+            return [ru for ru in all_util if ru['resource_type'] == resource_type]
+        return all_util
+    
+    def get_aggregate_stats(self, series: str, agent_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get precomputed aggregates for a series, across all agents by default."""
+        return self.sink.stats(series, agent_id)
@@ -12,8 +12,9 @@ try:
 except Exception:  # pragma: no cover - optional dependency may not be available
     pyperclip = None
 import argparse
+import threading
 from enum import Enum
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, Iterable, List, Any
 import os
 import sys
 from datetime import datetime, timezone
@@ -24,7 +25,12 @@ project_root = Path(__file__).resolve().parents[3]
 # EDIT END
 sys.path.append(str(project_root))
 
-from dreamos.tools.cursor_controller import CursorController
+from dreamos.automation.input_arbiter import (
+    DEFAULT_PRIORITY,
+    InputArbiter,
+    MockInputBackend,
+    get_input_arbiter,
+)
 from dreamos.core.agent_registry import AgentRegistry
 
 # Configure logging
@@ -46,33 +52,58 @@ class MessageMode(Enum):
     CAPTAIN = "[CAPTAIN]"
     TASK = "[TASK]"
     INTEGRATE = "[INTEGRATE]"
+    STATUS = "[STATUS]"
+    WAKE = "[WAKE]"
     NORMAL = ""  # No additional tags
 
 def send_cell_phone_message(from_agent, to_agent, message, priority=2):
     """Send a message from one agent to another using the cellphone system."""
     try:
-        cellphone = AgentCellphone(agent_id=from_agent)  # Use from_agent as the sender
-        return cellphone.message_agent(to_agent, message, mode=MessageMode.RESUME)  # Use RESUME mode to add tags
+        cellphone = get_cellphone()
+        logger.debug(f"Relaying message from {from_agent} to {to_agent}")
+        return cellphone.message_agent(to_agent, message, mode=MessageMode.RESUME, priority=priority)  # Use RESUME mode to add tags
     except Exception as e:
         logger.error(f"Failed to send cell phone message from {from_agent} to {to_agent}: {e}")
         return False
 
 class AgentCellphone:
-    def __init__(self):
-        self.cursor = CursorController()
-        self.registry = AgentRegistry()
-        self.config_dir = project_root / "runtime" / "config"
+    def __init__(self, agent_id: Optional[str] = None, arbiter: Optional[InputArbiter] = None,
+                 config_dir: Optional[Path] = None):
+        self.agent_id = agent_id
+        # All mouse/keyboard access goes through the shared arbiter so that
+        # concurrent senders (and CursorOrchestrator) never interleave input
+        self.arbiter = arbiter or get_input_arbiter()
+        self._registry: Optional[AgentRegistry] = None
+        self.config_dir = Path(config_dir) if config_dir else project_root / "runtime" / "config"
         self.coords_file = self.config_dir / "cursor_agent_coords.json"
         self.modes_file = self.config_dir / "templates" / "agent_modes.json"
+        self._config_stamp = None
+        self._config_lock = threading.Lock()
         self.load_configs()
 
+    @property
+    def registry(self) -> AgentRegistry:
+        """Agent registry, created on first use (only onboarding needs it)"""
+        if self._registry is None:
+            self._registry = AgentRegistry()
+        return self._registry
+
+    def _stat_configs(self):
+        stamp = []
+        for path in (self.coords_file, self.modes_file):
+            st = path.stat()
+            stamp.append((st.st_mtime_ns, st.st_size))
+        return tuple(stamp)
+
     def load_configs(self):
         """Load configuration files"""
         try:
+            stamp = self._stat_configs()
             with open(self.coords_file, 'r') as f:
                 self.coords = json.load(f)
             with open(self.modes_file, 'r') as f:
                 self.modes = json.load(f)
+            self._config_stamp = stamp
         except FileNotFoundError as e:
             logger.error(f"Configuration file not found: {e}")
             sys.exit(1)
@@ -80,8 +111,27 @@ class AgentCellphone:
             logger.error(f"Error parsing configuration file: {e}")
             sys.exit(1)
 
+    def refresh_configs(self):
+        """Reload configuration files if either has changed on disk"""
+        with self._config_lock:
+            try:
+                stamp = self._stat_configs()
+                if stamp == self._config_stamp:
+                    return
+                with open(self.coords_file, 'r') as f:
+                    coords = json.load(f)
+                with open(self.modes_file, 'r') as f:
+                    modes = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                # Likely caught mid-write; keep serving the last good config
+                logger.warning(f"Keeping previous configuration, reload failed: {e}")
+                return
+            self.coords, self.modes, self._config_stamp = coords, modes, stamp
+            logger.info("Reloaded cellphone configuration")
+
     def get_agent_coords(self, agent_id: str) -> Dict[str, Any]:
         """Get coordinates for a specific agent"""
+        self.refresh_configs()
         if agent_id not in self.coords:
             raise ValueError(f"Agent {agent_id} not found in coordinates file")
         
@@ -122,58 +172,85 @@ class AgentCellphone:
 
     def get_mode_template(self, mode: str, **kwargs) -> str:
         """Get the prompt template for a specific mode"""
+        self.refresh_configs()
         if mode not in self.modes["modes"]:
             raise ValueError(f"Mode {mode} not found in modes configuration")
         
         template = self.modes["modes"][mode]["prompt_template"]
         return template.format(**kwargs)
 
-    def send_message(self, agent_id: str, message: str, mode: MessageMode = MessageMode.NORMAL):
+    def _queue_message(self, agent_id: str, message: str, priority: int = DEFAULT_PRIORITY):
+        """Queue a message for the agent's input box; returns the job's future"""
+        input_box = self.get_agent_coords(agent_id)["input_box"]
+        # The chat input is addressed by screen position, not window title
+        return self.arbiter.inject(
+            agent_id, message, coords=(input_box["x"], input_box["y"]),
+            priority=priority, focus=False,
+        )
+
+    def send_message(self, agent_id: str, message: str, mode: MessageMode = MessageMode.NORMAL,
+                     priority: int = DEFAULT_PRIORITY):
         """Send a message to a specific agent"""
         try:
-            coords = self.get_agent_coords(agent_id)
-            
             # Format message with mode tag if needed
             if mode != MessageMode.NORMAL:
                 message = f"{mode.value} {message}"
-            
-            # Click input box
-            input_box = coords["input_box"]
-            self.cursor.move_to(input_box["x"], input_box["y"])
-            self.cursor.click()
-            time.sleep(0.5)
-            
-            # Type message
-            self.cursor.type_text(message)
-            time.sleep(0.5)
-            
-            # Press Enter to send
-            self.cursor.press_enter()
-            time.sleep(1)
-            
-            # If this is part of initialization sequence, wait longer
-            if "Confirm your identity" in message or "Load your core protocols" in message or \
-               "Initialize your state management" in message or "Connect to the agent registry" in message or \
-               "Establish communication channels" in message or "Report your initialization status" in message:
-                time.sleep(2)  # Wait longer for initialization steps
-            
+
+            self._queue_message(agent_id, message, priority).result()
             logger.info(f"Message sent to {agent_id} with mode {mode.value}")
             
         except Exception as e:
             logger.error(f"Error sending message to {agent_id}: {e}")
             raise
 
+    def message_agent(self, agent_id: str, message: str, mode: MessageMode = MessageMode.NORMAL,
+                      priority: int = DEFAULT_PRIORITY) -> bool:
+        """Send a message to another agent, returning whether it was delivered"""
+        try:
+            self.send_message(agent_id, message, mode, priority)
+            return True
+        except Exception:
+            return False
+
+    def message_agents(self, agent_ids: Iterable[str], message: str,
+                       mode: MessageMode = MessageMode.NORMAL,
+                       priority: int = DEFAULT_PRIORITY) -> Dict[str, bool]:
+        """Deliver one message to many agents in a single pass.
+
+        Recipients are queued in screen order (top to bottom, then left to
+        right) so the cursor sweeps across the windows once, and all of them
+        are queued before waiting on any. Returns delivery status per agent.
+        """
+        if mode != MessageMode.NORMAL:
+            message = f"{mode.value} {message}"
+        results: Dict[str, bool] = {}
+        targets = []
+        for agent_id in agent_ids:
+            try:
+                box = self.get_agent_coords(agent_id)["input_box"]
+                targets.append(((box["y"], box["x"]), agent_id))
+            except Exception as e:
+                logger.error(f"Error sending to {agent_id}: {e}")
+                results[agent_id] = False
+        pending = {}
+        for _, agent_id in sorted(targets):
+            try:
+                pending[agent_id] = self._queue_message(agent_id, message, priority)
+            except Exception as e:
+                logger.error(f"Error sending to {agent_id}: {e}")
+                results[agent_id] = False
+        for agent_id, future in pending.items():
+            try:
+                results[agent_id] = bool(future.result())
+            except Exception as e:
+                logger.error(f"Error sending to {agent_id}: {e}")
+                results[agent_id] = False
+        logger.info(f"Message sent to {sum(results.values())}/{len(results)} agents with mode {mode.value}")
+        return results
+
     def onboard_agent(self, agent_id: str, message: str):
         """Onboard a new agent with initial setup"""
         try:
-            coords = self.get_agent_coords(agent_id)
-            
-            # Click the input box directly - no need to click initial spot first
-            input_box = coords["input_box"]
-            self.cursor.move_to(input_box["x"], input_box["y"])
-            self.cursor.click()
-            time.sleep(0.5)
-            
             # Type and send the welcome message
             if not message:
                 message = f"""Welcome to Dream.os! You are now {agent_id}.
@@ -189,13 +266,7 @@ Please initialize with the following sequence:
 Once initialized, you will be integrated into the Dream.os swarm network.
 Please proceed with the initialization sequence and report your status."""
 
-            # Type message
-            self.cursor.type_text(message)
-            time.sleep(0.5)
-            
-            # Press Enter to send
-            self.cursor.press_enter()
-            time.sleep(1)
+            self._queue_message(agent_id, message).result()
             
             # Update registry
             self.registry.register_agent(agent_id)
@@ -292,6 +363,7 @@ Please proceed with the initialization sequence and report your status."""
         """List all available agents"""
         print("\nAvailable Agents:")
         print("-" * 20)
+        self.refresh_configs()
         # Filter out non-agent entries and sort
         agents = [agent_id for agent_id in self.coords.keys() 
                  if agent_id.startswith("Agent-") and 
@@ -325,13 +397,12 @@ Please proceed with the initialization sequence and report your status."""
     def send_to_all_agents(self, message: str, mode: MessageMode = MessageMode.NORMAL):
         """Send message to all agents"""
         agents = [f"Agent-{i}" for i in range(1, 9)]
+        results = self.message_agents(agents, message, mode)
         for agent_id in agents:
-            try:
-                self.send_message(agent_id, message, mode)
+            if results.get(agent_id):
                 print(f"Message sent to {agent_id}")
-            except Exception as e:
-                print(f"Error sending to {agent_id}: {e}")
-                logger.error(f"Error sending to {agent_id}: {e}")
+            else:
+                print(f"Error sending to {agent_id}")
 
     def menu_onboard_agent(self):
         """Handle agent onboarding through menu"""
@@ -599,6 +670,20 @@ Proceed with system integration operations."""
             print(f"Error sending to all agents: {e}")
             logger.error(f"Send to all error: {e}")
 
+_cellphone: Optional[AgentCellphone] = None
+_cellphone_lock = threading.Lock()
+
+
+def get_cellphone() -> AgentCellphone:
+    """Return the process-wide cellphone session, creating it on first use."""
+    global _cellphone
+    if _cellphone is None:
+        with _cellphone_lock:
+            if _cellphone is None:
+                _cellphone = AgentCellphone()
+    return _cellphone
+
+
 def main():
     parser = argparse.ArgumentParser(description="Agent Cellphone - Control agent interactions")
     parser.add_argument("--cli", action="store_true", help="Launch interactive CLI menu")
@@ -620,12 +705,12 @@ def main():
         logger.setLevel(logging.DEBUG)
         logger.debug("Debug mode enabled")
     
-    cellphone = AgentCellphone()
-    
-    # Override cursor controller in test mode
+    # Record input instead of moving the cursor in test mode
     if args.test:
         logger.info("Running in test mode - no actual cursor movements")
-        cellphone.cursor = TestCursorController()
+        cellphone = AgentCellphone(arbiter=InputArbiter(MockInputBackend()))
+    else:
+        cellphone = AgentCellphone()
     
     # Handle direct command line arguments first
     if args.agent:
@@ -720,44 +805,5 @@ Continue with your autonomous operations."""
     else:
         parser.print_help()
 
-class TestCursorController:
-    """Test version of CursorController that simulates actions without moving the cursor"""
-    def __init__(self):
-        self.last_position = (0, 0)
-        self.last_action = None
-        self.last_text = None
-        self.action_history = []
-    
-    def move_to(self, x: int, y: int):
-        self.last_position = (x, y)
-        self.last_action = f"move_to({x}, {y})"
-        self.action_history.append(self.last_action)
-        logger.debug(f"TEST: Moving cursor to ({x}, {y})")
-    
-    def click(self):
-        self.last_action = "click"
-        self.action_history.append(self.last_action)
-        logger.debug(f"TEST: Clicking at {self.last_position}")
-    
-    def type_text(self, text: str):
-        self.last_text = text
-        self.last_action = f"type_text({text})"
-        self.action_history.append(self.last_action)
-        logger.debug(f"TEST: Typing text: {text}")
-    
-    def press_enter(self):
-        self.last_action = "press_enter"
-        self.action_history.append(self.last_action)
-        logger.debug("TEST: Pressing Enter")
-    
-    def press_ctrl_n(self):
-        self.last_action = "press_ctrl_n"
-        self.action_history.append(self.last_action)
-        logger.debug("TEST: Pressing Ctrl+N")
-    
-    def get_action_history(self):
-        """Return the history of actions performed"""
-        return self.action_history
-
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -12,7 +12,7 @@ import time
 from pathlib import Path
 from datetime import datetime
 import argparse
-from agent_cellphone import AgentCellphone, MessageMode
+from agent_cellphone import MessageMode, get_cellphone
 
 # Configure logging
 logging.basicConfig(
@@ -24,7 +24,7 @@ logger = logging.getLogger('agent_onboarding')
 
 class AgentOnboarding:
     def __init__(self):
-        self.cellphone = AgentCellphone()
+        self.cellphone = get_cellphone()
         self.registry_file = Path("runtime/agent_registry.json")
         self.registry = self._load_registry()
         
@@ -12,9 +12,6 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 from queue import Queue
 import threading
-import pyautogui
-import pyperclip
-from PIL import ImageChops, Image
 import pygetwindow as gw
 import hashlib
 import os
@@ -26,6 +23,9 @@ import psutil
 import argparse
 import signal
 from dreamos.tools.agent_cellphone import send_cell_phone_message
+from dreamos.automation.input_arbiter import get_input_arbiter
+from dreamos.utils.gui.screen_watcher import get_screen_watcher
+from dreamos.tools.agent_resume.response_log import ResponseLog, jaccard, tokenize
 
 # Configure logging
 logging.basicConfig(
@@ -133,6 +133,7 @@ class ResponseValidator:
         
         # Duplicate detection window (in seconds)
         self.DUPLICATE_WINDOW = 300  # 5 minutes
+        self.SIMILARITY_THRESHOLD = 0.9
         
     def validate_response(self, agent_id: str, content: str, timestamp: str) -> Tuple[bool, str]:
         """Validate a response and return (is_valid, reason)."""
@@ -197,9 +198,22 @@ class ResponseValidator:
             logger.error(f"Error checking malformed content: {e}")
             return True
             
-    def is_duplicate(self, agent_id: str, content: str, history: List[dict]) -> bool:
-        """Check if response is a duplicate within the time window."""
+    def is_duplicate(self, agent_id: str, content: str, history) -> bool:
+        """Check if response is a duplicate within the time window.
+
+        ``history`` is either a ResponseLog, checked through its hash and LSH
+        indexes, or a list of response records, checked one by one.
+        """
         try:
+            since = (datetime.now(timezone.utc) - timedelta(seconds=self.DUPLICATE_WINDOW)).isoformat()
+            content_hash = hashlib.sha256(content.encode()).hexdigest()
+
+            if isinstance(history, ResponseLog):
+                if any(history.entries[i].agent_id == agent_id and history.entries[i].timestamp >= since
+                       for i in history.find_hash(content_hash)):
+                    return True
+                return bool(history.near_duplicates(content, agent_id, since, self.SIMILARITY_THRESHOLD))
+
             # Get recent responses for this agent
             recent = [
                 r for r in history 
@@ -207,15 +221,14 @@ class ResponseValidator:
                 (datetime.now(timezone.utc) - datetime.fromisoformat(r["timestamp"].replace('Z', '+00:00'))).total_seconds() < self.DUPLICATE_WINDOW
             ]
             
-            # Check for exact duplicates
-            content_hash = hashlib.sha256(content.encode()).hexdigest()
-            for response in recent:
-                if hashlib.sha256(response["content"].encode()).hexdigest() == content_hash:
-                    return True
+            # Check for exact duplicates (records carry their content hash)
+            if any(r.get("hash") == content_hash for r in recent):
+                return True
                     
             # Check for near-duplicates (90% similarity)
+            tokens = tokenize(content)
             for response in recent:
-                if self._similarity(content, response["content"]) > 0.9:
+                if jaccard(tokens, tokenize(response["content"])) > self.SIMILARITY_THRESHOLD:
                     return True
                     
             return False
@@ -227,15 +240,8 @@ class ResponseValidator:
     def _similarity(self, str1: str, str2: str) -> float:
         """Calculate string similarity ratio."""
         try:
-            # Convert to sets of words
-            set1 = set(str1.lower().split())
-            set2 = set(str2.lower().split())
-            
-            # Calculate Jaccard similarity
-            intersection = len(set1.intersection(set2))
-            union = len(set1.union(set2))
-            
-            return intersection / union if union > 0 else 0
+            # Jaccard similarity of the word token sets
+            return jaccard(tokenize(str1), tokenize(str2))
             
         except Exception as e:
             logger.error(f"Error calculating similarity: {e}")
@@ -356,17 +362,21 @@ class HistoryCompressor:
             return False
 
 class ResponseHistory:
-    """Manages response history tracking and querying."""
+    """Manages response history tracking and querying.
+
+    Responses live in an append-only log (history.jsonl) indexed by
+    ResponseLog, so lookups, searches and duplicate checks touch only the
+    records that can match instead of re-reading the whole history.
+    """
     
     def __init__(self):
         self.history_dir = Path("runtime/agent_responses")
         self.history_file = self.history_dir / "history.jsonl"
-        self.index_file = self.history_dir / "index.json"
         self.history_dir.mkdir(parents=True, exist_ok=True)
         self.validator = ResponseValidator()
+        self.log = ResponseLog(self.history_file)
         self.compressor = HistoryCompressor(self.history_dir)
         self.compressor.start_compression_service()
-        self._load_index()
         
     def __del__(self):
         """Cleanup when object is destroyed."""
@@ -374,31 +384,6 @@ class ResponseHistory:
             self.compressor.stop_compression_service()
         except Exception as e:
             logger.error(f"Error stopping compression service: {e}")
-        
-    def _load_index(self):
-        """Load or initialize the response index."""
-        try:
-            if self.index_file.exists():
-                with open(self.index_file, 'r') as f:
-                    self.index = json.load(f)
-            else:
-                self.index = {
-                    "agents": {},  # agent_id -> list of response hashes
-                    "timestamps": {},  # timestamp -> list of response hashes
-                    "hashes": {}  # hash -> response metadata
-                }
-                self._save_index()
-        except Exception as e:
-            logger.error(f"Error loading response index: {e}")
-            self.index = {"agents": {}, "timestamps": {}, "hashes": {}}
-            
-    def _save_index(self):
-        """Save the response index."""
-        try:
-            with open(self.index_file, 'w') as f:
-                json.dump(self.index, f, indent=2)
-        except Exception as e:
-            logger.error(f"Error saving response index: {e}")
             
     def add_response(self, agent_id: str, content: str) -> Optional[str]:
         """Add a response to history and return its hash if valid."""
@@ -415,8 +400,7 @@ class ResponseHistory:
                 return None
                 
             # Check for duplicates
-            recent_responses = self.get_responses(agent_id=agent_id)
-            if self.validator.is_duplicate(agent_id, content, recent_responses):
+            if self.validator.is_duplicate(agent_id, content, self.log):
                 logger.warning(f"Duplicate response from {agent_id}")
                 return None
                 
@@ -436,26 +420,8 @@ class ResponseHistory:
                 }
             }
             
-            # Append to history file
-            with open(self.history_file, 'a') as f:
-                f.write(json.dumps(record) + '\n')
-                
-            # Update index
-            if agent_id not in self.index["agents"]:
-                self.index["agents"][agent_id] = []
-            self.index["agents"][agent_id].append(response_hash)
-            
-            if timestamp not in self.index["timestamps"]:
-                self.index["timestamps"][timestamp] = []
-            self.index["timestamps"][timestamp].append(response_hash)
-            
-            self.index["hashes"][response_hash] = {
-                "agent_id": agent_id,
-                "timestamp": timestamp,
-                "validation": record["validation"]
-            }
-            
-            self._save_index()
+            # Append to history file and its indexes
+            self.log.append(record)
             logger.info(f"Added valid response to history: {response_hash}")
             return response_hash
             
@@ -464,33 +430,9 @@ class ResponseHistory:
             return None
             
     def get_responses(self, agent_id: str = None, since: str = None, until: str = None) -> List[dict]:
-        """Query responses with optional filters."""
-        try:
-            responses = []
-            
-            # Get relevant hashes from index
-            hashes = set()
-            if agent_id:
-                hashes.update(self.index["agents"].get(agent_id, []))
-            if since or until:
-                for ts, ts_hashes in self.index["timestamps"].items():
-                    if since and ts < since:
-                        continue
-                    if until and ts > until:
-                        continue
-                    hashes.update(ts_hashes)
-                    
-            # If no filters, get all hashes
-            if not hashes:
-                hashes = set(self.index["hashes"].keys())
-                
-            # Read responses from history file
-            with open(self.history_file, 'r') as f:
-                for line in f:
-                    record = json.loads(line)
-                    if record["hash"] in hashes:
-                        responses.append(record)
-                        
+        """Query responses with optional filters (all given filters must match)."""
+        try:
+            responses = self.log.records(self.log.select(agent_id, since, until))
             return sorted(responses, key=lambda x: x["timestamp"])
             
         except Exception as e:
@@ -500,12 +442,8 @@ class ResponseHistory:
     def get_response_by_hash(self, response_hash: str) -> Optional[dict]:
         """Get a specific response by its hash."""
         try:
-            with open(self.history_file, 'r') as f:
-                for line in f:
-                    record = json.loads(line)
-                    if record["hash"] == response_hash:
-                        return record
-            return None
+            matches = self.log.find_hash(response_hash)
+            return self.log.read(matches[0]) if matches else None
         except Exception as e:
             logger.error(f"Error getting response by hash: {e}")
             return None
@@ -525,28 +463,29 @@ class ResponseHistory:
     def get_duplicate_responses(self, agent_id: Optional[str] = None) -> List[dict]:
         """Get list of duplicate responses."""
         try:
-            responses = self.get_responses(agent_id)
-            duplicates = []
-            
-            # Group responses by content hash
-            content_groups = {}
-            for response in responses:
-                content_hash = hashlib.sha256(response["content"].encode()).hexdigest()
-                if content_hash not in content_groups:
-                    content_groups[content_hash] = []
-                content_groups[content_hash].append(response)
-                
-            # Find groups with multiple responses
-            for group in content_groups.values():
-                if len(group) > 1:
-                    duplicates.extend(group)
+            # Group entries by content hash using the index; read only duplicates
+            groups: Dict[str, List[int]] = {}
+            for i in self.log.select(agent_id):
+                groups.setdefault(self.log.entries[i].hash, []).append(i)
+            duplicates = sorted(i for group in groups.values() if len(group) > 1 for i in group)
                     
-            return sorted(duplicates, key=lambda x: x["timestamp"])
+            return sorted(self.log.records(duplicates), key=lambda x: x["timestamp"])
             
         except Exception as e:
             logger.error(f"Error getting duplicate responses: {e}")
             return []
 
+    def _matching(self, candidates: List[int], predicate, limit: Optional[int]) -> List[dict]:
+        """Records among ``candidates`` satisfying ``predicate``, newest ``limit`` kept."""
+        matches = []
+        for i in reversed(candidates):
+            record = self.log.read(i)
+            if predicate(record["content"]):
+                matches.append(record)
+                if limit and len(matches) == limit:
+                    break
+        return sorted(matches, key=lambda x: x["timestamp"])
+
     def search_responses(self,
                         query: str,
                         agent_id: Optional[str] = None,
@@ -557,6 +496,9 @@ class ResponseHistory:
                         limit: Optional[int] = None) -> List[dict]:
         """Search responses by content.
         
+        Plain-text queries are narrowed through the token index first; regex
+        queries are checked against every response matching the filters.
+        
         Args:
             query: Search query (text or regex pattern)
             agent_id: Optional agent ID to filter by
@@ -570,6 +512,8 @@ class ResponseHistory:
             List of matching responses, sorted by timestamp
         """
         try:
+            candidates = self.log.select(agent_id, since, until)
+            
             # Compile regex if needed
             if use_regex:
                 try:
@@ -577,37 +521,18 @@ class ResponseHistory:
                 except re.error as e:
                     logger.error(f"Invalid regex pattern: {e}")
                     return []
+                predicate = lambda content: pattern.search(content) is not None
             else:
-                # Convert query to lowercase for case-insensitive search
-                query = query if case_sensitive else query.lower()
-                
-            # Get base responses
-            responses = self.get_responses(
-                agent_id=agent_id,
-                since=since,
-                until=until
-            )
-            
-            # Search responses
-            matches = []
-            for response in responses:
-                content = response["content"]
-                if not case_sensitive and not use_regex:
-                    content = content.lower()
-                    
-                # Check for match
-                if use_regex:
-                    if pattern.search(content):
-                        matches.append(response)
+                narrowed = self.log.substring_candidates(query)
+                if narrowed is not None:
+                    candidates = [i for i in candidates if i in narrowed]
+                if case_sensitive:
+                    predicate = lambda content: query in content
                 else:
-                    if query in content:
-                        matches.append(response)
-                        
-            # Apply limit if specified
-            if limit:
-                matches = matches[-limit:]
-                
-            return matches
+                    lowered = query.lower()
+                    predicate = lambda content: lowered in content.lower()
+                    
+            return self._matching(candidates, predicate, limit)
             
         except Exception as e:
             logger.error(f"Error searching responses: {e}")
@@ -636,41 +561,44 @@ class ResponseHistory:
             List of matching responses, sorted by timestamp
         """
         try:
-            # Get base responses
-            responses = self.get_responses(
-                agent_id=agent_id,
-                since=since,
-                until=until
-            )
-            
-            # Search responses
-            matches = []
-            for response in responses:
-                content = response["content"]
+            candidates = self.log.select(agent_id, since, until)
+            
+            # Narrow through the token index: intersect for AND, union for OR.
+            # A keyword the index cannot narrow (no word characters) disables
+            # narrowing for OR and is simply skipped for AND.
+            sets = [self.log.substring_candidates(k) for k in keywords]
+            narrowed = None
+            if match_all:
+                for found in sets:
+                    if found is not None:
+                        narrowed = found if narrowed is None else narrowed & found
+            elif sets and all(found is not None for found in sets):
+                narrowed = set().union(*sets)
+            if narrowed is not None:
+                candidates = [i for i in candidates if i in narrowed]
+            
+            if not case_sensitive:
+                keywords = [k.lower() for k in keywords]
+            combine = all if match_all else any
+            
+            def predicate(content):
                 if not case_sensitive:
                     content = content.lower()
-                    keywords = [k.lower() for k in keywords]
-                    
-                # Check for matches
-                if match_all:
-                    if all(k in content for k in keywords):
-                        matches.append(response)
-                else:
-                    if any(k in content for k in keywords):
-                        matches.append(response)
+                return combine(k in content for k in keywords)
                         
-            # Apply limit if specified
-            if limit:
-                matches = matches[-limit:]
-                
-            return matches
+            return self._matching(candidates, predicate, limit)
             
         except Exception as e:
             logger.error(f"Error searching responses by keywords: {e}")
             return []
 
 class ResponseDetector:
-    """Detects when Cursor chat responses are complete and captures them."""
+    """Detects when Cursor chat responses are complete and captures them.
+
+    All agent chat regions are registered with the shared ScreenWatcher, which
+    grabs the screen once per cycle. A region is captured once it has changed
+    and then stayed unchanged for STABLE_THRESHOLD cycles.
+    """
     
     def __init__(self):
         self.STABLE_THRESHOLD = 3
@@ -682,6 +610,8 @@ class ResponseDetector:
         self.running = False
         self.detector_thread = None
         self.history = ResponseHistory()
+        self.watcher = get_screen_watcher()
+        self._settling = set()  # Window titles changed since their last capture
         
     def start_detection(self):
         """Start the response detection thread."""
@@ -711,10 +641,14 @@ class ResponseDetector:
             try:
                 # Find all agent windows
                 windows = [w for w in gw.getAllWindows() if "Agent-" in w.title]
+                self._sync_regions(windows)
+                
+                # One grab covers every window; only changed regions are diffed
+                self._settling.update(self.watcher.tick())
                 
-                # Process each window
-                for window in windows:
-                    self._process_window(window)
+                for title in sorted(self._settling):
+                    if self.watcher.is_stable(title, self.STABLE_THRESHOLD):
+                        self._process_window(title)
                     
                 # Sleep between cycles
                 time.sleep(self.CHECK_INTERVAL)
@@ -723,73 +657,42 @@ class ResponseDetector:
                 logger.error(f"Error in detection loop: {e}")
                 time.sleep(1)
                 
-    def _process_window(self, window):
-        """Process a single agent window."""
-        try:
-            # Calculate chat region
-            region = (
+    def _sync_regions(self, windows):
+        """Register each window's chat region and drop regions of closed windows."""
+        titles = set()
+        for window in windows:
+            titles.add(window.title)
+            self.watcher.register(window.title, (
                 window.left + self.CHAT_OFFSET_X,
                 window.top + self.CHAT_OFFSET_Y,
                 self.CHAT_WIDTH,
                 self.CHAT_HEIGHT
-            )
-            
-            # Check if response is complete
-            if self._is_response_complete(region):
-                # Capture response
-                response = self._capture_response(region)
-                
-                # Queue the response
-                self._queue_response(window.title, response)
-                
-        except Exception as e:
-            logger.error(f"Error processing window {window.title}: {e}")
-            
-    def _is_response_complete(self, region):
-        """Check if response in region is complete."""
-        try:
-            stable_count = 0
-            last_img = pyautogui.screenshot(region=region)
-            
-            while stable_count < self.STABLE_THRESHOLD:
-                time.sleep(self.CHECK_INTERVAL)
-                img = pyautogui.screenshot(region=region)
-                if self._images_equal(last_img, img):
-                    stable_count += 1
-                else:
-                    stable_count = 0
-                    last_img = img
-                    
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error checking response completion: {e}")
-            return False
+            ))
+        for title in [t for t in self.watcher.regions if "Agent-" in t and t not in titles]:
+            self.watcher.unregister(title)
+            self._settling.discard(title)
             
-    def _images_equal(self, img1, img2):
-        """Check if two images are identical."""
+    def _process_window(self, title):
+        """Capture and queue the settled response of one agent window."""
         try:
-            return not ImageChops.difference(img1, img2).getbbox()
+            self._settling.discard(title)
+            response = self._capture_response(self.watcher.regions[title].box)
+            # Selecting the text repaints the region; take that as the new
+            # baseline so the capture does not trigger another one
+            self._settling.update(t for t in self.watcher.tick() if t != title)
+            self._queue_response(title, response)
+                
         except Exception as e:
-            logger.error(f"Error comparing images: {e}")
-            return False
+            logger.error(f"Error processing window {title}: {e}")
             
     def _capture_response(self, region):
         """Capture response text from region."""
         try:
-            # Click to focus
             x, y, w, h = region
-            pyautogui.click(x + 10, y + 10)
-            time.sleep(0.1)
-            
-            # Select all and copy
-            pyautogui.hotkey('ctrl', 'a')
-            time.sleep(0.05)
-            pyautogui.hotkey('ctrl', 'c')
-            time.sleep(0.1)
-            
-            # Get clipboard content
-            return pyperclip.paste()
+            # Goes through the input arbiter like all other GUI input
+            return get_input_arbiter().copy(
+                f"response-{x},{y}", coords=(x + 10, y + 10), focus=False
+            ).result()
             
         except Exception as e:
             logger.error(f"Error capturing response: {e}")
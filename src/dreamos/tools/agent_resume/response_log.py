@@ -0,0 +1,337 @@
+"""
+Append-only response log with offset, token and MinHash-LSH indexes.
+
+Records are appended to the history JSONL file exactly as before, so history
+rotation and existing files keep working. A sidecar ``.idx`` file gets one line
+per record holding its byte offset and length, its token set and its LSH band
+keys. Opening the log reads only the sidecar, then indexes any records that
+were appended after it (for example after a crash between the two writes).
+
+In memory this gives:
+  • offsets by position, agent and content hash, so one record costs one seek
+  • an inverted token index, so text and keyword search only verify candidates
+  • LSH buckets over MinHash signatures, so near-duplicate checks compare a
+    handful of candidates instead of every recent response
+"""
+
+import bisect
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import struct
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# MinHash: 64 permutations split into 16 bands of 4 rows. Two responses with
+# Jaccard similarity 0.9 share a band with probability > 0.9999; at 0.5 only
+# ~64% of pairs become candidates, and candidates are verified exactly.
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+_PRIME = (1 << 61) - 1
+# Fixed seed: band keys are persisted, so they must be stable across runs
+_rng = random.Random(0x5EED)
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+
+def tokenize(text: str) -> Set[str]:
+    """Lower-case word tokens used by both the search and duplicate indexes."""
+    return set(_TOKEN_RE.findall(text.lower()))
+
+
+def record_hash(record: dict) -> str:
+    """A record's content hash, computing it for records written without one."""
+    return record.get("hash") or hashlib.sha256(record.get("content", "").encode()).hexdigest()
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
+
+def minhash(tokens: Iterable[str]) -> List[int]:
+    hashes = [int.from_bytes(hashlib.blake2b(t.encode(), digest_size=8).digest(), "little")
+              for t in tokens]
+    if not hashes:
+        return [_PRIME] * NUM_PERM
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS]
+
+
+def band_keys(tokens: Iterable[str]) -> List[int]:
+    """One 64-bit key per LSH band of the token set's MinHash signature."""
+    sig = minhash(tokens)
+    return [
+        int.from_bytes(hashlib.blake2b(
+            struct.pack(f"<{ROWS}Q", *sig[band * ROWS:(band + 1) * ROWS]), digest_size=8).digest(), "little")
+        for band in range(BANDS)
+    ]
+
+
+class _Entry(NamedTuple):
+    offset: int
+    length: int
+    hash: str
+    agent_id: str
+    timestamp: str
+
+
+class ResponseLog:
+    """Indexed, append-only store for response records.
+
+    Records are dicts with at least ``hash``, ``agent_id``, ``timestamp`` and
+    ``content``. Entries are numbered in log order; query methods return those
+    numbers and ``read``/``records`` turn them back into dicts.
+    """
+
+    def __init__(self, log_path: Path):
+        self.log_path = Path(log_path)
+        self.index_path = self.log_path.with_suffix(".idx")
+        self._lock = threading.RLock()
+        self._reset()
+        with self._lock:
+            self._load()
+
+    # ----- index maintenance -----
+
+    def _reset(self):
+        self.entries: List[_Entry] = []
+        self._timestamps: List[str] = []
+        self._by_hash: Dict[str, List[int]] = {}
+        self._by_agent: Dict[str, List[int]] = {}
+        self._agent_timestamps: Dict[str, List[str]] = {}
+        self._postings: Dict[str, List[int]] = {}
+        self._buckets: Dict[int, List[int]] = {}
+        self._time_ordered = True
+        self._indexed_end = 0
+        self._log_ino: Optional[int] = None
+
+    def _add_entry(self, entry: _Entry, tokens: Iterable[str], bands: List[int]) -> int:
+        i = len(self.entries)
+        if self._timestamps and entry.timestamp < self._timestamps[-1]:
+            self._time_ordered = False
+        self.entries.append(entry)
+        self._timestamps.append(entry.timestamp)
+        self._by_hash.setdefault(entry.hash, []).append(i)
+        self._by_agent.setdefault(entry.agent_id, []).append(i)
+        self._agent_timestamps.setdefault(entry.agent_id, []).append(entry.timestamp)
+        for token in tokens:
+            self._postings.setdefault(token, []).append(i)
+        for band, key in enumerate(bands):
+            # Fold the band number in so equal rows in different bands don't collide
+            self._buckets.setdefault(key ^ band, []).append(i)
+        self._indexed_end = entry.offset + entry.length
+        return i
+
+    def _load(self):
+        if self.index_path.exists():
+            good = 0  # Bytes of the index file that were loaded
+            try:
+                with open(self.index_path, "rb") as f:
+                    for line in f:
+                        try:
+                            row = json.loads(line)
+                        except json.JSONDecodeError:
+                            break  # Torn final line; the log catch-up below re-indexes it
+                        # Offsets only grow; gaps are corrupt log lines that were skipped
+                        if row["offset"] < self._indexed_end:
+                            break
+                        entry = _Entry(row["offset"], row["length"], row["hash"],
+                                       row["agent_id"], row["timestamp"])
+                        self._add_entry(entry, row["tokens"], [int(k, 16) for k in row["bands"]])
+                        good += len(line)
+                if good < self.index_path.stat().st_size:
+                    # Drop the unusable tail so catch-up rows are appended after good ones
+                    os.truncate(self.index_path, good)
+            except (OSError, KeyError, ValueError) as e:
+                logger.warning(f"Rebuilding unreadable response index {self.index_path}: {e}")
+                self._reset()
+                self.index_path.unlink(missing_ok=True)
+        self._sync(force_check=True)
+
+    def _sync(self, force_check: bool = False):
+        """Bring the index in line with the log after rotation or outside appends."""
+        try:
+            st = os.stat(self.log_path)
+            size, ino = st.st_size, st.st_ino
+        except FileNotFoundError:
+            size, ino = 0, None
+        rotated = self._log_ino is not None and ino != self._log_ino
+        if not rotated and size == self._indexed_end and not force_check:
+            return
+        if rotated or size < self._indexed_end or (force_check and not self._tail_matches()):
+            logger.info(f"Response log {self.log_path} was replaced; rebuilding its index")
+            self._reset()
+            self.index_path.unlink(missing_ok=True)
+        self._log_ino = ino
+        if size > self._indexed_end:
+            self._index_from(self._indexed_end)
+
+    def _tail_matches(self) -> bool:
+        if not self.entries:
+            return True
+        try:
+            return record_hash(self.read(len(self.entries) - 1)) == self.entries[-1].hash
+        except (OSError, ValueError):
+            return False
+
+    def _index_from(self, offset: int):
+        rows = []
+        with open(self.log_path, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # Partial append still in progress
+                try:
+                    record = json.loads(raw)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping corrupt record at byte {offset} of {self.log_path}")
+                    offset += len(raw)
+                    self._indexed_end = offset
+                    continue
+                rows.append(self._index_record(record, offset, len(raw)))
+                offset += len(raw)
+        self._append_index_rows(rows)
+
+    def _index_record(self, record: dict, offset: int, length: int) -> dict:
+        response_hash = record_hash(record)
+        tokens = sorted(tokenize(record.get("content", "")))
+        bands = band_keys(tokens)
+        entry = _Entry(offset, length, response_hash, record.get("agent_id", ""), record.get("timestamp", ""))
+        self._add_entry(entry, tokens, bands)
+        return {"offset": offset, "length": length, "hash": response_hash,
+                "agent_id": entry.agent_id, "timestamp": entry.timestamp,
+                "tokens": tokens, "bands": [f"{k:016x}" for k in bands]}
+
+    def _append_index_rows(self, rows: List[dict]):
+        if not rows:
+            return
+        try:
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(row) + "\n" for row in rows))
+        except OSError as e:
+            logger.error(f"Failed to append to response index {self.index_path}: {e}")
+
+    # ----- writes -----
+
+    def append(self, record: dict) -> int:
+        """Append a record to the log and index it; returns its entry number."""
+        line = (json.dumps(record) + "\n").encode()
+        with self._lock:
+            self._sync()
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.log_path, "ab") as f:
+                offset = f.tell()
+                f.write(line)
+            if offset != self._indexed_end:
+                # Someone else appended in between; index their records too
+                self._sync(force_check=True)
+                return len(self.entries) - 1
+            if self._log_ino is None:
+                self._log_ino = os.stat(self.log_path).st_ino
+            row = self._index_record(record, offset, len(line))
+            self._append_index_rows([row])
+            return len(self.entries) - 1
+
+    # ----- reads -----
+
+    def read(self, i: int) -> dict:
+        entry = self.entries[i]
+        with open(self.log_path, "rb") as f:
+            f.seek(entry.offset)
+            return json.loads(f.read(entry.length))
+
+    def records(self, indices: Iterable[int]) -> List[dict]:
+        with self._lock, open(self.log_path, "rb") as f:
+            out = []
+            for i in indices:
+                entry = self.entries[i]
+                f.seek(entry.offset)
+                out.append(json.loads(f.read(entry.length)))
+            return out
+
+    # ----- queries -----
+
+    def find_hash(self, response_hash: str) -> List[int]:
+        with self._lock:
+            self._sync()
+            return list(self._by_hash.get(response_hash, []))
+
+    def select(self, agent_id: Optional[str] = None, since: Optional[str] = None,
+               until: Optional[str] = None) -> List[int]:
+        """Entry numbers matching every given filter, in log order."""
+        with self._lock:
+            self._sync()
+            if agent_id is not None:
+                indices = self._by_agent.get(agent_id, [])
+                stamps = self._agent_timestamps.get(agent_id, [])
+            else:
+                indices = range(len(self.entries))
+                stamps = self._timestamps
+            if since is None and until is None:
+                return list(indices)
+            if self._time_ordered:
+                lo = bisect.bisect_left(stamps, since) if since else 0
+                hi = bisect.bisect_right(stamps, until) if until else len(stamps)
+                return list(indices[lo:hi])
+            return [i for i, ts in zip(indices, stamps)
+                    if (not since or ts >= since) and (not until or ts <= until)]
+
+    def substring_candidates(self, text: str) -> Optional[Set[int]]:
+        """Entries that may contain ``text`` (case-insensitively); None if the
+        index cannot narrow it down (no word characters in ``text``).
+
+        A query token followed by a non-word character must end a word in the
+        content, one preceded by a non-word character must start one, and a
+        token bounded on both sides must match a word exactly.
+        """
+        lowered = text.lower()
+        spans = list(_TOKEN_RE.finditer(lowered))
+        if not spans:
+            return None
+        with self._lock:
+            self._sync()
+            result: Optional[Set[int]] = None
+            for m in spans:
+                token, left, right = m.group(), m.start() > 0, m.end() < len(lowered)
+                if left and right:
+                    words = [token] if token in self._postings else []
+                elif left:
+                    words = [w for w in self._postings if w.startswith(token)]
+                elif right:
+                    words = [w for w in self._postings if w.endswith(token)]
+                else:
+                    words = [w for w in self._postings if token in w]
+                found: Set[int] = set()
+                for word in words:
+                    found.update(self._postings[word])
+                result = found if result is None else result & found
+                if not result:
+                    break
+            return result
+
+    def near_duplicates(self, content: str, agent_id: str, since: Optional[str],
+                        threshold: float) -> List[int]:
+        """Entries by ``agent_id`` at or after ``since`` whose token-set Jaccard
+        similarity to ``content`` exceeds ``threshold``."""
+        tokens = tokenize(content)
+        with self._lock:
+            self._sync()
+            candidates: Set[int] = set()
+            for band, key in enumerate(band_keys(sorted(tokens))):
+                candidates.update(self._buckets.get(key ^ band, ()))
+            candidates = {
+                i for i in candidates
+                if self.entries[i].agent_id == agent_id and (not since or self.entries[i].timestamp >= since)
+            }
+            return sorted(
+                i for i, record in zip(sorted(candidates), self.records(sorted(candidates)))
+                if jaccard(tokens, tokenize(record.get("content", ""))) > threshold
+            )
@@ -13,7 +13,7 @@ import time
 from pathlib import Path
 import argparse
 from typing import Optional, Dict
-from agent_cellphone import AgentCellphone, MessageMode
+from agent_cellphone import MessageMode, get_cellphone
 
 # Configure logging
 logging.basicConfig(
@@ -25,7 +25,7 @@ logger = logging.getLogger('captain_handler')
 
 class CaptainHandler:
     def __init__(self):
-        self.cellphone = AgentCellphone()
+        self.cellphone = get_cellphone()
         self.registry_file = Path("runtime/agent_registry.json")
         self.registry = self._load_registry()
         
@@ -3,66 +3,216 @@ Cache module for the project scanner.
 
 This module provides functionality to cache scan results to improve performance
 on subsequent scans.
+
+Updates are buffered in memory and written behind: dirty entries are appended
+to a journal next to the cache file once ``batch_size`` of them are pending, or
+``flush_interval`` seconds after the first unflushed update (a timer flushes a
+cache that has gone idle), and at shutdown. When the journal grows
+as large as the last compacted cache file it is compacted into a new one, so
+the total write cost of a scan stays linear in the number of files.
 """
 
+import atexit
 import json
 import logging
+import os
 import threading
+import time
+import weakref
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+# Marker for journal records that delete a key
+_REMOVED = object()
+
 
 class ProjectCache:
     """
     Manages caching for the project scanner to avoid redundant analysis.
     """
-    def __init__(self, cache_path: Path):
-        self.cache_path = cache_path
-        self.cache_lock = threading.Lock()
+    def __init__(
+        self,
+        cache_path: Path,
+        batch_size: int = 200,
+        flush_interval: float = 2.0,
+        compact_threshold: int = 1000,
+    ):
+        """
+        Args:
+            cache_path: Cache file (compacted snapshot); the journal sits beside it
+            batch_size: Dirty entries that trigger a journal flush
+            flush_interval: Longest time an update stays unflushed
+            compact_threshold: Minimum journal records before compacting
+        """
+        self.cache_path = Path(cache_path)
+        self.journal_path = self.cache_path.with_name(self.cache_path.name + ".journal")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.compact_threshold = compact_threshold
+        self.cache_lock = threading.RLock()
+        self._dirty: Dict[str, Any] = {}
+        self._journal_records = 0
+        self._snapshot_entries = 0  # Entries in the cache file at the last compaction
+        self._last_flush = time.monotonic()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._journal_torn = False
         self.cache = self._load()
+        if self._journal_torn:
+            # Later appends would land on the torn line, so start a clean journal
+            self._save()
+        _open_caches.add(self)
 
     def _load(self) -> Dict:
         with self.cache_lock:
+            cache: Dict[str, Any] = {}
             if self.cache_path.exists():
                 try:
                     with open(self.cache_path, "r") as f:
-                        return json.load(f)
+                        cache = json.load(f)
+                    self._snapshot_entries = len(cache)
                 except (json.JSONDecodeError, IOError) as e:
                     logger.warning(
                         f"Failed to load cache file {self.cache_path}: {e}. Starting fresh."
                     )
-                    return {}
-            return {}
+                    cache = {}
+            self._replay_journal(cache)
+            return cache
+
+    def _replay_journal(self, cache: Dict[str, Any]) -> None:
+        """Apply journal records written since the last compaction."""
+        if not self.journal_path.exists():
+            return
+        try:
+            with open(self.journal_path, "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from a crash mid-append
+                        logger.warning(f"Ignoring truncated record in {self.journal_path}")
+                        self._journal_torn = True
+                        break
+                    if "value" in record:
+                        cache[record["key"]] = record["value"]
+                    else:
+                        cache.pop(record["key"], None)
+                    self._journal_records += 1
+        except IOError as e:
+            logger.warning(f"Failed to read cache journal {self.journal_path}: {e}")
 
     def _save(self):
+        """Compact: atomically rewrite the cache file and drop the journal."""
         with self.cache_lock:
             try:
                 self.cache_path.parent.mkdir(parents=True, exist_ok=True)
-                with open(self.cache_path, "w") as f:
+                temp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+                with open(temp_path, "w") as f:
                     json.dump(self.cache, f, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.cache_path)
+                # Replaying a stale journal over the new file is harmless, so a
+                # crash before this unlink loses nothing
+                self.journal_path.unlink(missing_ok=True)
+                self._dirty.clear()
+                self._journal_records = 0
+                self._snapshot_entries = len(self.cache)
             except IOError as e:
                 logger.error(f"Failed to save cache file {self.cache_path}: {e}")
 
-    def get(self, key: str) -> Optional[Any]:
+    def flush(self):
+        """Append pending updates to the journal, compacting when it has grown large."""
+        with self.cache_lock:
+            self._last_flush = time.monotonic()
+            if not self._dirty:
+                return
+            # Compacting once the journal outgrows the last snapshot keeps the
+            # rewrites geometric, so their total cost is linear
+            if self._journal_records + len(self._dirty) >= max(self.compact_threshold, self._snapshot_entries):
+                self._save()
+                return
+            lines = "".join(
+                json.dumps({"key": key} if value is _REMOVED else {"key": key, "value": value}) + "\n"
+                for key, value in self._dirty.items()
+            )
+            try:
+                self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.journal_path, "a") as f:
+                    f.write(lines)
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._journal_records += len(self._dirty)
+                self._dirty.clear()
+            except IOError as e:
+                logger.error(f"Failed to append to cache journal {self.journal_path}: {e}")
+
+    def close(self):
+        """Flush pending updates and compact the journal into the cache file."""
         with self.cache_lock:
-            return self.cache.get(key)
+            timer, self._flush_timer = self._flush_timer, None
+            if timer is not None:
+                timer.cancel()
+            if self._dirty or self._journal_records:
+                self._save()
+        _open_caches.discard(self)
+
+    def _mark_dirty(self, key: str, value: Any):
+        self._dirty[key] = value
+        if (len(self._dirty) >= self.batch_size
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+        elif self._flush_timer is None:
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Flush within flush_interval even if no later update triggers it."""
+        self._flush_timer = threading.Timer(self.flush_interval, self._flush_pending)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _flush_pending(self):
+        with self.cache_lock:
+            self._flush_timer = None
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Deferred flush of {self.cache_path} failed: {e}")
+
+    def get(self, key: str, default: Optional[Any] = None) -> Optional[Any]:
+        with self.cache_lock:
+            return self.cache.get(key, default)
 
     def set(self, key: str, value: Any):
         with self.cache_lock:
             self.cache[key] = value
-            # Consider debounced/throttled save later if performance is an issue
-            self._save()
+            self._mark_dirty(key, value)
 
     def remove(self, key: str):
         with self.cache_lock:
-            self.cache.pop(key, None)
-            self._save()
+            if key in self.cache:
+                del self.cache[key]
+                self._mark_dirty(key, _REMOVED)
+
+    # Mapping-style access, so FileProcessor can use the cache directly
+    def __getitem__(self, key: str) -> Any:
+        with self.cache_lock:
+            return self.cache[key]
+
+    def __setitem__(self, key: str, value: Any):
+        self.set(key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.cache
 
     def clear(self):
         with self.cache_lock:
             self.cache = {}
+            self._dirty.clear()
+            self._journal_records = 0
+            self._snapshot_entries = 0
+            self.journal_path.unlink(missing_ok=True)
             if self.cache_path.exists():
                 try:
                     self.cache_path.unlink()
@@ -75,4 +225,14 @@ class ProjectCache:
         Analyze cache data for patterns or insights.
         """
         logger.info("ProjectCache.analyze_scan_results called, but not yet implemented.")
-        return {} 
\ No newline at end of file
+        return {}
+
+
+_open_caches: "weakref.WeakSet[ProjectCache]" = weakref.WeakSet()
+
+
+@atexit.register
+def close_all_caches() -> None:
+    """Persist every open cache; registered to run at interpreter exit."""
+    for cache in list(_open_caches):
+        cache.close()
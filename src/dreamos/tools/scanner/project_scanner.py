@@ -181,7 +181,7 @@ class ProjectScanner(BaseScanner):
         # Create file processor
         file_processor = FileProcessor(
             project_root=self.project_root,
-            cache=self.cache.cache if self.cache else {},
+            cache=self.cache if self.cache else {},
             cache_lock=self._scan_results_lock,
             additional_ignore_dirs=self.additional_ignore_dirs,
             use_cache=self.use_cache,
@@ -221,6 +221,8 @@ class ProjectScanner(BaseScanner):
                     self.analysis[file_path_str] = analysis_data
         
         logger.info(f"Completed analysis of {len(self.analysis)} files")
+        if self.cache:
+            self.cache.flush()
         
         # Generate reports
         report_generator = ReportGenerator(
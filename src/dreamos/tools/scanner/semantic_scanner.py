@@ -6,8 +6,8 @@ including code structure analysis, dependency tracking, and semantic indexing.
 """
 
 import ast
+import asyncio
 import logging
-import json
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Set
 from collections import defaultdict
@@ -15,6 +15,7 @@ from collections import defaultdict
 from dreamos.core.config import AppConfig
 from dreamos.tools.scanner.base_scanner import BaseScanner
 from dreamos.tools.scanner.language_analyzer import LanguageAnalyzer
+from dreamos.tools.scanner.symbol_index import SymbolIndex
 
 logger = logging.getLogger(__name__)
 
@@ -25,25 +26,18 @@ class SemanticScanner(BaseScanner):
         """Initialize semantic scanner with configuration."""
         super().__init__(config)
         self.language_analyzer = LanguageAnalyzer()
-        self._semantic_index: Dict[str, Any] = {}
-        self._index_file = Path(config.paths.cache_dir) / "semantic_index.json"
+        self._index_file = Path(config.paths.cache_dir) / "semantic_index.db"
+        self.symbol_index = SymbolIndex(self._index_file)
         
     async def scan(self, project_path: Path) -> Dict[str, Any]:
-        """Scan project for semantic information."""
+        """Scan project for semantic information.
+
+        Updates the persistent symbol index; only files whose content
+        changed since the last scan are parsed.
+        """
         try:
-            # Extract semantic information from code
-            semantic_info = await self._extract_semantic_info(project_path)
-            
-            # Build semantic index
-            semantic_index = await self._build_semantic_index(semantic_info)
-            
-            # Save index for future use
-            await self._save_semantic_index(semantic_index)
-            
-            return {
-                "semantic_info": semantic_info,
-                "semantic_index": semantic_index
-            }
+            semantic_index = await asyncio.to_thread(self.symbol_index.update, project_path)
+            return {"semantic_index": semantic_index}
             
         except Exception as e:
             logger.error(f"Error scanning project: {e}")
@@ -52,21 +46,35 @@ class SemanticScanner(BaseScanner):
     async def search(
         self,
         query: str,
-        project_path: Optional[Path] = None
+        project_path: Optional[Path] = None,
+        kinds: Optional[List[str]] = None,
+        limit: int = 50
     ) -> List[Dict[str, Any]]:
-        """Search code using semantic capabilities."""
+        """Search code using semantic capabilities.
+
+        Queries the persistent symbol index. A project that has never been
+        indexed is scanned first; call ``scan`` to pick up later changes.
+        """
         try:
-            # Load semantic index
-            semantic_index = await self._load_semantic_index(project_path)
-            
-            # Perform semantic search
-            results = await self._semantic_search(query, semantic_index)
-            
-            return results
+            if project_path and not self.symbol_index.is_indexed(project_path):
+                await self.scan(project_path)
+            return self.symbol_index.search(query, root=project_path, kinds=kinds, limit=limit)
             
         except Exception as e:
             logger.error(f"Error searching code: {e}")
             return []
+
+    async def find_callers(
+        self,
+        name: str,
+        project_path: Optional[Path] = None
+    ) -> List[Dict[str, Any]]:
+        """Find functions and methods that call ``name``."""
+        try:
+            return self.symbol_index.callers(name, root=project_path)
+        except Exception as e:
+            logger.error(f"Error finding callers of {name}: {e}")
+            return []
             
     async def analyze(self, code_path: Path) -> Dict[str, Any]:
         """Analyze code for semantic information."""
@@ -184,150 +192,6 @@ class SemanticScanner(BaseScanner):
             logger.error(f"Error analyzing directory {dir_path}: {e}")
             return {}
             
-    async def _build_semantic_index(self, semantic_info: Dict[str, Any]) -> Dict[str, Any]:
-        """Build semantic index from semantic information."""
-        try:
-            index = {
-                "classes": {},
-                "functions": {},
-                "variables": {},
-                "imports": {},
-                "dependencies": set()
-            }
-            
-            for file_path, file_info in semantic_info.get("files", {}).items():
-                # Index classes
-                for class_name, class_info in file_info.get("classes", {}).items():
-                    index["classes"][class_name] = {
-                        "file": file_path,
-                        "bases": class_info["bases"],
-                        "docstring": class_info["docstring"],
-                        "methods": class_info["methods"]
-                    }
-                    
-                # Index functions
-                for func_name, func_info in file_info.get("functions", {}).items():
-                    index["functions"][func_name] = {
-                        "file": file_path,
-                        "args": func_info["args"],
-                        "returns": func_info["returns"],
-                        "docstring": func_info["docstring"]
-                    }
-                    
-                # Index variables
-                for var_name, var_info in file_info.get("variables", {}).items():
-                    index["variables"][var_name] = {
-                        "file": file_path,
-                        "type": var_info["type"],
-                        "value": var_info["value"]
-                    }
-                    
-                # Index imports
-                for imp in file_info.get("imports", []):
-                    if imp not in index["imports"]:
-                        index["imports"][imp] = set()
-                    index["imports"][imp].add(file_path)
-                    
-                # Add dependencies
-                index["dependencies"].update(file_info.get("dependencies", set()))
-                
-            return index
-            
-        except Exception as e:
-            logger.error(f"Error building semantic index: {e}")
-            return {}
-            
-    async def _save_semantic_index(self, index: Dict[str, Any]):
-        """Save semantic index to file."""
-        try:
-            # Convert sets to lists for JSON serialization
-            serializable_index = {
-                "classes": index["classes"],
-                "functions": index["functions"],
-                "variables": index["variables"],
-                "imports": {k: list(v) for k, v in index["imports"].items()},
-                "dependencies": list(index["dependencies"])
-            }
-            
-            self._index_file.parent.mkdir(parents=True, exist_ok=True)
-            self._index_file.write_text(json.dumps(serializable_index, indent=2))
-            
-        except Exception as e:
-            logger.error(f"Error saving semantic index: {e}")
-            
-    async def _load_semantic_index(self, project_path: Optional[Path]) -> Dict[str, Any]:
-        """Load semantic index for project."""
-        try:
-            if self._index_file.exists():
-                data = json.loads(self._index_file.read_text())
-                
-                # Convert lists back to sets
-                return {
-                    "classes": data["classes"],
-                    "functions": data["functions"],
-                    "variables": data["variables"],
-                    "imports": {k: set(v) for k, v in data["imports"].items()},
-                    "dependencies": set(data["dependencies"])
-                }
-            else:
-                # If no index exists, create one
-                if project_path:
-                    semantic_info = await self._extract_semantic_info(project_path)
-                    return await self._build_semantic_index(semantic_info)
-                return {}
-                
-        except Exception as e:
-            logger.error(f"Error loading semantic index: {e}")
-            return {}
-            
-    async def _semantic_search(
-        self,
-        query: str,
-        semantic_index: Dict[str, Any]
-    ) -> List[Dict[str, Any]]:
-        """Perform semantic search using index."""
-        try:
-            results = []
-            query = query.lower()
-            
-            # Search classes
-            for class_name, class_info in semantic_index["classes"].items():
-                if (query in class_name.lower() or
-                    query in class_info["docstring"].lower() if class_info["docstring"] else False):
-                    results.append({
-                        "type": "class",
-                        "name": class_name,
-                        "file": class_info["file"],
-                        "docstring": class_info["docstring"]
-                    })
-                    
-            # Search functions
-            for func_name, func_info in semantic_index["functions"].items():
-                if (query in func_name.lower() or
-                    query in func_info["docstring"].lower() if func_info["docstring"] else False):
-                    results.append({
-                        "type": "function",
-                        "name": func_name,
-                        "file": func_info["file"],
-                        "docstring": func_info["docstring"]
-                    })
-                    
-            # Search variables
-            for var_name, var_info in semantic_index["variables"].items():
-                if query in var_name.lower():
-                    results.append({
-                        "type": "variable",
-                        "name": var_name,
-                        "file": var_info["file"],
-                        "type": var_info["type"]
-                    })
-                    
-            return results
-            
-        except Exception as e:
-            logger.error(f"Error performing semantic search: {e}")
-            return []
-            
     async def _analyze_code_structure(self, code_path: Path) -> Dict[str, Any]:
         """Analyze code structure."""
         try:
@@ -0,0 +1,337 @@
+"""
+Persistent symbol index for the semantic scanner.
+
+Symbols (classes, functions, methods and module-level variables) extracted
+from Python files are stored in SQLite, together with each file's content
+hash, so a refresh only re-parses files whose contents changed. Names,
+docstrings and call references are searchable through an FTS5 table with
+token and prefix matching; builds of SQLite without FTS5 fall back to LIKE
+queries.
+"""
+
+import ast
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Directories never worth indexing
+SKIP_DIRS = {"__pycache__", "node_modules", "venv", ".venv", "env", "build", "dist"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    root TEXT NOT NULL,
+    path TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    UNIQUE (root, path)
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    qualname TEXT NOT NULL,
+    line INTEGER,
+    docstring TEXT,
+    calls TEXT
+);
+CREATE INDEX IF NOT EXISTS symbols_file ON symbols(file_id);
+CREATE INDEX IF NOT EXISTS symbols_name ON symbols(name COLLATE NOCASE);
+"""
+
+# Column weights for bm25: name, name words, docstring, calls
+_RANK = "bm25(symbols_fts, 10.0, 5.0, 1.0, 2.0)"
+
+_CAMEL = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+
+def _name_words(name: str) -> str:
+    """Split snake_case and CamelCase names into lowercase words."""
+    return " ".join(w.lower() for part in name.split("_") for w in _CAMEL.findall(part))
+
+
+def _calls(node: ast.AST) -> List[str]:
+    """Names called anywhere inside node, in first-seen order."""
+    seen: Dict[str, None] = {}
+    for child in ast.walk(node):
+        if isinstance(child, ast.Call):
+            func = child.func
+            if isinstance(func, ast.Name):
+                seen.setdefault(func.id, None)
+            elif isinstance(func, ast.Attribute):
+                seen.setdefault(func.attr, None)
+    return list(seen)
+
+
+def extract_symbols(source: str) -> List[Dict[str, Any]]:
+    """
+    Extract indexable symbols from Python source.
+
+    Returns:
+        Dicts with kind, name, qualname, line, docstring and calls
+    """
+    tree = ast.parse(source)
+    symbols: List[Dict[str, Any]] = []
+
+    def visit(body: Iterable[ast.stmt], prefix: str, in_function: bool) -> None:
+        for node in body:
+            if isinstance(node, ast.ClassDef):
+                qualname = f"{prefix}{node.name}"
+                symbols.append({
+                    "kind": "class", "name": node.name, "qualname": qualname,
+                    "line": node.lineno, "docstring": ast.get_docstring(node), "calls": [],
+                })
+                visit(node.body, f"{qualname}.", in_function)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                qualname = f"{prefix}{node.name}"
+                symbols.append({
+                    "kind": "method" if prefix and not in_function else "function",
+                    "name": node.name, "qualname": qualname, "line": node.lineno,
+                    "docstring": ast.get_docstring(node), "calls": _calls(node),
+                })
+                visit(node.body, f"{qualname}.", True)
+            elif isinstance(node, ast.Assign) and not prefix:
+                for target in node.targets:
+                    if isinstance(target, ast.Name):
+                        symbols.append({
+                            "kind": "variable", "name": target.id, "qualname": target.id,
+                            "line": node.lineno, "docstring": None, "calls": [],
+                        })
+
+    visit(tree.body, "", False)
+    return symbols
+
+
+class SymbolIndex:
+    """SQLite-backed symbol index, updated per file by content hash."""
+
+    def __init__(self, db_path: Path):
+        """
+        Open (or create) the index.
+
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+        self.fts = self._create_fts()
+        self._conn.commit()
+
+    def _create_fts(self) -> bool:
+        try:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS symbols_fts "
+                "USING fts5(name, words, docstring, calls)"
+            )
+            return True
+        except sqlite3.OperationalError:
+            logger.warning("SQLite was built without FTS5; symbol search falls back to LIKE queries.")
+            return False
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # Updating
+
+    def update(self, root: Path) -> Dict[str, int]:
+        """
+        Bring the index for a project up to date.
+
+        Files are only read when their mtime or size changed, and only
+        re-parsed when their content hash changed.
+
+        Args:
+            root: Project directory
+
+        Returns:
+            Counts of files seen, re-parsed and removed, and total symbols
+        """
+        root = Path(root).resolve()
+        root_key = str(root)
+        on_disk: Dict[str, os.stat_result] = {}
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.startswith(".")]
+            for filename in filenames:
+                if filename.endswith(".py"):
+                    path = os.path.join(dirpath, filename)
+                    try:
+                        on_disk[os.path.relpath(path, root)] = os.stat(path)
+                    except OSError:
+                        continue
+
+        with self._lock:
+            indexed = {
+                row["path"]: row
+                for row in self._conn.execute(
+                    "SELECT id, path, hash, mtime_ns, size FROM files WHERE root = ?", (root_key,)
+                )
+            }
+            removed = [row["id"] for path, row in indexed.items() if path not in on_disk]
+            for file_id in removed:
+                self._delete_file(file_id)
+
+            updated = 0
+            for rel_path, stat in on_disk.items():
+                row = indexed.get(rel_path)
+                if row is not None and row["mtime_ns"] == stat.st_mtime_ns and row["size"] == stat.st_size:
+                    continue
+                if self._index_file(root_key, rel_path, root / rel_path, stat, row):
+                    updated += 1
+            self._conn.commit()
+            total = self._conn.execute(
+                "SELECT COUNT(*) FROM symbols JOIN files ON files.id = symbols.file_id WHERE root = ?",
+                (root_key,),
+            ).fetchone()[0]
+
+        if updated or removed:
+            logger.info(f"Symbol index for {root}: {updated} files re-parsed, {len(removed)} removed")
+        return {"files": len(on_disk), "updated": updated, "removed": len(removed), "symbols": total}
+
+    def _index_file(self, root_key: str, rel_path: str, path: Path,
+                    stat: os.stat_result, row: Optional[sqlite3.Row]) -> bool:
+        """Re-index one file if its content hash changed. Returns True if re-parsed."""
+        try:
+            raw = path.read_bytes()
+        except OSError as e:
+            logger.warning(f"Cannot read {path}: {e}")
+            return False
+        file_hash = hashlib.sha1(raw).hexdigest()
+        if row is not None and row["hash"] == file_hash:
+            # Touched but unchanged: just remember the new stat
+            self._conn.execute(
+                "UPDATE files SET mtime_ns = ?, size = ? WHERE id = ?",
+                (stat.st_mtime_ns, stat.st_size, row["id"]),
+            )
+            return False
+
+        try:
+            symbols = extract_symbols(raw.decode("utf-8", errors="replace"))
+        except (SyntaxError, ValueError) as e:
+            logger.debug(f"Skipping symbols for unparsable {path}: {e}")
+            symbols = []
+
+        if row is not None:
+            self._delete_file(row["id"])
+        file_id = self._conn.execute(
+            "INSERT INTO files (root, path, hash, mtime_ns, size) VALUES (?, ?, ?, ?, ?)",
+            (root_key, rel_path, file_hash, stat.st_mtime_ns, stat.st_size),
+        ).lastrowid
+        for symbol in symbols:
+            calls = " ".join(symbol["calls"])
+            symbol_id = self._conn.execute(
+                "INSERT INTO symbols (file_id, kind, name, qualname, line, docstring, calls) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (file_id, symbol["kind"], symbol["name"], symbol["qualname"],
+                 symbol["line"], symbol["docstring"], calls),
+            ).lastrowid
+            if self.fts:
+                self._conn.execute(
+                    "INSERT INTO symbols_fts (rowid, name, words, docstring, calls) VALUES (?, ?, ?, ?, ?)",
+                    (symbol_id, symbol["name"], _name_words(symbol["name"]),
+                     symbol["docstring"] or "", calls),
+                )
+        return True
+
+    def _delete_file(self, file_id: int) -> None:
+        if self.fts:
+            self._conn.execute(
+                "DELETE FROM symbols_fts WHERE rowid IN (SELECT id FROM symbols WHERE file_id = ?)",
+                (file_id,),
+            )
+        self._conn.execute("DELETE FROM symbols WHERE file_id = ?", (file_id,))
+        self._conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+    def is_indexed(self, root: Path) -> bool:
+        """Return True if the project has been indexed at least once."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM files WHERE root = ? LIMIT 1", (str(Path(root).resolve()),)
+            ).fetchone() is not None
+
+    # Querying
+
+    def search(self, query: str, root: Optional[Path] = None, kinds: Optional[Iterable[str]] = None,
+               limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Search symbol names, name words, docstrings and call references.
+
+        Every query term must match, as a token or token prefix
+        ("conf" matches get_config and ConfigLoader).
+
+        Args:
+            query: Free-text query
+            root: Restrict to one indexed project
+            kinds: Restrict to symbol kinds (class, function, method, variable)
+            limit: Maximum results
+
+        Returns:
+            Result dicts ordered best match first
+        """
+        terms = [t.lower() for t in re.findall(r"[A-Za-z0-9]+", query)]
+        if not terms:
+            return []
+        if self.fts:
+            match = " ".join(f'"{term}"*' for term in terms)
+            return self._query("symbols_fts MATCH ?", [match], root, kinds, limit, _RANK, fts=True)
+        # Without FTS5: every term must appear somewhere in the searchable text
+        clauses, params = [], []
+        for term in terms:
+            clauses.append("(lower(symbols.name) LIKE ? OR lower(symbols.docstring) LIKE ? "
+                           "OR lower(symbols.calls) LIKE ?)")
+            params.extend([f"%{term}%"] * 3)
+        return self._query(" AND ".join(clauses), params, root, kinds, limit, "length(symbols.name)")
+
+    def callers(self, name: str, root: Optional[Path] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Return functions and methods whose bodies call exactly ``name``."""
+        # calls is a space-separated name list; LIKE would treat "_" as a wildcard
+        exact = "instr(' ' || symbols.calls || ' ', ?) > 0"
+        if self.fts:
+            # The FTS tokenizer splits on "_", so the phrase match only narrows
+            # the candidates (get_config also matches get_config_value)
+            return self._query(f"symbols_fts MATCH ? AND {exact}", [f'calls : "{name}"', f" {name} "],
+                               root, None, limit, _RANK, fts=True)
+        return self._query(exact, [f" {name} "], root, None, limit, "symbols.qualname")
+
+    def _query(self, where: str, params: List[Any], root: Optional[Path], kinds: Optional[Iterable[str]],
+               limit: int, order: str, fts: bool = False) -> List[Dict[str, Any]]:
+        sql = ("SELECT symbols.kind, symbols.name, symbols.qualname, symbols.line, symbols.docstring, "
+               "files.path, files.root FROM ")
+        sql += "symbols_fts JOIN symbols ON symbols.id = symbols_fts.rowid " if fts else "symbols "
+        sql += "JOIN files ON files.id = symbols.file_id WHERE " + where
+        if root is not None:
+            sql += " AND files.root = ?"
+            params = params + [str(Path(root).resolve())]
+        if kinds:
+            kinds = list(kinds)
+            sql += f" AND symbols.kind IN ({', '.join('?' * len(kinds))})"
+            params = params + kinds
+        sql += f" ORDER BY {order} LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(sql, params + [limit]).fetchall()
+        return [
+            {
+                "type": row["kind"],
+                "name": row["name"],
+                "qualname": row["qualname"],
+                "file": row["path"],
+                "line": row["line"],
+                "docstring": row["docstring"],
+            }
+            for row in rows
+        ]
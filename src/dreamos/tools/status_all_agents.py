@@ -1,15 +1,21 @@
 """
 Real-time status monitor for Dream.OS agents
 Provides live overview of agent health, uptime, and performance metrics
+
+Each refresh takes one snapshot: every agent PID is checked once, the devlog
+directory is scanned once, and the metrics file is read and written once.
+Runtime totals grow by the time since the previous sample of the same run.
 """
 
 import argparse
 import json
 import logging
+import os
+import tempfile
 import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import psutil
 
@@ -37,6 +43,52 @@ STATUS_SYMBOLS = {
     "restarting": ("\033[94m🔄\033[0m", "\033[94mrestarting\033[0m"),  # Blue
 }
 
+# psutil.Process objects reused across watch-mode refreshes
+_process_cache: Dict[int, psutil.Process] = {}
+
+
+def snapshot_processes(pids: Iterable[int]) -> Dict[int, Tuple[str, Optional[int]]]:
+    """
+    Check a set of PIDs in one pass
+
+    Process handles are cached between calls; is_running() compares the
+    creation time, so a reused PID is reported as crashed, not running.
+
+    Returns:
+        Dict mapping each PID to (status, exit code if available)
+    """
+    snapshot = {}
+    for pid in set(pids):
+        try:
+            process = _process_cache.get(pid)
+            if process is None:
+                process = _process_cache[pid] = psutil.Process(pid)
+            if process.is_running() and process.status() != psutil.STATUS_ZOMBIE:
+                snapshot[pid] = ("running", None)
+                continue
+            _process_cache.pop(pid, None)
+            try:
+                snapshot[pid] = ("crashed", process.wait(timeout=0))  # Exit code if it is our child
+            except (psutil.TimeoutExpired, psutil.Error, ChildProcessError):
+                snapshot[pid] = ("crashed", None)
+        except psutil.NoSuchProcess:
+            _process_cache.pop(pid, None)
+            snapshot[pid] = ("crashed", None)
+        except psutil.AccessDenied:
+            snapshot[pid] = ("unknown", None)
+        except Exception:
+            snapshot[pid] = ("unknown", None)
+    return snapshot
+
+
+def scan_devlogs() -> Dict[str, float]:
+    """Modification time of every devlog, keyed by file name, from one directory scan"""
+    try:
+        with os.scandir(DEVLOG_DIR) as entries:
+            return {entry.name: entry.stat().st_mtime for entry in entries if entry.is_file()}
+    except FileNotFoundError:
+        return {}
+
 
 class AgentStatus:
     """Represents an agent's current status and metrics"""
@@ -70,19 +122,7 @@ class AgentStatus:
         """
         if not self.pid:
             return "stopped", None
-
-        try:
-            # Use psutil for cross-platform process checking
-            process = psutil.Process(self.pid)
-            if process.is_running():
-                return "running", None
-            return "crashed", process.wait()  # Get exit code if available
-        except psutil.NoSuchProcess:
-            return "crashed", None
-        except psutil.AccessDenied:
-            return "unknown", None
-        except Exception:
-            return "unknown", None
+        return snapshot_processes([self.pid])[self.pid]
 
     def get_uptime(self) -> Optional[float]:
         """Get agent uptime in seconds"""
@@ -92,17 +132,35 @@ class AgentStatus:
             datetime.now(timezone.utc) - self.start_time.replace(tzinfo=timezone.utc)
         ).total_seconds()
 
-    def get_last_activity(self) -> Optional[float]:
-        """Get time since last activity in seconds"""
-        devlog = DEVLOG_DIR / f"{self.agent_id.lower()}.log"
-        if not devlog.exists():
+    def get_last_activity(self, devlog_mtimes: Optional[Dict[str, float]] = None) -> Optional[float]:
+        """Get time since last activity in seconds
+
+        Args:
+            devlog_mtimes: Result of scan_devlogs(); the devlog is stat'ed if omitted
+        """
+        name = f"{self.agent_id.lower()}.log"
+        if devlog_mtimes is None:
+            devlog_mtimes = {}
+            devlog = DEVLOG_DIR / name
+            if devlog.exists():
+                devlog_mtimes[name] = devlog.stat().st_mtime
+        if name not in devlog_mtimes:
             return None
 
-        return time.time() - devlog.stat().st_mtime
+        return time.time() - devlog_mtimes[name]
+
+    def format_status(
+        self,
+        process_state: Optional[Tuple[str, Optional[int]]] = None,
+        devlog_mtimes: Optional[Dict[str, float]] = None,
+    ) -> str:
+        """Format agent status for display
 
-    def format_status(self) -> str:
-        """Format agent status for display"""
-        status, exit_code = self.check_process()
+        Args:
+            process_state: (status, exit code) from a snapshot; checked if omitted
+            devlog_mtimes: Result of scan_devlogs(); stat'ed if omitted
+        """
+        status, exit_code = process_state or self.check_process()
         symbol, status_text = STATUS_SYMBOLS.get(status, STATUS_SYMBOLS["unknown"])
 
         # Build status line
@@ -126,7 +184,7 @@ class AgentStatus:
             parts.append(f"restarts: {self.restart_count}")
 
         # Add last activity if available
-        last_activity = self.get_last_activity()
+        last_activity = self.get_last_activity(devlog_mtimes)
         if last_activity:
             parts.append(f"last active: {format_duration(last_activity)} ago")
 
@@ -167,36 +225,76 @@ def load_metrics() -> Dict:
     return {}
 
 
-def update_metrics(agent_id: str, status: str, uptime: Optional[float]):
-    """Update agent metrics"""
+def save_metrics(metrics: Dict) -> None:
+    """Write agent metrics atomically"""
     METRICS_DIR.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", dir=METRICS_DIR, suffix=".tmp", delete=False, encoding="utf-8"
+    ) as f:
+        json.dump(metrics, f, indent=2)
+    os.replace(f.name, METRICS_FILE)
 
-    metrics = load_metrics()
-    agent_metrics = metrics.get(
-        agent_id,
-        {
-            "total_restarts": 0,
-            "total_runtime_seconds": 0,
-            "crashes": 0,
-            "last_crash": None,
-        },
-    )
 
-    if status == "crashed" and (
-        not agent_metrics["last_crash"]
-        or datetime.fromisoformat(agent_metrics["last_crash"])
-        < datetime.now(timezone.utc)
-    ):
-        agent_metrics["crashes"] += 1
-        agent_metrics["last_crash"] = datetime.now(timezone.utc).isoformat()
+def update_metrics(
+    agents: List[AgentStatus],
+    process_states: Dict[str, Tuple[str, Optional[int]]],
+    now: Optional[datetime] = None,
+) -> Dict:
+    """
+    Update metrics for all agents with one read and one write
 
-    if uptime:
-        agent_metrics["total_runtime_seconds"] += uptime
+    Runtime is accumulated incrementally: each sample of a running agent adds
+    the time since the previous sample of the same run (identified by PID and
+    start time), or the uptime so far if the run is new. A crash is counted
+    once per run, not on every refresh that sees it.
 
-    metrics[agent_id] = agent_metrics
+    Args:
+        agents: Agents in this refresh
+        process_states: (status, exit code) per agent ID
+        now: Sample time (defaults to the current UTC time)
 
-    with METRICS_FILE.open("w") as f:
-        json.dump(metrics, f, indent=2)
+    Returns:
+        The updated metrics
+    """
+    now = now or datetime.now(timezone.utc)
+    metrics = load_metrics()
+
+    for agent in agents:
+        status, _ = process_states.get(agent.agent_id, ("unknown", None))
+        agent_metrics = metrics.setdefault(
+            agent.agent_id,
+            {
+                "total_restarts": 0,
+                "total_runtime_seconds": 0,
+                "crashes": 0,
+                "last_crash": None,
+            },
+        )
+        run_id = f"{agent.pid}@{agent.start_time.isoformat() if agent.start_time else ''}"
+
+        if status == "crashed" and agent_metrics.get("last_crashed_run") != run_id:
+            agent_metrics["crashes"] += 1
+            agent_metrics["last_crash"] = now.isoformat()
+            agent_metrics["last_crashed_run"] = run_id
+
+        if status == "running" and agent.start_time:
+            uptime = (now - agent.start_time.replace(tzinfo=timezone.utc)).total_seconds()
+            previous = agent_metrics.get("last_sample")
+            if previous and previous.get("run") == run_id:
+                elapsed = (now - datetime.fromisoformat(previous["at"])).total_seconds()
+                delta = min(max(elapsed, 0), max(uptime, 0))
+            else:
+                delta = max(uptime, 0)
+            agent_metrics["total_runtime_seconds"] += delta
+            agent_metrics["last_sample"] = {"run": run_id, "at": now.isoformat()}
+        else:
+            agent_metrics.pop("last_sample", None)
+
+    try:
+        save_metrics(metrics)
+    except Exception as e:
+        logger.error(f"Failed to save metrics file: {e}")
+    return metrics
 
 
 def show_status(watch: bool = False, interval: int = 5):
@@ -221,13 +319,19 @@ def show_status(watch: bool = False, interval: int = 5):
             )  # Cyan command
             return
 
-        for agent_id in sorted(state.keys()):
-            agent = AgentStatus(agent_id, state.get(agent_id))
-            print(agent.format_status())
+        # One snapshot per refresh: all PIDs, one devlog scan, one metrics write
+        agents = [AgentStatus(agent_id, state.get(agent_id)) for agent_id in sorted(state.keys())]
+        pid_states = snapshot_processes(agent.pid for agent in agents if agent.pid)
+        devlog_mtimes = scan_devlogs()
+        process_states = {
+            agent.agent_id: pid_states[agent.pid] if agent.pid else ("stopped", None)
+            for agent in agents
+        }
+
+        for agent in agents:
+            print(agent.format_status(process_states[agent.agent_id], devlog_mtimes))
 
-            # Update metrics
-            status, _ = agent.check_process()
-            update_metrics(agent_id, status, agent.get_uptime())
+        update_metrics(agents, process_states)
 
         if watch:
             print(f"\nUpdating every {interval}s (Ctrl+C to exit)")
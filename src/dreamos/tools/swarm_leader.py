@@ -1,12 +1,18 @@
+import os
 import time
 import logging
 import threading
 import json
 import re
-import shutil
 from pathlib import Path
 from datetime import datetime, timezone
-from agent_cellphone import AgentCellphone, MessageMode
+from agent_cellphone import MessageMode, get_cellphone
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # Falls back to polling the feedback directory's mtime
+    FileSystemEventHandler = Observer = None
 
 # Configure logging
 logging.basicConfig(
@@ -16,16 +22,37 @@ logging.basicConfig(
 )
 logger = logging.getLogger('swarm_leader')
 
+VERSION_PATTERN = re.compile(r"Version:\s*(\d+\.\d+\.\d+)")
+FEEDBACK_POLL_INTERVAL = 2  # seconds between feedback dir checks without watchdog
+FEEDBACK_SETTLE_TIME = 5    # seconds an unparsable feedback file may still be mid-write
+
 class SwarmLeader:
-    def __init__(self):
-        self.cellphone = AgentCellphone()
+    """Coordinates the swarm.
+
+    The leadership loop wakes up for two reasons: feedback files arriving
+    (a watchdog event, or a changed feedback directory mtime when watchdog is
+    not installed), handled in one batch right away; and the periodic cycle
+    every resume_interval, which refreshes protocol versions, checks agent
+    statuses and sends the leadership message. The coordination state is
+    only written when one of these changed it.
+    """
+
+    def __init__(self, cellphone=None):
+        self.cellphone = cellphone or get_cellphone()
         self.running = False
         self.resume_interval = 600  # 10 minutes
         self.leader_id = "Agent-8"  # Our ID as the swarm leader
         self.protocol_dir = Path("docs/agents/protocols")
+        self.feedback_dir = Path("runtime/agent_comms/feedback")
         self.coordination_file = Path("runtime/agent_comms/coordination/swarm_status.json")
         self.coordination_file.parent.mkdir(parents=True, exist_ok=True)
         self.agent_status = {}
+        self._dirty = False
+        self._wake = threading.Event()
+        self._observer = None
+        self._protocol_stamps = {}   # protocol file -> (mtime_ns, size) when last parsed
+        self._feedback_stamp = None  # feedback dir mtime_ns after the last batch
+        self._feedback_retry = False  # a file was left for the next batch
         self.load_coordination_state()
         
     def load_coordination_state(self):
@@ -52,12 +79,15 @@ class SwarmLeader:
             self.agent_status["last_update"] = datetime.now(timezone.utc).isoformat()
             with open(self.coordination_file, 'w') as f:
                 json.dump(self.agent_status, f, indent=2)
+            self._dirty = False
         except Exception as e:
             logger.error(f"Error saving coordination state: {e}")
             
     def start_leadership_loop(self):
         """Start the leadership loop in a background thread."""
         self.running = True
+        self._wake.clear()
+        self._start_feedback_watcher()
         self.leadership_thread = threading.Thread(target=self._leadership_loop)
         self.leadership_thread.daemon = True
         self.leadership_thread.start()
@@ -66,66 +96,113 @@ class SwarmLeader:
     def stop_leadership_loop(self):
         """Stop the leadership loop."""
         self.running = False
+        self._wake.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
         if hasattr(self, 'leadership_thread'):
             self.leadership_thread.join()
         logger.info("Stopped swarm leadership loop")
         
+    def notify_feedback(self):
+        """Wake the leadership loop to process newly written feedback now."""
+        self._wake.set()
+        
+    def _start_feedback_watcher(self):
+        """Watch the feedback directory with watchdog, if it is installed."""
+        if Observer is None:
+            return
+        feedback_dir = self.feedback_dir.resolve()
+        
+        def on_any_event(event):
+            # Only files appearing directly in the feedback dir matter
+            path = Path(getattr(event, "dest_path", "") or event.src_path)
+            if event.event_type != "deleted" and path.parent == feedback_dir and path.suffix == ".json":
+                self._wake.set()
+                
+        try:
+            self.feedback_dir.mkdir(parents=True, exist_ok=True)
+            handler = FileSystemEventHandler()
+            handler.on_any_event = on_any_event
+            self._observer = Observer()
+            self._observer.schedule(handler, str(feedback_dir), recursive=False)
+            self._observer.start()
+        except Exception as e:
+            logger.warning(f"Feedback watcher unavailable, polling instead: {e}")
+            self._observer = None
+        
     def _leadership_loop(self):
         """Main leadership loop that coordinates swarm activities."""
+        next_cycle = time.monotonic()
         while self.running:
             try:
-                # Update protocol versions
-                self._update_protocol_versions()
-                
-                # Check agent statuses
-                self._check_agent_statuses()
-                
-                # Send leadership message
-                self._send_leadership_message()
-                
-                # Process feedback
+                # Feedback is handled as soon as it arrives
                 self._process_agent_feedback()
                 
-                # Update coordination state
-                self.save_coordination_state()
-                
-                # Wait for next interval
-                time.sleep(self.resume_interval)
+                if time.monotonic() >= next_cycle:
+                    self._update_protocol_versions()
+                    self._check_agent_statuses()
+                    self._send_leadership_message()
+                    next_cycle = time.monotonic() + self.resume_interval
+                    
+                # Update coordination state only if something changed
+                if self._dirty:
+                    self.save_coordination_state()
+                    
+                # Sleep until the next cycle or until feedback arrives
+                timeout = max(0.0, next_cycle - time.monotonic())
+                if self._observer is None:
+                    timeout = min(timeout, FEEDBACK_POLL_INTERVAL)
+                self._wake.wait(timeout)
+                self._wake.clear()
                 
             except Exception as e:
                 logger.error(f"Error in leadership loop: {e}")
-                time.sleep(60)  # Wait a minute before retrying
+                self._wake.wait(60)  # Wait a minute before retrying
                 
     def _update_protocol_versions(self):
-        """Update protocol versions from documentation."""
+        """Update protocol versions from documentation.
+        
+        Only protocol files whose mtime or size changed since they were last
+        parsed are read again.
+        """
         try:
             for protocol_file in self.protocol_dir.glob("*.md"):
+                st = protocol_file.stat()
+                stamp = (st.st_mtime_ns, st.st_size)
+                if self._protocol_stamps.get(protocol_file) == stamp:
+                    continue
                 with open(protocol_file, 'r') as f:
                     content = f.read()
-                    # Extract version from header
-                    version_match = re.search(r"Version:\s*(\d+\.\d+\.\d+)", content)
-                    if version_match:
-                        self.agent_status["protocol_versions"][protocol_file.stem] = version_match.group(1)
+                self._protocol_stamps[protocol_file] = stamp
+                # Extract version from header
+                version_match = VERSION_PATTERN.search(content)
+                if version_match:
+                    versions = self.agent_status["protocol_versions"]
+                    if versions.get(protocol_file.stem) != version_match.group(1):
+                        versions[protocol_file.stem] = version_match.group(1)
+                        self._dirty = True
         except Exception as e:
             logger.error(f"Error updating protocol versions: {e}")
             
     def _check_agent_statuses(self):
         """Check and update status of all agents."""
         try:
-            for agent_id in self.agent_status["agents"]:
-                # Send status check message
-                status_message = {
-                    "type": "status_check",
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                    "protocol_versions": self.agent_status["protocol_versions"]
-                }
-                
-                ok = self.cellphone.message_agent(
-                    agent_id,
-                    json.dumps(status_message),
-                    MessageMode.STATUS
-                )
-                
+            # One status check message, delivered to every agent in a single pass
+            status_message = {
+                "type": "status_check",
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "protocol_versions": self.agent_status["protocol_versions"]
+            }
+            
+            results = self.cellphone.message_agents(
+                list(self.agent_status["agents"]),
+                json.dumps(status_message),
+                MessageMode.STATUS
+            )
+            
+            for agent_id, ok in results.items():
                 if not ok:
                     logger.warning(f"Failed to check status for {agent_id}")
                     
@@ -157,30 +234,69 @@ class SwarmLeader:
         except Exception as e:
             logger.error(f"Error sending leadership message: {e}")
             
-    def _process_agent_feedback(self):
-        """Process feedback from agents."""
+    def _process_agent_feedback(self) -> int:
+        """Process all queued feedback from agents as one batch.
+        
+        Returns:
+            Number of feedback files processed
+        """
         try:
-            feedback_dir = Path("runtime/agent_comms/feedback")
-            if feedback_dir.exists():
-                for feedback_file in feedback_dir.glob("*.json"):
+            feedback_dir = self.feedback_dir
+            try:
+                stamp = os.stat(feedback_dir).st_mtime_ns
+            except FileNotFoundError:
+                return 0
+            # Nothing was added or removed since the last batch
+            if stamp == self._feedback_stamp and not self._feedback_retry:
+                return 0
+                
+            with os.scandir(feedback_dir) as entries:
+                queued = sorted(
+                    (entry.stat().st_mtime_ns, entry.name, Path(entry.path))
+                    for entry in entries
+                    if entry.is_file() and entry.name.endswith(".json")
+                )
+                
+            processed = []
+            self._feedback_retry = False
+            for _, _, feedback_file in queued:
+                try:
                     with open(feedback_file, 'r') as f:
                         feedback = json.load(f)
-                        
-                    # Process feedback based on type
-                    if feedback["type"] == "status_update":
-                        self._handle_status_update(feedback)
-                    elif feedback["type"] == "task_update":
-                        self._handle_task_update(feedback)
-                    elif feedback["type"] == "protocol_feedback":
-                        self._handle_protocol_feedback(feedback)
-                        
-                    # Archive processed feedback
-                    archive_dir = feedback_dir / "archive"
-                    archive_dir.mkdir(exist_ok=True)
-                    shutil.move(feedback_file, archive_dir / feedback_file.name)
+                except (OSError, json.JSONDecodeError) as e:
+                    if time.time() - feedback_file.stat().st_mtime < FEEDBACK_SETTLE_TIME:
+                        self._feedback_retry = True  # Probably still being written
+                        continue
+                    logger.error(f"Archiving unreadable feedback {feedback_file.name}: {e}")
+                    processed.append(feedback_file)
+                    continue
+                    
+                # Process feedback based on type
+                feedback_type = feedback.get("type")
+                if feedback_type == "status_update":
+                    self._handle_status_update(feedback)
+                elif feedback_type == "task_update":
+                    self._handle_task_update(feedback)
+                elif feedback_type == "protocol_feedback":
+                    self._handle_protocol_feedback(feedback)
+                processed.append(feedback_file)
+                
+            # Archive processed feedback
+            if processed:
+                archive_dir = feedback_dir / "archive"
+                archive_dir.mkdir(exist_ok=True)
+                for feedback_file in processed:
+                    os.replace(feedback_file, archive_dir / feedback_file.name)
+                self._dirty = True
+                logger.info(f"Processed {len(processed)} feedback files")
+            # Taken before the scan, so files added during it are not skipped;
+            # our own archive moves just cost one more (empty) scan
+            self._feedback_stamp = stamp
+            return len(processed)
                     
         except Exception as e:
             logger.error(f"Error processing agent feedback: {e}")
+            return 0
             
     def _handle_status_update(self, feedback: dict):
         """Handle agent status update feedback."""
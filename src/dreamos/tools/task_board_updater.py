@@ -5,14 +5,33 @@ Task Board Updater Script
 This script safely updates the task_board.json file using filelock to avoid
 permission errors and race conditions. It can be used to add new tasks, update
 existing tasks, or modify the status of tasks.
+
+Updates are not written into task_board.json directly. Each one is appended as
+a small patch to a journal next to it (task_board.json.journal/), sharded per
+agent so agents reporting their own status only take their own shard's lock.
+Concurrent writers in one process share a single write + fsync per shard
+(group commit). The journal is folded back into task_board.json once a shard
+grows past COMPACT_THRESHOLD_BYTES or the snapshot is older than
+COMPACT_INTERVAL seconds, and a timer compacts patches that no later write
+picks up. A CLI call exits without waiting for that timer, so it compacts only
+when one of those triggers is already due and otherwise leaves its patch for
+the next compaction. Code that needs the current board should use
+load_task_board(), which returns snapshot + journal.
+
+Each shard keeps a <shard>.lock file beside it in the journal directory. These
+files are deliberately never deleted: a process may be holding or waiting on
+the lock, and removing the file would let the next writer lock a new inode
+while the old one is still held, so two writers could append at once.
 """
 
 import argparse
 import json
 import logging
 import os
+import re
 import sys
 import tempfile
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -34,6 +53,8 @@ logger = logging.getLogger("task_board_updater")
 # Constants
 DEFAULT_TASK_BOARD_PATH = Path("runtime/task_board.json")
 DEFAULT_LOCK_TIMEOUT = 30  # seconds
+COMPACT_THRESHOLD_BYTES = 64 * 1024  # journal shard size that triggers compaction
+COMPACT_INTERVAL = 30  # seconds a patch may wait before task_board.json reflects it
 
 
 class TaskBoardUpdater:
@@ -45,6 +66,9 @@ class TaskBoardUpdater:
         self,
         task_board_path: Path = DEFAULT_TASK_BOARD_PATH,
         lock_timeout: int = DEFAULT_LOCK_TIMEOUT,
+        shard_by_agent: bool = True,
+        compact_threshold: int = COMPACT_THRESHOLD_BYTES,
+        compact_interval: float = COMPACT_INTERVAL,
     ):
         """
         Initialize the TaskBoardUpdater.
@@ -52,31 +76,68 @@ class TaskBoardUpdater:
         Args:
             task_board_path: Path to the task_board.json file
             lock_timeout: Timeout in seconds for acquiring the file lock
+            shard_by_agent: Keep one journal shard (and lock) per agent; if
+                            False all patches go to a single shard
+            compact_threshold: Shard size in bytes that triggers compaction
+            compact_interval: Maximum snapshot age in seconds before a write
+                              triggers compaction
         """
         self.task_board_path = task_board_path
         self.lock_timeout = lock_timeout
         self.lock_path = task_board_path.with_suffix(task_board_path.suffix + ".lock")
-
-        # Ensure directory exists
+        self.journal_dir = task_board_path.with_name(task_board_path.name + ".journal")
+        self.shard_by_agent = shard_by_agent
+        self.compact_threshold = compact_threshold
+        self.compact_interval = compact_interval
+        # One lock object per file: filelock is re-entrant per instance only
+        self._board_lock = filelock.FileLock(self.lock_path, timeout=lock_timeout)
+        self._shard_locks: Dict[str, filelock.FileLock] = {}
+
+        # Group commit state
+        self._commit_cond = threading.Condition()
+        self._queue: List[tuple] = []
+        self._errors: Dict[int, Exception] = {}
+        self._seq = 0
+        self._durable = 0
+        self._flushing = False
+        self._compact_timer: Optional[threading.Timer] = None
+        self._timer_lock = threading.Lock()
+
+        # Ensure directories exist
         self.task_board_path.parent.mkdir(parents=True, exist_ok=True)
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+
+    def _read_snapshot(self) -> Dict[str, Any]:
+        """Read task_board.json itself (without journal patches)."""
+        if not self.task_board_path.exists():
+            logger.warning(f"Task board file not found: {self.task_board_path}")
+            return {"cursor_agents": {}, "last_updated_utc": datetime.utcnow().isoformat()}
 
-    def _read_task_board(self) -> Dict[str, Any]:
+        with open(self.task_board_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _read_task_board(self, agent_id: Optional[str] = None) -> Dict[str, Any]:
         """
-        Read the task board file with file locking.
+        Read the task board: the snapshot plus all journal patches.
+
+        Args:
+            agent_id: If given, only that agent's shard is replayed, which is
+                      enough to see that agent's current entry
 
         Returns:
             Dict containing task board data
         """
         try:
-            with filelock.FileLock(self.lock_path, timeout=self.lock_timeout):
-                if not self.task_board_path.exists():
-                    logger.warning(f"Task board file not found: {self.task_board_path}")
-                    return {"cursor_agents": {}, "last_updated_utc": datetime.utcnow().isoformat()}
-
-                with open(self.task_board_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-
-                return data
+            # Under the board lock no compaction can fold patches into the
+            # snapshot between the two reads, which would let an older patch
+            # overwrite newer snapshot state
+            with self._board_lock:
+                shards = [self._shard_name(agent_id)] if agent_id and self.shard_by_agent else None
+                patches = self._read_journal(shards)
+                data = self._read_snapshot()
+            for patch in patches:
+                _apply_patch(data, patch)
+            return data
         except filelock.Timeout:
             logger.error(f"Could not acquire lock for {self.task_board_path} within {self.lock_timeout} seconds")
             raise
@@ -96,7 +157,7 @@ class TaskBoardUpdater:
         """
         temp_file_path = None
         try:
-            with filelock.FileLock(self.lock_path, timeout=self.lock_timeout):
+            with self._board_lock:
                 # Update the last updated timestamp
                 data["last_updated_utc"] = datetime.utcnow().isoformat()
 
@@ -129,6 +190,197 @@ class TaskBoardUpdater:
                     pass
             raise
 
+    # ----- journal -----
+
+    def _shard_name(self, agent_id: str) -> str:
+        if not self.shard_by_agent:
+            return "board"
+        # Sanitizing may map two agents to one shard; that only shares a lock
+        return re.sub(r"[^\w.-]", "_", agent_id) or "_"
+
+    def _shard_lock(self, shard: str) -> filelock.FileLock:
+        # The .lock file outlives the lock; see the module docstring
+        lock = self._shard_locks.get(shard)
+        if lock is None:
+            lock = self._shard_locks.setdefault(
+                shard, filelock.FileLock(self.journal_dir / f"{shard}.lock", timeout=self.lock_timeout)
+            )
+        return lock
+
+    def _read_journal(self, shards: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Patches in apply order: per shard, those being compacted, then live ones."""
+        if shards is None:
+            shards = sorted({p.stem for p in self.journal_dir.glob("*.jsonl")}
+                            | {p.stem for p in self.journal_dir.glob("*.compacting")})
+        patches = []
+        for shard in shards:
+            # Live file first: if a compaction moves it aside in between, its
+            # patches are then found in the .compacting file instead of lost
+            live = _read_patches(self.journal_dir / f"{shard}.jsonl")
+            patches.extend(_read_patches(self.journal_dir / f"{shard}.compacting"))
+            patches.extend(live)
+        return patches
+
+    def _append(self, patch: Dict[str, Any]) -> None:
+        """
+        Durably append a patch, sharing the write and fsync with any patches
+        other threads queue meanwhile (group commit).
+        """
+        shard = self._shard_name(patch["agent_id"])
+        with self._commit_cond:
+            self._seq += 1
+            seq = self._seq
+            self._queue.append((seq, shard, patch))
+            while self._durable < seq:
+                if self._flushing:
+                    self._commit_cond.wait()
+                    continue
+                # Become the leader and flush everything queued so far
+                self._flushing = True
+                batch, self._queue = self._queue, []
+                self._commit_cond.release()
+                try:
+                    needs_compaction = self._write_batch(batch)
+                    error = None
+                except Exception as e:
+                    needs_compaction, error = False, e
+                finally:
+                    self._commit_cond.acquire()
+                if error is not None:
+                    self._errors.update({s: error for s, _, _ in batch})
+                self._durable = batch[-1][0]
+                self._flushing = False
+                self._commit_cond.notify_all()
+                if needs_compaction:
+                    self._commit_cond.release()
+                    try:
+                        self.compact(only_if_needed=True)
+                    finally:
+                        self._commit_cond.acquire()
+            error = self._errors.pop(seq, None)
+        if error is not None:
+            raise error
+        self._schedule_compaction()
+
+    def _schedule_compaction(self) -> None:
+        """Compact within compact_interval even if no later write triggers it."""
+        with self._timer_lock:
+            if self._compact_timer is not None:
+                return
+            self._compact_timer = threading.Timer(self.compact_interval, self._compact_pending)
+            self._compact_timer.daemon = True
+            self._compact_timer.start()
+
+    def _compact_pending(self) -> None:
+        with self._timer_lock:
+            self._compact_timer = None
+        try:
+            if self._has_journal():
+                self.compact()
+        except Exception as e:
+            logger.error(f"Deferred compaction of {self.task_board_path} failed: {e}")
+
+    def _has_journal(self) -> bool:
+        return any(self.journal_dir.glob("*.jsonl")) or any(self.journal_dir.glob("*.compacting"))
+
+    def close(self) -> None:
+        """
+        Cancel the compaction timer, compacting first if a trigger is already due.
+
+        Patches that are not yet due stay in the journal; load_task_board()
+        merges them and the next write or compaction folds them in.
+        """
+        with self._timer_lock:
+            timer, self._compact_timer = self._compact_timer, None
+        if timer is not None:
+            timer.cancel()
+        if self._has_journal():
+            self.compact(only_if_needed=True)
+
+    def _write_batch(self, batch: List[tuple]) -> bool:
+        """Append a batch with one write + fsync per shard; True if compaction is due."""
+        by_shard: Dict[str, List[str]] = {}
+        for _, shard, patch in batch:
+            by_shard.setdefault(shard, []).append(json.dumps(patch) + "\n")
+
+        needs_compaction = False
+        for shard, lines in by_shard.items():
+            path = self.journal_dir / f"{shard}.jsonl"
+            try:
+                with self._shard_lock(shard):
+                    with open(path, "a+b") as f:
+                        # Start on a fresh line if a crash left a torn patch
+                        if f.tell() > 0:
+                            f.seek(-1, os.SEEK_END)
+                            if f.read(1) != b"\n":
+                                lines.insert(0, "\n")
+                        f.write("".join(lines).encode("utf-8"))
+                        f.flush()
+                        os.fsync(f.fileno())
+                        size = f.tell()
+            except filelock.Timeout:
+                logger.error(f"Could not acquire lock for journal shard {shard} within {self.lock_timeout} seconds")
+                raise
+            needs_compaction = needs_compaction or size >= self.compact_threshold
+        return needs_compaction or self._snapshot_age() >= self.compact_interval
+
+    def _snapshot_age(self) -> float:
+        try:
+            return datetime.now().timestamp() - self.task_board_path.stat().st_mtime
+        except FileNotFoundError:
+            return float("inf")
+
+    def compact(self, only_if_needed: bool = False) -> int:
+        """
+        Fold all journal patches into task_board.json.
+
+        Args:
+            only_if_needed: Skip unless a shard is over the size threshold or
+                            the snapshot is older than the compaction interval
+                            (re-checked under the lock, as another process may
+                            have just compacted)
+
+        Returns:
+            Number of patches folded in
+        """
+        try:
+            with self._board_lock:
+                live = sorted(self.journal_dir.glob("*.jsonl"))
+                if only_if_needed and self._snapshot_age() < self.compact_interval and not any(
+                    p.stat().st_size >= self.compact_threshold for p in live
+                ):
+                    return 0
+
+                # Move live shards aside; writers start new shard files meanwhile
+                for path in live:
+                    compacting = path.with_suffix(".compacting")
+                    with self._shard_lock(path.stem):
+                        if compacting.exists():
+                            # Left over from an interrupted compaction: keep the order
+                            with open(path, "rb") as src, open(compacting, "ab") as dst:
+                                dst.write(src.read())
+                                dst.flush()
+                                os.fsync(dst.fileno())
+                            path.unlink()
+                        else:
+                            path.replace(compacting)
+
+                compacting = sorted(self.journal_dir.glob("*.compacting"))
+                patches = [patch for path in compacting for patch in _read_patches(path)]
+                data = self._read_snapshot()
+                for patch in patches:
+                    _apply_patch(data, patch)
+                self._write_task_board(data)
+                for path in compacting:
+                    path.unlink()
+                logger.info(f"Compacted {len(patches)} journal patches into {self.task_board_path}")
+                return len(patches)
+        except filelock.Timeout:
+            logger.error(f"Could not acquire lock for {self.task_board_path} within {self.lock_timeout} seconds")
+            raise
+
+    # ----- updates -----
+
     def update_agent_status(
         self,
         agent_id: str,
@@ -147,34 +399,19 @@ class TaskBoardUpdater:
             task_id: Optional task ID the agent is working on
             task_description: Optional task description
         """
-        data = self._read_task_board()
-
-        # Ensure cursor_agents section exists
-        if "cursor_agents" not in data:
-            data["cursor_agents"] = {}
-
-        # Create agent entry if it doesn't exist
-        if agent_id not in data["cursor_agents"]:
-            data["cursor_agents"][agent_id] = {
-                "status": "UNKNOWN",
-                "last_status_update_utc": datetime.utcnow().isoformat(),
-            }
-
-        # Update agent data
-        agent_data = data["cursor_agents"][agent_id]
-        agent_data["status"] = status
-        agent_data["last_status_update_utc"] = datetime.utcnow().isoformat()
+        now = datetime.utcnow().isoformat()
+        fields = {"status": status, "last_status_update_utc": now}
 
         if status_details:
-            agent_data["status_details"] = status_details
+            fields["status_details"] = status_details
 
         if task_id:
-            agent_data["current_task_id"] = task_id
+            fields["current_task_id"] = task_id
 
         if task_description:
-            agent_data["assigned_task_description"] = task_description
+            fields["assigned_task_description"] = task_description
 
-        self._write_task_board(data)
+        self._append({"op": "status", "agent_id": agent_id, "fields": fields, "ts": now})
         logger.info(f"Updated status for agent {agent_id} to {status}")
 
     def add_task(
@@ -188,28 +425,13 @@ class TaskBoardUpdater:
             task_id: ID of the task
             task_data: Task data dictionary
         """
-        data = self._read_task_board()
-
-        # Ensure cursor_agents section exists
-        if "cursor_agents" not in data:
-            data["cursor_agents"] = {}
-
-        # Create agent entry if it doesn't exist
-        if agent_id not in data["cursor_agents"]:
-            data["cursor_agents"][agent_id] = {
-                "status": "UNKNOWN",
-                "last_status_update_utc": datetime.utcnow().isoformat(),
-                "tasks": {},
-            }
-
-        # Ensure tasks section exists
-        if "tasks" not in data["cursor_agents"][agent_id]:
-            data["cursor_agents"][agent_id]["tasks"] = {}
-
-        # Add task
-        data["cursor_agents"][agent_id]["tasks"][task_id] = task_data
-
-        self._write_task_board(data)
+        self._append({
+            "op": "add_task",
+            "agent_id": agent_id,
+            "task_id": task_id,
+            "task": task_data,
+            "ts": datetime.utcnow().isoformat(),
+        })
         logger.info(f"Added task {task_id} to agent {agent_id}")
 
     def update_task(
@@ -223,7 +445,7 @@ class TaskBoardUpdater:
             task_id: ID of the task to update
             task_updates: Dictionary of task fields to update
         """
-        data = self._read_task_board()
+        data = self._read_task_board(agent_id)
 
         # Check if agent and task exist
         if (
@@ -235,19 +457,81 @@ class TaskBoardUpdater:
             logger.error(f"Task {task_id} not found for agent {agent_id}")
             return
 
-        # Update task
-        for key, value in task_updates.items():
-            data["cursor_agents"][agent_id]["tasks"][task_id][key] = value
-
-        # Update timestamp
-        data["cursor_agents"][agent_id]["tasks"][task_id][
-            "last_updated"
-        ] = datetime.utcnow().isoformat()
+        now = datetime.utcnow().isoformat()
+        fields = dict(task_updates)
+        fields["last_updated"] = now
 
-        self._write_task_board(data)
+        self._append({"op": "update_task", "agent_id": agent_id, "task_id": task_id, "fields": fields, "ts": now})
         logger.info(f"Updated task {task_id} for agent {agent_id}")
 
 
+def _read_patches(path: Path) -> List[Dict[str, Any]]:
+    """Patches in a journal file; missing files and torn lines are skipped."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return []
+    patches = []
+    for line in lines:
+        try:
+            patches.append(json.loads(line))
+        except json.JSONDecodeError:
+            if line.strip():
+                logger.warning(f"Skipping torn journal entry in {path}")
+    return patches
+
+
+def _apply_patch(data: Dict[str, Any], patch: Dict[str, Any]) -> None:
+    """
+    Apply one journal patch to task board data.
+
+    Patches set absolute values, so they must be applied in journal order on
+    top of the snapshot they were written after. Replaying a run that is
+    already in the snapshot, in the same order (after an interrupted
+    compaction), gives the same result; applying an older patch over a newer
+    snapshot does not.
+    """
+    agents = data.setdefault("cursor_agents", {})
+    agent_id = patch["agent_id"]
+    op = patch["op"]
+
+    if op == "status":
+        agent_data = agents.setdefault(agent_id, {"status": "UNKNOWN", "last_status_update_utc": patch["ts"]})
+        agent_data.update(patch["fields"])
+    elif op == "add_task":
+        agent_data = agents.setdefault(
+            agent_id, {"status": "UNKNOWN", "last_status_update_utc": patch["ts"], "tasks": {}}
+        )
+        agent_data.setdefault("tasks", {})[patch["task_id"]] = patch["task"]
+    elif op == "update_task":
+        task = agents.get(agent_id, {}).get("tasks", {}).get(patch["task_id"])
+        if task is None:
+            return
+        task.update(patch["fields"])
+    else:
+        logger.warning(f"Unknown journal patch op: {op}")
+        return
+
+    if patch["ts"] > data.get("last_updated_utc", ""):
+        data["last_updated_utc"] = patch["ts"]
+
+
+def load_task_board(task_board_path: Path = DEFAULT_TASK_BOARD_PATH) -> Dict[str, Any]:
+    """
+    Read the current task board, including journal patches not yet compacted.
+
+    Use this instead of reading task_board.json directly.
+
+    Args:
+        task_board_path: Path to the task_board.json file
+
+    Returns:
+        Dict containing task board data
+    """
+    return TaskBoardUpdater(Path(task_board_path))._read_task_board()
+
+
 def main():
     """Main function to run the script."""
     parser = argparse.ArgumentParser(description="Update agent status and tasks in task_board.json")
@@ -293,6 +577,9 @@ def main():
         help="JSON string containing task updates or path to JSON file",
     )
 
+    # Parser for compact operation
+    subparsers.add_parser("compact", help="Fold the update journal into the task board file")
+
     args = parser.parse_args()
 
     # Create TaskBoardUpdater
@@ -315,9 +602,15 @@ def main():
         # Parse updates JSON
         updates = _parse_json_arg(args.updates_json)
         updater.update_task(args.agent_id, args.task_id, updates)
+    elif args.operation == "compact":
+        updater.compact()
     else:
         parser.print_help()
 
+    # This process exits now, so its compaction timer would never fire;
+    # compact here only if a size or age trigger is already due
+    updater.close()
+
 
 def _parse_json_arg(json_arg: str) -> Dict[str, Any]:
     """
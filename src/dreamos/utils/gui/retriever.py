@@ -2,7 +2,7 @@
 dreamos.utils.gui.retriever
 ----------------------------------
 High-reliability GUI clipboard retriever for Dream.OS agents.
-• Waits for completion image
+• Waits for completion image (region-limited, via the shared ScreenWatcher)
 • Clicks copy button with retry & adaptive sleeps
 • Validates clipboard via placeholder
 • Saves debug screenshots on failure
@@ -15,6 +15,8 @@ from typing import Any, Dict, Optional, Tuple
 
 import pyautogui
 
+from dreamos.utils.gui.screen_watcher import Box, MATCH_TOLERANCE, get_screen_watcher
+
 try:
     import pyperclip
     PYPERCLIP_AVAILABLE = True
@@ -30,7 +32,8 @@ COMPLETE_IMAGE      = Path("runtime/config/assets/gui_images/complete.png")
 CLICK_DELAY         = 0.25   # seconds between move+click
 POST_CLICK_WAIT     = 1.0    # seconds to allow clipboard to update
 IMAGE_TIMEOUT       = 300    # seconds to wait for COMPLETE_IMAGE
-IMAGE_CONF          = 0.80   # pyautogui confidence
+IMAGE_TOLERANCE     = MATCH_TOLERANCE  # mean grey-level difference accepted as a match
+REGION_MARGIN       = 200    # px around the agent's known coords searched for images
 COPY_RETRIES        = 3      # attempts if clipboard unchanged
 SCREENSHOT_DIR      = Path("runtime/debug_screenshots")
 
@@ -75,18 +78,46 @@ class ResponseRetriever:
             return (entry["x"], entry["y"])
         return None
 
+    def _response_region(self) -> Box:
+        """Screen box searched for status images.
+
+        Uses the agent's ``response_region`` entry ({x, y, width, height}) when
+        calibrated, otherwise the agent's known coordinates padded by
+        REGION_MARGIN, falling back to the primary screen.
+        """
+        entries = (self.all_coords or {}).get(self.agent_id, {})
+        region = entries.get("response_region")
+        if isinstance(region, dict) and {"x", "y", "width", "height"} <= region.keys():
+            return (region["x"], region["y"], region["width"], region["height"])
+        points = [(e["x"], e["y"]) for e in entries.values()
+                  if isinstance(e, dict) and "x" in e and "y" in e]
+        if not points:
+            width, height = pyautogui.size()
+            return (0, 0, width, height)
+        left = min(x for x, _ in points) - REGION_MARGIN
+        top = min(y for _, y in points) - REGION_MARGIN
+        right = max(x for x, _ in points) + REGION_MARGIN
+        bottom = max(y for _, y in points) + REGION_MARGIN
+        return (left, top, right - left, bottom - top)
+
     # ----------------------------------------------------------------- Screen
     def _wait_for_image(self, img: Path) -> bool:
         self.log.info("Waiting for %s …", img.name)
-        start = time.time()
-        while time.time() - start < IMAGE_TIMEOUT:
-            try:
-                if pyautogui.locateOnScreen(str(img), confidence=IMAGE_CONF):
-                    self.log.info("%s detected.", img.name)
-                    return True
-            except pyautogui.PyAutoGUIException as e:
-                self.log.warning("Image search error: %s", e)
-            time.sleep(1)
+        if not img.exists():
+            self.log.warning("Image file missing: %s", img)
+            return False
+        watcher = get_screen_watcher()
+        key = f"{self.agent_id}.response"
+        try:
+            watcher.register(key, self._response_region())
+            watcher.add_template(str(img), img, IMAGE_TOLERANCE)
+            found = watcher.wait_for_template(key, str(img), IMAGE_TIMEOUT)
+        except Exception as e:
+            self.log.warning("Image search error: %s", e)
+            return False
+        if found:
+            self.log.info("%s detected.", img.name)
+            return True
         self.log.warning("Timeout waiting for %s", img.name)
         return False
 
@@ -0,0 +1,322 @@
+"""
+dreamos.utils.gui.screen_watcher
+----------------------------------
+Shared capture-and-match service for GUI polling.
+• One screen grab per tick, limited to the bounding box of registered regions
+• Regions kept as downscaled grayscale buffers
+• Per-region frame hash: unchanged regions skip diffing and template matching
+• Templates downscaled at every block phase, so any screen offset matches
+• Difference and template checks in Pillow + plain Python (no NumPy/OpenCV)
+
+Callers register named regions (an agent's chat pane, the area around its copy
+button) and ask whether a region has changed, has been stable for N ticks, or
+contains a template image. Work per tick beyond the grab itself scales with the
+number of regions whose pixels actually changed.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from PIL import Image, ImageChops, ImageStat
+
+try:
+    from PIL import ImageGrab
+except ImportError:  # pragma: no cover - not available on every platform
+    ImageGrab = None
+
+logger = logging.getLogger(__name__)
+
+Box = Tuple[int, int, int, int]  # left, top, width, height in screen pixels
+
+# ── Config ────────────────────────────────────────────────────────────────────
+DEFAULT_SCALE     = 4     # downscale factor applied before any comparison
+DEFAULT_INTERVAL  = 0.5   # seconds; poll() grabs at most once per interval
+NOISE_LEVEL       = 16    # grey-level delta ignored as capture noise
+MATCH_TOLERANCE   = 24    # mean grey-level difference accepted as a match
+PROBE_POINTS      = 24    # high-contrast template pixels checked before a full compare
+
+_NOISE_LUT = [0] * (NOISE_LEVEL + 1) + [255] * (255 - NOISE_LEVEL)
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+def to_gray(img: Image.Image, scale: int = DEFAULT_SCALE) -> Image.Image:
+    """Grayscale ``img`` and shrink it by ``scale`` (box filter)."""
+    gray = img.convert("L")
+    return gray.reduce(scale) if scale > 1 else gray
+
+
+def changed_fraction(a: Image.Image, b: Image.Image) -> float:
+    """Fraction of pixels differing by more than NOISE_LEVEL between two grey frames."""
+    if a.size != b.size:
+        return 1.0
+    mask = ImageChops.difference(a, b).point(_NOISE_LUT)
+    return mask.histogram()[255] / (a.size[0] * a.size[1])
+
+
+def _grab_screen(box: Box) -> Image.Image:
+    if ImageGrab is None:
+        raise RuntimeError("Screen capture unavailable: PIL.ImageGrab is not supported here")
+    left, top, width, height = box
+    return ImageGrab.grab(bbox=(left, top, left + width, top + height), all_screens=True)
+
+
+@dataclass
+class TemplateVariant:
+    """The template downscaled for one alignment of its origin to the block grid."""
+
+    crop: Tuple[int, int]                  # full-res template pixels trimmed before downscaling
+    image: Image.Image
+    probes: List[Tuple[int, int, int]]     # (dx, dy, grey)
+
+
+@dataclass
+class Template:
+    """A downscaled grey template plus probe pixels for fast rejection.
+
+    Frames are shrunk in ``scale`` x ``scale`` blocks, so a template whose
+    screen offset is not a multiple of ``scale`` straddles block boundaries
+    and its own downscaled image no longer matches. One variant is kept per
+    block phase: the template is trimmed so its first full block lines up
+    with the grid, then downscaled. find() tries every variant.
+    """
+
+    name: str
+    scale: int
+    variants: List[TemplateVariant]
+    tolerance: float = MATCH_TOLERANCE
+
+    @classmethod
+    def from_image(cls, name: str, img: Image.Image, scale: int = DEFAULT_SCALE,
+                   tolerance: float = MATCH_TOLERANCE) -> "Template":
+        gray = img.convert("L")
+        width, height = gray.size
+        variants = []
+        # Phase (0, 0) first: aligned templates are found without trying the rest
+        for cy in range(scale):
+            for cx in range(scale):
+                cols, rows = (width - cx) // scale, (height - cy) // scale
+                if cols < 1 or rows < 1:
+                    continue
+                image = to_gray(gray.crop((cx, cy, cx + cols * scale, cy + rows * scale)), scale)
+                data = image.tobytes()
+                mean = sum(data) / len(data)
+                # Pixels far from the mean discriminate best, so they are probed first
+                order = sorted(range(len(data)), key=lambda i: -abs(data[i] - mean))
+                probes = [(i % cols, i // cols, data[i]) for i in order[:PROBE_POINTS]]
+                variants.append(TemplateVariant((cx, cy), image, probes))
+        return cls(name, scale, variants, tolerance)
+
+    def find(self, frame: Image.Image) -> Optional[Tuple[int, int]]:
+        """Top-left of the best match, in full-resolution pixels from the frame's origin, or None.
+
+        Neighbouring phases of a template often match within tolerance too, a
+        few pixels off, so the variant with the lowest difference wins.
+        """
+        best = None
+        for variant in self.variants:
+            match = self._find_variant(variant, frame)
+            if match is None:
+                continue
+            x, y, score = match
+            if best is None or score < best[2]:
+                best = (x * self.scale - variant.crop[0], y * self.scale - variant.crop[1], score)
+                if score == 0:
+                    break
+        return best[:2] if best else None
+
+    def _find_variant(self, variant: TemplateVariant, frame: Image.Image) -> Optional[Tuple[int, int, float]]:
+        """(x, y, mean difference) of the first match of one variant in ``frame``
+        (downscaled coordinates), or None."""
+        fw, fh = frame.size
+        tw, th = variant.image.size
+        if tw > fw or th > fh:
+            return None
+        data = frame.tobytes()
+        probes = [(dy * fw + dx, grey) for dx, dy, grey in variant.probes]
+        # A true match averages <= tolerance; allow twice that while probing
+        limits = [2 * self.tolerance * (i + 1) for i in range(len(probes))]
+        checks = list(zip(probes, limits))
+        for y in range(fh - th + 1):
+            row = y * fw
+            for x in range(fw - tw + 1):
+                base = row + x
+                err = 0
+                for (offset, grey), limit in checks:
+                    err += abs(data[base + offset] - grey)
+                    if err > limit:
+                        break
+                else:
+                    window = frame.crop((x, y, x + tw, y + th))
+                    score = ImageStat.Stat(ImageChops.difference(window, variant.image)).mean[0]
+                    if score <= self.tolerance:
+                        return (x, y, score)
+        return None
+
+
+@dataclass
+class RegionState:
+    """What the watcher knows about one registered region."""
+
+    box: Box
+    origin: Tuple[int, int] = (0, 0)      # screen pixel of the frame's top-left block
+    frame: Optional[Image.Image] = None   # reference frame, downscaled grey
+    digest: Optional[bytes] = None        # hash of the most recently grabbed frame
+    changed: bool = False                 # changed on the latest tick
+    stable_ticks: int = 0                 # ticks since the last real change
+    last_change: float = 0.0
+    matches: Dict[str, Optional[Tuple[int, int]]] = field(default_factory=dict)
+
+
+# ── Main class ────────────────────────────────────────────────────────────────
+class ScreenWatcher:
+    """Grabs the screen once per tick and tracks changes in registered regions.
+
+    Args:
+        grab: Callable taking a screen Box and returning an image of it;
+              defaults to PIL.ImageGrab. Tests pass a synthetic source.
+        scale: Downscale factor for all comparisons
+        interval: Minimum seconds between grabs made through poll()
+    """
+
+    def __init__(self, grab: Optional[Callable[[Box], Image.Image]] = None,
+                 scale: int = DEFAULT_SCALE, interval: float = DEFAULT_INTERVAL):
+        self.grab = grab or _grab_screen
+        self.scale = scale
+        self.interval = interval
+        self.regions: Dict[str, RegionState] = {}
+        self.templates: Dict[str, Template] = {}
+        self.stats = {"ticks": 0, "unchanged": 0, "noise": 0, "changed": 0, "matches": 0}
+        self._lock = threading.RLock()
+        self._last_tick: Optional[float] = None
+
+    # ------------------------------------------------------------ Registry
+    def register(self, key: str, box: Box) -> None:
+        """Watch ``box`` under ``key``; re-registering the same box is a no-op."""
+        box = tuple(int(v) for v in box)
+        with self._lock:
+            state = self.regions.get(key)
+            if state is None or state.box != box:
+                self.regions[key] = RegionState(box)
+
+    def unregister(self, key: str) -> None:
+        with self._lock:
+            self.regions.pop(key, None)
+
+    def add_template(self, name: str, image: Union[Image.Image, str, Path],
+                     tolerance: float = MATCH_TOLERANCE) -> Template:
+        """Load (once) and downscale a template image."""
+        with self._lock:
+            if name not in self.templates:
+                img = image if isinstance(image, Image.Image) else Image.open(image)
+                self.templates[name] = Template.from_image(name, img, self.scale, tolerance)
+            return self.templates[name]
+
+    # ---------------------------------------------------------------- Ticks
+    def tick(self) -> List[str]:
+        """Grab once and update every region; returns the keys that changed."""
+        with self._lock:
+            self._last_tick = time.monotonic()
+            if not self.regions:
+                return []
+            boxes = [state.box for state in self.regions.values()]
+            left = min(b[0] for b in boxes)
+            top = min(b[1] for b in boxes)
+            right = max(b[0] + b[2] for b in boxes)
+            bottom = max(b[1] + b[3] for b in boxes)
+            shot = to_gray(self.grab((left, top, right - left, bottom - top)), self.scale)
+            self.stats["ticks"] += 1
+
+            changed = []
+            s = self.scale
+            for key, state in self.regions.items():
+                x0, y0 = (state.box[0] - left) // s, (state.box[1] - top) // s
+                frame = shot.crop((x0, y0, x0 + max(1, state.box[2] // s), y0 + max(1, state.box[3] // s)))
+                # The frame's block grid moves when the grabbed bounding box does
+                origin = (left + x0 * s, top + y0 * s)
+                moved = origin != state.origin
+                state.origin = origin
+                digest = hashlib.blake2b(frame.tobytes(), digest_size=16).digest()
+                if digest == state.digest and not moved:
+                    state.changed = False
+                    state.stable_ticks += 1
+                    self.stats["unchanged"] += 1
+                    continue
+                state.digest = digest
+                if state.frame is not None and not moved and changed_fraction(state.frame, frame) == 0.0:
+                    # Sub-threshold flicker: keep the reference frame and its matches
+                    state.changed = False
+                    state.stable_ticks += 1
+                    self.stats["noise"] += 1
+                    continue
+                state.frame = frame
+                state.matches.clear()
+                state.changed = True
+                state.stable_ticks = 0
+                state.last_change = self._last_tick
+                self.stats["changed"] += 1
+                changed.append(key)
+            return changed
+
+    def poll(self) -> List[str]:
+        """tick() unless one already ran within ``interval``; shared by all waiters."""
+        with self._lock:
+            if self._last_tick is not None and time.monotonic() - self._last_tick < self.interval:
+                return []
+            return self.tick()
+
+    # -------------------------------------------------------------- Queries
+    def is_stable(self, key: str, ticks: int) -> bool:
+        state = self.regions.get(key)
+        return state is not None and state.frame is not None and state.stable_ticks >= ticks
+
+    def find(self, key: str, template: str) -> Optional[Tuple[int, int]]:
+        """Screen position of ``template`` inside region ``key``, or None.
+
+        The result is cached until the region changes, so repeated queries on
+        an unchanged region cost nothing.
+        """
+        with self._lock:
+            state = self.regions.get(key)
+            if state is None:
+                raise KeyError(f"Region not registered: {key}")
+            if state.frame is None:
+                self.tick()
+            if template not in state.matches:
+                state.matches[template] = self.templates[template].find(state.frame)
+                self.stats["matches"] += 1
+            loc = state.matches[template]
+            if loc is None:
+                return None
+            return (state.origin[0] + loc[0], state.origin[1] + loc[1])
+
+    def wait_for_template(self, key: str, template: str, timeout: float) -> Optional[Tuple[int, int]]:
+        """Poll until ``template`` appears in region ``key``; None on timeout."""
+        end = time.monotonic() + timeout
+        while True:
+            self.poll()
+            loc = self.find(key, template)
+            if loc is not None:
+                return loc
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(self.interval, remaining))
+
+
+_watcher: Optional[ScreenWatcher] = None
+_watcher_lock = threading.Lock()
+
+
+def get_screen_watcher() -> ScreenWatcher:
+    """Return the process-wide watcher so all pollers share one grab per tick."""
+    global _watcher
+    if _watcher is None:
+        with _watcher_lock:
+            if _watcher is None:
+                _watcher = ScreenWatcher()
+    return _watcher
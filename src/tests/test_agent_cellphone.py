@@ -0,0 +1,51 @@
+import json
+import os
+
+from dreamos.automation.input_arbiter import InputArbiter, MockInputBackend
+from dreamos.tools.agent_cellphone import AgentCellphone, MessageMode
+
+
+def _write_configs(config_dir, coords):
+    (config_dir / "templates").mkdir(parents=True, exist_ok=True)
+    (config_dir / "cursor_agent_coords.json").write_text(json.dumps({
+        agent_id: {"input_box": {"x": x, "y": y}, "initial_spot": {"x": x, "y": y}}
+        for agent_id, (x, y) in coords.items()
+    }))
+    (config_dir / "templates" / "agent_modes.json").write_text(json.dumps({"modes": {}}))
+
+
+def test_batch_delivery_in_screen_order(tmp_path):
+    _write_configs(tmp_path, {
+        "Agent-1": (500, 100), "Agent-2": (100, 100), "Agent-3": (100, 600), "Agent-4": (500, 600),
+    })
+    backend = MockInputBackend()
+    cellphone = AgentCellphone(arbiter=InputArbiter(backend), config_dir=tmp_path)
+
+    results = cellphone.message_agents(["Agent-1", "Agent-3", "Agent-9", "Agent-4", "Agent-2"],
+                                       "ping", MessageMode.STATUS)
+
+    assert results == {"Agent-1": True, "Agent-2": True, "Agent-3": True, "Agent-4": True, "Agent-9": False}
+    clicks = [action[1:] for action in backend.actions if action[0] == "click"]
+    assert clicks == [(100, 100), (500, 100), (100, 600), (500, 600)]
+    assert [text for _, text in backend.sent] == ["[STATUS] ping"] * 4
+    cellphone.arbiter.stop(5)
+
+
+def test_configs_reload_only_when_changed(tmp_path, monkeypatch):
+    _write_configs(tmp_path, {"Agent-1": (10, 10)})
+    cellphone = AgentCellphone(arbiter=InputArbiter(MockInputBackend()), config_dir=tmp_path)
+    loads = []
+    real_load = json.load
+    monkeypatch.setattr(json, "load", lambda f: loads.append(f.name) or real_load(f))
+
+    for _ in range(5):
+        assert cellphone.get_agent_coords("Agent-1")["input_box"] == {"x": 10, "y": 10}
+    assert loads == []
+
+    _write_configs(tmp_path, {"Agent-1": (20, 30)})
+    coords_file = tmp_path / "cursor_agent_coords.json"
+    stat = coords_file.stat()
+    os.utime(coords_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cellphone.get_agent_coords("Agent-1")["input_box"] == {"x": 20, "y": 30}
+    assert len(loads) == 2
+    cellphone.arbiter.stop(5)
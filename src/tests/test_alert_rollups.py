@@ -0,0 +1,66 @@
+import asyncio
+import json
+from datetime import date, datetime, timedelta
+
+from dreamos.core.alert_manager import AlertAggregator, DailyDigest
+from dreamos.core.event_rollup import RollupStore
+
+
+def test_rollup_store_buckets_and_bounded_samples():
+    store = RollupStore(bucket_seconds=60, sample_size=3, retention_seconds=300)
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    for i in range(1000):
+        store.record("DRIFT", f"agent-{i % 4}", timestamp=start + timedelta(seconds=i),
+                     value=i % 7, sample={"i": i})
+
+    assert store.count("DRIFT") == 1000
+    assert store.count("DRIFT", "agent-1") == 250
+    assert store.bucket_count() <= 7
+    longest = store.samples("DRIFT", limit=3)
+    assert [sample["i"] % 7 for sample in longest] == [6, 6, 6]
+    assert len(store.samples("DRIFT", "agent-0")) == 3
+
+
+def test_aggregator_flushes_on_timer_and_resets_window():
+    aggregator = AlertAggregator(window_seconds=600, sample_size=2)
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    for i in range(50):
+        assert aggregator.add_alert("ERROR", f"agent-{i % 3}", {"n": i},
+                                    now=start + timedelta(seconds=i)) is None
+
+    assert aggregator.flush_expired(now=start + timedelta(seconds=300)) == []
+    flushed = aggregator.flush_expired(now=start + timedelta(seconds=600))
+    assert len(flushed) == 1
+    details = flushed[0]["details"]
+    assert details["count"] == 50
+    assert details["agents"] == ["agent-0", "agent-1", "agent-2"]
+    assert [s["details"]["n"] for s in details["samples"]] == [49, 48]
+    assert sum(count for _, count in details["per_minute"]) == 50
+    assert "ERROR" not in aggregator.alert_groups
+
+
+def test_digest_from_rollups_and_index(tmp_path):
+    digest = DailyDigest(workspace_root=tmp_path, config={})
+    for i in range(20):
+        digest.track_event("TASK_COMPLETE", {"agent_id": "1", "task_id": f"t{i}"})
+    digest.track_event("DRIFT", {"agent_id": "2", "duration": 90})
+    digest.track_event("RECOVERY", {"agent_id": "2", "recovery_successful": True})
+    digest.track_event("ERROR", {"agent_id": "2", "error_type": "timeout"})
+
+    day = date(2025, 5, 14)
+    data = asyncio.run(digest.generate_digest(specific_date=day))
+    assert data["task_executions"] == 20
+    assert data["drift_events"] == 1
+    assert data["recovery_success"].startswith("1/1")
+    assert data["samples"]["longest_drifts"][0]["duration"] == 90
+
+    index = json.loads((tmp_path / "runtime" / "digests" / "digest-index.json").read_text())
+    assert index["digests"][day.isoformat()]["task_executions"] == 20
+    assert "samples" not in index["digests"][day.isoformat()]
+
+    # A fresh instance reads history from the index rather than per-day files
+    (tmp_path / "runtime" / "digests" / f"daily-{day.isoformat()}.json").unlink()
+    reloaded = DailyDigest(workspace_root=tmp_path, config={})
+    history = reloaded._load_historical_digests_up_to(day + timedelta(days=1), days_limit=7)
+    assert [entry["date"] for entry in history] == [day.isoformat()]
+    assert reloaded._load_previous_digest(day + timedelta(days=1))["errors"] == 1
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dreamos.backtesting import PortfolioEngine, StrategyBase
+from dreamos.backtesting.utils import BacktestError
+
+
+class _FixedSignals(StrategyBase):
+    """Strategy that replays a precomputed signal frame."""
+
+    def __init__(self, signals):
+        super().__init__("FixedSignals")
+        self._signals = signals
+
+    def generate_signals(self, data):
+        return self._signals
+
+
+def _signal_frame(weights, n_bars=365, n_symbols=3, seed=7):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start="2023-01-01", periods=n_bars, freq="D")
+    frame = pd.DataFrame(index=dates)
+    for i in range(n_symbols):
+        symbol = f"SYM{i}"
+        frame[f"{symbol}_signal"] = rng.choice(weights, n_bars)
+        frame[f"{symbol}_price"] = rng.normal(150, 10, n_bars)
+    return frame
+
+
+def _assert_equivalent(signals, initial_capital=100000.0):
+    strategy = _FixedSignals(signals)
+    expected = strategy._run_rowwise(signals, initial_capital)
+    actual = strategy.run(None, initial_capital)
+
+    np.testing.assert_allclose(actual["portfolio_value"], expected["portfolio_value"])
+    assert actual["cash"] == pytest.approx(expected["cash"], abs=1e-6)
+    assert actual["positions"].keys() == expected["positions"].keys()
+    for symbol, quantity in expected["positions"].items():
+        assert actual["positions"][symbol] == pytest.approx(quantity)
+    assert len(actual["trades"]) == len(expected["trades"])
+    for got, want in zip(actual["trades"], expected["trades"]):
+        assert (got["timestamp"], got["symbol"], got["action"]) == (
+            want["timestamp"], want["symbol"], want["action"]
+        )
+        assert got["quantity"] == pytest.approx(want["quantity"])
+
+
+def test_full_allocation_signals_match_rowwise():
+    _assert_equivalent(_signal_frame([1.0, -1.0]))
+
+
+def test_fractional_and_flat_signals_match_rowwise():
+    _assert_equivalent(_signal_frame([0.0, 0.05, -0.1, np.nan], n_symbols=5))
+
+
+def test_missing_prices_match_rowwise():
+    signals = _signal_frame([0.0, 0.2, -0.3])
+    signals.iloc[10:20, 1] = np.nan
+    _assert_equivalent(signals)
+
+
+def test_engine_rejects_mismatched_matrices():
+    signals = pd.DataFrame({"A": [1.0, 0.0]})
+    prices = pd.DataFrame({"A": [10.0, 11.0], "B": [5.0, 6.0]})
+    with pytest.raises(BacktestError):
+        PortfolioEngine().run(signals, prices, 1000.0)
@@ -0,0 +1,64 @@
+import json
+import os
+
+from dreamos.core.checkpoint_store import CheckpointStore
+
+
+def _checkpoint(memory):
+    return {
+        "agent_id": "agent-1",
+        "timestamp": "2025-01-01T00:00:00+00:00",
+        "checkpoint_type": "routine",
+        "version": "1.0",
+        "state": {
+            "current_task": {"id": "", "status": "unknown", "progress_percentage": 0, "context": {}},
+            "mailbox": {"last_processed_id": "", "pending_count": 0},
+            "operational_context": {"goals": ["g"] * 200, "constraints": [], "decisions": []},
+            "memory": {"short_term": [], "session": memory},
+        },
+    }
+
+
+def _chunk_files(store):
+    return [name for _, _, names in os.walk(store.objects_dir) for name in names if name.endswith(".z")]
+
+
+def test_unchanged_chunks_are_shared_and_round_trip(tmp_path):
+    store = CheckpointStore(str(tmp_path), "agent-1")
+    session = [{"turn": i, "text": f"message {i}"} for i in range(300)]
+
+    first = store.save("agent-1_20250101000000_routine.checkpoint", _checkpoint(session))
+    chunks_after_first = len(_chunk_files(store))
+    second = store.save("agent-1_20250101000100_routine.checkpoint",
+                        _checkpoint(session + [{"turn": 300, "text": "new"}]))
+
+    # Only the last run of the appended list and its parents are new
+    assert len(_chunk_files(store)) - chunks_after_first <= 3
+    with open(second) as f:
+        assert json.load(f)["version"] == "2.0"
+    restored = store.load(second)
+    assert restored["state"]["memory"]["session"][-1] == {"turn": 300, "text": "new"}
+    assert restored["state"] == _checkpoint(session + [{"turn": 300, "text": "new"}])["state"]
+    assert store.load(first)["state"] == _checkpoint(session)["state"]
+
+
+def test_retention_uses_index_and_collects_unshared_chunks(tmp_path):
+    store = CheckpointStore(str(tmp_path), "agent-1")
+    paths = []
+    for i in range(5):
+        session = [{"turn": i, "text": "x" * 600}]
+        paths.append(store.save(f"agent-1_2025010100000{i}_routine.checkpoint", _checkpoint(session)))
+    store.save("agent-1_20250101000009_pre_operation.checkpoint",
+               dict(_checkpoint([]), checkpoint_type="pre_operation"))
+
+    assert store.prune("routine", keep=3) == paths[:2]
+    assert store.list("routine") == paths[2:]
+    assert store.latest("pre_operation").endswith("_pre_operation.checkpoint")
+    assert set(store.index["refs"]) == {name[:-2] for name in _chunk_files(store)}
+
+    # A fresh store reads the index; a manifest dropped in by hand is picked up
+    legacy = tmp_path / "agent-1_20250101000010_routine.checkpoint"
+    legacy.write_text(json.dumps(_checkpoint([])))
+    reopened = CheckpointStore(str(tmp_path), "agent-1")
+    assert reopened.latest("routine") == str(legacy)
+    assert reopened.load(str(legacy))["state"]["memory"] == {"short_term": [], "session": []}
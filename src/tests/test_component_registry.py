@@ -0,0 +1,97 @@
+import gzip
+import json
+
+import pytest
+
+from dreamos.launcher import registry as registry_module
+from dreamos.launcher.registry import ComponentRegistry
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    metadata = tmp_path / "metadata"
+    (metadata / "backups").mkdir(parents=True)
+    monkeypatch.setattr(registry_module, "METADATA_DIR", metadata)
+    monkeypatch.setattr(registry_module, "REGISTRY_PATH", metadata / "component_registry.json")
+    monkeypatch.setattr(registry_module, "REGISTRY_BACKUP_DIR", metadata / "backups")
+    monkeypatch.setattr(registry_module, "SCHEMAS_DIR", tmp_path / "schemas")
+    monkeypatch.setattr(registry_module, "TRANSACTION_LOG_PATH", metadata / "transaction_log.json")
+    return ComponentRegistry()
+
+
+def _component(n, **fields):
+    component = {
+        "component_id": f"comp-{n}",
+        "name": f"Component {n}",
+        "entry_point": f"components/comp_{n}.py",
+        "type": ["tool", "service", "agent"][n % 3],
+        "owner_agent": f"Agent-{n % 4}",
+        "status": "active" if n % 2 else "inactive",
+        "tags": ["core"] + (["gui"] if n % 5 == 0 else []),
+    }
+    component.update(fields)
+    return component
+
+
+def test_indexed_search_matches_scan_and_follows_updates(registry):
+    for n in range(30):
+        assert registry.create_component(_component(n)) == (True, None)
+
+    def scan(filters=None, tags=None):
+        return {
+            comp_id for comp_id, comp in registry.get_all_components().items()
+            if all(comp.get(k) == v for k, v in (filters or {}).items())
+            and all(t in comp.get("tags", []) for t in tags or [])
+        }
+
+    queries = [
+        ({"type": "tool"}, None),
+        ({"type": "service", "status": "active"}, None),
+        ({"owner_agent": "Agent-1"}, ["gui"]),
+        ({"name": "Component 7"}, None),
+        ({"type": "tool", "version": "1.0.0"}, ["core"]),
+        ({"type": "missing"}, None),
+        (None, ["gui", "core"]),
+    ]
+    for filters, tags in queries:
+        assert set(registry.search_components(filters, tags)) == scan(filters, tags)
+
+    registry.update_component("comp-3", {"type": "agent", "tags": ["gui"]})
+    registry.delete_component("comp-10")
+    assert "comp-3" not in registry.get_components_by_type("tool")
+    assert "comp-3" in registry.search_components({"type": "agent"}, ["gui"])
+    assert "comp-10" not in registry.search_components(tags=["gui"])
+    for filters, tags in queries:
+        assert set(registry.search_components(filters, tags)) == scan(filters, tags)
+
+
+def test_incremental_backups_restore_each_point(registry, monkeypatch):
+    monkeypatch.setattr(registry_module, "BACKUP_CHAIN_LENGTH", 3)
+    monkeypatch.setattr(registry_module, "MAX_BACKUP_CHAINS", 2)
+    snapshots = []
+    for n in range(12):
+        registry.create_component(_component(n))
+        registry._create_backup()
+        backups = registry._backup_files()
+        snapshots.append((backups[-1][0], set(registry.get_all_components())))
+
+    backups = registry._backup_files()
+    kinds = [kind for _, kind, _ in backups]
+    assert kinds.count("full") == 2
+    assert len(backups) == 8
+    # Deltas only carry what changed since the previous backup
+    with gzip.open(backups[-1][2], "rt") as f:
+        assert list(json.load(f)["changed"]) == ["comp-11"]
+
+    # Legacy whole-file copies are still restorable
+    legacy = registry_module.REGISTRY_BACKUP_DIR / "registry_backup_20990101_000000.json"
+    legacy.write_text(json.dumps({"components": {"comp-0": _component(0)}}))
+    assert registry.restore_backup("20990101_000000") == (True, None)
+    assert set(registry.get_all_components()) == {"comp-0"}
+    legacy.unlink()
+
+    for timestamp, expected in snapshots[-8:]:
+        assert registry.restore_backup(timestamp) == (True, None)
+        assert set(registry.get_all_components()) == expected
+        assert set(registry.get_components_by_type("tool")) == {c for c in expected if int(c[5:]) % 3 == 0}
+    assert registry.restore_backup(snapshots[0][0])[0] is False
@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from dreamos.core import config
+
+
+@pytest.fixture
+def fresh_config(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("DREAMOS_CONFIG_PATH", raising=False)
+    monkeypatch.setattr(config, "_config", None)
+    monkeypatch.setattr(config, "_config_source", None)
+    monkeypatch.setattr(config, "_config_inputs", {})
+    monkeypatch.setattr(config, "_logging_configured", True)
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("logging:\n  level: INFO\n")
+    return config_file
+
+
+def _fail_yaml_source(self):
+    raise AssertionError("YAML source should not run on a snapshot hit")
+
+
+def test_snapshot_is_reused_until_inputs_change(fresh_config, monkeypatch):
+    first = config.AppConfig.load(str(fresh_config))
+    snapshot = fresh_config.with_name(".config.yaml.snapshot.json")
+    assert snapshot.exists()
+    assert snapshot.stat().st_mode & 0o077 == 0
+
+    monkeypatch.setattr(config.YamlConfigSettingsSource, "_load_config", _fail_yaml_source)
+    second = config.AppConfig.load(str(fresh_config))
+    assert second == first
+    assert second.paths.runtime.is_absolute()
+
+    # A different DREAMOS_* environment or YAML invalidates the key
+    monkeypatch.setenv("DREAMOS_SNAPSHOT_TEST", "1")
+    with pytest.raises(config.appconfig_errors.ConfigurationError):
+        config.AppConfig.load(str(fresh_config))
+    monkeypatch.delenv("DREAMOS_SNAPSHOT_TEST")
+    assert config.AppConfig.load(str(fresh_config)) == first
+    fresh_config.write_text("logging:\n  level: DEBUG\n")
+    with pytest.raises(config.appconfig_errors.ConfigurationError):
+        config.AppConfig.load(str(fresh_config))
+
+
+def test_snapshot_never_stores_secrets(fresh_config, monkeypatch):
+    fresh_config.write_text(
+        "logging:\n  level: INFO\nopenai:\n  openai_api_key: sk-yaml-secret\n"
+    )
+    monkeypatch.setenv("DREAMOS_CHATGPT_SCRAPER", '{"chatgpt_password": "env-secret"}')
+    first = config.AppConfig.load(str(fresh_config))
+    snapshot = fresh_config.with_name(".config.yaml.snapshot.json")
+    text = snapshot.read_text()
+    assert "sk-yaml-secret" not in text
+    assert "env-secret" not in text
+
+    # Secrets are read back from the YAML and environment on a snapshot hit
+    second = config.AppConfig.load(str(fresh_config))
+    assert second == first
+    assert second.openai.api_key.get_secret_value() == "sk-yaml-secret"
+    assert second.chatgpt_scraper.password.get_secret_value() == "env-secret"
+
+
+def test_get_config_is_lazy_and_hot_reloads(fresh_config, monkeypatch):
+    monkeypatch.setenv("DREAMOS_CONFIG_PATH", str(fresh_config))
+    monkeypatch.setattr(config, "_RELOAD_CHECK_INTERVAL", 0.0)
+
+    first = config.get_config()
+    assert config.get_config() is first
+    assert first.logging.level == "INFO"
+
+    fresh_config.write_text("logging:\n  level: DEBUG\n")
+    stat = fresh_config.stat()
+    os.utime(fresh_config, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    reloaded = config.get_config()
+    assert reloaded is not first
+    assert reloaded.logging.level == "DEBUG"
@@ -0,0 +1,87 @@
+import os
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+def dedup_engine(monkeypatch):
+    # The dedup scripts live at the repository root
+    monkeypatch.syspath_prepend(str(REPO_ROOT))
+    import dedup_engine
+    return dedup_engine
+
+
+def _source(n):
+    return "\n".join(f"def handler_{n}_{i}(request, value):\n    return process(request, value + {i})\n"
+                     for i in range(30))
+
+
+def test_only_size_collisions_are_read_and_cache_makes_reruns_free(tmp_path, dedup_engine, monkeypatch):
+    monkeypatch.setattr(dedup_engine, "PARTIAL_HASH_BYTES", 16)
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "a.json").write_text('{"same": "content here"}')
+    (tmp_path / "pkg" / "b.json").write_text('{"same": "content here"}')
+    (tmp_path / "c.json").write_text('{"same": "content HERE"}')  # same size, differs late
+    (tmp_path / "d.json").write_text('{"xame": "content here"}')  # same size, differs early
+    (tmp_path / "unique.json").write_text("{}")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "e.json").write_text('{"same": "content here"}')
+
+    reads = []
+    real_hash_path = dedup_engine._hash_path
+    monkeypatch.setattr(dedup_engine, "_hash_path", lambda task: reads.append(task[:2]) or real_hash_path(task))
+
+    files = dedup_engine.walk_files(tmp_path, [".json"], ["node_modules"])
+    cache_path = tmp_path / "cache.json"
+    engine = dedup_engine.DedupEngine(cache_path=cache_path, num_workers=1)
+    groups = engine.find_exact(files)
+    engine.save()
+
+    assert list(groups.values()) == [sorted([str(tmp_path / "a.json"), str(tmp_path / "pkg" / "b.json")])]
+    assert not any(path.endswith("unique.json") for path, _ in reads)
+    assert sorted(os.path.basename(p) for p, kind in reads if kind == "full") == ["a.json", "b.json", "c.json"]
+
+    reads.clear()
+    rerun = dedup_engine.DedupEngine(cache_path=cache_path, num_workers=1)
+    assert rerun.find_exact(dedup_engine.walk_files(tmp_path, [".json"], ["node_modules"])) == groups
+    assert reads == []
+
+    (tmp_path / "c.json").write_text('{"same": "content here"}')
+    stat = (tmp_path / "c.json").stat()
+    os.utime(tmp_path / "c.json", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    reads.clear()
+    rerun = dedup_engine.DedupEngine(cache_path=cache_path, num_workers=1)
+    groups = rerun.find_exact(dedup_engine.walk_files(tmp_path, [".json"], ["node_modules"]))
+    assert [len(paths) for paths in groups.values()] == [3]
+    assert {os.path.basename(p) for p, _ in reads} == {"c.json"}
+
+
+def test_process_pool_matches_in_process_results(tmp_path, dedup_engine):
+    for n in range(40):
+        (tmp_path / f"f{n}.txt").write_text(f"content {n % 10:02d}")
+    files = dedup_engine.walk_files(tmp_path, [".txt"], [])
+    pooled = dedup_engine.DedupEngine(num_workers=2).find_exact(files)
+    serial = dedup_engine.DedupEngine(num_workers=1).find_exact(files)
+    assert pooled == serial
+    assert len(pooled) == 10 and all(len(paths) == 4 for paths in pooled.values())
+
+
+def test_near_duplicate_sources_are_grouped(tmp_path, dedup_engine):
+    original = _source(1)
+    (tmp_path / "original.py").write_text(original)
+    (tmp_path / "edited.py").write_text(original.replace("value + 7)", "value + 70)"))
+    (tmp_path / "copy.py").write_text(original)
+    (tmp_path / "other.py").write_text(_source(2).replace("process", "transform"))
+
+    engine = dedup_engine.DedupEngine(cache_path=tmp_path / "cache.json", num_workers=1)
+    files = dedup_engine.walk_files(tmp_path, [".py"], [])
+    exact = engine.find_exact(files)
+    near = engine.find_near(files, threshold=0.8)
+
+    assert [sorted(os.path.basename(p) for p in paths) for paths in exact.values()] == [["copy.py", "original.py"]]
+    assert [sorted(os.path.basename(p) for p in group["paths"]) for group in near] == [
+        ["copy.py", "edited.py", "original.py"]]
+    assert 0.8 <= near[0]["similarity"] < 1
@@ -0,0 +1,151 @@
+import threading
+import time
+
+import filelock
+import pytest
+
+from dreamos.automation.input_arbiter import (
+    InputArbiter,
+    InputArbiterError,
+    InputDeadlineExceeded,
+    MockInputBackend,
+)
+
+
+def _hold_worker(arbiter):
+    """Occupy the worker so later submissions queue up behind it."""
+    release = threading.Event()
+    started = threading.Event()
+    original = arbiter.backend.focus
+
+    def focus(window):
+        if window == "blocker":
+            started.set()
+            release.wait(5)
+        return original(window)
+
+    arbiter.backend.focus = focus
+    blocker = arbiter.click("blocker")
+    assert started.wait(5)
+    return release, blocker
+
+
+def test_priority_order_and_same_window_coalescing():
+    backend = MockInputBackend()
+    arbiter = InputArbiter(backend)
+    release, blocker = _hold_worker(arbiter)
+
+    futures = [
+        arbiter.inject("Agent-1", "a1", coords=(10, 10)),
+        arbiter.inject("Agent-2", "b1", coords=(20, 20)),
+        arbiter.inject("Agent-1", "a2", coords=(10, 10)),
+        arbiter.inject("Agent-3", "urgent", coords=(30, 30), priority=0),
+    ]
+    release.set()
+    assert all(f.result(5) for f in futures + [blocker])
+    arbiter.stop(5)
+
+    assert backend.sent == [("Agent-3", "urgent"), ("Agent-1", "a1"), ("Agent-1", "a2"), ("Agent-2", "b1")]
+    # Agent-1's two messages share one focus and click
+    assert backend.actions.count(("click", 10, 10)) == 1
+    assert arbiter.stats["coalesced"] == 1
+
+
+def test_expired_jobs_are_dropped_and_missing_windows_fail():
+    backend = MockInputBackend()
+    backend.missing_windows.add("gone")
+    arbiter = InputArbiter(backend)
+    release, _ = _hold_worker(arbiter)
+
+    late = arbiter.inject("Agent-1", "too late", timeout=0.01)
+    missing = arbiter.inject("gone", "hello")
+    time.sleep(0.05)
+    release.set()
+
+    with pytest.raises(InputDeadlineExceeded):
+        late.result(5)
+    with pytest.raises(InputArbiterError):
+        missing.result(5)
+    arbiter.stop(5)
+    assert backend.sent == []
+
+
+def test_readiness_is_polled_not_slept_and_copy_reads_clipboard():
+    backend = MockInputBackend(ready_after=3, contents={"Agent-1": "response text"})
+    arbiter = InputArbiter(backend, poll_interval=0.001)
+
+    assert arbiter.copy("Agent-1", coords=(5, 5)).result(5) == "response text"
+    assert backend.ready_polls == 4
+
+    backend.ready_after = 10**6
+    arbiter.ready_timeout = 0.05
+    with pytest.raises(InputArbiterError):
+        arbiter.inject("Agent-1", "never ready", coords=(5, 5)).result(5)
+    arbiter.stop(5)
+
+
+def test_concurrent_broadcast_throughput():
+    backend = MockInputBackend(latency=0.0005)
+    arbiter = InputArbiter(backend)
+    futures = []
+
+    def sender(agent):
+        for i in range(25):
+            futures.append(arbiter.inject(agent, f"{agent}:{i}", coords=(1, 1)))
+
+    threads = [threading.Thread(target=sender, args=(f"Agent-{n}",)) for n in range(1, 9)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert all(f.result(10) for f in futures)
+    arbiter.stop(5)
+
+    assert len(backend.sent) == 200
+    # Each window's messages arrive in submission order and never interleave mid-message
+    for n in range(1, 9):
+        texts = [text for window, text in backend.sent if window == f"Agent-{n}"]
+        assert texts == [f"Agent-{n}:{i}" for i in range(25)]
+
+
+def test_coordinate_jobs_settle_before_the_next_action(monkeypatch):
+    from dreamos.automation import input_arbiter
+
+    # No window handle: coordinate-addressed jobs must still wait for the click
+    monkeypatch.setattr(input_arbiter, "pygetwindow", None)
+    backend = input_arbiter.PyAutoGUIBackend(settle=0.05)
+    assert backend.is_ready("response-10,20")
+
+    backend.click(10, 20)
+    assert not backend.is_ready("response-10,20")
+    time.sleep(0.06)
+    assert backend.is_ready("response-10,20")
+
+    backend.press("enter")
+    assert not backend.is_ready("Agent-1")
+
+
+def test_batches_are_exclusive_across_arbiters_sharing_a_lock(tmp_path):
+    # Each arbiter stands in for a separate process, e.g. the AgentCellphone CLI
+    lock_path = tmp_path / "locks" / "input.lock"
+    first = InputArbiter(MockInputBackend(), lock_path=lock_path)
+    second_backend = MockInputBackend()
+    second = InputArbiter(second_backend, lock_path=lock_path)
+    release, blocker = _hold_worker(first)
+
+    queued = second.inject("Agent-2", "waits", coords=(1, 1))
+    time.sleep(0.1)
+    assert not queued.done() and second_backend.actions == []
+
+    release.set()
+    assert blocker.result(5) and queued.result(5)
+    assert second_backend.sent == [("Agent-2", "waits")]
+
+    release, blocker = _hold_worker(first)
+    second.lock_timeout = 0.05
+    with pytest.raises(filelock.Timeout):
+        second.inject("Agent-2", "gives up").result(5)
+    release.set()
+    blocker.result(5)
+    first.stop(5)
+    second.stop(5)
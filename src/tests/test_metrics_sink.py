@@ -0,0 +1,134 @@
+import json
+
+from dreamos.core import metrics_logger, metrics_sink
+from dreamos.core.metrics_logger import MetricsLogger
+from dreamos.core.metrics_sink import MetricsSink
+from dreamos.metrics.agent_metrics import AgentMetrics, MetricsCollector
+
+
+def test_sink_bounds_memory_and_batches_appends(tmp_path):
+    sink = MetricsSink(tmp_path, capacity=4, batch_size=1000, background=False)
+    for i in range(10):
+        sink.record("latency", f"agent-{i % 2}", i, {"task": i},
+                     timestamp=f"2025-01-01T00:00:{i:02d}")
+
+    # Nothing touches disk until a flush
+    assert not sink.log_file.exists()
+    assert len(sink.recent("latency", "agent-0")) == 4
+    assert [p["task"] for p in sink.recent("latency")] == [2, 3, 4, 5, 6, 7, 8, 9]
+
+    stats = sink.stats("latency", "agent-1")
+    assert stats["count"] == 5
+    assert stats["mean"] == 5.0
+    assert stats["window_mean"] == 6.0  # last four odd values: 3, 5, 7, 9
+    assert sink.stats("latency")["max"] == 9.0
+
+    sink.flush()
+    with open(sink.log_file) as f:
+        assert len(f.readlines()) == 10
+
+    # Aggregates and recent windows come back from the snapshot, not the log
+    sink.log_file.unlink()
+    restored = MetricsSink(tmp_path, capacity=4, background=False)
+    assert restored.stats("latency") == sink.stats("latency")
+    assert restored.agents() == ["agent-0", "agent-1"]
+
+
+def test_agent_metrics_share_one_sink(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(metrics_sink, "_sinks", {})
+
+    legacy = tmp_path / "runtime" / "metrics" / "agent2_metrics.json"
+    legacy.parent.mkdir(parents=True)
+    legacy.write_text(json.dumps({
+        "response_times": [{"timestamp": "2025-01-01T00:00:00", "action": "old", "duration_ms": 50.0}],
+        "success_rates": [],
+        "resource_utilization": []
+    }))
+
+    agent1 = AgentMetrics("agent1")
+    agent1.record_response_time("act", 100.0)
+    agent1.record_success_rate("act", False)
+    collector = MetricsCollector()
+
+    assert sorted(collector.get_all_agent_metrics()) == ["agent1", "agent2"]
+    assert [rt["action"] for rt in collector.get_aggregate_response_times()] == ["old", "act"]
+    assert collector.get_aggregate_stats("response_times")["mean"] == 75.0
+    assert agent1.get_summary()["success_rates"]["mean"] == 0.0
+    assert not legacy.exists()
+
+
+def test_metrics_logger_writes_behind(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics_sink, "_sinks", {})
+    first = MetricsLogger(tmp_path)
+    second = MetricsLogger(tmp_path)
+    for i in range(3):
+        first.log_task_execution_metrics("agent-1", f"t{i}", 0.0, 0.5, success=True)
+    second.log_agent_cycle_update("agent-1")
+
+    assert first.metrics is second.metrics
+    assert first.sink.stats("task_execution", "agent-1")["mean"] == 500.0
+
+    first.flush()
+    with open(first.metrics_file) as f:
+        metrics = json.load(f)
+    assert metrics["metrics"]["task_execution"]["total"] == 3
+    assert metrics["agent_metrics"]["agent-1"]["cycle_count"] == 1
+    with open(first.status_file) as f:
+        assert json.load(f)["agents"]["agent-1"]["cycle_count"] == 1
+
+    for sink in metrics_sink._sinks.values():
+        sink.close()
+
+
+def test_sinks_in_separate_processes_merge_on_flush(tmp_path, monkeypatch):
+    # Two sinks on one directory stand in for two agent processes
+    first = MetricsSink(tmp_path, capacity=4, background=False)
+    second = MetricsSink(tmp_path, capacity=4, background=False)
+    first.record("latency", "agent-1", 10, timestamp="2025-01-01T00:00:01")
+    second.record("latency", "agent-2", 30, timestamp="2025-01-01T00:00:02")
+    first.flush()
+    second.flush()
+
+    # The second flush merged into the file instead of overwriting it, and
+    # the first sink picks up the other process's points on read
+    assert first.stats("latency")["count"] == 2
+    assert first.stats("latency")["mean"] == 20.0
+    assert sorted(first.agents()) == ["agent-1", "agent-2"]
+
+    monkeypatch.setattr(metrics_logger, "get_metrics_sink", lambda directory: first)
+    first_logger = MetricsLogger(tmp_path)
+    monkeypatch.setattr(metrics_logger, "get_metrics_sink", lambda directory: second)
+    second_logger = MetricsLogger(tmp_path)
+    first_logger.log_task_execution_metrics("agent-1", "t1", 0.0, 0.1, success=True)
+    second_logger.log_task_execution_metrics("agent-2", "t2", 0.0, 0.3, success=False)
+    first.flush()
+    second.flush()
+
+    with open(first_logger.metrics_file) as f:
+        execution = json.load(f)["metrics"]["task_execution"]
+    assert (execution["total"], execution["successful"], execution["failed"]) == (2, 1, 1)
+    assert abs(execution["average_latency_ms"] - 200.0) < 1e-6
+    assert first_logger.metrics["metrics"]["task_execution"]["total"] == 2
+
+
+def test_failed_flush_keeps_pending_points(tmp_path, monkeypatch):
+    sink = MetricsSink(tmp_path, background=False)
+    sink.record("latency", "agent-1", 1.0)
+
+    def fail(path, text):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(metrics_sink, "_atomic_write", fail)
+    sink.log_file.mkdir()  # appends fail too
+    sink.flush()
+    assert not sink.snapshot_file.exists()
+
+    sink.log_file.rmdir()
+    monkeypatch.undo()
+    sink.record("latency", "agent-1", 3.0)
+    sink.flush()
+    with open(sink.log_file) as f:
+        assert [json.loads(line)["value"] for line in f] == [1.0, 3.0]
+    restored = MetricsSink(tmp_path, background=False)
+    assert restored.stats("latency", "agent-1")["count"] == 2
@@ -0,0 +1,57 @@
+import subprocess
+import sys
+import threading
+import time
+
+import psutil
+
+from dreamos.launcher.process_manager import ResourceSampler, tail_lines
+
+
+def test_tail_lines_matches_readlines(tmp_path):
+    log = tmp_path / "process.log"
+    log.write_text("".join(f"line {i} {'x' * (i % 50)}\n" for i in range(5000)))
+    with open(log) as f:
+        expected = f.readlines()
+    for n in (1, 7, 100, 5000, 9000):
+        assert tail_lines(log, n, block_size=64) == expected[-n:]
+
+    log.write_bytes(b"first\r\nsecond\r\nunterminated")
+    assert tail_lines(log, 2) == ["second\n", "unterminated"]
+    assert tail_lines(log, 0) == []
+
+
+def test_one_sampler_thread_publishes_samples_and_exits():
+    sampler = ResourceSampler(interval=60)
+    samples, exits = {}, []
+    sampler.subscribe(on_sample=lambda pid, s: samples.setdefault(pid, s),
+                      on_exit=lambda pid, status: exits.append((pid, status)))
+
+    children = [subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+                for _ in range(4)]
+    try:
+        for i, child in enumerate(children):
+            assert sampler.track(f"p{i}", child.pid)
+        assert sum(t.name == "process-sampler" for t in threading.enumerate()) == 1
+
+        sampler.sample_once()
+        assert sorted(samples) == ["p0", "p1", "p2", "p3"]
+        assert samples["p0"]["memory_mb"] > 0
+
+        # A killed child we never reaped lingers as a zombie; it is reported once
+        children[0].kill()
+        while psutil.Process(children[0].pid).status() != psutil.STATUS_ZOMBIE:
+            time.sleep(0.01)
+        sampler.sample_once()
+        sampler.sample_once()
+        assert exits == [("p0", "terminated")]
+        assert not sampler.is_tracked("p0")
+
+        assert not sampler.track("gone", children[0].pid)
+        assert exits[-1] == ("gone", "crashed")
+    finally:
+        for i, child in enumerate(children):
+            sampler.untrack(f"p{i}")
+            child.kill()
+            child.wait()
+        sampler.wake()
@@ -0,0 +1,109 @@
+import os
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+def project_scanner(monkeypatch, tmp_path):
+    # The scanner lives at the repository root and keeps its cache in the cwd
+    monkeypatch.syspath_prepend(str(REPO_ROOT))
+    monkeypatch.chdir(tmp_path)
+    import project_scanner
+    # Reports are written into the project and would be picked up by rescans
+    monkeypatch.setattr(project_scanner.ReportGenerator, "save_report", lambda self: None)
+    monkeypatch.setattr(project_scanner.ReportGenerator, "export_chatgpt_context", lambda self, **kwargs: None)
+    return project_scanner
+
+
+@pytest.fixture
+def analyzed(project_scanner, monkeypatch):
+    """Names of the files the LanguageAnalyzer actually parses."""
+    names = []
+    original = project_scanner.LanguageAnalyzer.analyze_file
+
+    def analyze_file(self, file_path, source_code):
+        names.append(Path(file_path).name)
+        return original(self, file_path, source_code)
+
+    monkeypatch.setattr(project_scanner.LanguageAnalyzer, "analyze_file", analyze_file)
+    return names
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    (root / "pkg").mkdir(parents=True)
+    (root / "a.py").write_text("def alpha():\n    return 1\n")
+    (root / "pkg" / "b.py").write_text("class Beta:\n    def run(self):\n        pass\n")
+    return root
+
+
+def test_rescan_skips_unchanged_and_touched_files(project_scanner, analyzed, project):
+    project_scanner.ProjectScanner(project).scan_project()
+    assert sorted(analyzed) == ["a.py", "b.py"]
+
+    del analyzed[:]
+    progress = []
+    project_scanner.ProjectScanner(project).scan_project(progress_callback=progress.append)
+    assert analyzed == []
+    assert progress == [100]
+
+    # A touched file is re-hashed but not re-parsed; an edited one is re-parsed
+    stat = (project / "a.py").stat()
+    os.utime(project / "a.py", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    (project / "pkg" / "b.py").write_text("class Beta:\n    def stop(self):\n        pass\n")
+    scanner = project_scanner.ProjectScanner(project)
+    scanner.scan_project()
+    assert analyzed == ["b.py"]
+    assert scanner.cache["a.py"]["mtime"] == stat.st_mtime_ns + 10**9
+
+
+def test_moved_file_keeps_its_analysis(project_scanner, analyzed, project):
+    first = project_scanner.ProjectScanner(project)
+    first.scan_project()
+    data = first.cache[os.path.join("pkg", "b.py")]["data"]
+
+    (project / "pkg" / "b.py").rename(project / "pkg" / "c.py")
+    del analyzed[:]
+    scanner = project_scanner.ProjectScanner(project)
+    scanner.scan_project()
+
+    assert analyzed == []
+    moved = os.path.join("pkg", "c.py")
+    assert scanner.analysis[moved] == data
+    assert scanner.cache[moved]["data"] == data
+    assert os.path.join("pkg", "b.py") not in scanner.cache
+
+
+def test_pool_failure_falls_back_to_in_process_analysis(project_scanner, analyzed, project, monkeypatch):
+    for i in range(4):
+        (project / f"mod_{i}.py").write_text(f"def f{i}():\n    return {i}\n")
+
+    class BrokenPool:
+        """Delivers one result, then loses its workers."""
+
+        def __init__(self, max_workers, initializer):
+            initializer()
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def map(self, func, tasks, chunksize):
+            yield func(tasks[0])
+            raise RuntimeError("worker died")
+
+    monkeypatch.setattr(project_scanner, "MIN_FILES_FOR_POOL", 1)
+    monkeypatch.setattr(project_scanner, "ProcessPoolExecutor", BrokenPool)
+    scanner = project_scanner.ProjectScanner(project)
+    scanner.num_workers = 2
+    scanner.scan_project()
+
+    # Every file is analyzed exactly once: one by the pool, the rest in-process
+    assert sorted(analyzed) == sorted(["a.py", "b.py"] + [f"mod_{i}.py" for i in range(4)])
+    assert len(scanner.analysis) == 6
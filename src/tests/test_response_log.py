@@ -0,0 +1,74 @@
+import hashlib
+import json
+import random
+
+from dreamos.tools.agent_resume.response_log import ResponseLog
+
+
+def _record(agent_id, content, timestamp):
+    return {
+        "hash": hashlib.sha256(content.encode()).hexdigest(),
+        "agent_id": agent_id,
+        "timestamp": timestamp,
+        "content": content,
+        "validation": {"is_valid": True, "reason": "Valid response"},
+    }
+
+
+def _fill(log, n=60):
+    rng = random.Random(7)
+    words = ["deploy", "config", "parser", "retry", "socket", "cache", "merge", "queue", "token", "agent"]
+    for i in range(n):
+        text = " ".join(rng.choice(words) + str(rng.randrange(5)) for _ in range(12)) + f" item-{i}."
+        log.append(_record(f"Agent-{i % 3 + 1}", text, f"2025-01-01T00:{i:02d}:00+00:00"))
+
+
+def test_reopen_uses_index_and_catches_up_after_crash(tmp_path):
+    path = tmp_path / "history.jsonl"
+    log = ResponseLog(path)
+    _fill(log)
+    assert log.select("Agent-2", since="2025-01-01T00:10:00+00:00", until="2025-01-01T00:20:00+00:00") == [
+        10, 13, 16, 19]
+
+    # A record that reached the log but not the index, plus a torn index line
+    with open(path, "a") as f:
+        f.write(json.dumps(_record("Agent-1", "late arrival after crash", "2025-01-01T01:00:00+00:00")) + "\n")
+    with open(path.with_suffix(".idx"), "a") as f:
+        f.write('{"offset": 9')
+
+    reopened = ResponseLog(path)
+    assert len(reopened.entries) == 61
+    assert reopened.read(60)["content"] == "late arrival after crash"
+    assert reopened.find_hash(hashlib.sha256(b"late arrival after crash").hexdigest()) == [60]
+    assert ResponseLog(path).entries == reopened.entries
+
+    # Rotation replaces the log with an empty file
+    path.rename(tmp_path / "history-20250101.jsonl")
+    path.touch()
+    assert reopened.select() == []
+
+
+def test_substring_candidates_never_miss_a_match(tmp_path):
+    log = ResponseLog(tmp_path / "history.jsonl")
+    _fill(log)
+    contents = [r["content"].lower() for r in log.records(log.select())]
+
+    for query in ["retry3", "ache", "config1 parser", "ue2 tok", "item-42.", "-4", "nothing here"]:
+        expected = {i for i, c in enumerate(contents) if query in c}
+        candidates = log.substring_candidates(query)
+        assert expected <= candidates
+    assert len(log.substring_candidates("config1 parser")) < len(contents)
+    assert log.substring_candidates("!?") is None
+
+
+def test_near_duplicates_through_lsh(tmp_path):
+    log = ResponseLog(tmp_path / "history.jsonl")
+    _fill(log)
+    base = " ".join(f"word{i}" for i in range(40))
+    log.append(_record("Agent-1", base, "2025-01-01T02:00:00+00:00"))
+
+    assert log.near_duplicates(base + " word40", "Agent-1", "2025-01-01T01:00:00+00:00", 0.9) == [60]
+    assert log.near_duplicates(base + " word40", "Agent-2", None, 0.9) == []
+    assert log.near_duplicates(base + " word40", "Agent-1", "2025-01-01T03:00:00+00:00", 0.9) == []
+    unrelated = " ".join(f"other{i}" for i in range(40))
+    assert log.near_duplicates(unrelated, "Agent-1", None, 0.9) == []
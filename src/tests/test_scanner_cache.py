@@ -0,0 +1,89 @@
+import importlib.util
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / "dreamos" / "tools" / "scanner" / "cache.py"
+
+
+@pytest.fixture(scope="module")
+def cache_module():
+    # Loaded directly: the scanner package __init__ pulls in modules this tree lacks
+    spec = importlib.util.spec_from_file_location("scanner_cache", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _journal_keys(cache):
+    with open(cache.journal_path) as f:
+        return [json.loads(line)["key"] for line in f]
+
+
+def test_journal_replays_over_snapshot(cache_module, tmp_path):
+    path = tmp_path / "scan_cache.json"
+    cache = cache_module.ProjectCache(path, batch_size=2, compact_threshold=100)
+    cache.set("a.py", {"hash": "1"})
+    cache.set("b.py", {"hash": "2"})
+    cache.remove("a.py")
+    cache.set("c.py", {"hash": "3"})
+
+    # Flushed in batches of two without compacting: no snapshot yet
+    assert not path.exists()
+    assert _journal_keys(cache) == ["a.py", "b.py", "a.py", "c.py"]
+
+    reopened = cache_module.ProjectCache(path)
+    assert reopened.cache == {"b.py": {"hash": "2"}, "c.py": {"hash": "3"}}
+    reopened.close()
+    cache.close()
+
+
+def test_compaction_rewrites_snapshot_and_drops_journal(cache_module, tmp_path):
+    path = tmp_path / "scan_cache.json"
+    cache = cache_module.ProjectCache(path, batch_size=1, compact_threshold=3)
+    cache.set("a.py", 1)
+    cache.set("b.py", 2)
+    assert _journal_keys(cache) == ["a.py", "b.py"]
+
+    cache.set("c.py", 3)  # Journal would reach compact_threshold
+    assert not cache.journal_path.exists()
+    assert json.loads(path.read_text()) == {"a.py": 1, "b.py": 2, "c.py": 3}
+
+    cache.set("d.py", 4)
+    cache.close()
+    assert not cache.journal_path.exists()
+    assert json.loads(path.read_text()) == {"a.py": 1, "b.py": 2, "c.py": 3, "d.py": 4}
+
+
+def test_torn_last_journal_line_is_dropped(cache_module, tmp_path):
+    path = tmp_path / "scan_cache.json"
+    cache = cache_module.ProjectCache(path, batch_size=1, compact_threshold=100)
+    cache.set("a.py", 1)
+    cache.set("b.py", 2)
+    cache_module._open_caches.discard(cache)  # Simulated crash: never closed
+    with open(cache.journal_path, "a") as f:
+        f.write('{"key": "c.py", "val')  # Crash mid-append
+
+    recovered = cache_module.ProjectCache(path, batch_size=1, compact_threshold=100)
+    assert recovered.cache == {"a.py": 1, "b.py": 2}
+    # Recovery compacts, so new appends do not land on the torn line
+    assert not recovered.journal_path.exists()
+    recovered.set("c.py", 3)
+    reopened = cache_module.ProjectCache(path)
+    assert reopened.cache == {"a.py": 1, "b.py": 2, "c.py": 3}
+    reopened.close()
+    recovered.close()
+
+
+def test_idle_cache_flushes_after_interval(cache_module, tmp_path):
+    cache = cache_module.ProjectCache(tmp_path / "scan_cache.json", flush_interval=0.05)
+    cache.set("a.py", 1)
+    assert not cache.journal_path.exists()
+
+    deadline = time.monotonic() + 5
+    while not cache.journal_path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _journal_keys(cache) == ["a.py"]
+    cache.close()
@@ -0,0 +1,96 @@
+from PIL import Image, ImageDraw
+
+from dreamos.utils.gui.screen_watcher import ScreenWatcher
+
+
+class FakeScreen:
+    """Synthetic screen; grab() crops the requested box and counts calls."""
+
+    def __init__(self, size=(1600, 900)):
+        self.image = Image.new("RGB", size, (30, 30, 30))
+        self.grabs = []
+
+    def grab(self, box):
+        self.grabs.append(box)
+        left, top, width, height = box
+        return self.image.crop((left, top, left + width, top + height))
+
+    def draw(self, box, fill):
+        ImageDraw.Draw(self.image).rectangle(box, fill=fill)
+
+
+def _badge():
+    badge = Image.new("RGB", (48, 24), (255, 255, 255))
+    ImageDraw.Draw(badge).rectangle((8, 8, 39, 15), fill=(0, 160, 0))
+    return badge
+
+
+def test_one_grab_per_tick_and_only_changed_regions_do_work():
+    screen = FakeScreen()
+    watcher = ScreenWatcher(grab=screen.grab)
+    for n in range(4):
+        watcher.register(f"Agent-{n}", (n * 400, 100, 320, 400))
+
+    assert sorted(watcher.tick()) == ["Agent-0", "Agent-1", "Agent-2", "Agent-3"]
+    assert watcher.tick() == []
+    assert screen.grabs == [(0, 100, 1520, 400)] * 2
+
+    screen.draw((840, 200, 900, 260), (200, 200, 200))
+    assert watcher.tick() == ["Agent-2"]
+    assert watcher.stats["changed"] == 5
+    assert watcher.stats["unchanged"] == 4 + 3
+
+    # Flicker below the noise level does not count as a change
+    screen.draw((40, 150, 60, 170), (34, 34, 34))
+    assert watcher.tick() == []
+    assert watcher.stats["noise"] == 1
+    assert watcher.is_stable("Agent-0", 3)
+    assert not watcher.is_stable("Agent-2", 3)
+
+
+def test_template_found_in_region_and_cached_until_change():
+    screen = FakeScreen()
+    watcher = ScreenWatcher(grab=screen.grab)
+    watcher.register("Agent-1", (400, 100, 400, 300))
+    watcher.add_template("complete", _badge())
+
+    assert watcher.find("Agent-1", "complete") is None
+    screen.image.paste(_badge(), (560, 240))
+    assert watcher.find("Agent-1", "complete") is None  # Not ticked yet: cached result
+    assert watcher.stats["matches"] == 1
+
+    assert watcher.tick() == ["Agent-1"]
+    assert watcher.find("Agent-1", "complete") == (560, 240)
+    assert watcher.find("Agent-1", "complete") == (560, 240)
+    assert watcher.stats["matches"] == 2
+
+    # The same badge outside the region is not reported
+    watcher.register("Agent-2", (900, 100, 400, 300))
+    assert watcher.find("Agent-2", "complete") is None
+
+
+def test_wait_for_template_polls_shared_ticks():
+    screen = FakeScreen()
+    watcher = ScreenWatcher(grab=screen.grab, interval=0.01)
+    watcher.register("Agent-1", (0, 0, 400, 300))
+    watcher.add_template("complete", _badge())
+
+    assert watcher.wait_for_template("Agent-1", "complete", timeout=0.05) is None
+    screen.image.paste(_badge(), (100, 100))
+    assert watcher.wait_for_template("Agent-1", "complete", timeout=1) == (100, 100)
+
+
+def test_template_found_at_every_block_phase():
+    icon = Image.new("RGB", (24, 24), (240, 240, 240))
+    ImageDraw.Draw(icon).rectangle((5, 5, 17, 17), fill=(20, 90, 200))
+    misses = []
+    for dy in range(4):
+        for dx in range(4):
+            screen = FakeScreen()
+            watcher = ScreenWatcher(grab=screen.grab)
+            watcher.register("Agent-1", (400, 100, 200, 200))
+            watcher.add_template("icon", icon)
+            screen.image.paste(icon, (480 + dx, 160 + dy))
+            if watcher.find("Agent-1", "icon") != (480 + dx, 160 + dy):
+                misses.append((dx, dy))
+    assert misses == []
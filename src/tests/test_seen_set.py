@@ -0,0 +1,51 @@
+import json
+from datetime import datetime, timedelta
+
+from dreamos.integrations.social.seen_set import SeenSet
+
+
+def test_sightings_append_and_survive_reload(tmp_path):
+    seen = SeenSet(tmp_path, "twitter")
+    assert seen.seen("a", "user_a:link") is False
+    assert seen.seen("a", "user_a:link") is True
+    assert seen.seen("b", "user_b:link") is False
+    seen.flush()
+
+    shard = next(tmp_path.glob("twitter_seen_*.jsonl"))
+    size = shard.stat().st_size
+    seen.seen("a", "user_a:link")
+    seen.flush()
+    assert len(shard.read_text().splitlines()) == 4  # appended, not rewritten
+    assert shard.read_text().startswith(shard.read_bytes()[:size].decode())
+
+    with open(shard, "a") as f:
+        f.write('{"hash": "c", "fir')  # torn write
+    reloaded = SeenSet(tmp_path, "twitter")
+    assert "a" in reloaded and "b" in reloaded and "c" not in reloaded
+    assert reloaded.entries["a"]["count"] == 3
+    assert reloaded.entries["b"]["source"] == "user_b:link"
+
+
+def test_expiry_drops_whole_shards_and_legacy_is_migrated(tmp_path):
+    now = datetime.now()
+    old = (now - timedelta(days=10)).isoformat()
+    recent = (now - timedelta(days=2)).isoformat()
+    (tmp_path / "twitter_dedup.json").write_text(json.dumps({
+        "seen_hashes": {
+            "old": {"first_seen": old, "last_seen": old, "count": 2, "source": "s1"},
+            "recent": {"first_seen": recent, "last_seen": recent, "count": 5, "source": "s2"},
+        },
+        "last_cleanup": old,
+    }))
+
+    seen = SeenSet(tmp_path, "twitter")
+    assert not (tmp_path / "twitter_dedup.json").exists()
+    assert seen.entries["recent"]["count"] == 5
+    seen.seen("fresh", "s3")
+    seen.flush()
+    assert len(list(tmp_path.glob("twitter_seen_*.jsonl"))) == 3
+
+    assert seen.expire() == 1
+    assert "old" not in seen and "recent" in seen and "fresh" in seen
+    assert len(list(tmp_path.glob("twitter_seen_*.jsonl"))) == 2
+    assert set(SeenSet(tmp_path, "twitter").entries) == {"recent", "fresh"}
@@ -0,0 +1,49 @@
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+
+from dreamos.tools import status_all_agents
+from dreamos.tools.status_all_agents import AgentStatus, snapshot_processes, update_metrics
+
+
+def _dead_pid():
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+def test_snapshot_checks_each_pid_once_and_reuses_handles(monkeypatch):
+    dead = _dead_pid()
+    cache = {}
+    monkeypatch.setattr(status_all_agents, "_process_cache", cache)
+
+    snapshot = snapshot_processes([os.getpid(), dead, os.getpid()])
+    assert snapshot == {os.getpid(): ("running", None), dead: ("crashed", None)}
+    handle = cache[os.getpid()]
+    assert list(cache) == [os.getpid()]
+    snapshot_processes([os.getpid()])
+    assert cache[os.getpid()] is handle  # Reused on the next refresh
+
+
+def test_metrics_add_runtime_deltas_and_count_crashes_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(status_all_agents, "METRICS_DIR", tmp_path)
+    monkeypatch.setattr(status_all_agents, "METRICS_FILE", tmp_path / "agent_metrics.json")
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    runner = AgentStatus("Agent-1", {"pid": 100, "start_time": start.isoformat()})
+    crasher = AgentStatus("Agent-2", {"pid": 200, "start_time": start.isoformat()})
+    states = {"Agent-1": ("running", None), "Agent-2": ("crashed", None)}
+    t0 = start.replace(tzinfo=timezone.utc) + timedelta(seconds=600)
+
+    for n in range(4):
+        metrics = update_metrics([runner, crasher], states, now=t0 + timedelta(seconds=5 * n))
+
+    assert metrics["Agent-1"]["total_runtime_seconds"] == 615  # 600 uptime + 3 x 5s
+    assert metrics["Agent-2"]["crashes"] == 1
+    assert json.loads((tmp_path / "agent_metrics.json").read_text()) == metrics
+
+    # A restarted run starts counting from its own start time
+    restarted = AgentStatus("Agent-1", {"pid": 101, "start_time": (start + timedelta(seconds=700)).isoformat()})
+    metrics = update_metrics([restarted], {"Agent-1": ("running", None)}, now=t0 + timedelta(seconds=130))
+    assert metrics["Agent-1"]["total_runtime_seconds"] == 615 + 30
@@ -0,0 +1,98 @@
+import importlib
+import json
+import os
+import sys
+import time
+
+from dreamos.tools import agent_cellphone
+
+
+class RecordingCellphone:
+    def __init__(self):
+        self.sent = []
+
+    def message_agents(self, agent_ids, message, mode):
+        self.sent.append(("status", list(agent_ids)))
+        return {agent_id: True for agent_id in agent_ids}
+
+    def message_agent(self, agent_id, message, mode):
+        self.sent.append(("leadership", agent_id))
+        return True
+
+
+def _leader(tmp_path, monkeypatch):
+    # swarm_leader is run as a script next to agent_cellphone
+    monkeypatch.setitem(sys.modules, "agent_cellphone", agent_cellphone)
+    swarm_leader = importlib.import_module("dreamos.tools.swarm_leader")
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "docs/agents/protocols").mkdir(parents=True)
+    (tmp_path / "runtime/agent_comms/feedback").mkdir(parents=True)
+    return swarm_leader, swarm_leader.SwarmLeader(cellphone=RecordingCellphone())
+
+
+def test_protocol_versions_reparsed_only_when_files_change(tmp_path, monkeypatch):
+    swarm_leader, leader = _leader(tmp_path, monkeypatch)
+    protocol = leader.protocol_dir / "onboarding.md"
+    protocol.write_text("# Onboarding\nVersion: 1.0.0\n")
+    leader._update_protocol_versions()
+    assert leader.agent_status["protocol_versions"] == {"onboarding": "1.0.0"}
+    assert leader._dirty
+    leader.save_coordination_state()
+
+    searches = []
+    real_search = swarm_leader.VERSION_PATTERN
+    monkeypatch.setattr(swarm_leader, "VERSION_PATTERN", type("P", (), {
+        "search": staticmethod(lambda text: searches.append(text) or real_search.search(text))
+    }))
+    leader._update_protocol_versions()
+    assert searches == [] and not leader._dirty
+
+    protocol.write_text("# Onboarding\nVersion: 1.1.0\n")
+    os.utime(protocol, ns=(time.time_ns(), time.time_ns() + 10**9))
+    leader._update_protocol_versions()
+    assert len(searches) == 1
+    assert leader.agent_status["protocol_versions"]["onboarding"] == "1.1.0" and leader._dirty
+
+
+def test_feedback_batch_archives_and_skips_idle_scans(tmp_path, monkeypatch):
+    _, leader = _leader(tmp_path, monkeypatch)
+    for n in range(3):
+        (leader.feedback_dir / f"status-{n}.json").write_text(json.dumps({
+            "type": "status_update", "agent_id": f"Agent-{n}", "timestamp": "2025-01-01T00:00:00", "status": "ok",
+        }))
+    (leader.feedback_dir / "partial.json").write_text('{"type": "task_')
+
+    assert leader._process_agent_feedback() == 3
+    assert sorted(leader.agent_status["agents"]) == ["Agent-0", "Agent-1", "Agent-2"]
+    assert sorted(p.name for p in (leader.feedback_dir / "archive").iterdir()) == [
+        "status-0.json", "status-1.json", "status-2.json"]
+    assert (leader.feedback_dir / "partial.json").exists()  # may still be mid-write
+
+    old = time.time() - 60
+    os.utime(leader.feedback_dir / "partial.json", (old, old))
+    assert leader._process_agent_feedback() == 1
+    leader._process_agent_feedback()  # sees its own archive moves once
+    monkeypatch.setattr(os, "scandir", lambda path: (_ for _ in ()).throw(AssertionError("scanned")))
+    assert leader._process_agent_feedback() == 0
+
+
+def test_loop_handles_feedback_without_waiting_for_the_cycle(tmp_path, monkeypatch):
+    swarm_leader, leader = _leader(tmp_path, monkeypatch)
+    monkeypatch.setattr(swarm_leader, "FEEDBACK_POLL_INTERVAL", 0.05)
+    leader.agent_status["agents"]["Agent-1"] = {}
+    leader.start_leadership_loop()
+    try:
+        (leader.feedback_dir / "task.json").write_text(json.dumps({
+            "type": "task_update", "task_id": "t-1", "agent_id": "Agent-1",
+            "timestamp": "2025-01-01T00:00:00", "status": "done",
+        }))
+        leader.notify_feedback()
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and "t-1" not in leader.agent_status["active_tasks"]:
+            time.sleep(0.02)
+        assert "t-1" in leader.agent_status["active_tasks"]
+    finally:
+        leader.stop_leadership_loop()
+    assert leader.cellphone.sent == [("status", ["Agent-1"]), ("leadership", "Agent-8")]
+    saved = json.loads(leader.coordination_file.read_text())
+    assert saved["active_tasks"]["t-1"]["status"] == "done"
@@ -0,0 +1,51 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / "dreamos" / "tools" / "scanner" / "symbol_index.py"
+
+
+@pytest.fixture(scope="module")
+def symbol_index():
+    # Loaded directly: the scanner package __init__ pulls in modules this tree lacks
+    spec = importlib.util.spec_from_file_location("scanner_symbol_index", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    root.mkdir()
+    (root / "a.py").write_text("def a():\n    return get_config()\n")
+    (root / "b.py").write_text("def b():\n    return get_config_value('key')\n")
+    (root / "c.py").write_text("def c():\n    return settings.get_config()\n")
+    return root
+
+
+@pytest.mark.parametrize("fts", [True, False])
+def test_callers_match_exact_names(symbol_index, project, tmp_path, fts):
+    index = symbol_index.SymbolIndex(tmp_path / "symbols.db")
+    if not fts:
+        index.fts = False  # Exercise the LIKE fallback against the same rows
+    elif not index.fts:
+        pytest.skip("SQLite built without FTS5")
+    index.update(project)
+
+    assert sorted(r["name"] for r in index.callers("get_config", root=project)) == ["a", "c"]
+    assert [r["name"] for r in index.callers("get_config_value", root=project)] == ["b"]
+    assert index.callers("config", root=project) == []
+    index.close()
+
+
+def test_update_reparses_only_changed_files(symbol_index, project, tmp_path):
+    index = symbol_index.SymbolIndex(tmp_path / "symbols.db")
+    assert index.update(project)["updated"] == 3
+
+    (project / "b.py").write_text("def b():\n    return get_config()\n")
+    stats = index.update(project)
+    assert (stats["updated"], stats["removed"]) == (1, 0)
+    assert sorted(r["name"] for r in index.callers("get_config", root=project)) == ["a", "b", "c"]
+    index.close()
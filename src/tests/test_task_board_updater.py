@@ -0,0 +1,143 @@
+import json
+import os
+import threading
+import time
+
+from dreamos.tools import task_board_updater
+from dreamos.tools.task_board_updater import TaskBoardUpdater
+
+
+def _updater(tmp_path, **kwargs):
+    kwargs.setdefault("compact_interval", 3600)
+    board = tmp_path / "task_board.json"
+    board.write_text(json.dumps({"cursor_agents": {}, "last_updated_utc": "2025-01-01T00:00:00"}))
+    return TaskBoardUpdater(board, **kwargs)
+
+
+def test_updates_go_to_per_agent_journals_and_compact_into_board(tmp_path):
+    updater = _updater(tmp_path)
+    snapshot = updater.task_board_path.read_text()
+
+    updater.update_agent_status("Agent-1", "EXECUTING", task_id="t-1")
+    updater.add_task("Agent-1", "t-1", {"title": "Write docs", "status": "PENDING"})
+    updater.update_task("Agent-1", "t-1", {"status": "DONE"})
+    updater.update_task("Agent-1", "missing", {"status": "DONE"})
+    updater.update_agent_status("Agent-2", "IDLE")
+
+    assert updater.task_board_path.read_text() == snapshot
+    assert sorted(p.name for p in updater.journal_dir.glob("*.jsonl")) == ["Agent-1.jsonl", "Agent-2.jsonl"]
+    view = updater._read_task_board()
+    agent = view["cursor_agents"]["Agent-1"]
+    assert agent["status"] == "EXECUTING" and agent["current_task_id"] == "t-1"
+    assert agent["tasks"]["t-1"]["status"] == "DONE"
+    assert "missing" not in agent["tasks"]
+    assert view["cursor_agents"]["Agent-2"]["status"] == "IDLE"
+
+    assert updater.compact() == 4
+    assert list(updater.journal_dir.glob("*.jsonl")) == []
+    on_disk = json.loads(updater.task_board_path.read_text())
+    assert on_disk["cursor_agents"] == view["cursor_agents"]
+    assert TaskBoardUpdater(updater.task_board_path)._read_task_board()["cursor_agents"] == view["cursor_agents"]
+
+
+def test_interrupted_compaction_and_torn_tail_replay_cleanly(tmp_path):
+    updater = _updater(tmp_path)
+    updater.add_task("Agent-1", "t-1", {"status": "PENDING"})
+    # Crash after moving the shard aside, before the snapshot was written
+    shard = updater.journal_dir / "Agent-1.jsonl"
+    shard.replace(shard.with_suffix(".compacting"))
+    updater.update_task("Agent-1", "t-1", {"status": "DONE"})
+    with open(shard, "a") as f:
+        f.write('{"op": "status", "agent_')
+    updater.update_agent_status("Agent-1", "IDLE")
+
+    view = updater._read_task_board()
+    assert view["cursor_agents"]["Agent-1"]["tasks"]["t-1"]["status"] == "DONE"
+    assert view["cursor_agents"]["Agent-1"]["status"] == "IDLE"
+    assert updater.compact() == 3
+    assert json.loads(updater.task_board_path.read_text())["cursor_agents"] == view["cursor_agents"]
+
+
+def test_group_commit_shares_fsyncs_and_triggers_compaction(tmp_path, monkeypatch):
+    updater = _updater(tmp_path, compact_threshold=1024)
+    fsyncs = []
+    real_fsync = os.fsync
+    gate = threading.Event()
+
+    def slow_fsync(fd):
+        fsyncs.append(fd)
+        gate.wait(0.05)
+        real_fsync(fd)
+
+    monkeypatch.setattr(task_board_updater.os, "fsync", slow_fsync)
+    threads = [
+        threading.Thread(target=updater.update_agent_status, args=(f"Agent-{n % 4}", f"STATUS-{n}"))
+        for n in range(40)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    statuses = {a: d["status"] for a, d in updater._read_task_board()["cursor_agents"].items()}
+    assert sorted(statuses) == ["Agent-0", "Agent-1", "Agent-2", "Agent-3"]
+    assert len(fsyncs) < 40
+    assert json.loads(updater.task_board_path.read_text())["cursor_agents"]  # compacted at the threshold
+
+
+def test_read_does_not_apply_patches_over_a_newer_snapshot(tmp_path, monkeypatch):
+    updater = _updater(tmp_path)
+    other = TaskBoardUpdater(updater.task_board_path, compact_interval=3600)
+    updater.update_agent_status("Agent-1", "IDLE")
+
+    # Another process writes and compacts between the reader's journal and snapshot reads
+    real_read_journal = updater._read_journal
+    compactors = []
+
+    def read_journal_then_compact(shards=None):
+        patches = real_read_journal(shards)
+        other.update_agent_status("Agent-1", "DONE")
+        compactor = threading.Thread(target=other.compact)
+        compactor.start()
+        compactor.join(timeout=0.5)  # Completes here unless the reader holds the board lock
+        compactors.append(compactor)
+        return patches
+
+    monkeypatch.setattr(updater, "_read_journal", read_journal_then_compact)
+    status = updater._read_task_board()["cursor_agents"]["Agent-1"]["status"]
+    compacted_during_read = not compactors[0].is_alive()
+    compactors[0].join()
+    # Either the compaction waited for the read, or the read must show its result
+    assert not compacted_during_read or status == "DONE"
+    monkeypatch.undo()
+    assert updater._read_task_board()["cursor_agents"]["Agent-1"]["status"] == "DONE"
+    assert json.loads(updater.task_board_path.read_text())["cursor_agents"]["Agent-1"]["status"] == "DONE"
+
+def test_pending_patches_reach_the_board_without_further_writes(tmp_path):
+    updater = _updater(tmp_path, compact_interval=0.05)
+    updater.update_agent_status("Agent-1", "BUSY")
+    updater.update_agent_status("Agent-1", "IDLE")
+
+    assert task_board_updater.load_task_board(updater.task_board_path)["cursor_agents"]["Agent-1"]["status"] == "IDLE"
+    deadline = time.monotonic() + 5
+    while updater._has_journal() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert json.loads(updater.task_board_path.read_text())["cursor_agents"]["Agent-1"]["status"] == "IDLE"
+
+
+def test_close_only_compacts_when_due(tmp_path):
+    updater = _updater(tmp_path)
+    snapshot = updater.task_board_path.read_text()
+    updater.update_agent_status("Agent-1", "IDLE")
+    updater.close()
+
+    # Not due: the patch waits in the journal and readers still see it
+    assert updater.task_board_path.read_text() == snapshot
+    assert [p.name for p in updater.journal_dir.glob("*.jsonl")] == ["Agent-1.jsonl"]
+    board = task_board_updater.load_task_board(updater.task_board_path)
+    assert board["cursor_agents"]["Agent-1"]["status"] == "IDLE"
+
+    due = TaskBoardUpdater(updater.task_board_path, compact_interval=0)
+    due.close()
+    assert list(updater.journal_dir.glob("*.jsonl")) == []
+    assert json.loads(updater.task_board_path.read_text())["cursor_agents"]["Agent-1"]["status"] == "IDLE"
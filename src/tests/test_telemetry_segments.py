@@ -0,0 +1,105 @@
+import datetime
+import importlib
+import json
+import os
+import sys
+import types
+
+import pytest
+
+
+@pytest.fixture
+def telemetry(monkeypatch):
+    # bridge.module3 is not part of this tree; SegmentedLog and FileStorage do not use it
+    module3 = types.ModuleType("bridge.module3")
+    module3.BridgeLogger = module3.ErrorHandler = object
+    monkeypatch.setitem(sys.modules, "bridge.module3", module3)
+    monkeypatch.delitem(sys.modules, "bridge.telemetry", raising=False)
+    module = importlib.import_module("bridge.telemetry")
+    yield module
+    sys.modules.pop("bridge.telemetry", None)
+
+
+def _at(minute, second=0):
+    return datetime.datetime(2025, 1, 1, 0, minute, second)
+
+
+def _metric(name, value, when):
+    return {"timestamp": when.isoformat() + "Z", "data": {"metric_name": name, "metric_value": value}}
+
+
+def _fill(log):
+    log.append(_metric("cpu", 1, _at(0, 10)), "cpu")
+    log.append(_metric("mem", 2, _at(0, 50)), "mem")
+    log.append(_metric("cpu", 3, _at(1, 5)), "cpu")
+    log.append(_metric("cpu", 4, _at(2, 30)), "cpu")
+
+
+def test_records_roll_over_into_time_segments(telemetry, tmp_path):
+    log = telemetry.SegmentedLog(str(tmp_path), "metrics", segment_seconds=60)
+    _fill(log)
+
+    names = sorted(name for name in os.listdir(tmp_path) if name.endswith(".jsonl"))
+    assert names == ["metrics-20250101T000000.jsonl", "metrics-20250101T000100.jsonl",
+                     "metrics-20250101T000200.jsonl"]
+    first = log.segments["metrics-20250101T000000.jsonl"]
+    assert (first["count"], first["keys"]) == (2, {"cpu": 1, "mem": 1})
+    assert first["min_ts"] < first["max_ts"]
+    assert log.key_counts() == {"cpu": 3, "mem": 1}
+    assert log.size_bytes() == sum(os.path.getsize(tmp_path / name) for name in names)
+
+
+def test_index_selects_only_overlapping_segments(telemetry, tmp_path, monkeypatch):
+    log = telemetry.SegmentedLog(str(tmp_path), "metrics", segment_seconds=60)
+    _fill(log)
+    log.flush_index()
+
+    selected = log.select_segments(_at(1, 0), _at(1, 59))
+    assert [os.path.basename(path) for path in selected] == ["metrics-20250101T000100.jsonl"]
+    assert len(log.select_segments(keys=["mem"])) == 1
+    assert [record["data"]["metric_value"] for _, record in log.read(_at(0, 30), _at(2, 0), ["cpu"])] == [3]
+
+    # A flushed index is trusted on reopen; only a segment grown since is rescanned
+    log.append(_metric("cpu", 5, _at(2, 40)), "cpu")
+    rescanned = []
+    original = telemetry.SegmentedLog._rescan_segment
+    monkeypatch.setattr(telemetry.SegmentedLog, "_rescan_segment",
+                        lambda self, name: rescanned.append(name) or original(self, name))
+    reopened = telemetry.SegmentedLog(str(tmp_path), "metrics", segment_seconds=60)
+    assert rescanned == ["metrics-20250101T000200.jsonl"]
+    assert reopened.segments == log.segments
+
+
+def test_drop_before_deletes_whole_expired_segments(telemetry, tmp_path):
+    log = telemetry.SegmentedLog(str(tmp_path), "metrics", segment_seconds=60)
+    _fill(log)
+
+    # The second segment's newest record (00:01:05) is not before the cutoff
+    assert log.drop_before(_at(1, 0)) == 1
+    assert not (tmp_path / "metrics-20250101T000000.jsonl").exists()
+    assert sorted(log.segments) == ["metrics-20250101T000100.jsonl", "metrics-20250101T000200.jsonl"]
+    assert log.drop_before(_at(1, 0)) == 0
+
+    with open(log.index_path) as f:
+        assert sorted(json.load(f)) == sorted(log.segments)
+
+
+def test_legacy_single_file_log_is_migrated(telemetry, tmp_path):
+    metrics_file = tmp_path / "metrics.jsonl"
+    with open(metrics_file, "w") as f:
+        f.write(json.dumps(_metric("cpu", 1, _at(0, 10))) + "\n")
+        f.write("not json\n")
+        f.write(json.dumps(_metric("cpu", 2, _at(5, 0))) + "\n")
+    config = {"events_file": str(tmp_path / "events.jsonl"), "metrics_file": str(metrics_file),
+              "segment_seconds": 60}
+
+    storage = telemetry.FileStorage(config)
+    assert not metrics_file.exists()
+    assert (tmp_path / "metrics.jsonl.migrated").exists()
+    assert len(storage.metrics_log.segments) == 2
+    result = storage.retrieve_metrics(["cpu"])
+    assert result["success"] and result["metrics"]["cpu"]["values"] == [1, 2]
+
+    # Reopening does not migrate again or duplicate records
+    reopened = telemetry.FileStorage(config)
+    assert reopened.retrieve_metrics(["cpu"])["metrics"]["cpu"]["values"] == [1, 2]